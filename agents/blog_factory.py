@@ -15,7 +15,6 @@ Publishes to Netlify and creates social content linking to blogs.
 import os
 import sys
 import json
-import re
 from datetime import datetime
 from typing import List, Dict, Optional
 
@@ -167,6 +166,7 @@ class BlogFactory:
         topics = self._generate_topics(brand, config, trends, articles_to_create)
         print(f"  Generated {len(topics)} topics")
 
+        saved_articles = []
         for topic in topics:
             try:
                 print(f"\n  Writing: {topic['title'][:50]}...")
@@ -206,28 +206,45 @@ class BlogFactory:
 
                 saved_article = self.db.save_blog_article(article_record)
                 results['created'] += 1
+                saved_articles.append(saved_article)
                 print(f"    Saved article: {saved_article['id']}")
 
-                # Publish to Netlify if configured
-                if self.can_publish:
-                    print(f"    Publishing to Netlify...")
-                    publish_result = self._publish_article(saved_article, brand)
+            except Exception as e:
+                results['errors'].append(f"Error with {topic.get('title', 'unknown')}: {str(e)}")
+                print(f"    Error: {e}")
+
+        # Publish all of today's articles in one Netlify deploy
+        if self.can_publish and saved_articles:
+            print(f"\n  Publishing {len(saved_articles)} article(s) to Netlify...")
+            publish_result = self._publish_articles(saved_articles, brand)
 
-                    if publish_result.get('success'):
+            if publish_result.get('success'):
+                for saved_article, published in zip(saved_articles, publish_result['articles']):
+                    try:
                         self.db.update_blog_status(
                             saved_article['id'],
                             'published',
-                            published_url=publish_result['published_url'],
-                            netlify_deploy_id=publish_result.get('deploy_id'),
-                            published_at=datetime.utcnow().isoformat()
+                            published_url=published['published_url'],
+                            netlify_deploy_id=published.get('deploy_id'),
+                            published_at=published['published_at']
                         )
-                        saved_article['published_url'] = publish_result['published_url']
+                        saved_article['published_url'] = published['published_url']
                         results['published'] += 1
-                        print(f"    Published: {publish_result['published_url']}")
-                    else:
-                        results['errors'].append(f"Publish failed: {publish_result.get('error')}")
-                        print(f"    Publish failed: {publish_result.get('error')}")
-
+                        print(f"    Published: {published['published_url']}")
+                    except Exception as e:
+                        results['errors'].append(
+                            f"Error with {saved_article.get('title', 'unknown')}: {str(e)}")
+                        print(f"    Error: {e}")
+                stats = publish_result.get('stats', {})
+                print(f"    Deploy {publish_result['deploy_id']}: {stats.get('files_uploaded', 0)} uploaded "
+                      f"({stats.get('bytes_uploaded', 0)} bytes), {stats.get('files_skipped', 0)} skipped, "
+                      f"{stats.get('deploy_seconds', 0)}s")
+            else:
+                results['errors'].append(f"Publish failed: {publish_result.get('error')}")
+                print(f"    Publish failed: {publish_result.get('error')}")
+
+        for saved_article in saved_articles:
+            try:
                 # Create social content to promote the blog
                 social_content = self._create_social_promotion(brand, saved_article, config)
                 if social_content:
@@ -241,7 +258,7 @@ class BlogFactory:
                             self.db.link_blog_to_social(saved_article['id'], content['id'])
 
             except Exception as e:
-                results['errors'].append(f"Error with {topic.get('title', 'unknown')}: {str(e)}")
+                results['errors'].append(f"Error promoting {saved_article.get('title', 'unknown')}: {str(e)}")
                 print(f"    Error: {e}")
 
         return results
@@ -392,13 +409,13 @@ The content_markdown should be a complete, publish-ready article with:
             print(f"    Article generation error: {e}")
             return None
 
-    def _publish_article(self, article: Dict, brand: Dict) -> Dict:
-        """Publish article to Netlify."""
+    def _publish_articles(self, articles: List[Dict], brand: Dict) -> Dict:
+        """Publish articles to Netlify in a single deploy."""
         if not self.netlify:
             return {'success': False, 'error': 'Netlify not configured'}
 
         try:
-            return self.netlify.publish_article(article, brand)
+            return self.netlify.publish_articles(articles, brand)
         except Exception as e:
             return {'success': False, 'error': str(e)}
 
@@ -444,18 +461,8 @@ The content_markdown should be a complete, publish-ready article with:
 
     def _markdown_to_html(self, markdown: str) -> str:
         """Convert markdown to HTML with proper structure."""
-        # Use the Netlify client's converter
-        try:
-            return NetlifyClient._markdown_to_html(None, markdown)
-        except:
-            # Fallback to simple conversion
-            import re
-            html = markdown
-            html = re.sub(r'^### (.+)$', r'<h3>\1</h3>', html, flags=re.MULTILINE)
-            html = re.sub(r'^## (.+)$', r'<h2>\1</h2>', html, flags=re.MULTILINE)
-            html = re.sub(r'\*\*(.+?)\*\*', r'<strong>\1</strong>', html)
-            html = re.sub(r'\[(.+?)\]\((.+?)\)', r'<a href="\2">\1</a>', html)
-            return html
+        # Same renderer the Netlify client uses for articles without content_html
+        return NetlifyClient._markdown_to_html(None, markdown)
 
 
 def main():
@@ -1,6 +1,7 @@
 """Daily Revenue Report — Generates a daily briefing with key metrics.
 
-Queries Supabase for:
+Computes from the local analytics snapshot (synced from Supabase first;
+unresolved errors and agent status are queried live):
 - Daily pin count and article count per brand
 - Error count and unresolved errors
 - Week-over-week growth percentages
@@ -21,6 +22,7 @@ from pathlib import Path
 # Add project root to path
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+from analytics.snapshot import AnalyticsSnapshot
 from database.supabase_client import get_supabase_client
 
 BRANDS = ["fitness", "deals", "menopause"]
@@ -34,59 +36,33 @@ BRAND_LABELS = {
 DROP_THRESHOLD = 0.30  # 30% drop triggers alert
 EXPECTED_DAILY_PINS = 5  # Per brand
 
+SNAPSHOT_TABLES = ("content_history", "generated_articles", "errors")
 
-def count_pins_for_date(db, date_str: str, brand: str) -> int:
-    """Count pins posted on a specific date for a brand."""
-    try:
-        result = db.client.table("content_history") \
-            .select("id", count="exact") \
-            .eq("brand", brand) \
-            .gte("created_at", date_str + "T00:00:00Z") \
-            .lte("created_at", date_str + "T23:59:59Z") \
-            .execute()
-        return result.count if result.count else 0
-    except Exception:
-        return 0
 
-
-def count_articles_for_date(db, date_str: str, brand: str = None) -> int:
-    """Count articles generated on a specific date."""
-    try:
-        query = db.client.table("generated_articles") \
-            .select("id", count="exact") \
-            .gte("created_at", date_str + "T00:00:00Z") \
-            .lte("created_at", date_str + "T23:59:59Z")
-        if brand:
-            query = query.eq("brand", brand)
-        result = query.execute()
-        return result.count if result.count else 0
-    except Exception:
-        return 0
+def count_by_brand_for_dates(table, dates: list) -> dict:
+    """Rows per brand on each date, as {date: {brand: count}} (one vectorized pass)."""
+    counts = table.daily_counts("brand", BRANDS, dates)
+    return {
+        date_str: {brand: int(counts[i, j]) for i, brand in enumerate(BRANDS)}
+        for j, date_str in enumerate(dates)
+    }
 
 
-def count_errors_for_date(db, date_str: str) -> dict:
+def count_errors_for_date(errors, date_str: str) -> dict:
     """Count errors on a specific date, broken down by severity."""
-    try:
-        result = db.client.table("errors") \
-            .select("severity") \
-            .gte("created_at", date_str + "T00:00:00Z") \
-            .lte("created_at", date_str + "T23:59:59Z") \
-            .execute()
-        errors = result.data or []
-        breakdown = {"high": 0, "medium": 0, "low": 0}
-        for err in errors:
-            sev = err.get("severity", "medium")
-            breakdown[sev] = breakdown.get(sev, 0) + 1
-        return {
-            "total": len(errors),
-            "by_severity": breakdown,
-        }
-    except Exception:
-        return {"total": 0, "by_severity": {}}
+    by_severity = errors.count_by("severity", where=errors.between(date_str, date_str))
+    return {
+        "total": sum(by_severity.values()),
+        "by_severity": {"high": 0, "medium": 0, "low": 0, **by_severity},
+    }
 
 
 def get_unresolved_errors(db) -> list:
-    """Get recent unresolved errors."""
+    """Get recent unresolved errors.
+
+    Queried live: errors are resolved long after they are logged, so the
+    snapshot's copy of the resolved flag would go stale.
+    """
     try:
         result = db.client.table("errors") \
             .select("error_type, error_message, severity, created_at") \
@@ -272,23 +248,21 @@ def main():
     today_str = datetime.now(timezone.utc).strftime("%Y-%m-%d")
     last_week_str = (datetime.now(timezone.utc) - timedelta(days=7)).strftime("%Y-%m-%d")
 
-    # Collect today's data
-    print("\n  Collecting today's metrics...")
-    today_pins = {}
-    today_articles = {}
-    last_week_pins = {}
-    last_week_articles = {}
+    print("\n  Syncing analytics snapshot...")
+    snapshot = AnalyticsSnapshot.open(db.client, SNAPSHOT_TABLES)
 
+    # Collect today's data
+    print("  Collecting today's metrics...")
+    pins = count_by_brand_for_dates(snapshot["content_history"], [today_str, last_week_str])
+    articles = count_by_brand_for_dates(snapshot["generated_articles"], [today_str, last_week_str])
+    today_pins, last_week_pins = pins[today_str], pins[last_week_str]
+    today_articles, last_week_articles = articles[today_str], articles[last_week_str]
     for brand in BRANDS:
-        today_pins[brand] = count_pins_for_date(db, today_str, brand)
-        today_articles[brand] = count_articles_for_date(db, today_str, brand)
-        last_week_pins[brand] = count_pins_for_date(db, last_week_str, brand)
-        last_week_articles[brand] = count_articles_for_date(db, last_week_str, brand)
         print(f"  {BRAND_LABELS[brand]}: {today_pins[brand]} pins, {today_articles[brand]} articles")
 
     # Errors
     print("  Collecting error data...")
-    today_errors = count_errors_for_date(db, today_str)
+    today_errors = count_errors_for_date(snapshot["errors"], today_str)
     unresolved = get_unresolved_errors(db)
     print(f"  Errors today: {today_errors['total']}, Unresolved: {len(unresolved)}")
 
@@ -1,7 +1,8 @@
 """Dashboard Generator — Creates a static HTML dashboard from Supabase data.
 
-Queries Supabase for pins, articles, errors, and agent status,
-then generates outputs/dashboard.html with a clean dark-themed design.
+Computes pin and article metrics from the local analytics snapshot (synced
+from Supabase first), reads unresolved errors and agent status live, then
+generates outputs/dashboard.html with a clean dark-themed design.
 
 Usage:
     python -m analytics.generate_dashboard
@@ -15,6 +16,7 @@ from datetime import datetime, timedelta, timezone
 # Add project root to path
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+from analytics.snapshot import AnalyticsSnapshot
 from database.supabase_client import get_supabase_client
 
 BRANDS = ["fitness", "deals", "menopause"]
@@ -34,56 +36,34 @@ BRAND_SITES = {
     "menopause": "https://menopause-planner-website.vercel.app",
 }
 
+SNAPSHOT_TABLES = ("content_history", "generated_articles", "pinterest_pins")
 
-def get_total_pins_by_brand(db) -> dict:
+
+def count_by_brand(table, where=None) -> dict:
+    """Row count per brand (brands with no rows count 0)."""
+    counts = table.count_by("brand", where=where)
+    return {brand: counts.get(brand, 0) for brand in BRANDS}
+
+
+def get_total_pins_by_brand(snapshot) -> dict:
     """Get total pin count per brand from content_history."""
-    counts = {}
-    for brand in BRANDS:
-        try:
-            result = db.client.table("content_history") \
-                .select("id", count="exact") \
-                .eq("brand", brand) \
-                .execute()
-            counts[brand] = result.count if result.count else 0
-        except Exception:
-            counts[brand] = 0
-    return counts
-
-
-def get_total_articles_by_brand(db) -> dict:
+    return count_by_brand(snapshot["content_history"])
+
+
+def get_total_articles_by_brand(snapshot) -> dict:
     """Get total article count per brand from generated_articles."""
-    counts = {}
-    for brand in BRANDS:
-        try:
-            result = db.client.table("generated_articles") \
-                .select("id", count="exact") \
-                .eq("brand", brand) \
-                .execute()
-            counts[brand] = result.count if result.count else 0
-        except Exception:
-            counts[brand] = 0
-    return counts
-
-
-def get_pins_last_7_days(db) -> dict:
+    return count_by_brand(snapshot["generated_articles"])
+
+
+def get_pins_last_7_days(snapshot) -> dict:
     """Get pin count per brand for the last 7 days."""
     cutoff = (datetime.now(timezone.utc) - timedelta(days=7)).strftime("%Y-%m-%d")
-    counts = {}
-    for brand in BRANDS:
-        try:
-            result = db.client.table("content_history") \
-                .select("id", count="exact") \
-                .eq("brand", brand) \
-                .gte("created_at", cutoff + "T00:00:00Z") \
-                .execute()
-            counts[brand] = result.count if result.count else 0
-        except Exception:
-            counts[brand] = 0
-    return counts
+    history = snapshot["content_history"]
+    return count_by_brand(history, where=history.since(cutoff))
 
 
 def get_recent_errors(db, limit: int = 5) -> list:
-    """Get most recent unresolved errors."""
+    """Get most recent unresolved errors (live: the resolved flag changes late)."""
     try:
         result = db.client.table("errors") \
             .select("error_type, error_message, severity, created_at") \
@@ -108,18 +88,11 @@ def get_agent_status(db) -> list:
         return []
 
 
-def get_recent_pins(db, limit: int = 10) -> list:
+def get_recent_pins(snapshot, limit: int = 10) -> list:
     """Get most recently posted pins."""
-    try:
-        result = db.client.table("pinterest_pins") \
-            .select("brand, title, status, created_at, destination_url") \
-            .eq("status", "posted") \
-            .order("created_at", desc=True) \
-            .limit(limit) \
-            .execute()
-        return result.data or []
-    except Exception:
-        return []
+    pins = snapshot["pinterest_pins"]
+    return pins.records(["brand", "title", "status", "created_at", "destination_url"],
+                        where=pins.eq("status", "posted"), limit=limit)
 
 
 def escape_html(text: str) -> str:
@@ -400,13 +373,14 @@ def main():
 
     db = get_supabase_client()
 
-    print("  Fetching data...")
-    total_pins = get_total_pins_by_brand(db)
-    total_articles = get_total_articles_by_brand(db)
-    pins_7d = get_pins_last_7_days(db)
+    print("  Syncing analytics snapshot...")
+    snapshot = AnalyticsSnapshot.open(db.client, SNAPSHOT_TABLES)
+    total_pins = get_total_pins_by_brand(snapshot)
+    total_articles = get_total_articles_by_brand(snapshot)
+    pins_7d = get_pins_last_7_days(snapshot)
     errors = get_recent_errors(db)
     agents = get_agent_status(db)
-    recent_pins = get_recent_pins(db)
+    recent_pins = get_recent_pins(snapshot)
 
     for brand in BRANDS:
         print(f"  {BRAND_LABELS[brand]}: {total_pins[brand]} pins, {total_articles[brand]} articles")
@@ -1,6 +1,7 @@
 """Pin Performance Tracker — Aggregates pin metrics from Supabase.
 
-Queries pinterest_pins and pinterest_analytics tables to identify:
+Computes from the local analytics snapshot of the pinterest_pins and
+pinterest_analytics tables (synced from Supabase first) to identify:
 - Top-performing pin styles, topics, and posting times
 - Brand-level performance breakdowns
 - Weekly trends and growth patterns
@@ -16,12 +17,14 @@ import os
 import sys
 import json
 from datetime import datetime, timedelta, timezone
-from collections import defaultdict
 from pathlib import Path
 
+import numpy as np
+
 # Add project root to path
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+from analytics.snapshot import AnalyticsSnapshot
 from database.supabase_client import get_supabase_client
 
 BRANDS = ["fitness", "deals", "menopause"]
@@ -31,33 +34,8 @@ BRAND_LABELS = {
     "menopause": "Menopause Planner",
 }
 
-
-def get_pins_for_period(db, start_date: str, end_date: str) -> list:
-    """Fetch all pinterest_pins created within a date range."""
-    try:
-        result = db.client.table("pinterest_pins") \
-            .select("*") \
-            .gte("created_at", start_date + "T00:00:00Z") \
-            .lte("created_at", end_date + "T23:59:59Z") \
-            .execute()
-        return result.data or []
-    except Exception as e:
-        print(f"  Error fetching pins: {e}")
-        return []
-
-
-def get_pinterest_analytics(db, start_date: str, end_date: str) -> list:
-    """Fetch pinterest_analytics records for the period."""
-    try:
-        result = db.client.table("pinterest_analytics") \
-            .select("*") \
-            .gte("collected_at", start_date + "T00:00:00Z") \
-            .lte("collected_at", end_date + "T23:59:59Z") \
-            .execute()
-        return result.data or []
-    except Exception as e:
-        print(f"  Error fetching pinterest_analytics: {e}")
-        return []
+SNAPSHOT_TABLES = ("pinterest_pins", "pinterest_analytics")
+BOARD_METRICS = ("impressions", "saves", "clicks", "pin_clicks")
 
 
 def get_content_history(db, start_date: str, end_date: str) -> list:
@@ -74,69 +52,59 @@ def get_content_history(db, start_date: str, end_date: str) -> list:
         return []
 
 
-def analyze_pins(pins: list) -> dict:
-    """Analyze pin data to find patterns and top performers."""
-    by_brand = defaultdict(list)
-    by_status = defaultdict(int)
-    by_style = defaultdict(int)
-    by_topic = defaultdict(int)
+def _ranked(counts: dict, limit: int = None) -> list:
+    """(value, count) pairs, most frequent first."""
+    return sorted(counts.items(), key=lambda x: x[1], reverse=True)[:limit]
 
-    for pin in pins:
-        brand = pin.get("brand", "unknown")
-        by_brand[brand].append(pin)
-        by_status[pin.get("status", "unknown")] += 1
 
-        style = pin.get("visual_style", "unknown")
-        if style and style != "unknown":
-            by_style[style] += 1
+def analyze_pins(pins, where=None) -> dict:
+    """Analyze pin data to find patterns and top performers.
 
-        topic = pin.get("topic") or pin.get("niche", "")
-        if topic:
-            by_topic[topic] += 1
+    pins is the pinterest_pins snapshot table; where selects the period.
+    """
+    brands, statuses, by_brand_status = pins.crosstab("brand", "status", where)
+    status_totals = by_brand_status.sum(axis=0)
 
     # Brand summaries
     brand_summary = {}
     for brand in BRANDS:
-        brand_pins = by_brand.get(brand, [])
-        posted = [p for p in brand_pins if p.get("status") == "posted"]
-        failed = [p for p in brand_pins if p.get("status") == "failed"]
+        row = by_brand_status[brands.index(brand)] if brand in brands else np.zeros(len(statuses), int)
+        total = int(row.sum())
+        posted = int(row[statuses.index("posted")]) if "posted" in statuses else 0
+        failed = int(row[statuses.index("failed")]) if "failed" in statuses else 0
         brand_summary[brand] = {
-            "total": len(brand_pins),
-            "posted": len(posted),
-            "failed": len(failed),
-            "success_rate": round(len(posted) / max(len(brand_pins), 1) * 100, 1),
+            "total": total,
+            "posted": posted,
+            "failed": failed,
+            "success_rate": round(posted / max(total, 1) * 100, 1),
         }
 
-    # Top topics (sorted by frequency)
-    top_topics = sorted(by_topic.items(), key=lambda x: x[1], reverse=True)[:10]
+    # Topic falls back to niche when a pin has none
+    in_period = np.ones(len(pins), bool) if where is None else where
+    has_topic = pins.columns["topic"] != pins.code("topic", "")
+    topics = pins.count_by("topic", where=in_period & has_topic)
+    for niche, count in pins.count_by("niche", where=in_period & ~has_topic).items():
+        if niche:
+            topics[niche] = topics.get(niche, 0) + count
 
-    # Top styles
-    top_styles = sorted(by_style.items(), key=lambda x: x[1], reverse=True)
+    styles = pins.count_by("visual_style", where=where)
+    styles = {style: count for style, count in styles.items() if style and style != "unknown"}
 
     return {
-        "total_pins": len(pins),
+        "total_pins": int(status_totals.sum()),
         "brand_summary": brand_summary,
-        "status_breakdown": dict(by_status),
-        "top_topics": top_topics,
-        "top_styles": top_styles,
+        "status_breakdown": {statuses[i]: int(status_totals[i]) for i in np.flatnonzero(status_totals)},
+        "top_topics": _ranked(topics, 10),
+        "top_styles": _ranked(styles),
     }
 
 
-def analyze_board_analytics(analytics_records: list) -> dict:
+def analyze_board_analytics(analytics, where=None) -> dict:
     """Aggregate board-level analytics (impressions, saves, clicks)."""
-    brand_totals = defaultdict(lambda: {
-        "impressions": 0, "saves": 0, "clicks": 0, "pin_clicks": 0, "boards": 0
-    })
-
-    for record in analytics_records:
-        brand = record.get("brand", "unknown")
-        brand_totals[brand]["impressions"] += record.get("impressions", 0)
-        brand_totals[brand]["saves"] += record.get("saves", 0)
-        brand_totals[brand]["clicks"] += record.get("clicks", 0)
-        brand_totals[brand]["pin_clicks"] += record.get("pin_clicks", 0)
-        brand_totals[brand]["boards"] += 1
-
-    return dict(brand_totals)
+    return {
+        brand: {**{metric: totals[metric] for metric in BOARD_METRICS}, "boards": totals["rows"]}
+        for brand, totals in analytics.sum_by("brand", BOARD_METRICS, where=where).items()
+    }
 
 
 def save_weekly_summary(db, summary: dict) -> None:
@@ -239,19 +207,21 @@ def main():
     start_date = (datetime.now(timezone.utc) - timedelta(days=7)).strftime("%Y-%m-%d")
     print(f"  Period: {start_date} to {end_date}")
 
-    # Fetch data
-    print("\n  Fetching pins...")
-    pins = get_pins_for_period(db, start_date, end_date)
-    print(f"  Found {len(pins)} pins")
+    # Sync, then select the period
+    print("\n  Syncing analytics snapshot...")
+    snapshot = AnalyticsSnapshot.open(db.client, SNAPSHOT_TABLES)
+    pins = snapshot["pinterest_pins"]
+    in_period = pins.between(start_date, end_date)
+    print(f"  Found {int(in_period.sum())} pins")
 
-    print("  Fetching board analytics...")
-    analytics_records = get_pinterest_analytics(db, start_date, end_date)
-    print(f"  Found {len(analytics_records)} analytics records")
+    analytics = snapshot["pinterest_analytics"]
+    collected = analytics.between(start_date, end_date, column="collected_at")
+    print(f"  Found {int(collected.sum())} analytics records")
 
     # Analyze
     print("\n  Analyzing...")
-    pin_analysis = analyze_pins(pins)
-    board_analytics = analyze_board_analytics(analytics_records)
+    pin_analysis = analyze_pins(pins, in_period)
+    board_analytics = analyze_board_analytics(analytics, collected)
 
     # Save summary to Supabase
     save_weekly_summary(db, pin_analysis)
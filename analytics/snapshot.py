@@ -0,0 +1,401 @@
+"""Columnar analytics snapshot — local NumPy copy of the reporting tables.
+
+daily_report, generate_dashboard, pin_tracker and revenue_intelligence's
+analytics reader each sent many small Supabase queries (a count per brand
+per day, per table) and then aggregated rows in Python loops.
+AnalyticsSnapshot keeps one columnar copy of each table instead:
+
+- Columns are NumPy arrays: int64 ids, UTC microsecond timestamps, integer
+  metrics, and dictionary-encoded strings (int32 codes + category list), so
+  group-bys are a bincount over codes
+- Each table is synced incrementally by a created_at watermark, in pages,
+  and re-fetches a trailing window (refresh_days) so late updates such as
+  a pin moving to "posted" are picked up; rows are upserted by id, and rows
+  in the window that are gone upstream are dropped
+- Persisted per table as cache/analytics/<table>.npz (ANALYTICS_SNAPSHOT_DIR),
+  restored by the analytics workflows' cache step, so a report run costs
+  one small sync plus milliseconds of compute
+
+Usage:
+    snapshot = AnalyticsSnapshot.open(db.client)
+    pins = snapshot["content_history"]
+    today = pins.between("2026-10-17", "2026-10-17")
+    per_brand = pins.count_by("brand", where=today)
+"""
+
+import json
+import logging
+import os
+import tempfile
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Union
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+DEFAULT_SNAPSHOT_DIR = PROJECT_ROOT / "cache" / "analytics"
+SNAPSHOT_VERSION = 1
+SYNC_PAGE_SIZE = 1000
+US_PER_DAY = 86_400_000_000
+EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+STR, INT, BOOL, TIME = "str", "int", "bool", "time"
+
+
+@dataclass(frozen=True)
+class TableSpec:
+    """Columns kept for a table (besides id and created_at) and its refresh window."""
+    columns: Dict[str, str]
+    refresh_days: float = 2
+    time_column: str = "created_at"
+
+
+SNAPSHOT_TABLES = {
+    "content_history": TableSpec({
+        "brand": STR, "status": STR, "trending_topic": STR, "board": STR, "visual_style": STR,
+    }),
+    "generated_articles": TableSpec({"brand": STR, "slug": STR, "article_title": STR}),
+    # errors.resolved changes long after rows are logged: unresolved errors
+    # are read live (daily_report, generate_dashboard), not from here
+    "errors": TableSpec({"error_type": STR, "error_message": STR, "severity": STR}),
+    "pinterest_pins": TableSpec({
+        "brand": STR, "title": STR, "status": STR, "visual_style": STR, "topic": STR,
+        "niche": STR, "destination_url": STR,
+    }),
+    "pinterest_analytics": TableSpec({
+        "brand": STR, "impressions": INT, "saves": INT, "clicks": INT, "pin_clicks": INT,
+        "collected_at": TIME,
+    }),
+}
+
+
+def get_snapshot_dir() -> Path:
+    return Path(os.environ.get("ANALYTICS_SNAPSHOT_DIR") or DEFAULT_SNAPSHOT_DIR)
+
+
+def to_micros(value) -> int:
+    """UTC microseconds for an ISO timestamp, datetime or date (naive = UTC)."""
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    elif isinstance(value, date) and not isinstance(value, datetime):
+        value = datetime(value.year, value.month, value.day)
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return (value - EPOCH) // timedelta(microseconds=1)
+
+
+def from_micros(micros: int) -> str:
+    return (EPOCH + timedelta(microseconds=int(micros))).isoformat()
+
+
+def _day_start(day: Union[str, date]) -> int:
+    """Microseconds at 00:00 UTC of a YYYY-MM-DD string or date."""
+    return to_micros(date.fromisoformat(day) if isinstance(day, str) else day)
+
+
+# ═══════════════════════════════════════════════════════════════
+# COLUMN TABLE
+# ═══════════════════════════════════════════════════════════════
+
+class ColumnTable:
+    """One table as NumPy columns, with vectorized filters and group-bys.
+
+    Filters return boolean masks; every aggregate takes an optional `where`
+    mask. String columns hold int32 codes into categories(column).
+    """
+
+    def __init__(self, name: str, spec: TableSpec):
+        self.name = name
+        self.spec = spec
+        self.watermark: Optional[int] = None
+        self.columns: Dict[str, np.ndarray] = {"id": np.empty(0, np.int64),
+                                               "created_at": np.empty(0, np.int64)}
+        self._categories: Dict[str, List[str]] = {}
+        self._codes: Dict[str, Dict[str, int]] = {}
+        for column, kind in spec.columns.items():
+            self.columns[column] = np.empty(0, np.int32 if kind == STR else
+                                            np.int8 if kind == BOOL else np.int64)
+            if kind == STR:
+                self._categories[column] = []
+                self._codes[column] = {}
+
+    def __len__(self):
+        return len(self.columns["id"])
+
+    def categories(self, column: str) -> List[str]:
+        return self._categories[column]
+
+    def code(self, column: str, value: str) -> int:
+        """Code of a string value, or -1 if the table has never seen it."""
+        return self._codes[column].get(value, -1)
+
+    def _encode(self, column: str, value) -> int:
+        value = "" if value is None else str(value)
+        codes = self._codes[column]
+        code = codes.get(value)
+        if code is None:
+            code = codes[value] = len(self._categories[column])
+            self._categories[column].append(value)
+        return code
+
+    # ── filters ──────────────────────────────────────────────────────────────
+
+    def eq(self, column: str, value) -> np.ndarray:
+        kind = self.spec.columns.get(column)
+        if kind == STR:
+            return self.columns[column] == self.code(column, value)
+        if kind == BOOL:
+            return self.columns[column] == (-1 if value is None else int(bool(value)))
+        return self.columns[column] == value
+
+    def isin(self, column: str, values: Iterable[str]) -> np.ndarray:
+        return np.isin(self.columns[column], [self.code(column, v) for v in values])
+
+    def since(self, start, column: Optional[str] = None) -> np.ndarray:
+        """Rows at or after start (ISO timestamp, datetime or YYYY-MM-DD)."""
+        return self.columns[column or self.spec.time_column] >= to_micros(start)
+
+    def between(self, first_day, last_day, column: Optional[str] = None) -> np.ndarray:
+        """Rows from 00:00 UTC of first_day through the end of last_day."""
+        column = column or self.spec.time_column
+        values = self.columns[column]
+        return (values >= _day_start(first_day)) & (values < _day_start(last_day) + US_PER_DAY)
+
+    # ── aggregates ───────────────────────────────────────────────────────────
+
+    def _select(self, column: str, where) -> np.ndarray:
+        values = self.columns[column]
+        return values if where is None else values[where]
+
+    def count_by(self, column: str, where=None) -> Dict[str, int]:
+        """Row count per value of a string column (values with no rows omitted)."""
+        counts = np.bincount(self._select(column, where), minlength=len(self._categories[column]))
+        return {self._categories[column][code]: int(counts[code]) for code in np.flatnonzero(counts)}
+
+    def sum_by(self, column: str, value_columns: Sequence[str], where=None) -> Dict[str, Dict[str, int]]:
+        """Per value of a string column: the sum of each value column and a row count."""
+        codes = self._select(column, where)
+        size = len(self._categories[column])
+        counts = np.bincount(codes, minlength=size)
+        sums = {vc: np.bincount(codes, weights=self._select(vc, where), minlength=size)
+                for vc in value_columns}
+        return {
+            self._categories[column][code]: {
+                **{vc: int(sums[vc][code]) for vc in value_columns}, "rows": int(counts[code]),
+            }
+            for code in np.flatnonzero(counts)
+        }
+
+    def crosstab(self, rows: str, cols: str, where=None):
+        """(row categories, col categories, count matrix) for two string columns."""
+        n_rows, n_cols = len(self._categories[rows]), len(self._categories[cols])
+        flat = self._select(rows, where).astype(np.int64) * n_cols + self._select(cols, where)
+        matrix = np.bincount(flat, minlength=n_rows * n_cols).reshape(n_rows, n_cols)
+        return self._categories[rows], self._categories[cols], matrix
+
+    def daily_counts(self, column: str, keys: Sequence[str], days: Sequence, where=None) -> np.ndarray:
+        """Counts as a (len(keys), len(days)) array: rows per key per UTC day."""
+        key_pos = np.full(len(self._categories[column]), -1, dtype=np.int64)
+        for pos, key in enumerate(keys):
+            code = self.code(column, key)
+            if code >= 0:
+                key_pos[code] = pos
+        row_keys = key_pos[self._select(column, where)]
+        row_days = self._select(self.spec.time_column, where) // US_PER_DAY
+        known = row_keys >= 0
+
+        counts = np.zeros((len(keys), len(days)), dtype=np.int64)
+        for j, day in enumerate(days):
+            on_day = known & (row_days == _day_start(day) // US_PER_DAY)
+            counts[:, j] = np.bincount(row_keys[on_day], minlength=len(keys))
+        return counts
+
+    def records(self, columns: Sequence[str], where=None, newest_first=True,
+                limit: Optional[int] = None) -> List[dict]:
+        """Rows as dicts (timestamps as ISO strings), ordered by the time column."""
+        index = np.arange(len(self)) if where is None else np.flatnonzero(where)
+        times = self.columns[self.spec.time_column][index]
+        order = np.argsort(-times if newest_first else times, kind="stable")
+        index = index[order[:limit] if limit is not None else order]
+
+        out = [{} for _ in index]
+        for column in columns:
+            kind = self.spec.columns.get(column, TIME if column == "created_at" else INT)
+            values = self.columns[column][index]
+            if kind == STR:
+                categories = self._categories[column]
+                decoded = [categories[v] for v in values]
+            elif kind == TIME:
+                decoded = [from_micros(int(v)) for v in values]
+            elif kind == BOOL:
+                decoded = [None if v < 0 else bool(v) for v in values]
+            else:
+                decoded = values.tolist()
+            for row, value in zip(out, decoded):
+                row[column] = value
+        return out
+
+    # ── updates ──────────────────────────────────────────────────────────────
+
+    def upsert(self, rows: Sequence[dict]) -> int:
+        """Merge Supabase rows by id (newer copies replace older). Returns rows merged."""
+        rows = [r for r in rows if r.get("id") is not None and r.get("created_at")]
+        if not rows:
+            return 0
+        new = {"id": np.array([int(r["id"]) for r in rows], dtype=np.int64),
+               "created_at": np.array([to_micros(r["created_at"]) for r in rows], dtype=np.int64)}
+        for column, kind in self.spec.columns.items():
+            if kind == STR:
+                new[column] = np.array([self._encode(column, r.get(column)) for r in rows], dtype=np.int32)
+            elif kind == BOOL:
+                new[column] = np.array([-1 if r.get(column) is None else int(bool(r[column]))
+                                        for r in rows], dtype=np.int8)
+            elif kind == TIME:
+                new[column] = np.array([to_micros(r[column]) if r.get(column) else 0
+                                        for r in rows], dtype=np.int64)
+            else:
+                new[column] = np.array([int(r.get(column) or 0) for r in rows], dtype=np.int64)
+
+        # Last copy of each id within the batch, then drop superseded old rows
+        _, last = np.unique(new["id"][::-1], return_index=True)
+        keep_new = np.sort(len(rows) - 1 - last)
+        keep_old = ~np.isin(self.columns["id"], new["id"])
+        for column in self.columns:
+            self.columns[column] = np.concatenate([self.columns[column][keep_old],
+                                                   new[column][keep_new]])
+
+        newest = int(new["created_at"].max())
+        self.watermark = newest if self.watermark is None else max(self.watermark, newest)
+        return len(keep_new)
+
+    def sync(self, supabase_client) -> int:
+        """Pull rows created since the watermark (minus refresh_days), in pages.
+
+        Saved rows inside that window that the pull no longer returns were
+        deleted upstream and are dropped.
+        """
+        since = None
+        if self.watermark is not None:
+            since = self.watermark - int(self.spec.refresh_days * US_PER_DAY)
+        select = ", ".join(["id", "created_at", *[c for c in self.spec.columns if c != "created_at"]])
+        seen, start = [], 0
+        while True:
+            query = supabase_client.table(self.name).select(select).order("created_at")
+            if since is not None:
+                query = query.gte("created_at", from_micros(since))
+            rows = query.range(start, start + SYNC_PAGE_SIZE - 1).execute().data or []
+            self.upsert(rows)
+            seen.extend(int(r["id"]) for r in rows if r.get("id") is not None)
+            if len(rows) < SYNC_PAGE_SIZE:
+                break
+            start += SYNC_PAGE_SIZE
+
+        if since is not None:
+            gone = (self.columns["created_at"] >= since) & ~np.isin(self.columns["id"], seen)
+            if gone.any():
+                logger.info(f"Analytics snapshot {self.name}: dropping {int(gone.sum())} deleted row(s)")
+                for column in self.columns:
+                    self.columns[column] = self.columns[column][~gone]
+        return len(seen)
+
+    # ── persistence ──────────────────────────────────────────────────────────
+
+    def to_arrays(self) -> Dict[str, np.ndarray]:
+        arrays = dict(self.columns)
+        for column, categories in self._categories.items():
+            arrays[f"{column}__categories"] = np.array(categories, dtype=str)
+        arrays["__meta__"] = np.array(json.dumps({
+            "version": SNAPSHOT_VERSION, "table": self.name, "watermark": self.watermark,
+            "columns": self.spec.columns,
+        }))
+        return arrays
+
+    @classmethod
+    def from_arrays(cls, name: str, spec: TableSpec, arrays) -> "ColumnTable":
+        """Rebuild from saved arrays; a mismatched version or column set gives an empty table."""
+        table = cls(name, spec)
+        meta = json.loads(str(arrays["__meta__"]))
+        if meta.get("version") != SNAPSHOT_VERSION or meta.get("columns") != spec.columns:
+            logger.info(f"Analytics snapshot {name} has a different layout; re-syncing from scratch")
+            return table
+        for column in table.columns:
+            table.columns[column] = arrays[column]
+        for column in table._categories:
+            table._categories[column] = arrays[f"{column}__categories"].tolist()
+            table._codes[column] = {v: i for i, v in enumerate(table._categories[column])}
+        table.watermark = meta.get("watermark")
+        return table
+
+
+# ═══════════════════════════════════════════════════════════════
+# SNAPSHOT
+# ═══════════════════════════════════════════════════════════════
+
+class AnalyticsSnapshot:
+    """The reporting tables as ColumnTables, persisted under one directory."""
+
+    def __init__(self, directory=None):
+        self.directory = Path(directory) if directory else get_snapshot_dir()
+        self.tables: Dict[str, ColumnTable] = {}
+
+    def __getitem__(self, name: str) -> ColumnTable:
+        if name not in self.tables:
+            self.tables[name] = ColumnTable(name, SNAPSHOT_TABLES[name])
+        return self.tables[name]
+
+    def path(self, name: str) -> Path:
+        return self.directory / f"{name}.npz"
+
+    @classmethod
+    def load(cls, directory=None, tables: Iterable[str] = SNAPSHOT_TABLES) -> "AnalyticsSnapshot":
+        snapshot = cls(directory)
+        for name in tables:
+            try:
+                with np.load(snapshot.path(name), allow_pickle=False) as arrays:
+                    snapshot.tables[name] = ColumnTable.from_arrays(name, SNAPSHOT_TABLES[name], arrays)
+            except FileNotFoundError:
+                continue
+            except (OSError, ValueError, KeyError) as e:
+                logger.warning(f"Ignoring unreadable analytics snapshot {snapshot.path(name)}: {e}")
+        return snapshot
+
+    @classmethod
+    def open(cls, supabase_client, tables: Iterable[str] = SNAPSHOT_TABLES, directory=None) -> "AnalyticsSnapshot":
+        """Load the saved snapshot, sync the given tables from Supabase, and save."""
+        tables = list(tables)
+        snapshot = cls.load(directory, tables)
+        snapshot.sync(supabase_client, tables)
+        snapshot.save(tables)
+        return snapshot
+
+    def sync(self, supabase_client, tables: Iterable[str] = SNAPSHOT_TABLES) -> Dict[str, int]:
+        """Incrementally sync each table; a failed table keeps its saved rows."""
+        fetched = {}
+        for name in tables:
+            try:
+                fetched[name] = self[name].sync(supabase_client)
+            except Exception as e:
+                logger.warning(f"Analytics snapshot sync of {name} failed (using saved rows): {e}")
+                fetched[name] = 0
+        logger.info("Analytics snapshot synced: " + ", ".join(
+            f"{name} {len(self[name])} rows (+{count})" for name, count in fetched.items()))
+        return fetched
+
+    def save(self, tables: Iterable[str] = None):
+        """Atomically write each table's .npz."""
+        for name in tables or list(self.tables):
+            if name not in self.tables:
+                continue
+            try:
+                self.directory.mkdir(parents=True, exist_ok=True)
+                fd, tmp = tempfile.mkstemp(dir=self.directory, prefix=f".{name}-", suffix=".npz")
+                with os.fdopen(fd, "wb") as f:
+                    np.savez(f, **self.tables[name].to_arrays())
+                os.replace(tmp, self.path(name))
+            except OSError as e:
+                logger.warning(f"Could not persist analytics snapshot {name}: {e}")
+
@@ -18,10 +18,15 @@ Usage:
 
 import os
 import re
+import sys
 import logging
 import argparse
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent))
+
+from utils.site_build import write_if_changed
+
 logging.basicConfig(
     level=logging.INFO,
     format='%(asctime)s - %(levelname)s - %(message)s'
@@ -171,8 +176,8 @@ def update_blog_html(
     insert_pos = tag_end + 1
     updated_content = content[:insert_pos] + new_item + content[insert_pos:]
 
-    # Write updated content
-    blog_file.write_text(updated_content, encoding='utf-8')
+    # Write updated content (atomically, so a failed run never leaves a truncated page)
+    write_if_changed(blog_file, updated_content)
     logger.info(f"Updated blog listing: {blog_path}")
     logger.info(f"Added article: {title}")
 
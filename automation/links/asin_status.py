@@ -0,0 +1,315 @@
+"""
+Shared, cached Amazon ASIN verification for article saves.
+
+pin_article_generator.validate_amazon_links used to make a blocking
+requests.get for every /dp/ URL in every article, with no session reuse,
+so each save_and_register_article waited on up to ~20 Amazon round trips
+and re-verified the same approved ASINs in every article of the run.
+AsinVerifier answers "is this ASIN still a live product page?" once:
+
+- Statuses are kept per ASIN in a TTL cache (cache/asin_status.json),
+  shared by every article, worker thread and run within ASIN_STATUS_TTL_HOURS
+- The cache is seeded from automation/links/verify_asins.py (Rainforest)
+  runs, and from its report at ASIN_VERIFY_REPORT when one is present, so
+  ASINs verified live there are never fetched here (its "invalid" rows are
+  not trusted: a failed Rainforest lookup is reported the same way)
+- Misses are fetched together through link_engine.LinkChecker: one pooled
+  httpx client, per-host concurrency and rate limits, Retry-After handling
+- An ASIN already being fetched by another thread is waited for, not
+  fetched twice
+
+Only definite answers are cached: "ok" (the product page loads) and
+"broken" (404, or Amazon redirected to a search page). Throttling,
+timeouts and other non-answers come back as "unknown" and are retried on
+the next save.
+
+Usage:
+    verifier = get_asin_verifier()
+    statuses = verifier.verify(["B002DYIZEO", "B000BD0RT0"])
+    if statuses["B002DYIZEO"].broken:
+        ...
+"""
+
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Optional
+
+from automation.links.link_engine import LinkCheck, LinkChecker
+
+logger = logging.getLogger(__name__)
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
+DEFAULT_CACHE_PATH = PROJECT_ROOT / "cache" / "asin_status.json"
+DEFAULT_REPORT_PATH = PROJECT_ROOT / "verification_report.json"
+DEFAULT_TTL_HOURS = 24.0
+DEFAULT_TIMEOUT = 10.0
+# Waiting on another thread's fetch of the same ASIN never takes longer than this
+INFLIGHT_WAIT_SECONDS = 60.0
+
+OK = "ok"
+BROKEN = "broken"
+UNKNOWN = "unknown"
+
+# Final URLs that mean Amazon no longer has the product page
+SEARCH_REDIRECT_MARKERS = ("/s?k=", "/gp/search/")
+
+
+def product_url(asin: str) -> str:
+    """Canonical, untagged product page URL (checks don't count as affiliate clicks)."""
+    return f"https://www.amazon.com/dp/{asin}"
+
+
+def get_ttl_seconds() -> float:
+    """Cache TTL in seconds (ASIN_STATUS_TTL_HOURS, 0 disables the cache)."""
+    return float(os.environ.get("ASIN_STATUS_TTL_HOURS") or DEFAULT_TTL_HOURS) * 3600
+
+
+@dataclass
+class AsinStatus:
+    """Whether an ASIN's product page is live, and how we know."""
+    asin: str
+    status: str = UNKNOWN
+    http_status: Optional[int] = None
+    final_url: Optional[str] = None
+    error: Optional[str] = None
+    source: str = "http"           # "http" | "rainforest"
+    checked_at: float = 0.0
+    cached: bool = False
+
+    @property
+    def broken(self) -> bool:
+        return self.status == BROKEN
+
+    @property
+    def definitive(self) -> bool:
+        return self.status in (OK, BROKEN)
+
+    @classmethod
+    def from_check(cls, asin: str, check: LinkCheck) -> "AsinStatus":
+        """Classify a LinkChecker result for a product page."""
+        final_url = check.final_url or ""
+        if check.error is not None or check.http_status is None:
+            status = UNKNOWN
+        elif check.http_status == 404 or any(m in final_url for m in SEARCH_REDIRECT_MARKERS):
+            status = BROKEN
+        elif check.http_status < 400:
+            status = OK
+        else:
+            # 403/405/429/503: Amazon throttling or refusing bots, not a dead page
+            status = UNKNOWN
+        return cls(asin=asin, status=status, http_status=check.http_status,
+                   final_url=check.final_url, error=check.error, checked_at=check.checked_at)
+
+    def to_dict(self) -> dict:
+        data = asdict(self)
+        data.pop("cached")
+        return data
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "AsinStatus":
+        fields = ("asin", "status", "http_status", "final_url", "error", "source", "checked_at")
+        return cls(**{k: data[k] for k in fields if k in data}, cached=True)
+
+
+# ═══════════════════════════════════════════════════════════════
+# CACHE
+# ═══════════════════════════════════════════════════════════════
+
+class AsinStatusCache:
+    """Thread-safe TTL cache of definitive AsinStatuses, persisted as JSON."""
+
+    def __init__(self, path=None, ttl=None, clock=time.time):
+        self.path = Path(path or os.environ.get("ASIN_STATUS_CACHE_PATH") or DEFAULT_CACHE_PATH)
+        self.ttl = get_ttl_seconds() if ttl is None else ttl
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._entries: Dict[str, dict] = {}
+        self._dirty = False
+
+    def __len__(self):
+        return len(self._entries)
+
+    @classmethod
+    def load(cls, path=None, ttl=None, clock=time.time) -> "AsinStatusCache":
+        cache = cls(path, ttl, clock)
+        try:
+            state = json.loads(cache.path.read_text())
+        except FileNotFoundError:
+            return cache
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable ASIN status cache {cache.path}: {e}")
+            return cache
+        entries = state.get("entries", {})
+        now = clock()
+        cache._entries = {asin: entry for asin, entry in entries.items()
+                          if now - entry.get("checked_at", 0) < cache.ttl}
+        cache._dirty = len(cache._entries) != len(entries)
+        return cache
+
+    def get(self, asin: str) -> Optional[AsinStatus]:
+        with self._lock:
+            entry = self._entries.get(asin)
+            if entry is None:
+                return None
+            if self._clock() - entry.get("checked_at", 0) >= self.ttl:
+                del self._entries[asin]
+                self._dirty = True
+                return None
+            return AsinStatus.from_dict(entry)
+
+    def put(self, status: AsinStatus):
+        if self.ttl <= 0 or not status.definitive:
+            return
+        with self._lock:
+            current = self._entries.get(status.asin)
+            if current and current.get("checked_at", 0) > status.checked_at:
+                return
+            self._entries[status.asin] = status.to_dict()
+            self._dirty = True
+
+    def seed_from_report(self, report: dict) -> int:
+        """Add the valid results of a verify_asins.py report as OK.
+
+        Only "valid" rows are seeded: RainforestClient.get_product returns
+        None for quota errors and timeouts as well as missing products, so
+        an "invalid" row may be a live page and is left to the live check.
+        Entries older than the TTL are skipped. Returns the number of ASINs
+        added or refreshed.
+        """
+        added = 0
+        for item in report.get("results", []):
+            if item.get("status") != "valid":
+                continue
+            try:
+                checked_at = datetime.fromisoformat(item["verified_at"]).timestamp()
+            except (KeyError, TypeError, ValueError):
+                continue
+            if self._clock() - checked_at >= self.ttl:
+                continue
+            before = self._entries.get(item["asin"])
+            self.put(AsinStatus(asin=item["asin"], status=OK,
+                                source="rainforest", checked_at=checked_at))
+            added += self._entries.get(item["asin"]) is not before
+        return added
+
+    def save(self):
+        """Atomically write the cache if it changed since load/save."""
+        with self._lock:
+            if not self._dirty:
+                return
+            entries = dict(self._entries)
+            self._dirty = False
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=self.path.parent, prefix=".asin-status-")
+            with os.fdopen(fd, "w") as f:
+                json.dump({"saved_at": datetime.now(timezone.utc).isoformat(),
+                           "entries": entries}, f)
+            os.replace(tmp, self.path)
+        except OSError as e:
+            logger.warning(f"Could not persist ASIN status cache: {e}")
+
+
+# ═══════════════════════════════════════════════════════════════
+# VERIFIER
+# ═══════════════════════════════════════════════════════════════
+
+class AsinVerifier:
+    """Cached, concurrent ASIN liveness checks shared across threads.
+
+    Args:
+        cache: Status cache (None: nothing is remembered between calls).
+        checker_factory: Returns a fresh LinkChecker per batch of misses.
+    """
+
+    def __init__(self, cache: Optional[AsinStatusCache] = None,
+                 checker_factory: Optional[Callable[[], LinkChecker]] = None,
+                 timeout: float = DEFAULT_TIMEOUT):
+        self.cache = cache
+        self._checker_factory = checker_factory or (lambda: LinkChecker(cache=None, timeout=timeout))
+        self._lock = threading.Lock()
+        self._inflight: Dict[str, threading.Event] = {}
+        self._results: Dict[str, AsinStatus] = {}
+        self.stats = {"requested": 0, "cached": 0, "fetched": 0, "waited": 0}
+
+    def verify(self, asins: Iterable[str]) -> Dict[str, AsinStatus]:
+        """Status for every ASIN; only ones not cached (or being fetched) hit Amazon."""
+        unique = list(dict.fromkeys(asins))
+        results, mine, waits = {}, [], {}
+        with self._lock:
+            self.stats["requested"] += len(unique)
+            for asin in unique:
+                hit = self.cache.get(asin) if self.cache is not None else None
+                if hit is not None:
+                    results[asin] = hit
+                elif asin in self._inflight:
+                    waits[asin] = self._inflight[asin]
+                else:
+                    self._inflight[asin] = threading.Event()
+                    mine.append(asin)
+            self.stats["cached"] += len(results)
+            self.stats["fetched"] += len(mine)
+            self.stats["waited"] += len(waits)
+
+        if mine:
+            try:
+                results.update(self._fetch(mine))
+            finally:
+                with self._lock:
+                    for asin in mine:
+                        self._inflight.pop(asin).set()
+
+        for asin, event in waits.items():
+            event.wait(INFLIGHT_WAIT_SECONDS)
+            with self._lock:
+                results[asin] = self._results.get(asin) or AsinStatus(asin=asin, error="Not checked")
+        return results
+
+    def _fetch(self, asins) -> Dict[str, AsinStatus]:
+        started = time.perf_counter()
+        urls = {product_url(asin): asin for asin in asins}
+        checks = self._checker_factory().check(list(urls))
+        statuses = {}
+        for url, asin in urls.items():
+            status = AsinStatus.from_check(asin, checks[url])
+            statuses[asin] = status
+            if self.cache is not None:
+                self.cache.put(status)
+        with self._lock:
+            self._results.update(statuses)
+        if self.cache is not None:
+            self.cache.save()
+        broken = sum(s.broken for s in statuses.values())
+        logger.info(f"Verified {len(asins)} ASIN(s) in {time.perf_counter() - started:.1f}s "
+                    f"({broken} broken)")
+        return statuses
+
+
+_default_verifier = None
+_default_lock = threading.Lock()
+
+
+def get_asin_verifier() -> AsinVerifier:
+    """Process-wide verifier over the persistent cache (ASIN_STATUS_CACHE_PATH / ASIN_STATUS_TTL_HOURS)."""
+    global _default_verifier
+    with _default_lock:
+        if _default_verifier is None:
+            cache = AsinStatusCache.load()
+            report = Path(os.environ.get("ASIN_VERIFY_REPORT") or DEFAULT_REPORT_PATH)
+            if report.is_file():
+                try:
+                    seeded = cache.seed_from_report(json.loads(report.read_text()))
+                except (OSError, ValueError) as e:
+                    logger.warning(f"Ignoring unreadable ASIN report {report}: {e}")
+                else:
+                    if seeded:
+                        logger.info(f"Seeded {seeded} ASIN status(es) from {report}")
+            _default_verifier = AsinVerifier(cache=cache)
+        return _default_verifier
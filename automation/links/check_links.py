@@ -2,16 +2,15 @@
 Affiliate link health checker.
 
 Checks all Amazon affiliate links across website files using either
-HTTP HEAD requests or the Rainforest API (if configured).
+HTTP requests or the Rainforest API (if configured).
 
-Reuses extract_asins.py for link discovery and rainforest_client.py
-for API-based verification.
+Reuses extract_asins.py for link discovery, link_engine.py for concurrent
+cached HTTP checks and rainforest_client.py for API-based verification.
 """
 
 import os
 import sys
 import json
-import time
 import argparse
 import logging
 from pathlib import Path
@@ -21,6 +20,7 @@ from datetime import datetime, timezone
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
 from automation.links.extract_asins import extract_all_asins
+from automation.links.link_engine import USER_AGENT, LinkCache, LinkCheck, LinkChecker
 
 logging.basicConfig(
     level=logging.INFO,
@@ -28,79 +28,61 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-USER_AGENT = (
-    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
-    "AppleWebKit/537.36 (KHTML, like Gecko) "
-    "Chrome/122.0.0.0 Safari/537.36"
-)
+def asin_url(asin: str) -> str:
+    return f"https://www.amazon.com/dp/{asin}"
 
 
-def check_asin_http(asin: str, timeout: int = 10) -> dict:
+def classify_http_check(check: LinkCheck) -> dict:
     """
-    Check a single ASIN via HTTP HEAD request.
+    Turn a raw link_engine result for an ASIN page into a check dict.
 
     Args:
-        asin: Amazon ASIN to check
-        timeout: Request timeout in seconds
+        check: LinkCheck for https://www.amazon.com/dp/<asin>
 
     Returns:
         Dict with status, http_status, and error info
     """
-    import requests
+    if check.error:
+        return {"status": "error", "http_status": None, "error": check.error}
+    if check.blocked:
+        return {
+            "status": "error",
+            "http_status": check.http_status,
+            "error": f"HTTP {check.http_status}: Amazon refused the automated check",
+        }
 
-    url = f"https://www.amazon.com/dp/{asin}"
-    headers = {"User-Agent": USER_AGENT}
+    final_url = check.final_url or ""
+    if check.http_status >= 400:
+        return {
+            "status": "broken",
+            "http_status": check.http_status,
+            "error": f"HTTP {check.http_status}",
+        }
 
-    for attempt in range(2):  # Retry once on failure
-        try:
-            resp = requests.head(
-                url,
-                headers=headers,
-                timeout=timeout,
-                allow_redirects=True,
-            )
+    if "/errors/" in final_url or "dogsofamazon" in final_url:
+        return {
+            "status": "broken",
+            "http_status": check.http_status,
+            "error": f"Redirected to error page: {final_url}",
+        }
 
-            # Check for broken indicators
-            final_url = resp.url or ""
-            if resp.status_code >= 400:
-                return {
-                    "status": "broken",
-                    "http_status": resp.status_code,
-                    "error": f"HTTP {resp.status_code}",
-                }
-
-            if "/errors/" in final_url or "dogsofamazon" in final_url:
-                return {
-                    "status": "broken",
-                    "http_status": resp.status_code,
-                    "error": f"Redirected to error page: {final_url}",
-                }
-
-            return {
-                "status": "valid",
-                "http_status": resp.status_code,
-                "error": None,
-            }
+    return {"status": "valid", "http_status": check.http_status, "error": None}
 
-        except (requests.exceptions.Timeout, requests.exceptions.ConnectionError) as e:
-            if attempt == 0:
-                logger.warning(f"Retrying {asin} after error: {e}")
-                time.sleep(1)
-                continue
-            return {
-                "status": "error",
-                "http_status": None,
-                "error": str(e),
-            }
-        except requests.exceptions.RequestException as e:
-            return {
-                "status": "error",
-                "http_status": None,
-                "error": str(e),
-            }
 
-    # Should not reach here, but just in case
-    return {"status": "error", "http_status": None, "error": "Unknown error"}
+def check_asin_http(asin: str, timeout: int = 10) -> dict:
+    """
+    Check a single ASIN via HTTP (uncached; run_checks batches instead).
+
+    Args:
+        asin: Amazon ASIN to check
+        timeout: Request timeout in seconds
+
+    Returns:
+        Dict with status, http_status, and error info
+    """
+    url = asin_url(asin)
+    checks = LinkChecker(timeout=timeout, headers={"User-Agent": USER_AGENT}).check([url])
+    return classify_http_check(checks[url])
 
 
 def check_asin_rainforest(asin: str, client) -> dict:
@@ -131,14 +113,19 @@ def check_asin_rainforest(asin: str, client) -> dict:
         }
 
 
-def run_checks(source_paths: list[str], output_dir: str, timeout: int = 10) -> dict:
+def run_checks(source_paths: list[str], output_dir: str, timeout: int = 10,
+               use_cache: bool = True) -> dict:
     """
     Extract all ASINs from sources and check each one.
 
+    In HTTP mode every ASIN page is checked concurrently through link_engine
+    (per-host rate limits, Retry-After, results cached in cache/link_checks.json).
+
     Args:
         source_paths: Files/directories to scan for affiliate links
         output_dir: Directory to write reports to
         timeout: HTTP request timeout in seconds
+        use_cache: Reuse cached results younger than LINK_CACHE_TTL_HOURS
 
     Returns:
         Full report dict
@@ -167,10 +154,13 @@ def run_checks(source_paths: list[str], output_dir: str, timeout: int = 10) -> d
         except Exception as e:
             logger.warning(f"Failed to init Rainforest client, falling back to HTTP: {e}")
 
+    http_checks = {}
     if mode == "http":
-        logger.info("Using HTTP HEAD requests for verification")
+        logger.info("Using concurrent HTTP requests for verification")
+        checker = LinkChecker(cache=LinkCache.load() if use_cache else None, timeout=timeout)
+        http_checks = checker.check(asin_url(item["asin"]) for item in asins_data.get("asins", []))
 
-    # Step 3: Check each ASIN
+    # Step 3: Classify each ASIN
     results = []
     valid_count = 0
     broken_count = 0
@@ -178,14 +168,12 @@ def run_checks(source_paths: list[str], output_dir: str, timeout: int = 10) -> d
 
     for item in asins_data.get("asins", []):
         asin = item["asin"]
-        logger.info(f"Checking {asin}...")
 
         if mode == "rainforest":
+            logger.info(f"Checking {asin}...")
             check = check_asin_rainforest(asin, rainforest_client)
         else:
-            check = check_asin_http(asin, timeout=timeout)
-            # Rate limit: 1 request per second
-            time.sleep(1)
+            check = classify_http_check(http_checks[asin_url(asin)])
 
         status = check["status"]
         if status == "valid":
@@ -379,6 +367,11 @@ def main():
         default=10,
         help="HTTP request timeout in seconds (default: 10)",
     )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Re-verify every link instead of reusing cache/link_checks.json",
+    )
 
     args = parser.parse_args()
 
@@ -387,7 +380,8 @@ def main():
     output_dir.mkdir(parents=True, exist_ok=True)
 
     # Run checks
-    report = run_checks(args.source, args.output_dir, timeout=args.timeout)
+    report = run_checks(args.source, args.output_dir, timeout=args.timeout,
+                        use_cache=not args.no_cache)
 
     # Write reports
     write_json_report(report, output_dir)
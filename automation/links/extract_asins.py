@@ -2,15 +2,19 @@
 Extract Amazon ASINs from HTML files.
 
 Scans index.html and article files for Amazon affiliate links
-and extracts unique ASINs for verification.
+and extracts unique ASINs for verification. Parsing is done by
+link_index.py, which caches per-file results between runs.
 """
 
-import re
+import sys
 import json
 import argparse
 from pathlib import Path
-from typing import Set
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent))
+
+from automation.links.link_index import IndexedLink, LinkIndex, get_link_index, links_in_file
 
 
 @dataclass
@@ -23,6 +27,16 @@ class ExtractedLink:
     context: str  # Surrounding text for identification
 
 
+def _to_extracted(link: IndexedLink) -> ExtractedLink:
+    return ExtractedLink(
+        asin=link.asin,
+        url=link.url,
+        source_file=link.file,
+        line_number=link.line,
+        context=link.context,
+    )
+
+
 def extract_asins_from_file(file_path: Path) -> list[ExtractedLink]:
     """
     Extract all Amazon ASINs from an HTML file.
@@ -33,76 +47,33 @@ def extract_asins_from_file(file_path: Path) -> list[ExtractedLink]:
     Returns:
         List of ExtractedLink objects
     """
-    extracted = []
-
-    # ASIN patterns in Amazon URLs
-    # /dp/ASIN, /gp/product/ASIN, /product/ASIN
-    asin_pattern = r'(?:amazon\.com/(?:dp|gp/product|product)/([A-Z0-9]{10}))'
-
     try:
-        content = file_path.read_text(encoding='utf-8')
-        lines = content.split('\n')
-
-        for line_num, line in enumerate(lines, 1):
-            # Find all ASIN matches in this line
-            for match in re.finditer(asin_pattern, line, re.IGNORECASE):
-                asin = match.group(1).upper()
-
-                # Extract URL context
-                url_match = re.search(
-                    rf'https?://[^\s"\'<>]*{asin}[^\s"\'<>]*',
-                    line,
-                    re.IGNORECASE
-                )
-                url = url_match.group(0) if url_match else f"amazon.com/dp/{asin}"
-
-                # Get surrounding context (product name if available)
-                context = ""
-                # Look for alt text or title nearby
-                alt_match = re.search(r'alt="([^"]*)"', line)
-                if alt_match:
-                    context = alt_match.group(1)
-                else:
-                    title_match = re.search(r'title="([^"]*)"', line)
-                    if title_match:
-                        context = title_match.group(1)
-
-                extracted.append(ExtractedLink(
-                    asin=asin,
-                    url=url,
-                    source_file=str(file_path),
-                    line_number=line_num,
-                    context=context[:100] if context else "",
-                ))
-
+        return [_to_extracted(link) for link in links_in_file(file_path) if link.asin]
     except Exception as e:
         print(f"Error reading {file_path}: {e}")
-
-    return extracted
+        return []
 
 
-def extract_all_asins(source_paths: list[str]) -> dict:
+def extract_all_asins(source_paths: list[str], index: LinkIndex | None = None) -> dict:
     """
     Extract ASINs from multiple files/directories.
 
+    Files are parsed through the persistent link index, so only pages that
+    changed since the last run are re-read.
+
     Args:
         source_paths: List of file paths or directories
+        index: LinkIndex to use (default: cache/link_index.json, saved after update)
 
     Returns:
         Dict with unique ASINs and their locations
     """
-    all_links: list[ExtractedLink] = []
-    seen_asins: Set[str] = set()
-
-    for source in source_paths:
-        path = Path(source)
-
-        if path.is_file() and path.suffix == '.html':
-            all_links.extend(extract_asins_from_file(path))
+    if index is None:
+        index = get_link_index(source_paths)
+    else:
+        index.update(source_paths)
 
-        elif path.is_dir():
-            for html_file in path.rglob('*.html'):
-                all_links.extend(extract_asins_from_file(html_file))
+    all_links = [_to_extracted(link) for link in index.links(source_paths) if link.asin]
 
     # Deduplicate and organize
     unique_asins = {}
@@ -0,0 +1,379 @@
+"""
+Shared async link-verification engine for the affiliate link checkers.
+
+check_links.py and validate_links.py used to issue one blocking request
+per link with a fixed 1s sleep in between, so a full audit of the
+generated sites (500+ HTML pages, the same product URL repeated across
+dozens of them) took tens of minutes. LinkChecker replaces that loop:
+
+- URLs are deduplicated before anything goes on the wire
+- Requests run concurrently on one httpx.AsyncClient, with a per-host
+  semaphore and token bucket so no single host (amazon.com,
+  m.media-amazon.com, ...) sees more than its share
+- 429/503 responses honour Retry-After by pausing that host (every
+  in-flight request to it, not just the one that got throttled), except
+  Amazon's 503, which is how it answers bots: that comes back at once as
+  a definitive "blocked" result instead of stalling the whole host
+- Definitive answers are kept in a TTL cache (cache/link_checks.json), so
+  links that were fine yesterday aren't re-verified on every run
+
+The engine only records what the server said (status, final URL, transport
+error); each caller decides what counts as broken.
+
+Usage:
+    checker = LinkChecker(cache=LinkCache.load())
+    checks = checker.check(urls)          # {url: LinkCheck}
+    if checks[url].http_status == 404:
+        ...
+"""
+
+import asyncio
+import json
+import logging
+import os
+import random
+import tempfile
+import time
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from pathlib import Path
+from typing import Optional
+from urllib.parse import urlparse
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
+DEFAULT_CACHE_PATH = PROJECT_ROOT / "cache" / "link_checks.json"
+
+USER_AGENT = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
+    "AppleWebKit/537.36 (KHTML, like Gecko) "
+    "Chrome/122.0.0.0 Safari/537.36"
+)
+
+DEFAULT_HOST_CONCURRENCY = 4
+DEFAULT_HOST_RATE = 4.0         # requests per second per host
+DEFAULT_CACHE_TTL_HOURS = 72.0
+DEFAULT_TIMEOUT = 10.0
+MAX_RETRIES = 2
+MAX_RETRY_AFTER = 60.0          # longer server waits are reported, not honoured
+BACKOFF_BASE_SECONDS = 1.0
+
+# HEAD is often refused by product pages; these get a GET before being judged
+HEAD_FALLBACK_CODES = {405, 501, 503}
+# Throttling / transient server states: retried, and never cached
+RETRY_CODES = {429, 503}
+# Hosts whose 503 (after the GET fallback) means "bot refused", not "try later"
+BOT_BLOCK_HOSTS = ("amazon.com", "media-amazon.com", "amzn.to")
+BOT_BLOCK_CODES = {503}
+
+
+def is_bot_blocking_host(url) -> bool:
+    host = urlparse(url).hostname or ""
+    return any(host == h or host.endswith("." + h) for h in BOT_BLOCK_HOSTS)
+
+
+def get_host_concurrency():
+    return int(os.environ.get("LINK_CHECK_HOST_CONCURRENCY") or DEFAULT_HOST_CONCURRENCY)
+
+
+def get_host_rate():
+    return float(os.environ.get("LINK_CHECK_HOST_RPS") or DEFAULT_HOST_RATE)
+
+
+def get_cache_ttl():
+    """Cache TTL in seconds (LINK_CACHE_TTL_HOURS, 0 disables the cache)."""
+    return float(os.environ.get("LINK_CACHE_TTL_HOURS") or DEFAULT_CACHE_TTL_HOURS) * 3600
+
+
+# ═══════════════════════════════════════════════════════════════
+# RESULTS + CACHE
+# ═══════════════════════════════════════════════════════════════
+
+@dataclass
+class LinkCheck:
+    """Raw outcome of fetching one URL."""
+    url: str
+    http_status: Optional[int] = None
+    final_url: Optional[str] = None
+    error: Optional[str] = None
+    error_kind: Optional[str] = None  # "timeout" | "connection" | "other"
+    blocked: bool = False             # host refused the bot; verify in a browser
+    checked_at: float = 0.0
+    cached: bool = False
+
+    @property
+    def definitive(self) -> bool:
+        """True if a re-check would very likely give the same answer."""
+        if self.blocked:
+            return True
+        return self.error is None and self.http_status is not None \
+            and self.http_status not in RETRY_CODES and self.http_status < 500
+
+    def to_dict(self) -> dict:
+        data = asdict(self)
+        data.pop("cached")
+        return data
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "LinkCheck":
+        return cls(**{k: data.get(k) for k in ("url", "http_status", "final_url",
+                                                "error", "error_kind")},
+                   blocked=data.get("blocked", False),
+                   checked_at=data.get("checked_at", 0.0), cached=True)
+
+
+class LinkCache:
+    """TTL cache of definitive LinkChecks, persisted as JSON."""
+
+    def __init__(self, path=None, ttl=None, clock=time.time):
+        self.path = Path(path or os.environ.get("LINK_CACHE_PATH") or DEFAULT_CACHE_PATH)
+        self.ttl = get_cache_ttl() if ttl is None else ttl
+        self._clock = clock
+        self._entries = {}
+        self._dirty = False
+
+    def __len__(self):
+        return len(self._entries)
+
+    @classmethod
+    def load(cls, path=None, ttl=None, clock=time.time) -> "LinkCache":
+        cache = cls(path, ttl, clock)
+        try:
+            state = json.loads(cache.path.read_text())
+        except FileNotFoundError:
+            return cache
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable link cache {cache.path}: {e}")
+            return cache
+        now = clock()
+        cache._entries = {
+            url: entry for url, entry in state.get("entries", {}).items()
+            if now - entry.get("checked_at", 0) < cache.ttl
+        }
+        cache._dirty = len(cache._entries) != len(state.get("entries", {}))
+        return cache
+
+    def get(self, url) -> Optional[LinkCheck]:
+        entry = self._entries.get(url)
+        if entry is None:
+            return None
+        if self._clock() - entry.get("checked_at", 0) >= self.ttl:
+            del self._entries[url]
+            self._dirty = True
+            return None
+        return LinkCheck.from_dict(entry)
+
+    def put(self, check: LinkCheck):
+        if self.ttl <= 0 or not check.definitive:
+            return
+        self._entries[check.url] = check.to_dict()
+        self._dirty = True
+
+    def save(self):
+        """Atomically write the cache if it changed since load/save."""
+        if not self._dirty:
+            return
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=self.path.parent, prefix=".link-checks-")
+            with os.fdopen(fd, "w") as f:
+                json.dump({"saved_at": datetime.now(timezone.utc).isoformat(),
+                           "entries": self._entries}, f)
+            os.replace(tmp, self.path)
+            self._dirty = False
+        except OSError as e:
+            logger.warning(f"Could not persist link cache: {e}")
+
+
+# ═══════════════════════════════════════════════════════════════
+# PER-HOST LIMITING
+# ═══════════════════════════════════════════════════════════════
+
+def retry_after_seconds(value, now=None) -> Optional[float]:
+    """Parse a Retry-After header (delta-seconds or HTTP-date) into seconds."""
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    now = now or datetime.now(timezone.utc)
+    return max(0.0, (when - now).total_seconds())
+
+
+class TokenBucket:
+    """Event-loop token bucket refilled continuously at `rate` per second."""
+
+    def __init__(self, rate, capacity, clock=time.monotonic):
+        self.rate = rate
+        self.capacity = capacity
+        self._clock = clock
+        self._tokens = capacity
+        self._updated = clock()
+
+    def reserve(self, amount=1) -> float:
+        """Take `amount` tokens and return how long to wait before using them.
+
+        Tokens may go negative so waiting callers are served in order.
+        """
+        now = self._clock()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+        self._tokens -= amount
+        return 0.0 if self._tokens >= 0 else -self._tokens / self.rate
+
+
+class HostLimiter:
+    """Concurrency cap + token bucket + Retry-After pause for one host."""
+
+    def __init__(self, concurrency, rate, clock=time.monotonic):
+        self._semaphore = asyncio.Semaphore(concurrency)
+        self._bucket = TokenBucket(rate, max(1.0, float(concurrency)), clock)
+        self._clock = clock
+        self._paused_until = 0.0
+
+    def pause(self, seconds):
+        self._paused_until = max(self._paused_until, self._clock() + seconds)
+
+    async def __aenter__(self):
+        await self._semaphore.acquire()
+        try:
+            wait = self._bucket.reserve()
+            pause = self._paused_until - self._clock()
+            # A pause can be extended while we sleep, so keep checking
+            while max(wait, pause) > 0:
+                await asyncio.sleep(max(wait, pause))
+                wait = 0.0
+                pause = self._paused_until - self._clock()
+        except BaseException:
+            self._semaphore.release()
+            raise
+        return self
+
+    async def __aexit__(self, *exc):
+        self._semaphore.release()
+
+
+# ═══════════════════════════════════════════════════════════════
+# CHECKER
+# ═══════════════════════════════════════════════════════════════
+
+class LinkChecker:
+    """Concurrent, cached, per-host rate-limited URL checker."""
+
+    def __init__(self, cache: Optional[LinkCache] = None, timeout=DEFAULT_TIMEOUT,
+                 host_concurrency=None, host_rate=None, max_retries=MAX_RETRIES,
+                 headers=None, transport=None):
+        self.cache = cache
+        self.timeout = timeout
+        self.host_concurrency = host_concurrency or get_host_concurrency()
+        self.host_rate = host_rate or get_host_rate()
+        self.max_retries = max_retries
+        self.headers = {"User-Agent": USER_AGENT, **(headers or {})}
+        self._transport = transport
+        self._hosts = {}
+        self.stats = {"requested": 0, "unique": 0, "cached": 0, "fetched": 0, "retries": 0}
+
+    def check(self, urls) -> dict:
+        """Check every URL (duplicates are checked once). Returns {url: LinkCheck}."""
+        return asyncio.run(self.check_async(urls))
+
+    async def check_async(self, urls) -> dict:
+        urls = list(urls)
+        unique = list(dict.fromkeys(urls))
+        self.stats["requested"] += len(urls)
+        self.stats["unique"] += len(unique)
+
+        results, pending = {}, []
+        for url in unique:
+            hit = self.cache.get(url) if self.cache is not None else None
+            if hit is not None:
+                results[url] = hit
+            else:
+                pending.append(url)
+        self.stats["cached"] += len(results)
+
+        if pending:
+            self._hosts = {}
+            started = time.perf_counter()
+            async with httpx.AsyncClient(headers=self.headers, timeout=self.timeout,
+                                         follow_redirects=True,
+                                         transport=self._transport) as client:
+                fetched = await asyncio.gather(*(self._fetch(client, url) for url in pending))
+            for check in fetched:
+                results[check.url] = check
+                if self.cache is not None:
+                    self.cache.put(check)
+            self.stats["fetched"] += len(pending)
+            logger.info(
+                f"Checked {len(pending)} URLs across {len(self._hosts)} hosts in "
+                f"{time.perf_counter() - started:.1f}s ({len(results) - len(pending)} cached, "
+                f"{len(urls) - len(unique)} duplicates skipped)"
+            )
+
+        if self.cache is not None:
+            self.cache.save()
+        return results
+
+    def _host(self, url) -> HostLimiter:
+        host = urlparse(url).netloc.lower()
+        if host not in self._hosts:
+            self._hosts[host] = HostLimiter(self.host_concurrency, self.host_rate)
+        return self._hosts[host]
+
+    async def _fetch(self, client, url) -> LinkCheck:
+        limiter = self._host(url)
+        for attempt in range(self.max_retries + 1):
+            check = LinkCheck(url=url, checked_at=time.time())
+            retry_in = None
+            async with limiter:
+                try:
+                    resp = await client.head(url)
+                    if resp.status_code in HEAD_FALLBACK_CODES:
+                        async with client.stream("GET", url) as resp:
+                            pass
+                    check.http_status = resp.status_code
+                    check.final_url = str(resp.url)
+                    if resp.status_code in BOT_BLOCK_CODES and is_bot_blocking_host(url):
+                        check.blocked = True
+                        return check
+                    if resp.status_code in RETRY_CODES:
+                        retry_in = retry_after_seconds(resp.headers.get("Retry-After"))
+                        if retry_in is None:
+                            retry_in = _backoff(attempt)
+                        elif retry_in > MAX_RETRY_AFTER:
+                            logger.warning(f"{url}: Retry-After {retry_in:.0f}s exceeds cap, giving up")
+                            return check
+                        limiter.pause(retry_in)
+                except httpx.TimeoutException:
+                    check.error, check.error_kind = f"Request timed out ({self.timeout:g}s)", "timeout"
+                    retry_in = _backoff(attempt)
+                except httpx.TransportError as e:
+                    check.error, check.error_kind = f"Connection error: {e}", "connection"
+                    retry_in = _backoff(attempt)
+                except Exception as e:
+                    check.error, check.error_kind = f"Unexpected error: {e}", "other"
+                    return check
+            if retry_in is None or attempt == self.max_retries:
+                return check
+            self.stats["retries"] += 1
+            logger.debug(f"Retrying {url} in {retry_in:.1f}s ({check.error or check.http_status})")
+            await asyncio.sleep(retry_in)
+        return check
+
+
+def _backoff(attempt, base=BACKOFF_BASE_SECONDS):
+    """Exponential backoff with jitter: uniform in [d/2, d] for d = base * 2**attempt."""
+    delay = base * (2 ** attempt)
+    return delay / 2 + random.random() * delay / 2
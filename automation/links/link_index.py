@@ -0,0 +1,307 @@
+"""
+Persistent, incrementally updated index of Amazon links in the site HTML.
+
+extract_asins.py, validate_links.py, pre_deploy_check.py and
+scripts/convert_search_urls.py each re-read every generated page with
+their own line-by-line regexes (extract_asins re-ran three more searches
+per match). LinkIndex scans each file once with a single compiled pattern
+and keeps the result:
+
+- One pass per file: every Amazon URL (product, search, image, short
+  host) with its line, ASIN, affiliate tag, alt/title context and anchor
+  text
+- Incremental: a file is only re-parsed when its mtime/size changed and
+  its content hash differs; deleted files drop out
+- Changed files are parsed in a process pool when there are enough of them
+- Persisted to cache/link_index.json (LINK_INDEX_PATH), written atomically
+
+Usage:
+    index = get_link_index()
+    index.update(["outputs/fitover35-website/"])
+    for link in index.links(["outputs/fitover35-website/"], kinds={"link"}):
+        print(link.file, link.line, link.asin, link.tag)
+    index.save()
+"""
+
+import hashlib
+import json
+import logging
+import os
+import re
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable, Iterator, Optional
+
+logger = logging.getLogger(__name__)
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
+DEFAULT_INDEX_PATH = PROJECT_ROOT / "cache" / "link_index.json"
+INDEX_VERSION = 1
+
+# Below this many changed files a process pool costs more than it saves
+PARALLEL_MIN_FILES = 64
+
+# Every Amazon URL, with or without scheme: www./smile./bare amazon.com and
+# the m.media-amazon.com image CDN. The scan anchors on the literal host
+# (spelled case-insensitively by hand: re.IGNORECASE or a leading optional
+# scheme/subdomain group would make the regex engine try every offset),
+# then URL_HEAD_RE extends each match back over scheme and subdomain.
+# Classified per match in _classify().
+AMAZON_URL_RE = re.compile(r'[aA][mM][aA][zZ][oO][nN]\.[cC][oO][mM]/[^\s"\'<>]+')
+URL_HEAD_RE = re.compile(r'(?:https?://)?[\w.-]*\Z', re.IGNORECASE)
+URL_HEAD_WINDOW = 100
+ASIN_RE = re.compile(r'/(?:dp|gp/product|product)/([A-Z0-9]{10})', re.IGNORECASE)
+TAG_RE = re.compile(r'[?&]tag=([^&"\'<>\s]+)')
+ALT_RE = re.compile(r'alt="([^"]*)"')
+TITLE_RE = re.compile(r'title="([^"]*)"')
+# Anchor text when the URL is an href: rest of the <a> tag, then its body
+ANCHOR_TEXT_RE = re.compile(r'["\']?[^>]{0,500}?>(.{0,500}?)</a>', re.IGNORECASE | re.DOTALL)
+HTML_TAG_RE = re.compile(r'<[^>]+>')
+
+KINDS = ("link", "search", "image", "other")
+
+
+@dataclass(frozen=True)
+class IndexedLink:
+    """One Amazon URL occurrence in an HTML file."""
+    file: str
+    line: int
+    url: str
+    kind: str               # "link" | "search" | "image" | "other" (no scheme / other host)
+    asin: Optional[str]
+    tag: Optional[str]
+    context: str            # alt= or title= text on the same line
+    text: str               # anchor text if the URL is an <a href>
+
+
+# ═══════════════════════════════════════════════════════════════
+# SCANNING
+# ═══════════════════════════════════════════════════════════════
+
+def _classify(url: str) -> str:
+    lower = url.lower()
+    if not lower.startswith(("http://", "https://")):
+        return "other"
+    host = lower.split("/", 3)[2]
+    if host == "m.media-amazon.com":
+        return "image" if lower.split("/", 4)[3] == "images" else "other"
+    if host not in ("amazon.com", "www.amazon.com"):
+        return "other"
+    return "search" if "/s?" in lower or "/s%3f" in lower else "link"
+
+
+def scan_html(content: str) -> list:
+    """All Amazon URLs in an HTML string as [line, url, kind, asin, tag, context, text] rows."""
+    rows = []
+    line, counted = 1, 0
+    for match in AMAZON_URL_RE.finditer(content):
+        start = URL_HEAD_RE.search(content, max(0, match.start() - URL_HEAD_WINDOW),
+                                   match.start()).start()
+        line += content.count("\n", counted, start)
+        counted = start
+
+        url = content[start:match.end()].rstrip(")")
+        asin = ASIN_RE.search(url)
+        tag = TAG_RE.search(url)
+
+        line_start = content.rfind("\n", 0, start) + 1
+        line_end = content.find("\n", start)
+        line_text = content[line_start:line_end if line_end != -1 else len(content)]
+        context = ALT_RE.search(line_text) or TITLE_RE.search(line_text)
+
+        text = ""
+        if content[max(0, start - 6):start].lower().endswith(("href=\"", "href='")):
+            anchor = ANCHOR_TEXT_RE.match(content, match.end())
+            if anchor:
+                text = " ".join(HTML_TAG_RE.sub(" ", anchor.group(1)).split())[:200]
+
+        rows.append([
+            line,
+            url,
+            _classify(url),
+            asin.group(1).upper() if asin else None,
+            tag.group(1) if tag else None,
+            context.group(1)[:100] if context else "",
+            text,
+        ])
+    return rows
+
+
+def scan_file(path) -> tuple:
+    """(sha1, rows) for one HTML file; module-level so it can run in a process pool."""
+    data = Path(path).read_bytes()
+    digest = hashlib.sha1(data).hexdigest()
+    return digest, scan_html(data.decode("utf-8", errors="replace"))
+
+
+def _row_to_link(file: str, row: list) -> IndexedLink:
+    return IndexedLink(file, *row)
+
+
+def links_in_file(path) -> list:
+    """Scan one file without touching the persistent index."""
+    return [_row_to_link(str(path), row) for row in scan_file(path)[1]]
+
+
+def _html_files(source: Path) -> Iterator[Path]:
+    if source.is_file():
+        if source.suffix == ".html":
+            yield source
+        return
+    for root, _dirs, files in os.walk(source):
+        for name in files:
+            if name.endswith(".html"):
+                yield Path(root) / name
+
+
+# ═══════════════════════════════════════════════════════════════
+# INDEX
+# ═══════════════════════════════════════════════════════════════
+
+class LinkIndex:
+    """Amazon links per HTML file, keyed by absolute path, refreshed by mtime + hash."""
+
+    def __init__(self, path=None, workers=None):
+        self.path = Path(path or os.environ.get("LINK_INDEX_PATH") or DEFAULT_INDEX_PATH)
+        self.workers = workers or os.cpu_count() or 1
+        self._files = {}  # abs path -> {"mtime_ns", "size", "sha1", "links"}
+        self._dirty = False
+        self.stats = {"scanned": 0, "unchanged": 0, "removed": 0}
+
+    def __len__(self):
+        return sum(len(entry["links"]) for entry in self._files.values())
+
+    @classmethod
+    def load(cls, path=None, workers=None) -> "LinkIndex":
+        index = cls(path, workers)
+        try:
+            state = json.loads(index.path.read_text())
+        except FileNotFoundError:
+            return index
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable link index {index.path}: {e}")
+            return index
+        if state.get("version") == INDEX_VERSION:
+            index._files = state.get("files", {})
+        return index
+
+    def save(self):
+        """Atomically write the index if it changed since load/save."""
+        if not self._dirty:
+            return
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=self.path.parent, prefix=".link-index-")
+            with os.fdopen(fd, "w") as f:
+                json.dump({"version": INDEX_VERSION, "files": self._files}, f)
+            os.replace(tmp, self.path)
+            self._dirty = False
+        except OSError as e:
+            logger.warning(f"Could not persist link index: {e}")
+
+    # ── update ───────────────────────────────────────────────────────────────
+
+    def update(self, sources: Iterable) -> dict:
+        """Bring the index up to date for these files/directories. Returns this call's stats."""
+        stats = {"scanned": 0, "unchanged": 0, "removed": 0}
+        stale = []
+        for source in sources:
+            source = Path(source).resolve()
+            seen = set()
+            for path in _html_files(source):
+                key = str(path)
+                seen.add(key)
+                try:
+                    st = path.stat()
+                except OSError:
+                    continue
+                entry = self._files.get(key)
+                if entry and entry["mtime_ns"] == st.st_mtime_ns and entry["size"] == st.st_size:
+                    stats["unchanged"] += 1
+                else:
+                    stale.append((key, st))
+
+            prefix = str(source) + os.sep
+            for key in [k for k in self._files if (k == str(source) or k.startswith(prefix))
+                        and k not in seen]:
+                del self._files[key]
+                stats["removed"] += 1
+
+        for (key, st), result in zip(stale, self._scan([key for key, _ in stale])):
+            if result is None:
+                self._files.pop(key, None)
+                continue
+            digest, rows = result
+            entry = self._files.get(key)
+            if entry and entry["sha1"] == digest:
+                stats["unchanged"] += 1  # touched but identical: keep parsed links
+            else:
+                stats["scanned"] += 1
+                entry = {"links": rows, "sha1": digest}
+            entry.update(mtime_ns=st.st_mtime_ns, size=st.st_size)
+            self._files[key] = entry
+
+        if stale or stats["removed"]:
+            self._dirty = True
+        for k, v in stats.items():
+            self.stats[k] += v
+        logger.info(
+            f"Link index: {stats['scanned']} files parsed, {stats['unchanged']} unchanged, "
+            f"{stats['removed']} removed"
+        )
+        return stats
+
+    def _scan(self, paths: list) -> list:
+        """scan_file() over paths, in a process pool when it is worth it. None for unreadable files."""
+        if len(paths) >= PARALLEL_MIN_FILES and self.workers > 1:
+            try:
+                with ProcessPoolExecutor(max_workers=self.workers) as pool:
+                    return list(pool.map(_scan_or_none, paths, chunksize=16))
+            except (OSError, RuntimeError) as e:
+                logger.warning(f"Process pool unavailable, scanning serially: {e}")
+        return [_scan_or_none(path) for path in paths]
+
+    # ── queries ──────────────────────────────────────────────────────────────
+
+    def links(self, sources: Iterable, kinds: Optional[set] = None) -> Iterator[IndexedLink]:
+        """Indexed links under these sources, in file then line order.
+
+        `file` is reported relative to the source as the caller spelled it
+        (e.g. "outputs/site/a.html"), matching a plain os.walk of that source.
+        """
+        for source in sources:
+            root = Path(source).resolve()
+            prefix = str(root) + os.sep
+            for key in sorted(k for k in self._files if k == str(root) or k.startswith(prefix)):
+                shown = str(source) if key == str(root) else os.path.join(source, key[len(prefix):])
+                for row in self._files[key]["links"]:
+                    link = _row_to_link(shown, row)
+                    if kinds is None or link.kind in kinds:
+                        yield link
+
+    def files_with(self, sources: Iterable, kinds: set) -> list:
+        """Files (as spelled under `sources`) containing at least one link of these kinds."""
+        files = []
+        for link in self.links(sources, kinds):
+            if not files or files[-1] != link.file:
+                files.append(link.file)
+        return files
+
+
+def _scan_or_none(path):
+    try:
+        return scan_file(path)
+    except OSError as e:
+        logger.warning(f"Error reading {path}: {e}")
+        return None
+
+
+def get_link_index(sources: Optional[Iterable] = None) -> LinkIndex:
+    """Load the persistent index and, if given, refresh it for `sources` and save."""
+    index = LinkIndex.load()
+    if sources is not None:
+        index.update(sources)
+        index.save()
+    return index
@@ -11,42 +11,28 @@ Usage:
 
 import argparse
 import os
-import re
 import sys
 from pathlib import Path
 
-# Add parent dir so we can import config
+# Add the project root for link_index, and parent dir (ahead of it) so we can import config
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent))
 sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
 from config import AFFILIATE_TAGS, SITE_PATHS
+from automation.links.link_index import get_link_index
 
 
-TAG_RE = re.compile(r'[?&]tag=([^&"\'<>\s]+)')
-AMAZON_LINK_RE = re.compile(
-    r'https?://(?:www\.)?amazon\.com/[^\s"\'<>]+', re.IGNORECASE
-)
-
-
-def quick_tag_check(site_name: str, site_path: str, expected_tag: str):
+def quick_tag_check(site_name: str, site_path: str, expected_tag: str, index=None):
     """Fast check: only validates affiliate tags (no HTTP requests)."""
+    if index is None:
+        index = get_link_index([site_path])
+    else:
+        index.update([site_path])
+
     issues = []
-    for root, _dirs, files in os.walk(site_path):
-        for fname in files:
-            if not fname.endswith(".html"):
-                continue
-            filepath = os.path.join(root, fname)
-            with open(filepath, "r", encoding="utf-8", errors="replace") as f:
-                for lineno, line in enumerate(f, start=1):
-                    for match in AMAZON_LINK_RE.finditer(line):
-                        url = match.group(0)
-                        tag_match = TAG_RE.search(url)
-                        if tag_match:
-                            found_tag = tag_match.group(1)
-                            if found_tag != expected_tag:
-                                rel = os.path.relpath(filepath, site_path)
-                                issues.append((rel, lineno, found_tag))
-                        else:
-                            rel = os.path.relpath(filepath, site_path)
-                            issues.append((rel, lineno, "(missing)"))
+    for link in index.links([site_path], kinds={"link", "search"}):
+        if link.tag != expected_tag:
+            rel = os.path.relpath(link.file, site_path)
+            issues.append((rel, link.line, link.tag or "(missing)"))
     return issues
 
 
@@ -0,0 +1,210 @@
+"""
+Precompiled product-key matcher for affiliate link rewriting.
+
+pin_article_generator (_sanitize_affiliate_links, validate_amazon_links)
+and scripts/convert_search_urls.py map an Amazon search query to an
+approved product by walking the whole brand map for every search URL:
+substring tests in both directions, then word overlap, then SequenceMatcher
+against every key. ProductMatcher builds the lookup structures once per
+map and answers each query without touching keys that cannot match:
+
+- "key in query": an Aho-Corasick automaton over the lowercased keys,
+  one pass over the query
+- "query in key": one str.find over the keys joined in map order, so the
+  first hit is the earliest key
+- Word overlap: an inverted index from word to the keys containing it
+- ASIN -> approved values, for swapping a broken product link
+- Closest key: one SequenceMatcher per key, built once (the key side is
+  the expensive one to index); only keys whose quick upper bounds clear
+  the cutoff are scored, best bound first, stopping once none can win
+
+All answers follow map order exactly like the old loops: when several keys
+match, the one listed first wins.
+
+Usage:
+    matcher = ProductMatcher(AMAZON_AFFILIATE_LINKS["fitness"])
+    hit = matcher.first_substring_match("best creatine for men")
+    if hit:
+        key, url = hit
+"""
+
+import re
+from bisect import bisect_right
+from collections import deque
+from difflib import SequenceMatcher
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+# Separates keys in the joined haystack; never part of a search query
+_SEP = "\x00"
+# A bare ASIN or one inside a URL (/dp/B002DYIZEO?tag=...)
+ASIN_TOKEN_RE = re.compile(r"(?<![A-Z0-9])[A-Z0-9]{10}(?![A-Z0-9])")
+
+
+class AhoCorasick:
+    """Aho-Corasick automaton over a fixed list of strings.
+
+    The failure links are folded into a full transition table at build
+    time, so scanning is one dict lookup per character.
+    """
+
+    def __init__(self, keys: Sequence[str]):
+        goto: List[Dict[str, int]] = [{}]
+        outputs: List[Tuple[int, ...]] = [()]
+        for index, key in enumerate(keys):
+            if not key:
+                continue
+            node = 0
+            for char in key:
+                child = goto[node].get(char)
+                if child is None:
+                    child = len(goto)
+                    goto[node][char] = child
+                    goto.append({})
+                    outputs.append(())
+                node = child
+            outputs[node] += (index,)
+
+        # Breadth-first: a node's failure target is always finished before it
+        fail = [0] * len(goto)
+        delta: List[Dict[str, int]] = [dict(goto[0])] + [{} for _ in goto[1:]]
+        queue = deque(goto[0].values())
+        while queue:
+            node = queue.popleft()
+            delta[node] = {**delta[fail[node]], **goto[node]}
+            for char, child in goto[node].items():
+                queue.append(child)
+                fail[child] = delta[fail[node]].get(char, 0) if node else 0
+                outputs[child] += outputs[fail[child]]
+
+        self._delta = delta
+        self._outputs = outputs
+        # Lowest key index ending at each state; len(keys) when none does
+        self._first = [min(out, default=len(keys)) for out in outputs]
+        self._none = len(keys)
+
+    def iter_matches(self, text: str) -> Iterator[Tuple[int, int]]:
+        """Yield (end offset, key index) for every key occurrence in text."""
+        delta, outputs = self._delta, self._outputs
+        node = 0
+        for pos, char in enumerate(text):
+            node = delta[node].get(char, 0)
+            for index in outputs[node]:
+                yield pos + 1, index
+
+    def first_key(self, text: str) -> Optional[int]:
+        """Lowest index of any key occurring in text, or None."""
+        delta, first = self._delta, self._first
+        found = self._none
+        node = 0
+        for char in text:
+            node = delta[node].get(char, 0)
+            if first[node] < found:
+                found = first[node]
+        return None if found == self._none else found
+
+
+class ProductMatcher:
+    """Map-order-preserving fuzzy lookup of search queries against product keys.
+
+    closest() reuses per-key SequenceMatchers, so one instance should not be
+    queried from several threads at once.
+
+    Args:
+        mapping: product key -> value (approved URL or ASIN). Keys starting
+            with "_" (e.g. "_default") are not matchable.
+    """
+
+    def __init__(self, mapping: Dict[str, str]):
+        self.items: List[Tuple[str, str]] = [(k, v) for k, v in mapping.items() if not k.startswith("_")]
+        self._lookup: Dict[str, str] = dict(self.items)
+
+        lowered = [key.lower() for key, _ in self.items]
+        self._automaton = AhoCorasick(lowered)
+
+        self._haystack = _SEP.join(lowered)
+        self._starts: List[int] = []
+        offset = 0
+        for key in lowered:
+            self._starts.append(offset)
+            offset += len(key) + 1
+
+        self._key_words = [frozenset(key.split()) for key, _ in self.items]
+        self._word_index: Dict[str, List[int]] = {}
+        for index, words in enumerate(self._key_words):
+            for word in words:
+                self._word_index.setdefault(word, []).append(index)
+
+        self._by_asin: Dict[str, List[str]] = {}
+        for _, value in self.items:
+            for asin in set(ASIN_TOKEN_RE.findall(value)):
+                self._by_asin.setdefault(asin, []).append(value)
+
+        # b2j/fullbcount for each key are computed once and cached on these
+        self._sequence_matchers = [SequenceMatcher(None, "", key) for key, _ in self.items]
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    def get(self, key: str) -> Optional[str]:
+        """Exact key lookup."""
+        return self._lookup.get(key)
+
+    def values_for_asin(self, asin: str) -> List[str]:
+        """Values (in map order) that carry this ASIN."""
+        return self._by_asin.get(asin, [])
+
+    def first_substring_match(self, query: str) -> Optional[Tuple[str, str]]:
+        """First key (in map order) that contains, or is contained in, the query.
+
+        The query is compared as given; keys are compared lowercased. An
+        empty query or product map matches nothing.
+        """
+        if not query or not self.items:
+            return None
+        best = self._automaton.first_key(query)
+        if _SEP not in query:
+            pos = self._haystack.find(query)
+            if pos >= 0:
+                index = bisect_right(self._starts, pos) - 1
+                if best is None or index < best:
+                    best = index
+        return None if best is None else self.items[best]
+
+    def best_word_overlap(self, query: str, min_ratio: float = 0.7) -> Optional[Tuple[str, str]]:
+        """Key sharing the most words with the query, among keys whose words
+        are at least min_ratio covered by it. Ties go to the first key."""
+        counts: Dict[int, int] = {}
+        for word in set(query.split()):
+            for index in self._word_index.get(word, ()):
+                counts[index] = counts.get(index, 0) + 1
+
+        best_overlap, best = 0, None
+        for index in sorted(counts):
+            overlap = counts[index]
+            if overlap / len(self._key_words[index]) >= min_ratio and overlap > best_overlap:
+                best_overlap, best = overlap, index
+        return None if best is None else self.items[best]
+
+    def closest(self, query: str, cutoff: float = 0.6) -> Optional[Tuple[str, str]]:
+        """Key with the highest SequenceMatcher ratio above cutoff (first wins ties)."""
+        # quick_ratio() is an upper bound on ratio(): keys that cannot clear the
+        # cutoff are dropped, the rest are tried best bound first
+        candidates = []
+        for index, matcher in enumerate(self._sequence_matchers):
+            matcher.set_seq1(query)
+            if matcher.real_quick_ratio() > cutoff:
+                bound = matcher.quick_ratio()
+                if bound > cutoff:
+                    candidates.append((-bound, index))
+        candidates.sort()
+
+        best_ratio, best = 0.0, None
+        for neg_bound, index in candidates:
+            if -neg_bound < best_ratio:
+                break
+            ratio = self._sequence_matchers[index].ratio()
+            if ratio > best_ratio or (ratio == best_ratio and best is not None and index < best):
+                best_ratio, best = ratio, index
+        if best is None or best_ratio <= cutoff:
+            return None
+        return self.items[best]
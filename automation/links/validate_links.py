@@ -1,30 +1,32 @@
 """
 Amazon affiliate link validator.
 
-Scans HTML files for Amazon links, checks each with HTTP HEAD requests,
-validates affiliate tags, and reports broken links / wrong tags.
+Scans HTML files for Amazon links, checks every distinct URL once through
+the shared async engine (link_engine.py: per-host rate limits, result
+cache), validates affiliate tags, and reports broken links / wrong tags.
 
 Usage:
     python validate_links.py                     # audit both sites
     python validate_links.py --site fitover35    # audit one site
     python validate_links.py --file path.html    # audit one file
+    python validate_links.py --no-cache          # ignore cache/link_checks.json
 """
 
 import argparse
 import os
 import re
 import sys
-import time
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import List, Optional
+from typing import Dict, List, Optional
 from urllib.parse import parse_qs, urlparse
 
-import requests
-
-# Add parent dir so we can import config
+# Add the project root for link_engine, and parent dir (ahead of it) so we can import config
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent))
 sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
 from config import AFFILIATE_TAGS, SITE_PATHS
+from automation.links.link_engine import LinkCache, LinkCheck, LinkChecker
+from automation.links.link_index import LinkIndex, get_link_index, links_in_file
 
 
 # ---------------------------------------------------------------------------
@@ -69,46 +71,61 @@ class AuditReport:
 # Link extraction
 # ---------------------------------------------------------------------------
 
-AMAZON_LINK_RE = re.compile(
-    r'https?://(?:www\.)?amazon\.com/[^\s"\'<>]+', re.IGNORECASE
-)
-AMAZON_IMAGE_RE = re.compile(
-    r'https?://m\.media-amazon\.com/images/[^\s"\'<>]+', re.IGNORECASE
-)
+# amazon.com product/search links and m.media-amazon.com images (see link_index)
+AUDIT_KINDS = {"link", "search", "image"}
 TAG_RE = re.compile(r'[?&]tag=([^&"\'<>\s]+)')
 
 
 def extract_links_from_file(filepath: str, expected_tag: str):
     """Yield (url, line_number, is_image) tuples from an HTML file."""
-    with open(filepath, "r", encoding="utf-8", errors="replace") as f:
-        for lineno, line in enumerate(f, start=1):
-            for match in AMAZON_LINK_RE.finditer(line):
-                url = match.group(0).rstrip(")")
-                yield url, lineno, False
-            for match in AMAZON_IMAGE_RE.finditer(line):
-                url = match.group(0).rstrip(")")
-                yield url, lineno, True
+    for link in links_in_file(filepath):
+        if link.kind in AUDIT_KINDS:
+            yield link.url, link.line, link.kind == "image"
+
+
+def _indexed_links(sources: list, index: Optional[LinkIndex]) -> list:
+    """(url, filepath, lineno, is_image) for every audited link, via the link index."""
+    if index is None:
+        index = get_link_index(sources)
+    else:
+        index.update(sources)
+    return [(link.url, link.file, link.line, link.kind == "image")
+            for link in index.links(sources, AUDIT_KINDS)]
 
 
 # ---------------------------------------------------------------------------
 # HTTP checking
 # ---------------------------------------------------------------------------
 
-SESSION = requests.Session()
-SESSION.headers.update({
-    "User-Agent": (
-        "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
-        "AppleWebKit/537.36 (KHTML, like Gecko) "
-        "Chrome/120.0.0.0 Safari/537.36"
-    )
-})
+BROWSER_USER_AGENT = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
+    "AppleWebKit/537.36 (KHTML, like Gecko) "
+    "Chrome/120.0.0.0 Safari/537.36"
+)
+REQUEST_TIMEOUT = 15
 
-REQUEST_DELAY = 1.0  # seconds between requests to avoid rate limiting
+# Amazon product/search links often return 405/503 to automated requests
+# but work fine in real browsers. Only flag true 404s as broken.
+AMAZON_RATE_LIMIT_CODES = {405, 503}
+
+
+def make_checker(use_cache: bool = True) -> LinkChecker:
+    """LinkChecker configured for site audits (browser UA, cached results)."""
+    return LinkChecker(
+        cache=LinkCache.load() if use_cache else None,
+        timeout=REQUEST_TIMEOUT,
+        headers={"User-Agent": BROWSER_USER_AGENT},
+    )
 
 
 def check_link(url: str, source_file: str, lineno: int,
-               expected_tag: str, is_image: bool = False) -> LinkResult:
-    """Check a single URL with an HTTP HEAD request."""
+               expected_tag: str, is_image: bool = False,
+               check: Optional[LinkCheck] = None) -> LinkResult:
+    """Build the LinkResult for one link occurrence.
+
+    `check` is the engine result for `url`; audits pass it in from one
+    batched run, standalone calls fetch the URL here.
+    """
     result = LinkResult(
         url=url,
         source_file=source_file,
@@ -128,42 +145,28 @@ def check_link(url: str, source_file: str, lineno: int,
             result.tag_expected = expected_tag
             result.tag_ok = False  # missing tag entirely
 
-    # Amazon product/search links often return 405/503 to automated requests
-    # but work fine in real browsers. Only flag true 404s as broken.
-    AMAZON_RATE_LIMIT_CODES = {405, 503}
-
-    try:
-        resp = SESSION.head(url, allow_redirects=True, timeout=15)
-        result.status_code = resp.status_code
-        result.final_url = resp.url
-
-        # Amazon sometimes returns 503 for HEAD — retry with GET
-        if resp.status_code in (503, 405):
-            resp = SESSION.get(url, allow_redirects=True, timeout=15,
-                               stream=True)
-            result.status_code = resp.status_code
-            result.final_url = resp.url
-            resp.close()
-
-        # If still 405/503 on an amazon.com link, treat as rate-limited (OK)
-        if (result.status_code in AMAZON_RATE_LIMIT_CODES
-                and "amazon.com" in url and not is_image):
-            result.status_code = 200  # treat as OK (rate-limited, not broken)
-
-        # Check if redirect landed on an error/404 page
-        if result.final_url and "error" in result.final_url.lower():
-            result.error = f"Redirected to error page: {result.final_url}"
-
-    except requests.exceptions.Timeout:
-        result.error = "Request timed out (15s)"
-    except requests.exceptions.ConnectionError as e:
+    if check is None:
+        check = make_checker(use_cache=False).check([url])[url]
+
+    is_amazon_page = "amazon.com" in url and not is_image
+    result.status_code = check.http_status
+    result.final_url = check.final_url
+
+    if check.error:
         # Amazon connection resets are also rate limiting
-        if "amazon.com" in url and not is_image:
+        if check.error_kind == "connection" and is_amazon_page:
             result.status_code = 200  # treat as OK
         else:
-            result.error = f"Connection error: {e}"
-    except Exception as e:
-        result.error = f"Unexpected error: {e}"
+            result.error = check.error
+        return result
+
+    # If still 405/503 on an amazon.com link, treat as rate-limited (OK)
+    if result.status_code in AMAZON_RATE_LIMIT_CODES and is_amazon_page:
+        result.status_code = 200  # treat as OK (rate-limited, not broken)
+
+    # Check if redirect landed on an error/404 page
+    if result.final_url and "error" in result.final_url.lower():
+        result.error = f"Redirected to error page: {result.final_url}"
 
     return result
 
@@ -172,42 +175,20 @@ def check_link(url: str, source_file: str, lineno: int,
 # Audit runner
 # ---------------------------------------------------------------------------
 
-def audit_site(site_name: str, site_path: str, expected_tag: str,
-               verbose: bool = True) -> AuditReport:
-    """Audit all HTML files in a site directory."""
-    report = AuditReport(site=site_name)
-
-    html_files = []
-    for root, _dirs, files in os.walk(site_path):
-        for f in files:
-            if f.endswith(".html"):
-                html_files.append(os.path.join(root, f))
-
-    if verbose:
-        print(f"\n{'='*60}")
-        print(f"  Auditing: {site_name}")
-        print(f"  Path: {site_path}")
-        print(f"  Expected tag: {expected_tag}")
-        print(f"  HTML files found: {len(html_files)}")
-        print(f"{'='*60}\n")
-
-    all_links = []
-    for filepath in sorted(html_files):
-        for url, lineno, is_image in extract_links_from_file(filepath, expected_tag):
-            all_links.append((url, filepath, lineno, is_image))
-
-    report.total_links = len(all_links)
+def _check_links(report: AuditReport, all_links: list, expected_tag: str,
+                 checker: LinkChecker, verbose: bool, base_path: Optional[str] = None):
+    """Check every distinct URL once, then file each occurrence into the report."""
+    checks: Dict[str, LinkCheck] = checker.check(url for url, *_ in all_links)
     if verbose:
-        print(f"  Total Amazon links/images found: {report.total_links}\n")
+        print(f"  Distinct URLs: {len(checks)} "
+              f"({sum(c.cached for c in checks.values())} from cache)\n")
 
     for i, (url, filepath, lineno, is_image) in enumerate(all_links):
-        rel_path = os.path.relpath(filepath, site_path)
-        if verbose:
-            print(f"  [{i+1}/{report.total_links}] Checking {rel_path}:{lineno} ...", end=" ", flush=True)
-
-        result = check_link(url, filepath, lineno, expected_tag, is_image)
+        result = check_link(url, filepath, lineno, expected_tag, is_image, check=checks[url])
 
         if verbose:
+            rel_path = os.path.relpath(filepath, base_path) if base_path else filepath
+            print(f"  [{i+1}/{report.total_links}] {rel_path}:{lineno} ...", end=" ")
             if result.ok:
                 print(f"OK ({result.status_code})")
             elif result.error:
@@ -227,47 +208,46 @@ def audit_site(site_name: str, site_path: str, expected_tag: str,
         else:
             report.broken.append(result)
 
-        time.sleep(REQUEST_DELAY)
 
+def audit_site(site_name: str, site_path: str, expected_tag: str,
+               verbose: bool = True, checker: Optional[LinkChecker] = None,
+               index: Optional[LinkIndex] = None) -> AuditReport:
+    """Audit all HTML files in a site directory."""
+    report = AuditReport(site=site_name)
+
+    if verbose:
+        print(f"\n{'='*60}")
+        print(f"  Auditing: {site_name}")
+        print(f"  Path: {site_path}")
+        print(f"  Expected tag: {expected_tag}")
+        print(f"{'='*60}\n")
+
+    all_links = _indexed_links([site_path], index)
+
+    report.total_links = len(all_links)
+    if verbose:
+        print(f"  Total Amazon links/images found: {report.total_links}")
+
+    _check_links(report, all_links, expected_tag, checker or make_checker(), verbose,
+                 base_path=site_path)
     return report
 
 
 def audit_single_file(filepath: str, expected_tag: str,
-                      verbose: bool = True) -> AuditReport:
+                      verbose: bool = True, checker: Optional[LinkChecker] = None) -> AuditReport:
     """Audit a single HTML file."""
     report = AuditReport(site=os.path.basename(filepath))
 
-    all_links = []
-    for url, lineno, is_image in extract_links_from_file(filepath, expected_tag):
-        all_links.append((url, filepath, lineno, is_image))
+    all_links = [(url, filepath, lineno, is_image)
+                 for url, lineno, is_image in extract_links_from_file(filepath, expected_tag)]
 
     report.total_links = len(all_links)
     if verbose:
         print(f"\n  Auditing: {filepath}")
         print(f"  Expected tag: {expected_tag}")
-        print(f"  Links found: {report.total_links}\n")
-
-    for i, (url, filepath, lineno, is_image) in enumerate(all_links):
-        if verbose:
-            print(f"  [{i+1}/{report.total_links}] ...", end=" ", flush=True)
-
-        result = check_link(url, filepath, lineno, expected_tag, is_image)
-
-        if verbose:
-            status = "OK" if result.ok else (result.error or f"HTTP {result.status_code}")
-            print(status)
-
-        if is_image and not result.ok:
-            report.broken_images.append(result)
-        elif not result.tag_ok and not is_image:
-            report.wrong_tag.append(result)
-        elif result.ok:
-            report.working.append(result)
-        else:
-            report.broken.append(result)
-
-        time.sleep(REQUEST_DELAY)
+        print(f"  Links found: {report.total_links}")
 
+    _check_links(report, all_links, expected_tag, checker or make_checker(), verbose)
     return report
 
 
@@ -324,27 +304,30 @@ def main():
     parser.add_argument("--file", help="Audit a single HTML file")
     parser.add_argument("--tag", help="Expected affiliate tag (auto-detected if --site used)")
     parser.add_argument("--quiet", action="store_true", help="Suppress per-link output")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="Re-verify every link instead of reusing cache/link_checks.json")
     args = parser.parse_args()
 
     reports = []
+    checker = make_checker(use_cache=not args.no_cache)
 
     if args.file:
         tag = args.tag or "dailydealdarl-20"
-        report = audit_single_file(args.file, tag, verbose=not args.quiet)
+        report = audit_single_file(args.file, tag, verbose=not args.quiet, checker=checker)
         reports.append(report)
 
     elif args.site:
         site = args.site
         path = SITE_PATHS[site]
         tag = args.tag or AFFILIATE_TAGS[site]
-        report = audit_site(site, path, tag, verbose=not args.quiet)
+        report = audit_site(site, path, tag, verbose=not args.quiet, checker=checker)
         reports.append(report)
 
     else:
         # Audit all sites
         for site, path in SITE_PATHS.items():
             tag = AFFILIATE_TAGS[site]
-            report = audit_site(site, path, tag, verbose=not args.quiet)
+            report = audit_site(site, path, tag, verbose=not args.quiet, checker=checker)
             reports.append(report)
 
     # Print summaries
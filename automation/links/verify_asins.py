@@ -17,6 +17,7 @@ import sys
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
 from automation.amazon.rainforest_client import RainforestClient
+from automation.links.asin_status import AsinStatusCache
 
 logging.basicConfig(
     level=logging.INFO,
@@ -202,6 +203,13 @@ def main():
     output_path.write_text(json.dumps(report, indent=2))
     logger.info(f"Report written to {args.output}")
 
+    # Article saves skip Amazon round trips for ASINs verified here
+    if not args.dry_run:
+        cache = AsinStatusCache.load()
+        seeded = cache.seed_from_report(report)
+        cache.save()
+        logger.info(f"Seeded {seeded} ASIN status(es) into {cache.path}")
+
     # Print summary
     summary = report['summary']
     print(f"\n{'='*50}")
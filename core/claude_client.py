@@ -6,9 +6,28 @@ The class name and interface remain the same to avoid breaking downstream code.
 import os
 import json
 import time
-from typing import Dict, List, Optional, Any
+from typing import Any, Callable, Dict, List, Optional
 from google import genai
 
+from utils.llm_cache import cached_generate
+
+
+def _strip_json_fences(response: str) -> str:
+    """Remove markdown code fences the model sometimes wraps JSON in."""
+    clean_response = response.strip()
+    if clean_response.startswith('```json'):
+        clean_response = clean_response[7:]
+    if clean_response.startswith('```'):
+        clean_response = clean_response[3:]
+    if clean_response.endswith('```'):
+        clean_response = clean_response[:-3]
+    return clean_response.strip()
+
+
+def _is_json(response: str) -> bool:
+    json.loads(_strip_json_fences(response))
+    return True
+
 
 class ClaudeClient:
     """Wrapper for Gemini API operations.
@@ -28,14 +47,31 @@ class ClaudeClient:
                  system_prompt: str,
                  user_prompt: str,
                  max_tokens: int = 4096,
-                 temperature: float = 0.7) -> str:
-        """Generate text response from Gemini."""
+                 temperature: float = 0.7,
+                 use_cache: bool = True,
+                 validate: Optional[Callable[[str], bool]] = None) -> str:
+        """Generate text response from Gemini.
+
+        Responses are cached by (model, prompt, max_tokens, temperature);
+        see utils.llm_cache for TTL and replay mode. Responses rejected by
+        validate are returned but not cached.
+        """
         # Gemini doesn't have a separate system prompt param — merge into prompt
         if system_prompt:
             full_prompt = f"{system_prompt}\n\n{user_prompt}"
         else:
             full_prompt = user_prompt
 
+        return cached_generate(
+            self.model, full_prompt, max_tokens, False,
+            produce=lambda: self._generate_uncached(full_prompt, max_tokens, temperature),
+            use_cache=use_cache,
+            validate=validate,
+            temperature=temperature,
+        )
+
+    def _generate_uncached(self, full_prompt: str, max_tokens: int, temperature: float) -> str:
+        """Call Gemini with 429 retries."""
         for attempt in range(3):
             try:
                 response = self.client.models.generate_content(
@@ -65,18 +101,11 @@ class ClaudeClient:
 
 IMPORTANT: Your response must be valid JSON only. No markdown, no explanation, just the JSON object or array."""
 
-        response = self.generate(json_system, user_prompt, max_tokens, temperature)
+        response = self.generate(json_system, user_prompt, max_tokens, temperature,
+                                 validate=_is_json)
 
         # Clean up response in case model adds markdown
-        clean_response = response.strip()
-        if clean_response.startswith('```json'):
-            clean_response = clean_response[7:]
-        if clean_response.startswith('```'):
-            clean_response = clean_response[3:]
-        if clean_response.endswith('```'):
-            clean_response = clean_response[:-3]
-
-        return json.loads(clean_response.strip())
+        return json.loads(_strip_json_fences(response))
 
     def generate_content_ideas(self,
                                brand: Dict,
@@ -1,12 +1,34 @@
 """
 Netlify Client - Blog publishing for dailydealdarling.com
+
+Publishing goes through one digest-diffed deploy per run:
+- Rendered pages are hashed in parallel
+- The file map of the last deploy is cached in cache/netlify_manifests/
+  (NETLIFY_MANIFEST_DIR), re-read from the API when someone else deployed
+- One deploy is opened with the full file map; only the files Netlify
+  reports as required are uploaded, concurrently
 """
 import os
 import json
+import time
 import hashlib
+import logging
+import tempfile
 import requests
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import Dict, Optional
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from utils.markdown_renderer import MarkdownRenderer
+
+logger = logging.getLogger(__name__)
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+DEFAULT_MANIFEST_DIR = PROJECT_ROOT / "cache" / "netlify_manifests"
+UPLOAD_WORKERS = 8
+
+_MARKDOWN = MarkdownRenderer(keep_frontmatter=True)
 
 
 class NetlifyClient:
@@ -21,7 +43,8 @@ class NetlifyClient:
     You'll need a Netlify Personal Access Token.
     """
 
-    def __init__(self):
+    def __init__(self, manifest_dir: Optional[Path] = None, upload_workers: int = UPLOAD_WORKERS,
+                 session: Optional[requests.Session] = None):
         self.api_token = os.environ.get('NETLIFY_API_TOKEN')
         self.site_id = os.environ.get('NETLIFY_SITE_ID')  # From Netlify dashboard
         self.base_url = "https://api.netlify.com/api/v1"
@@ -29,6 +52,15 @@ class NetlifyClient:
         if not self.api_token:
             raise ValueError("NETLIFY_API_TOKEN environment variable required")
 
+        self.manifest_dir = Path(manifest_dir or os.environ.get('NETLIFY_MANIFEST_DIR')
+                                 or DEFAULT_MANIFEST_DIR)
+        self.upload_workers = upload_workers
+        if session is None:
+            session = requests.Session()
+            adapter = requests.adapters.HTTPAdapter(pool_maxsize=upload_workers)
+            session.mount("https://", adapter)
+        self.session = session
+
     def _headers(self) -> Dict:
         return {
             "Authorization": f"Bearer {self.api_token}",
@@ -37,84 +69,178 @@ class NetlifyClient:
 
     def publish_article(self, article: Dict, brand_config: Dict) -> Dict:
         """
-        Publish a blog article to Netlify.
-
-        For sites using a static site generator (Hugo, Jekyll, etc.),
-        this creates the markdown file and triggers a deploy.
-
-        For simple HTML sites, this deploys the rendered HTML directly.
+        Publish a single blog article to Netlify.
 
         Returns deployment info including the published URL.
+        See publish_articles() for publishing several in one deploy.
         """
-        slug = article['slug']
-        content_html = article.get('content_html') or self._markdown_to_html(article['content_markdown'])
-
-        # Build the full HTML page
-        page_html = self._build_blog_page(
-            title=article['title'],
-            meta_description=article['meta_description'],
-            content=content_html,
-            featured_image=article.get('featured_image_url'),
-            brand_config=brand_config
-        )
+        result = self.publish_articles([article], brand_config)
+        if not result['success']:
+            return {'success': False, 'error': result['error']}
+        return result['articles'][0]
 
-        # Calculate file hash for Netlify
-        file_content = page_html.encode('utf-8')
-        file_hash = hashlib.sha1(file_content).hexdigest()
+    def publish_articles(self, articles: List[Dict], brand_config: Dict) -> Dict:
+        """
+        Publish several blog articles in one deploy.
 
-        # Deploy to Netlify
-        try:
-            # First, get the current site
-            site_response = requests.get(
-                f"{self.base_url}/sites/{self.site_id}",
-                headers=self._headers()
+        Each article is rendered to /blog/<slug>/index.html. Returns
+        {'success', 'deploy_id', 'published_at', 'articles': [...], 'stats': {...}}
+        where each articles entry has the publish_article() keys, or
+        {'success': False, 'error', 'stats'} if the deploy failed.
+        """
+        files = {}
+        for article in articles:
+            content_html = article.get('content_html') or self._markdown_to_html(article['content_markdown'])
+            page_html = self._build_blog_page(
+                title=article['title'],
+                meta_description=article['meta_description'],
+                content=content_html,
+                featured_image=article.get('featured_image_url'),
+                brand_config=brand_config
             )
-            site_response.raise_for_status()
-            site_data = site_response.json()
-
-            # Create a new deploy
-            deploy_data = {
-                "files": {
-                    f"/blog/{slug}/index.html": file_hash
-                }
+            files[f"/blog/{article['slug']}/index.html"] = page_html.encode('utf-8')
+
+        result = self.deploy_files(files)
+        if not result['success']:
+            return result
+
+        published_at = datetime.utcnow().isoformat()
+        result['published_at'] = published_at
+        result['articles'] = [
+            {
+                'success': True,
+                'slug': article['slug'],
+                'deploy_id': result['deploy_id'],
+                'published_url': f"{result['site_url']}/blog/{article['slug']}/",
+                'published_at': published_at,
             }
+            for article in articles
+        ]
+        return result
 
-            deploy_response = requests.post(
-                f"{self.base_url}/sites/{self.site_id}/deploys",
-                headers=self._headers(),
-                json=deploy_data
-            )
-            deploy_response.raise_for_status()
-            deploy = deploy_response.json()
-            deploy_id = deploy['id']
+    # ── digest deploys ──────────────────────────────────────────────────────
 
-            # Upload the file
-            upload_response = requests.put(
-                f"{self.base_url}/deploys/{deploy_id}/files/blog/{slug}/index.html",
-                headers={
-                    "Authorization": f"Bearer {self.api_token}",
-                    "Content-Type": "application/octet-stream"
-                },
-                data=file_content
-            )
-            upload_response.raise_for_status()
+    def deploy_files(self, files: Dict[str, bytes]) -> Dict:
+        """
+        Deploy changed/new files on top of the last deployed file map.
 
-            # Get the published URL
-            site_url = site_data.get('ssl_url') or site_data.get('url')
-            published_url = f"{site_url}/blog/{slug}/"
+        files maps site paths ("/blog/x/index.html") to bytes. Returns
+        {'success', 'deploy_id', 'site_url', 'stats'} or {'success': False, 'error', 'stats'}.
+        stats: files_total, files_changed, files_uploaded, files_skipped,
+        bytes_uploaded, deploy_seconds.
+        """
+        started = time.perf_counter()
+        stats = {'files_total': 0, 'files_changed': 0, 'files_uploaded': 0,
+                 'files_skipped': 0, 'bytes_uploaded': 0, 'deploy_seconds': 0.0}
+        try:
+            digests = self._hash_files(files)
+            site = self._get(f"/sites/{self.site_id}")
+            manifest = self._current_manifest(site)
+            stats['files_changed'] = sum(1 for path, sha in digests.items()
+                                         if manifest['files'].get(path) != sha)
+
+            file_map = {**manifest['files'], **digests}
+            deploy = self._post(f"/sites/{self.site_id}/deploys", {"files": file_map})
+            deploy_id = deploy['id']
 
+            # Netlify asks for each missing sha once, whichever path carries it
+            by_sha = {}
+            for path, sha in digests.items():
+                by_sha.setdefault(sha, path)
+            required = deploy.get('required') or []
+            unknown = [sha for sha in required if sha not in by_sha]
+            if unknown:
+                raise RuntimeError(f"Netlify requires {len(unknown)} file(s) missing from this run; "
+                                   f"delete {self._manifest_path()} to resync")
+
+            uploads = [by_sha[sha] for sha in required]
+            with ThreadPoolExecutor(max_workers=self.upload_workers) as pool:
+                list(pool.map(lambda path: self._upload(deploy_id, path, files[path]), uploads))
+
+            self._save_manifest({'deploy_id': deploy_id, 'files': file_map})
+            stats.update(
+                files_total=len(file_map),
+                files_uploaded=len(uploads),
+                files_skipped=len(files) - len(uploads),
+                bytes_uploaded=sum(len(files[path]) for path in uploads),
+            )
             return {
                 'success': True,
                 'deploy_id': deploy_id,
-                'published_url': published_url,
-                'published_at': datetime.utcnow().isoformat()
+                'site_url': site.get('ssl_url') or site.get('url'),
+                'stats': stats,
             }
+        except (requests.exceptions.RequestException, RuntimeError, KeyError) as e:
+            return {'success': False, 'error': str(e), 'stats': stats}
+        finally:
+            stats['deploy_seconds'] = round(time.perf_counter() - started, 3)
+            logger.info(
+                f"Netlify deploy: {stats['files_uploaded']} uploaded "
+                f"({stats['bytes_uploaded']} bytes), {stats['files_skipped']} skipped, "
+                f"{stats['files_total']} files in site, {stats['deploy_seconds']}s"
+            )
 
-        except requests.exceptions.RequestException as e:
-            return {
-                'success': False,
-                'error': str(e)
-            }
+    def _hash_files(self, files: Dict[str, bytes]) -> Dict[str, str]:
+        """sha1 of every file, hashed across threads (hashlib releases the GIL)."""
+        with ThreadPoolExecutor(max_workers=self.upload_workers) as pool:
+            shas = pool.map(lambda data: hashlib.sha1(data).hexdigest(), files.values())
+            return dict(zip(files.keys(), shas))
+
+    def _current_manifest(self, site: Dict) -> Dict:
+        """Cached file map of the live deploy, refetched if another deploy went live since."""
+        manifest = self._load_manifest()
+        published = (site.get('published_deploy') or {}).get('id')
+        if manifest and (published is None or manifest.get('deploy_id') == published):
+            return manifest
+        listing = self._get(f"/sites/{self.site_id}/files")
+        return {'deploy_id': published,
+                'files': {entry.get('path') or entry['id']: entry['sha'] for entry in listing}}
+
+    def _manifest_path(self) -> Path:
+        return self.manifest_dir / f"{self.site_id}.json"
+
+    def _load_manifest(self) -> Optional[Dict]:
+        try:
+            return json.loads(self._manifest_path().read_text())
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable Netlify manifest: {e}")
+            return None
+
+    def _save_manifest(self, manifest: Dict):
+        path = self._manifest_path()
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=path.parent, prefix='.netlify-')
+            with os.fdopen(fd, 'w') as f:
+                json.dump(manifest, f)
+            os.replace(tmp, path)
+        except OSError as e:
+            logger.warning(f"Could not persist Netlify manifest: {e}")
+
+    def _get(self, endpoint: str):
+        response = self.session.get(f"{self.base_url}{endpoint}", headers=self._headers(), timeout=30)
+        response.raise_for_status()
+        return response.json()
+
+    def _post(self, endpoint: str, payload: Dict) -> Dict:
+        response = self.session.post(f"{self.base_url}{endpoint}", headers=self._headers(),
+                                     json=payload, timeout=60)
+        response.raise_for_status()
+        return response.json()
+
+    def _upload(self, deploy_id: str, path: str, data: bytes):
+        response = self.session.put(
+            f"{self.base_url}/deploys/{deploy_id}/files{path}",
+            headers={
+                "Authorization": f"Bearer {self.api_token}",
+                "Content-Type": "application/octet-stream"
+            },
+            data=data,
+            timeout=120,
+        )
+        response.raise_for_status()
 
     def _build_blog_page(self,
                          title: str,
@@ -231,42 +357,5 @@ class NetlifyClient:
         return template
 
     def _markdown_to_html(self, markdown: str) -> str:
-        """
-        Convert markdown to HTML.
-
-        For production, consider using a proper markdown library like markdown2.
-        This is a simple conversion for basic formatting.
-        """
-        import re
-
-        html = markdown
-
-        # Headers
-        html = re.sub(r'^### (.+)$', r'<h3>\1</h3>', html, flags=re.MULTILINE)
-        html = re.sub(r'^## (.+)$', r'<h2>\1</h2>', html, flags=re.MULTILINE)
-        html = re.sub(r'^# (.+)$', r'<h1>\1</h1>', html, flags=re.MULTILINE)
-
-        # Bold and italic
-        html = re.sub(r'\*\*(.+?)\*\*', r'<strong>\1</strong>', html)
-        html = re.sub(r'\*(.+?)\*', r'<em>\1</em>', html)
-
-        # Links
-        html = re.sub(r'\[(.+?)\]\((.+?)\)', r'<a href="\2">\1</a>', html)
-
-        # Lists (simple)
-        html = re.sub(r'^\- (.+)$', r'<li>\1</li>', html, flags=re.MULTILINE)
-
-        # Paragraphs
-        paragraphs = html.split('\n\n')
-        processed = []
-        for p in paragraphs:
-            p = p.strip()
-            if p and not p.startswith('<h') and not p.startswith('<li'):
-                if '<li>' in p:
-                    p = f'<ul>{p}</ul>'
-                else:
-                    p = f'<p>{p}</p>'
-            processed.append(p)
-        html = '\n'.join(processed)
-
-        return html
+        """Convert markdown to HTML with the shared article renderer."""
+        return _MARKDOWN.render(markdown)
@@ -1,5 +1,5 @@
 """Database module for Social Media Empire."""
 
-from .supabase_client import SupabaseClient, get_supabase_client
+from .supabase_client import FlushResult, PinBatch, SupabaseClient, get_supabase_client
 
-__all__ = ["SupabaseClient", "get_supabase_client"]
+__all__ = ["FlushResult", "PinBatch", "SupabaseClient", "get_supabase_client"]
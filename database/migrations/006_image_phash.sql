@@ -0,0 +1,22 @@
+-- Migration 006: Image hashes for dedup
+-- content_history.image_hash has been written by log_pin_to_history and
+-- queried by check_image_hash_exists, but was never part of the schema.
+-- image_phash holds a 64-bit perceptual dHash (16 hex chars) so visually
+-- identical images match even after re-encoding or a different overlay;
+-- video_automation/phash_index.py bulk-syncs it into a local multi-index hash table.
+-- Safe to run multiple times.
+
+ALTER TABLE content_history ADD COLUMN IF NOT EXISTS image_hash TEXT;
+ALTER TABLE content_history ADD COLUMN IF NOT EXISTS image_phash TEXT;
+ALTER TABLE pinterest_pins ADD COLUMN IF NOT EXISTS image_phash TEXT;
+
+-- phash_index.sync() pulls rows WHERE image_phash IS NOT NULL ORDER BY created_at
+CREATE INDEX IF NOT EXISTS idx_content_history_phash_created
+  ON content_history(created_at)
+  WHERE image_phash IS NOT NULL;
+CREATE INDEX IF NOT EXISTS idx_pinterest_pins_phash_created
+  ON pinterest_pins(created_at)
+  WHERE image_phash IS NOT NULL;
+
+-- Reload PostgREST schema cache so the columns are immediately queryable
+NOTIFY pgrst, 'reload schema';
@@ -0,0 +1,34 @@
+-- Migration 007: Bulk pinterest_pins state transitions
+-- PinBatch (database/supabase_client.py) buffers status changes and sends
+-- them in one RPC call instead of one UPDATE per pin. Each change applies
+-- only if the pin's current status is one of from_status (optimistic
+-- concurrency: a pin another run already moved on is left alone and
+-- reported back as a conflict). Only keys present in "values" are written.
+-- Requires 006_image_phash.sql. Without this function PinBatch falls back
+-- to one conditional UPDATE per group of identical changes.
+-- Safe to run multiple times.
+
+CREATE OR REPLACE FUNCTION transition_pinterest_pins(p_changes JSONB)
+RETURNS TABLE (id BIGINT)
+LANGUAGE sql
+AS $$
+  UPDATE pinterest_pins p
+     SET status              = COALESCE(c.to_status, p.status),
+         image_url           = CASE WHEN c.v ? 'image_url' THEN c.v->>'image_url' ELSE p.image_url END,
+         generated_image_url = CASE WHEN c.v ? 'generated_image_url' THEN c.v->>'generated_image_url' ELSE p.generated_image_url END,
+         image_phash         = CASE WHEN c.v ? 'image_phash' THEN c.v->>'image_phash' ELSE p.image_phash END,
+         destination_url     = CASE WHEN c.v ? 'destination_url' THEN c.v->>'destination_url' ELSE p.destination_url END,
+         article_generated   = CASE WHEN c.v ? 'article_generated' THEN (c.v->>'article_generated')::BOOLEAN ELSE p.article_generated END,
+         pinterest_pin_id    = CASE WHEN c.v ? 'pinterest_pin_id' THEN c.v->>'pinterest_pin_id' ELSE p.pinterest_pin_id END,
+         posted_at           = CASE WHEN c.v ? 'posted_at' THEN (c.v->>'posted_at')::TIMESTAMPTZ ELSE p.posted_at END,
+         error_message       = CASE WHEN c.v ? 'error_message' THEN c.v->>'error_message' ELSE p.error_message END
+    FROM jsonb_to_recordset(p_changes) AS c(id BIGINT, from_status TEXT[], to_status TEXT, v JSONB)
+   WHERE p.id = c.id
+     AND (c.from_status IS NULL OR p.status = ANY (c.from_status))
+  RETURNING p.id;
+$$;
+
+GRANT EXECUTE ON FUNCTION transition_pinterest_pins(JSONB) TO service_role;
+
+-- Reload PostgREST schema cache so the function is immediately callable
+NOTIFY pgrst, 'reload schema';
@@ -1,13 +1,24 @@
 """Supabase database client for Social Media Empire."""
 from __future__ import annotations
 
+import logging
+import threading
+import time
+from concurrent.futures import Future
 from datetime import datetime, timezone
-from typing import Optional, Any
-from dataclasses import dataclass
+from typing import Optional, Any, Iterable
+from dataclasses import dataclass, field
 from supabase import create_client, Client
 
 from utils.config import get_config
 
+logger = logging.getLogger(__name__)
+
+# Bulk pinterest_pins transitions (database/migrations/007_pin_transitions.sql)
+TRANSITION_RPC = "transition_pinterest_pins"
+# Seconds PinBatch.wait() holds a flush open for other threads' changes
+DEFAULT_BATCH_WINDOW = 0.05
+
 
 @dataclass
 class SupabaseClient:
@@ -248,6 +259,12 @@ class SupabaseClient:
         )
         return result.data or []
 
+    # ==================== Batched Writes ====================
+
+    def batch(self, window: float = DEFAULT_BATCH_WINDOW) -> "PinBatch":
+        """Buffer inserts and pinterest_pins status transitions; see PinBatch."""
+        return PinBatch(self.client, window=window)
+
     def resolve_error(self, error_id: int, resolution_notes: str = "") -> dict:
         """Mark an error as resolved."""
         data = {
@@ -259,6 +276,226 @@ class SupabaseClient:
         return result.data[0] if result.data else {}
 
 
+@dataclass
+class FlushResult:
+    """Outcome of PinBatch.flush().
+
+    inserted  — table -> rows as returned by Supabase (with ids), in buffer order
+    applied   — pin ids whose transition was written
+    conflicts — pin ids skipped because their status was not in from_status
+    requests  — Supabase round trips the flush took
+    """
+
+    inserted: dict[str, list[dict]] = field(default_factory=dict)
+    applied: list[Any] = field(default_factory=list)
+    conflicts: list[Any] = field(default_factory=list)
+    requests: int = 0
+
+
+@dataclass
+class _Transition:
+    pin_id: Any
+    to_status: Optional[str]
+    from_status: Optional[tuple[str, ...]]
+    values: dict
+    optional: set[str]
+    futures: list[Future] = field(default_factory=list)
+
+
+class PinBatch:
+    """Buffered inserts and pinterest_pins state transitions, flushed in bulk.
+
+    insert() and transition() return Futures and send nothing until flush():
+      - inserts go out as one multi-row insert per table (rows resolve to the
+        inserted row, id included)
+      - transitions go out as one transition_pinterest_pins RPC call; each
+        applies only if the pin's current status is in from_status and
+        resolves to True (applied) or False (conflict). Without the RPC
+        (migration 007 not run) they fall back to one conditional UPDATE
+        per group of identical changes.
+
+    Several transitions of one pin before a flush are merged into one (first
+    from_status, last to_status, values combined).
+
+    From many threads, wait(future) is a group commit: the first waiter
+    flushes after `window` seconds, taking everyone else's buffered changes
+    with it, so N concurrent workers cost one round trip instead of N.
+    """
+
+    def __init__(self, client: Client, window: float = DEFAULT_BATCH_WINDOW, use_rpc: bool = True):
+        self.client = client
+        self.window = window
+        self.use_rpc = use_rpc
+        self._lock = threading.Lock()
+        self._inserts: dict[str, list[tuple[dict, Optional[dict], Future]]] = {}
+        self._transitions: dict[Any, _Transition] = {}
+        self._leader = False
+
+    def __len__(self) -> int:
+        with self._lock:
+            return sum(len(rows) for rows in self._inserts.values()) + len(self._transitions)
+
+    def __enter__(self) -> "PinBatch":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None:
+            self.flush()
+
+    def insert(self, table: str, row: dict, fallback: Optional[dict] = None) -> Future:
+        """Buffer a row insert. fallback is tried alone if the bulk insert fails."""
+        future: Future = Future()
+        with self._lock:
+            self._inserts.setdefault(table, []).append((row, fallback, future))
+        return future
+
+    def transition(
+        self,
+        pin_id: Any,
+        to_status: Optional[str],
+        from_status: Optional[str | Iterable[str]] = None,
+        optional: Iterable[str] = (),
+        **values: Any
+    ) -> Future:
+        """Buffer a pinterest_pins change: status -> to_status (None keeps it) plus values.
+
+        from_status: required current status(es); None applies unconditionally.
+        optional: value keys to drop if the fallback UPDATE rejects them
+        (columns from migrations that may not have been run).
+        """
+        if isinstance(from_status, str):
+            from_status = (from_status,)
+        future: Future = Future()
+        with self._lock:
+            pending = self._transitions.get(pin_id)
+            if pending is None:
+                self._transitions[pin_id] = _Transition(
+                    pin_id, to_status, tuple(from_status) if from_status is not None else None,
+                    dict(values), set(optional), [future],
+                )
+            else:
+                pending.to_status = to_status or pending.to_status
+                pending.values.update(values)
+                pending.optional.update(optional)
+                pending.futures.append(future)
+        return future
+
+    def wait(self, future: Future) -> Any:
+        """Group commit: block until future resolves, flushing after `window` if no one else is."""
+        with self._lock:
+            lead = not self._leader
+            self._leader = True
+        if lead:
+            time.sleep(self.window)
+            with self._lock:
+                self._leader = False
+            self.flush()
+        return future.result()
+
+    def flush(self) -> FlushResult:
+        """Send everything buffered so far; resolves the returned Futures."""
+        with self._lock:
+            inserts, self._inserts = self._inserts, {}
+            transitions, self._transitions = list(self._transitions.values()), {}
+        result = FlushResult()
+        for table, rows in inserts.items():
+            result.inserted[table] = self._flush_inserts(table, rows, result)
+        if transitions:
+            self._flush_transitions(transitions, result)
+        return result
+
+    # ── inserts ──────────────────────────────────────────────────────────────
+
+    def _flush_inserts(self, table: str, rows: list, result: FlushResult) -> list[dict]:
+        result.requests += 1
+        try:
+            inserted = self.client.table(table).insert([row for row, _, _ in rows]).execute().data or []
+        except Exception as e:
+            logger.warning(f"Bulk insert into {table} failed ({e}), inserting rows one by one")
+            return [self._insert_one(table, row, fallback, future, result)
+                    for row, fallback, future in rows]
+        inserted = inserted if len(inserted) == len(rows) else [{} for _ in rows]
+        for (_, _, future), row in zip(rows, inserted):
+            future.set_result(row)
+        return inserted
+
+    def _insert_one(self, table, row, fallback, future, result) -> dict:
+        for attempt in (row, fallback):
+            if attempt is None:
+                continue
+            result.requests += 1
+            try:
+                data = self.client.table(table).insert(attempt).execute().data or [{}]
+                future.set_result(data[0])
+                return data[0]
+            except Exception as e:
+                error = e
+        future.set_exception(error)
+        return {}
+
+    # ── transitions ──────────────────────────────────────────────────────────
+
+    @staticmethod
+    def _settle(change: _Transition, applied: bool, result: FlushResult) -> None:
+        (result.applied if applied else result.conflicts).append(change.pin_id)
+        for future in change.futures:
+            future.set_result(applied)
+
+    def _flush_transitions(self, transitions: list[_Transition], result: FlushResult) -> None:
+        if self.use_rpc:
+            payload = [{"id": c.pin_id, "to_status": c.to_status,
+                        "from_status": list(c.from_status) if c.from_status is not None else None,
+                        "v": c.values} for c in transitions]
+            result.requests += 1
+            try:
+                data = self.client.rpc(TRANSITION_RPC, {"p_changes": payload}).execute().data or []
+                applied = {str(row["id"]) if isinstance(row, dict) else str(row) for row in data}
+                for change in transitions:
+                    self._settle(change, str(change.pin_id) in applied, result)
+                return
+            except Exception as e:
+                logger.warning(f"{TRANSITION_RPC} unavailable ({e}); run migration 007. "
+                               f"Falling back to grouped updates")
+                self.use_rpc = False
+
+        groups: dict[tuple, list[_Transition]] = {}
+        for change in transitions:
+            key = (change.to_status, change.from_status,
+                   tuple(sorted((k, repr(v)) for k, v in change.values.items())))
+            groups.setdefault(key, []).append(change)
+        for changes in groups.values():
+            self._update_group(changes, result)
+
+    def _update_group(self, changes: list[_Transition], result: FlushResult) -> None:
+        """One conditional UPDATE for changes that share status and values."""
+        first = changes[0]
+        values = dict(first.values)
+        if first.to_status is not None:
+            values["status"] = first.to_status
+        attempts = [values]
+        if first.optional & set(values):
+            attempts.append({k: v for k, v in values.items() if k not in first.optional})
+        for attempt in attempts:
+            result.requests += 1
+            try:
+                query = self.client.table("pinterest_pins").update(attempt) \
+                    .in_("id", [c.pin_id for c in changes])
+                if first.from_status is not None:
+                    query = query.in_("status", list(first.from_status))
+                data = query.execute().data or []
+                break
+            except Exception as e:
+                error = e
+        else:
+            for change in changes:
+                for future in change.futures:
+                    future.set_exception(error)
+            return
+        applied = {str(row.get("id")) for row in data}
+        for change in changes:
+            self._settle(change, str(change.pin_id) in applied, result)
+
+
 _supabase_client: Optional[SupabaseClient] = None
 
 
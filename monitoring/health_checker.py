@@ -1,12 +1,20 @@
-"""Health checking for all Social Media Empire services and APIs."""
+"""Health checking for all Social Media Empire services and APIs.
+
+Probes run concurrently in a thread pool under one global deadline, and
+every probe's latency is recorded in monitoring.latency_store so a service
+that is answering far slower than its own rolling p50/p95 is reported as
+degraded, not only one that fails outright.
+"""
 
 import logging
+from concurrent.futures import ThreadPoolExecutor, wait
 from datetime import datetime, timezone
-from typing import Optional
+from typing import Callable, Optional
 from dataclasses import dataclass, field
 import requests
 
 from utils.config import get_config
+from .latency_store import LatencyStore, get_latency_store
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -28,29 +36,91 @@ class HealthChecker:
     """Checks health of all integrated services."""
 
     timeout_seconds: int = 10
+    # Whole run is cut off after this long; unfinished probes report unhealthy
+    deadline_seconds: float = 30
+    max_workers: int = 8
+    # None = process-wide store from HEALTH_LATENCY_PATH
+    latency_store: Optional[LatencyStore] = None
+    record_latency: bool = True
+
+    def _probes(self) -> list[tuple[str, Callable[[], HealthCheckResult]]]:
+        """(service, probe) for every check in check_all, in report order."""
+        return [
+            ("gemini", self.check_gemini),
+            ("supabase", self.check_supabase),
+            ("supabase_tiktok", self.check_supabase_tiktok),
+            ("pexels", self.check_pexels),
+            ("pexels_video", self.check_pexels_video),
+            ("creatomate", self.check_creatomate),
+            ("resend", self.check_resend),
+            ("convertkit", self.check_convertkit),
+            ("youtube", self.check_youtube),
+            ("make_webhook_deals", self.check_make_webhook_deals),
+            ("make_webhook_menopause", self.check_make_webhook_menopause),
+            ("late_api", self.check_late_api),
+            ("elevenlabs", self.check_elevenlabs),
+            ("netlify", self.check_netlify),
+            ("github_api", self.check_github_api),
+            ("website_dailydealdarling", self.check_website_dailydealdarling),
+            ("website_fitover35", self.check_website_fitover35),
+        ]
+
+    def run_probes(self, probes: list[tuple[str, Callable[[], HealthCheckResult]]]) -> list[HealthCheckResult]:
+        """Run probes concurrently under deadline_seconds; results keep the input order.
+
+        Probes still running at the deadline are reported unhealthy (their
+        threads are abandoned, not waited for). Each result's latency is
+        compared with the service's rolling baseline and then recorded.
+        """
+        pool = ThreadPoolExecutor(max_workers=max(1, min(self.max_workers, len(probes))),
+                                  thread_name_prefix="health")
+        try:
+            futures = [pool.submit(probe) for _, probe in probes]
+            wait(futures, timeout=self.deadline_seconds)
+        finally:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+        results = []
+        for (service, _), future in zip(probes, futures):
+            if not future.done():
+                result = HealthCheckResult(
+                    service=service,
+                    status="unhealthy",
+                    error=f"No response within the {self.deadline_seconds:g}s health check deadline",
+                )
+            elif future.exception() is not None:
+                result = HealthCheckResult(service=service, status="unhealthy",
+                                           error=str(future.exception()))
+            else:
+                result = future.result()
+            results.append(self._apply_latency_history(result))
+        return results
+
+    def _store(self) -> Optional[LatencyStore]:
+        if not self.record_latency:
+            return None
+        return self.latency_store if self.latency_store is not None else get_latency_store()
+
+    def _apply_latency_history(self, result: HealthCheckResult) -> HealthCheckResult:
+        """Downgrade a healthy result whose latency regressed, then record the sample."""
+        store = self._store()
+        if store is None:
+            return result
+        baseline = store.baseline(result.service)
+        if baseline.samples:
+            result.details = {**result.details, "latency_baseline": baseline.as_dict()}
+        if result.status == "healthy" and store.regression(result.response_time_ms, baseline):
+            result.status = "degraded"
+            result.error = (
+                f"Latency regression: {result.response_time_ms:.0f}ms "
+                f"(p50 {baseline.p50_ms:.0f}ms, p95 {baseline.p95_ms:.0f}ms)"
+            )
+        store.record(result.service, result.status, result.response_time_ms)
+        return result
 
     def check_all(self) -> dict:
-        """Run all health checks and return summary."""
-        checks = [
-            self.check_gemini(),
-            self.check_supabase(),
-            self.check_supabase_tiktok(),
-            self.check_gemini(),
-            self.check_pexels(),
-            self.check_pexels_video(),
-            self.check_creatomate(),
-            self.check_resend(),
-            self.check_convertkit(),
-            self.check_youtube(),
-            self.check_make_webhook_deals(),
-            self.check_make_webhook_menopause(),
-            self.check_late_api(),
-            self.check_elevenlabs(),
-            self.check_netlify(),
-            self.check_github_api(),
-            self.check_website_dailydealdarling(),
-            self.check_website_fitover35(),
-        ]
+        """Run all health checks concurrently and return summary."""
+        checks = self.run_probes(self._probes())
 
         # Summarize
         healthy = sum(1 for c in checks if c.status == "healthy")
@@ -847,11 +917,11 @@ class HealthChecker:
 
     def check_critical_only(self) -> dict:
         """Check only critical services (faster)."""
-        checks = [
-            self.check_supabase(),
-            self.check_gemini(),
-            self.check_pexels(),
-        ]
+        checks = self.run_probes([
+            ("supabase", self.check_supabase),
+            ("gemini", self.check_gemini),
+            ("pexels", self.check_pexels),
+        ])
 
         healthy = all(c.status == "healthy" for c in checks)
 
@@ -865,9 +935,11 @@ class HealthChecker:
         }
 
 
-def run_health_check(full: bool = True) -> dict:
+def run_health_check(full: bool = True, deadline_seconds: Optional[float] = None) -> dict:
     """Run health checks and return results."""
     checker = HealthChecker()
+    if deadline_seconds:
+        checker.deadline_seconds = deadline_seconds
 
     if full:
         return checker.check_all()
@@ -883,10 +955,11 @@ def main():
     parser = argparse.ArgumentParser(description="Check service health")
     parser.add_argument("--full", action="store_true", help="Run full health check")
     parser.add_argument("--json", action="store_true", help="Output as JSON")
+    parser.add_argument("--deadline", type=float, help="Global deadline in seconds for all probes")
 
     args = parser.parse_args()
 
-    result = run_health_check(full=args.full)
+    result = run_health_check(full=args.full, deadline_seconds=args.deadline)
 
     if args.json:
         print(json.dumps(result, indent=2))
@@ -0,0 +1,161 @@
+"""Per-service latency history for health checks, with rolling p50/p95.
+
+HealthChecker used to judge a service only on hard failures, so an API that
+slowly went from 300ms to 4s stayed "healthy" until it timed out. Every
+probe's response_time_ms is now appended to a small SQLite time series and
+compared with that service's own recent history:
+
+- record() stores one sample (service, status, latency, timestamp)
+- baseline() returns rolling p50/p95 over the last WINDOW_SAMPLES samples
+  of the last WINDOW_DAYS days
+- regression() says whether a new latency is far enough above the baseline
+  to call the service degraded
+- Samples older than RETENTION_DAYS are pruned on write
+
+Usage:
+    store = get_latency_store()
+    baseline = store.baseline("supabase")
+    if LatencyStore.regression(2400.0, baseline):
+        ...mark degraded...
+    store.record("supabase", "healthy", 2400.0)
+"""
+
+import logging
+import math
+import os
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+DEFAULT_STORE_PATH = PROJECT_ROOT / "cache" / "health_latency.sqlite"
+
+WINDOW_SAMPLES = 50
+WINDOW_DAYS = 14
+RETENTION_DAYS = 90
+# A latency is a regression when it exceeds both the rolling p95 and
+# REGRESSION_FACTOR x p50, and the baseline has at least MIN_SAMPLES points.
+REGRESSION_FACTOR = 2.0
+MIN_SAMPLES = 10
+
+
+@dataclass
+class LatencyBaseline:
+    """Rolling latency percentiles for one service."""
+    service: str
+    samples: int
+    p50_ms: Optional[float]
+    p95_ms: Optional[float]
+
+    def as_dict(self) -> dict:
+        return {"samples": self.samples, "p50_ms": self.p50_ms, "p95_ms": self.p95_ms}
+
+
+def percentile(sorted_values, q: float) -> Optional[float]:
+    """Nearest-rank percentile (0 < q <= 100) of an ascending list."""
+    if not sorted_values:
+        return None
+    rank = max(1, math.ceil(q / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+class LatencyStore:
+    """SQLite-backed latency samples per service.
+
+    One connection is shared across the probe threads behind a lock.
+    """
+
+    def __init__(
+        self,
+        path: Optional[Path] = None,
+        window: int = WINDOW_SAMPLES,
+        window_days: float = WINDOW_DAYS,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.path = Path(path or DEFAULT_STORE_PATH)
+        self.window = window
+        self.window_days = window_days
+        self._clock = clock
+        self._lock = threading.Lock()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.path), timeout=30, check_same_thread=False)
+        with self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS probes ("
+                " service TEXT NOT NULL, status TEXT NOT NULL,"
+                " response_time_ms REAL, recorded_at REAL NOT NULL)"
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS probes_service_time ON probes (service, recorded_at)"
+            )
+
+    def record(self, service: str, status: str, response_time_ms: Optional[float]) -> None:
+        """Append one probe result and prune samples past retention."""
+        now = self._clock()
+        with self._lock:
+            try:
+                with self._conn:
+                    self._conn.execute(
+                        "INSERT INTO probes VALUES (?, ?, ?, ?)",
+                        (service, status, response_time_ms, now),
+                    )
+                    self._conn.execute(
+                        "DELETE FROM probes WHERE recorded_at < ?",
+                        (now - RETENTION_DAYS * 86400,),
+                    )
+            except sqlite3.Error as e:
+                logger.warning(f"Latency store write failed: {e}")
+
+    def baseline(self, service: str) -> LatencyBaseline:
+        """p50/p95 of the service's recent latencies (healthy or degraded probes with a timing)."""
+        since = self._clock() - self.window_days * 86400
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT response_time_ms FROM probes"
+                " WHERE service = ? AND recorded_at >= ? AND response_time_ms IS NOT NULL"
+                " ORDER BY recorded_at DESC LIMIT ?",
+                (service, since, self.window),
+            ).fetchall()
+        values = sorted(r[0] for r in rows)
+        return LatencyBaseline(service, len(values), percentile(values, 50), percentile(values, 95))
+
+    @staticmethod
+    def regression(
+        response_time_ms: Optional[float],
+        baseline: LatencyBaseline,
+        factor: float = REGRESSION_FACTOR,
+        min_samples: int = MIN_SAMPLES,
+    ) -> bool:
+        """True if response_time_ms is well above the service's own baseline."""
+        if response_time_ms is None or baseline.samples < min_samples:
+            return False
+        return response_time_ms > baseline.p95_ms and response_time_ms > factor * baseline.p50_ms
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM probes").fetchone()[0]
+
+
+_default_store = None
+_default_lock = threading.Lock()
+
+
+def get_latency_store() -> Optional[LatencyStore]:
+    """Process-wide store at HEALTH_LATENCY_PATH (HEALTH_LATENCY_PATH=off disables it)."""
+    global _default_store
+    with _default_lock:
+        if _default_store is None:
+            path = os.environ.get("HEALTH_LATENCY_PATH") or DEFAULT_STORE_PATH
+            if str(path).lower() == "off":
+                return None
+            try:
+                _default_store = LatencyStore(Path(path))
+            except (OSError, sqlite3.Error) as e:
+                logger.warning(f"Latency history unavailable: {e}")
+                return None
+        return _default_store
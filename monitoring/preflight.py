@@ -0,0 +1,376 @@
+"""Pre-flight checks for the content engine, run concurrently under one deadline.
+
+The content-engine job used to check its dependencies one after another:
+scripts/preflight_check.py probed Supabase, Pexels and Gemini serially, then
+the render step made a full Gemini generation call and POSTed the Make.com
+scenario activator followed by a fixed time.sleep(5). All of it added
+straight onto every cron run. Preflight instead:
+
+- Runs every probe at once through HealthChecker.run_probes, so the stage
+  costs the slowest probe (capped by PREFLIGHT_DEADLINE_SECONDS), not the sum
+- Caches passing read-only probes in cache/preflight_health.json for
+  PREFLIGHT_CACHE_TTL_SECONDS (default 300), so the render step reuses the
+  Gemini generation check the pre-flight step already did in the same job
+- Turns the post-activation sleep into a readiness deadline that is only
+  waited on (ScenarioActivation.wait_ready) right before the first pin is
+  posted, by which time rendering has long covered it
+- Reports per-probe and total timings
+
+Usage:
+    report = Preflight(["env", "supabase", "gemini"]).run()
+    for result in report.results:
+        print(result.service, result.status, report.timings[result.service])
+    if report.critical_failures:
+        sys.exit(1)
+"""
+
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+import urllib.request
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Callable, Optional
+
+import requests
+
+from .health_checker import HealthChecker, HealthCheckResult
+
+logger = logging.getLogger(__name__)
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+DEFAULT_CACHE_PATH = PROJECT_ROOT / "cache" / "preflight_health.json"
+DEFAULT_DEADLINE_SECONDS = 45
+DEFAULT_CACHE_TTL_SECONDS = 300
+PROBE_TIMEOUT_SECONDS = 10
+# How long Make.com needs after the activator fires before scenarios accept posts
+ACTIVATION_GRACE_SECONDS = 5
+
+SUPABASE_TABLES = ["content_history", "errors", "agent_runs", "daily_trending"]
+REQUIRED_ENV = [
+    ("GEMINI_API_KEY", "Gemini content generation"),
+    ("PEXELS_API_KEY", "Pexels image fetching"),
+    ("SUPABASE_URL", "Supabase database"),
+    ("SUPABASE_KEY", "Supabase database"),
+]
+# A missing one of these blocks the pipeline; the rest are warnings
+CRITICAL_ENV = {"GEMINI_API_KEY", "SUPABASE_URL", "SUPABASE_KEY"}
+BRAND_WEBHOOKS = {
+    "MAKE_WEBHOOK_FITNESS": "fitness",
+    "MAKE_WEBHOOK_DEALS": "deals",
+    "MAKE_WEBHOOK_MENOPAUSE": "menopause",
+}
+MAKE_HOOK_PREFIX = "https://hook.us2.make.com/"
+
+# Probe groups accepted by Preflight(probes=...)
+ALL_PROBES = ["env", "webhooks", "supabase", "pexels", "gemini", "gemini_generate", "make_activator"]
+# Read-only probes whose passing result may be reused from the cache
+CACHEABLE = ("supabase:", "pexels", "gemini", "gemini_generate")
+
+
+def get_deadline_seconds() -> float:
+    return float(os.environ.get("PREFLIGHT_DEADLINE_SECONDS") or DEFAULT_DEADLINE_SECONDS)
+
+
+def get_cache_ttl_seconds() -> float:
+    return float(os.environ.get("PREFLIGHT_CACHE_TTL_SECONDS") or DEFAULT_CACHE_TTL_SECONDS)
+
+
+def _elapsed_ms(started: float) -> float:
+    return (time.perf_counter() - started) * 1000
+
+
+# ═══════════════════════════════════════════════════════════════
+# RESULT CACHE
+# ═══════════════════════════════════════════════════════════════
+
+class HealthResultCache:
+    """Passing probe results shared across processes of one job, for ttl seconds."""
+
+    def __init__(self, path: Optional[Path] = None, ttl_seconds: Optional[float] = None,
+                 clock: Callable[[], float] = time.time):
+        self.path = Path(path or DEFAULT_CACHE_PATH)
+        self.ttl_seconds = get_cache_ttl_seconds() if ttl_seconds is None else ttl_seconds
+        self._clock = clock
+        self._lock = threading.Lock()
+
+    def _read(self) -> dict:
+        try:
+            return json.loads(self.path.read_text())
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable pre-flight cache {self.path}: {e}")
+            return {}
+
+    def get(self, service: str) -> Optional[HealthCheckResult]:
+        if self.ttl_seconds <= 0:
+            return None
+        with self._lock:
+            entry = self._read().get(service)
+        if not entry or self._clock() - entry["checked_at"] > self.ttl_seconds:
+            return None
+        result = HealthCheckResult(**entry["result"])
+        # Cost this run nothing; keep the original timing for reference
+        result.details = {**result.details, "cached": True,
+                          "cached_response_time_ms": result.response_time_ms}
+        result.response_time_ms = 0.0
+        return result
+
+    def put(self, result: HealthCheckResult) -> None:
+        if self.ttl_seconds <= 0 or result.status != "healthy":
+            return
+        with self._lock:
+            state = self._read()
+            state[result.service] = {"checked_at": self._clock(), "result": asdict(result)}
+            try:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                fd, tmp = tempfile.mkstemp(dir=self.path.parent, prefix=".preflight-")
+                with os.fdopen(fd, "w") as f:
+                    json.dump(state, f)
+                os.replace(tmp, self.path)
+            except OSError as e:
+                logger.warning(f"Could not persist pre-flight cache: {e}")
+
+
+# ═══════════════════════════════════════════════════════════════
+# MAKE.COM SCENARIO ACTIVATION
+# ═══════════════════════════════════════════════════════════════
+
+class ScenarioActivation:
+    """Fire the Make.com scenario activator and track when scenarios are ready.
+
+    Make.com gives no activation status the job can query (its API sits
+    behind Cloudflare, which is why the activator webhook exists), so
+    readiness is a deadline: grace_seconds after the activator answered.
+    wait_ready() polls that deadline just before posting instead of the job
+    sleeping up front.
+    """
+
+    def __init__(self, url: str, grace_seconds: float = ACTIVATION_GRACE_SECONDS,
+                 clock: Callable[[], float] = time.monotonic,
+                 sleep: Callable[[float], None] = time.sleep):
+        self.url = url
+        self.grace_seconds = grace_seconds
+        self._clock = clock
+        self._sleep = sleep
+        self.ready_at: Optional[float] = None
+
+    def trigger(self) -> HealthCheckResult:
+        started = time.perf_counter()
+        req = urllib.request.Request(
+            self.url,
+            data=json.dumps({"action": "activate_all"}).encode(),
+            headers={"Content-Type": "application/json"},
+            method="POST",
+        )
+        try:
+            with urllib.request.urlopen(req, timeout=15) as resp:
+                status = resp.status
+        except Exception as e:
+            return HealthCheckResult(service="make_activator", status="degraded",
+                                     response_time_ms=_elapsed_ms(started), error=f"skipped: {e}")
+        self.ready_at = self._clock() + self.grace_seconds
+        return HealthCheckResult(service="make_activator", status="healthy",
+                                 response_time_ms=_elapsed_ms(started),
+                                 details={"http_status": status})
+
+    def is_ready(self) -> bool:
+        return self.ready_at is None or self._clock() >= self.ready_at
+
+    def wait_ready(self, timeout: Optional[float] = None, poll_interval: float = 0.25) -> float:
+        """Block until scenarios should be active (at most timeout). Returns seconds waited."""
+        started = self._clock()
+        while not self.is_ready():
+            if timeout is not None and self._clock() - started >= timeout:
+                break
+            self._sleep(min(poll_interval, max(0.0, self.ready_at - self._clock())))
+        return self._clock() - started
+
+
+# ═══════════════════════════════════════════════════════════════
+# PRE-FLIGHT
+# ═══════════════════════════════════════════════════════════════
+
+@dataclass
+class PreflightReport:
+    """Probe results in request order, plus timings and which failures block the run."""
+    results: list[HealthCheckResult]
+    seconds: float
+    critical_failures: list[str] = field(default_factory=list)
+    warnings: list[str] = field(default_factory=list)
+    activation: Optional[ScenarioActivation] = None
+
+    @property
+    def timings(self) -> dict:
+        return {r.service: r.response_time_ms for r in self.results}
+
+    def result(self, service: str) -> Optional[HealthCheckResult]:
+        return next((r for r in self.results if r.service == service), None)
+
+
+class Preflight:
+    """Concurrent, deadline-bounded, cached pre-flight checks for the content engine."""
+
+    def __init__(self, probes: Optional[list[str]] = None,
+                 deadline_seconds: Optional[float] = None,
+                 cache: Optional[HealthResultCache] = None,
+                 activate_scenarios: bool = True):
+        self.groups = probes or ALL_PROBES
+        self.deadline_seconds = deadline_seconds or get_deadline_seconds()
+        self.cache = cache if cache is not None else HealthResultCache()
+        self.activation = None
+        activator_url = os.environ.get("MAKE_WEBHOOK_ACTIVATOR", "")
+        if activate_scenarios and activator_url and "make_activator" in self.groups:
+            self.activation = ScenarioActivation(activator_url)
+
+    def probes(self) -> list[tuple[str, Callable[[], HealthCheckResult]]]:
+        """(service, probe) for the requested groups, in report order."""
+        probes = []
+        for group in self.groups:
+            if group == "env":
+                probes.append(("env", self.check_env))
+            elif group == "webhooks":
+                probes.append(("webhooks", self.check_webhooks))
+            elif group == "supabase":
+                probes.extend((f"supabase:{t}", lambda t=t: self.check_supabase_table(t))
+                              for t in SUPABASE_TABLES)
+            elif group == "pexels":
+                probes.append(("pexels", self.check_pexels))
+            elif group == "gemini":
+                probes.append(("gemini", self.check_gemini))
+            elif group == "gemini_generate":
+                probes.append(("gemini_generate", self.check_gemini_generate))
+            elif group == "make_activator" and self.activation is not None:
+                probes.append(("make_activator", self.activation.trigger))
+        return [(service, self._cached(service, probe)) for service, probe in probes]
+
+    def _cached(self, service: str, probe: Callable[[], HealthCheckResult]):
+        if not service.startswith(CACHEABLE):
+            return probe
+
+        def run() -> HealthCheckResult:
+            hit = self.cache.get(service)
+            if hit is not None:
+                return hit
+            result = probe()
+            self.cache.put(result)
+            return result
+        return run
+
+    def run(self) -> PreflightReport:
+        started = time.perf_counter()
+        checker = HealthChecker(deadline_seconds=self.deadline_seconds, record_latency=False)
+        results = checker.run_probes(self.probes())
+
+        critical, warnings = [], []
+        for r in results:
+            if r.status == "healthy":
+                continue
+            message = f"{r.service}: {r.error or r.status}"
+            blocking = r.service.startswith(("supabase:", "gemini")) and r.service != "gemini_generate"
+            if r.service == "env":
+                blocking = bool(set(r.details.get("missing", [])) & CRITICAL_ENV)
+            (critical if blocking else warnings).append(message)
+
+        seconds = time.perf_counter() - started
+        logger.info(f"Pre-flight: {len(results)} probes in {seconds:.2f}s, "
+                    f"{len(critical)} critical, {len(warnings)} warnings")
+        return PreflightReport(results, seconds, critical, warnings, self.activation)
+
+    # ── probes ───────────────────────────────────────────────────────────────
+
+    def check_env(self) -> HealthCheckResult:
+        missing = [var for var, _ in REQUIRED_ENV if len(os.environ.get(var, "")) <= 10]
+        return HealthCheckResult(
+            service="env",
+            status="unhealthy" if missing else "healthy",
+            error=f"Missing {', '.join(missing)}" if missing else None,
+            details={"missing": missing},
+        )
+
+    def check_webhooks(self) -> HealthCheckResult:
+        """Configuration only.
+
+        Never make HTTP requests to webhook URLs: Make.com fires the scenario
+        on ANY method, and an empty-body call makes Pinterest return 400 and
+        deactivates the scenario before the real posting step runs.
+        """
+        unified = os.environ.get("MAKE_WEBHOOK", "").startswith(MAKE_HOOK_PREFIX)
+        brands = {label: os.environ.get(var, "").startswith(MAKE_HOOK_PREFIX)
+                  for var, label in BRAND_WEBHOOKS.items()}
+        unconfigured = [label for label, ok in brands.items() if not ok and not unified]
+        if not unified and not any(brands.values()):
+            status, error = "unhealthy", "No Make.com webhooks configured"
+        elif unconfigured:
+            status, error = "degraded", f"No webhook for {', '.join(unconfigured)}"
+        else:
+            status, error = "healthy", None
+        return HealthCheckResult(service="webhooks", status=status, error=error,
+                                 details={"unified": unified, "brands": brands})
+
+    def check_supabase_table(self, table: str) -> HealthCheckResult:
+        service = f"supabase:{table}"
+        url, key = os.environ.get("SUPABASE_URL", ""), os.environ.get("SUPABASE_KEY", "")
+        if not (url and key):
+            return HealthCheckResult(service=service, status="unhealthy",
+                                     error="skipped (credentials missing)")
+        started = time.perf_counter()
+        try:
+            resp = requests.get(
+                f"{url}/rest/v1/{table}?select=id&limit=1",
+                headers={"apikey": key, "Authorization": f"Bearer {key}"},
+                timeout=PROBE_TIMEOUT_SECONDS,
+            )
+        except requests.exceptions.RequestException as e:
+            return HealthCheckResult(service=service, status="unhealthy",
+                                     response_time_ms=_elapsed_ms(started), error=str(e)[:80])
+        error = None
+        if resp.status_code == 404:
+            error = "HTTP 404 — table may not exist (run 001_master_schema.sql)"
+        elif resp.status_code != 200:
+            error = f"HTTP {resp.status_code}"
+        return HealthCheckResult(service=service, status="unhealthy" if error else "healthy",
+                                 response_time_ms=_elapsed_ms(started), error=error)
+
+    def _check_get(self, service: str, env_var: str, url: str, headers: Optional[dict] = None):
+        if not os.environ.get(env_var, ""):
+            return HealthCheckResult(service=service, status="unhealthy", error="skipped (key missing)")
+        started = time.perf_counter()
+        try:
+            resp = requests.get(url, headers=headers, timeout=PROBE_TIMEOUT_SECONDS)
+        except requests.exceptions.RequestException as e:
+            return HealthCheckResult(service=service, status="unhealthy",
+                                     response_time_ms=_elapsed_ms(started), error=str(e)[:80])
+        ok = resp.status_code == 200
+        return HealthCheckResult(service=service, status="healthy" if ok else "unhealthy",
+                                 response_time_ms=_elapsed_ms(started),
+                                 error=None if ok else f"HTTP {resp.status_code}")
+
+    def check_pexels(self) -> HealthCheckResult:
+        return self._check_get("pexels", "PEXELS_API_KEY",
+                               "https://api.pexels.com/v1/search?query=fitness&per_page=1",
+                               headers={"Authorization": os.environ.get("PEXELS_API_KEY", "")})
+
+    def check_gemini(self) -> HealthCheckResult:
+        """API key and reachability: lists models, no generation."""
+        key = os.environ.get("GEMINI_API_KEY", "")
+        return self._check_get("gemini", "GEMINI_API_KEY",
+                               f"https://generativelanguage.googleapis.com/v1beta/models?key={key}")
+
+    def check_gemini_generate(self) -> HealthCheckResult:
+        """A real (tiny) generation through gemini_client, including its model fallback."""
+        from video_automation.gemini_client import health_check
+
+        started = time.perf_counter()
+        ok, detail = health_check()
+        return HealthCheckResult(
+            service="gemini_generate",
+            status="healthy" if ok else "unhealthy",
+            response_time_ms=_elapsed_ms(started),
+            error=None if ok else detail,
+            details={"model": detail} if ok else {},
+        )
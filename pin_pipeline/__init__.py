@@ -0,0 +1,16 @@
+"""Resumable, concurrent pin pipeline (content-engine Phases 0-2)."""
+
+from pin_pipeline.checkpoint import Checkpoint
+from pin_pipeline.engine import PinPipeline, PinRunResult, PinServices, PinWorkItem
+from pin_pipeline.runner import PipelineReport, Stage, StagePipeline
+
+__all__ = [
+    'Checkpoint',
+    'PinPipeline',
+    'PinRunResult',
+    'PinServices',
+    'PinWorkItem',
+    'PipelineReport',
+    'Stage',
+    'StagePipeline',
+]
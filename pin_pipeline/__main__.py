@@ -0,0 +1,121 @@
+"""
+CLI entry point for the pin pipeline.
+
+Usage:
+    python -m pin_pipeline --fake                          # fake Supabase + simulated APIs
+    python -m pin_pipeline --fake --pins-per-brand 4 --compare
+    python -m pin_pipeline --fake --run-id demo --crash-after render   # then re-run to resume
+    python -m pin_pipeline --brands fitness --dry-run      # real services, no DB writes
+"""
+
+import argparse
+import logging
+import os
+import sys
+import tempfile
+import time
+
+from pin_pipeline.checkpoint import Checkpoint
+from pin_pipeline.engine import STAGES, PinPipeline
+
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s [%(levelname)s] %(name)s: %(message)s",
+    datefmt="%H:%M:%S",
+)
+logger = logging.getLogger(__name__)
+
+
+def _fake_pipeline(args, checkpoint, workers=None, queue_size=None):
+    from pin_pipeline.fakes import FakeSupabase, fake_services
+
+    db = FakeSupabase(latency=args.db_latency)
+    services = fake_services(args.article_dir, llm=args.llm_latency,
+                             network=args.network_latency, cpu=args.cpu)
+    pipeline = PinPipeline(
+        db, args.brands, services=services, checkpoint=checkpoint,
+        max_pins_per_day=args.pins_per_brand, max_pins_per_run=args.pins_per_brand,
+        workers=workers, queue_size=queue_size or args.queue_size,
+        render_processes=not args.threads,
+    )
+    return pipeline
+
+
+def _real_pipeline(args, checkpoint):
+    from database.supabase_client import get_supabase_client
+
+    return PinPipeline(get_supabase_client().client, args.brands, checkpoint=checkpoint,
+                       dry_run=args.dry_run, queue_size=args.queue_size,
+                       render_processes=not args.threads)
+
+
+def _crash_after(pipeline, stage_name):
+    """Wrap a stage so the process dies right after its first completion, as a cancelled job would."""
+    stage_func = getattr(pipeline, f'_{stage_name}')
+
+    def wrapped(item):
+        result = stage_func(item)
+        if result is not None:
+            result.done.add(stage_name)
+            pipeline.checkpoint.record(item.key, result)
+            logger.error(f"Simulated crash after {stage_name} ({item.key}); "
+                         f"re-run with --run-id {pipeline.checkpoint.run_id} to resume")
+            logging.shutdown()
+            os._exit(3)
+        return result
+
+    setattr(pipeline, f'_{stage_name}', wrapped)
+
+
+def _run(pipeline):
+    started = time.perf_counter()
+    result = pipeline.run()
+    wall = time.perf_counter() - started
+    logger.info(f"{len(result.rendered_pins)} pin(s) ready, {len(result.articles_generated)} article(s), "
+                f"{len(result.report.failed)} failure(s) in {wall:.2f}s")
+    return wall
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run the content-engine pin pipeline")
+    parser.add_argument("--fake", action="store_true", help="Fake Supabase and simulated APIs")
+    parser.add_argument("--brands", type=lambda s: s.split(","), default=["fitness", "deals", "menopause"])
+    parser.add_argument("--run-id", default=None, help="Checkpoint id; reuse it to resume a crashed run")
+    parser.add_argument("--dry-run", action="store_true", help="Generate content only, no DB writes")
+    parser.add_argument("--queue-size", type=int, default=8)
+    parser.add_argument("--threads", action="store_true", help="Render on threads instead of processes")
+    parser.add_argument("--crash-after", choices=STAGES, help="Kill the run after a stage (tests resume)")
+    fake = parser.add_argument_group("fake mode")
+    fake.add_argument("--pins-per-brand", type=int, default=2)
+    fake.add_argument("--llm-latency", type=float, default=0.3)
+    fake.add_argument("--network-latency", type=float, default=0.1)
+    fake.add_argument("--db-latency", type=float, default=0.02)
+    fake.add_argument("--cpu", type=float, default=0.05, help="Seconds of CPU per template render")
+    fake.add_argument("--compare", action="store_true",
+                      help="Also run with one worker per stage and report the speedup")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory(prefix="pin-pipeline-") as tmp:
+        args.article_dir = f"{tmp}/articles"
+        if not args.fake:
+            checkpoint = Checkpoint.open(args.run_id)
+            pipeline = _real_pipeline(args, checkpoint)
+        else:
+            checkpoint = Checkpoint.open(args.run_id, directory=None if args.run_id else tmp)
+            pipeline = _fake_pipeline(args, checkpoint)
+
+        if args.crash_after:
+            _crash_after(pipeline, args.crash_after)
+        wall = _run(pipeline)
+
+        if args.fake and args.compare:
+            serial = _fake_pipeline(args, Checkpoint.open(directory=f"{tmp}/serial"),
+                                    workers={name: 1 for name in STAGES}, queue_size=1)
+            serial_wall = _run(serial)
+            logger.info(f"One worker per stage: {serial_wall:.2f}s, pipelined: {wall:.2f}s "
+                        f"({serial_wall / wall:.1f}x)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,129 @@
+"""Idempotent per-run checkpoint for the pin pipeline.
+
+A run's checkpoint is one JSON file, cache/pin_pipeline/<run_id>.json, that
+records the run plan and, for every item, which stages it has completed plus
+the state those stages produced (pin id, rendered image path, image URL...).
+Large artifacts (rendered images) live beside it in cache/pin_pipeline/<run_id>/.
+
+Writes are atomic (tempfile + os.replace) after every completed stage, so a
+crashed run leaves a consistent file behind. Running again with the same run
+id (GitHub keeps GITHUB_RUN_ID across re-run attempts) reloads it and every
+item resumes at its first unfinished stage.
+
+Usage:
+    checkpoint = Checkpoint.open(run_id)
+    if checkpoint.plan is None:
+        checkpoint.set_plan(keys)
+    checkpoint.record(item.key, item)
+"""
+
+import json
+import logging
+import os
+import re
+import shutil
+import tempfile
+import threading
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+DEFAULT_CHECKPOINT_DIR = PROJECT_ROOT / "cache" / "pin_pipeline"
+# Checkpoints older than this are deleted by prune()
+MAX_AGE_HOURS = 48
+
+
+def default_run_id():
+    """PIN_PIPELINE_RUN_ID, else GITHUB_RUN_ID, else a UTC timestamp."""
+    run_id = os.environ.get("PIN_PIPELINE_RUN_ID") or os.environ.get("GITHUB_RUN_ID")
+    if not run_id:
+        run_id = datetime.now(timezone.utc).strftime("local-%Y%m%d-%H%M%S")
+    return re.sub(r"[^A-Za-z0-9_.-]", "_", run_id)
+
+
+class Checkpoint:
+    """Completed stages and stage outputs per item, persisted after each change."""
+
+    def __init__(self, path, run_id=""):
+        self.path = Path(path)
+        self.run_id = run_id
+        self.artifact_dir = self.path.with_suffix("")
+        self.plan = None     # list of item keys, fixed on the first attempt
+        self.items = {}      # key -> {"done": [...], "state": {...}}
+        self.attempts = 0
+        self._lock = threading.Lock()
+
+    @classmethod
+    def open(cls, run_id=None, directory=None):
+        """Load the checkpoint for run_id, or start an empty one."""
+        run_id = run_id or default_run_id()
+        directory = Path(directory or os.environ.get("PIN_PIPELINE_DIR") or DEFAULT_CHECKPOINT_DIR)
+        checkpoint = cls(directory / f"{run_id}.json", run_id)
+        try:
+            state = json.loads(checkpoint.path.read_text())
+            checkpoint.plan = state.get("plan")
+            checkpoint.items = state.get("items", {})
+            checkpoint.attempts = state.get("attempts", 0)
+        except (OSError, ValueError):
+            pass
+        checkpoint.attempts += 1
+        if checkpoint.attempts > 1:
+            logger.info(f"Resuming pin pipeline run {run_id} (attempt {checkpoint.attempts}, "
+                        f"{len(checkpoint.items)} checkpointed item(s))")
+        return checkpoint
+
+    @property
+    def resumed(self):
+        return self.plan is not None
+
+    def set_plan(self, keys):
+        with self._lock:
+            self.plan = list(keys)
+        self.save()
+
+    def done(self, key):
+        """Stage names key has completed."""
+        return set(self.items.get(key, {}).get("done", ()))
+
+    def state(self, key):
+        return dict(self.items.get(key, {}).get("state", {}))
+
+    def record(self, key, item):
+        """Store item.done and item.to_state() for key and persist."""
+        with self._lock:
+            self.items[key] = {"done": sorted(item.done), "state": item.to_state()}
+        self.save()
+
+    def artifact_path(self, name):
+        """Path for a per-run artifact (directory created on demand)."""
+        self.artifact_dir.mkdir(parents=True, exist_ok=True)
+        return self.artifact_dir / re.sub(r"[^A-Za-z0-9_.-]", "_", name)
+
+    def save(self):
+        with self._lock:
+            state = {"run_id": self.run_id, "attempts": self.attempts,
+                     "plan": self.plan, "items": self.items}
+            try:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                fd, tmp = tempfile.mkstemp(dir=self.path.parent, prefix=".ckpt-")
+                with os.fdopen(fd, "w") as f:
+                    json.dump(state, f, default=str)
+                os.replace(tmp, self.path)
+            except OSError as e:
+                logger.warning(f"Could not persist pin pipeline checkpoint: {e}")
+
+    def prune(self, max_age_hours=MAX_AGE_HOURS):
+        """Delete other runs' checkpoints (and artifacts) older than max_age_hours."""
+        cutoff = time.time() - max_age_hours * 3600
+        for path in self.path.parent.glob("*.json"):
+            if path == self.path:
+                continue
+            try:
+                if path.stat().st_mtime < cutoff:
+                    path.unlink()
+                    shutil.rmtree(path.with_suffix(""), ignore_errors=True)
+            except OSError:
+                pass
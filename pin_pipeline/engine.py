@@ -0,0 +1,539 @@
+"""Content-engine pin stages: generate → render → upload → article.
+
+This is Phase 0-2 of .github/workflows/content-engine.yml as an importable
+pipeline. Each stage runs on its own worker pool with a bounded queue in
+front of it (pin_pipeline.runner), so a new pin is rendering while the next
+brand's content is still being generated, and its article is written as
+soon as its image is uploaded. Every completed stage is checkpointed
+(pin_pipeline.checkpoint): a crashed run re-run with the same run id resumes
+each pin at its first unfinished stage instead of generating it again.
+
+  generate  generate_pin_content → insert pinterest_pins row (content_ready)
+  render    Nano Banana AI image, else Pexels photo + brand template (process
+            pool) with perceptual-hash dedup on the background photo; image
+            saved as a run artifact
+  upload    text overlay (AI images) → Supabase Storage → status ready
+  article   article for the pin → destination_url points at it
+
+Pin inserts and status changes go through database.supabase_client.PinBatch:
+writes from concurrent workers are group-committed into one request, and a
+status change only applies if the pin is still in the expected state, so
+two overlapping runs never render the same pin.
+
+Posting (Phase 1b) stays in the workflow: pins may only be posted once their
+articles are committed and deployed.
+
+Every external call goes through PinServices, so the whole pipeline runs
+locally against pin_pipeline.fakes (see `python -m pin_pipeline --fake`).
+
+Usage:
+    pipeline = PinPipeline(db.client, brands, history=history, phash_index=phash_index)
+    result = pipeline.run()
+    for pin in result.rendered_pins:
+        ...post...
+"""
+
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+from database.supabase_client import PinBatch
+from pin_pipeline.checkpoint import Checkpoint
+from pin_pipeline.runner import DEFAULT_QUEUE_SIZE, PipelineReport, Stage, StagePipeline
+from video_automation.pin_image_generator import (
+    compute_image_hash,
+    compute_perceptual_hash,
+    map_visual_style,
+)
+
+logger = logging.getLogger(__name__)
+
+STAGES = ('generate', 'render', 'upload', 'article')
+# Error-log phase names used by the workflow (errors table)
+STAGE_PHASE = {'generate': '0', 'render': '1', 'upload': '1', 'article': '2'}
+
+MAX_PINS_PER_DAY = 3  # 3 pins/brand/day — Pinterest 2026 algorithm penalizes high volume
+MAX_PINS_PER_RUN = 1  # 1 pin/brand/run — spread pins across day for better engagement
+BACKLOG_HOURS = 24    # content_ready pins younger than this are rendered too
+DEDUP_RETRIES = 2     # re-picks when a rendered image duplicates a known one
+UPLOAD_WORKERS = 4
+
+
+# ═══════════════════════════════════════════════════════════════
+# WORK ITEMS AND SERVICES
+# ═══════════════════════════════════════════════════════════════
+
+@dataclass
+class PinWorkItem:
+    """One pin moving through the stages; to_state() is what gets checkpointed."""
+
+    key: str
+    brand: str
+    pin: Dict[str, Any] = field(default_factory=dict)     # pinterest_pins row
+    render: Dict[str, Any] = field(default_factory=dict)  # headline, style, ...
+    image_path: str = ''
+    nb_used: bool = False
+    article: Dict[str, Any] = field(default_factory=dict)
+    done: set = field(default_factory=set)
+
+    def to_state(self):
+        return {'brand': self.brand, 'pin': self.pin, 'render': self.render,
+                'image_path': self.image_path, 'nb_used': self.nb_used,
+                'article': self.article}
+
+    @classmethod
+    def from_state(cls, key, state, done=()):
+        return cls(key=key, brand=state.get('brand', ''), pin=state.get('pin') or {},
+                   render=state.get('render') or {}, image_path=state.get('image_path', ''),
+                   nb_used=state.get('nb_used', False), article=state.get('article') or {},
+                   done=set(done))
+
+
+@dataclass
+class PinServices:
+    """External calls the stages make. default() binds the production modules."""
+
+    generate_content: Callable       # (brand, supabase_client, history=) -> pin_data
+    log_history: Callable            # (pin_data, supabase_client, history=)
+    board_id: Callable               # (brand, board_name) -> board id
+    generate_ai_image: Callable      # (brand, topic) -> image bytes
+    pick_image: Callable             # (search_term, brand, supabase_client, history=) -> {'url': ...}
+    fetch_background: Callable       # (url, brand) -> image bytes or None
+    render_template: Callable        # (brand, headline, subheadline, image_bytes) -> JPEG bytes
+    add_overlay: Callable            # (image_bytes, headline, brand) -> image bytes
+    upload_image: Callable           # (image_bytes, filename) -> public URL
+    generate_article: Callable       # (brand, pin_data, supabase_client) -> (slug, markdown)
+    article_to_html: Callable        # (markdown, brand, slug, pin_data) -> html
+    save_article: Callable           # (html, brand, slug, pin_data, supabase_client) -> URL
+    site_config: Dict[str, Dict[str, str]] = field(default_factory=dict)
+
+    @classmethod
+    def default(cls):
+        from video_automation.content_brain import generate_pin_content, log_pin_to_history
+        from video_automation.image_selector import get_unique_pexels_image
+        from video_automation.nano_banana_generator import add_text_overlay, generate_pin_image
+        from video_automation.pin_article_generator import (
+            BRAND_SITE_CONFIG, article_to_html, generate_article_for_pin, save_and_register_article,
+        )
+        from video_automation.pin_image_generator import fetch_background_bytes, render_brand_pin
+        from video_automation.pinterest_boards import get_board_id
+        from video_automation.supabase_storage import upload_pin_image
+
+        return cls(
+            generate_content=generate_pin_content,
+            log_history=log_pin_to_history,
+            board_id=get_board_id,
+            generate_ai_image=generate_pin_image,
+            pick_image=get_unique_pexels_image,
+            fetch_background=fetch_background_bytes,
+            render_template=render_brand_pin,
+            add_overlay=add_text_overlay,
+            upload_image=upload_pin_image,
+            generate_article=generate_article_for_pin,
+            article_to_html=article_to_html,
+            save_article=save_and_register_article,
+            site_config=BRAND_SITE_CONFIG,
+        )
+
+
+@dataclass
+class PinRunResult:
+    """What the rest of the workflow needs from a pipeline run."""
+
+    rendered_pins: List[Dict[str, Any]]   # ready pins (image_url, destination_url)
+    articles_generated: List[str]         # "brand: slug" for articles written this run
+    picked_up: List[Dict[str, Any]]       # every pin that reached the render stage
+    report: PipelineReport
+
+
+def default_workers():
+    """Per-stage worker counts: Gemini-bound stages share the Gemini concurrency cap.
+
+    Render threads mostly wait on Pexels and downloads, so there are more of
+    them than render processes (one per core), as in pin_batch_renderer.
+    """
+    from video_automation.gemini_client import max_concurrency
+    from video_automation.pin_batch_renderer import FETCH_THREADS_PER_WORKER
+    from video_automation.pin_batch_renderer import default_workers as render_processes
+
+    gemini = max_concurrency()
+    return {'generate': gemini, 'render': render_processes() * FETCH_THREADS_PER_WORKER,
+            'upload': UPLOAD_WORKERS, 'article': gemini}
+
+
+# ═══════════════════════════════════════════════════════════════
+# PIPELINE
+# ═══════════════════════════════════════════════════════════════
+
+class PinPipeline:
+    """Plan a run's pins and push them through the stages; see module docstring."""
+
+    def __init__(self, supabase_client, brands, history=None, phash_index=None,
+                 services=None, checkpoint=None, dry_run=False, articles=True,
+                 max_pins_per_day=MAX_PINS_PER_DAY, max_pins_per_run=MAX_PINS_PER_RUN,
+                 workers=None, queue_size=DEFAULT_QUEUE_SIZE, render_processes=True,
+                 log_error=None):
+        from video_automation.brand_history import BrandHistorySnapshot
+        from video_automation.phash_index import PerceptualHashIndex
+
+        self.db = supabase_client
+        self.brands = list(brands)
+        self.history = history if history is not None else BrandHistorySnapshot.load(supabase_client, self.brands)
+        self.phash_index = phash_index if phash_index is not None else PerceptualHashIndex()
+        self.services = services or PinServices.default()
+        self.checkpoint = checkpoint or Checkpoint.open()
+        self.dry_run = dry_run
+        self.articles = articles
+        self.max_pins_per_day = max_pins_per_day
+        self.max_pins_per_run = max_pins_per_run
+        self.workers = {**default_workers(), **(workers or {})}
+        self.queue_size = queue_size
+        self.render_processes = render_processes
+        self._log_error = log_error
+        # Pin inserts and status changes from all workers are group-committed
+        self.batch = PinBatch(supabase_client)
+
+    # ── planning ─────────────────────────────────────────────────────────────
+
+    def _pins_today(self, brand):
+        today = datetime.now(timezone.utc).strftime('%Y-%m-%d')
+        result = self.db.table('content_history') \
+            .select('id', count='exact') \
+            .eq('brand', brand) \
+            .gte('created_at', today + 'T00:00:00Z') \
+            .execute()
+        count = getattr(result, 'count', None)
+        return count if count is not None else len(result.data or [])
+
+    def _new_items(self):
+        """One item per pin to generate, respecting the per-brand daily cap."""
+        items = []
+        for brand in self.brands:
+            pins_today = 0
+            try:
+                pins_today = self._pins_today(brand)
+                if pins_today >= self.max_pins_per_day:
+                    logger.info(f"[{brand}] SKIP — already {pins_today} pins today (max {self.max_pins_per_day})")
+                    continue
+            except Exception as e:
+                logger.warning(f"[{brand}] Pin count check failed ({e}), continuing...")
+            remaining = min(self.max_pins_per_run, self.max_pins_per_day - pins_today)
+            logger.info(f"[{brand}] Generating {remaining} pin(s) ({pins_today} already today)")
+            items.extend(PinWorkItem(key=f'new:{brand}:{n}', brand=brand) for n in range(remaining))
+        return items
+
+    def _backlog(self):
+        """content_ready pins from the last BACKLOG_HOURS (promo pins, earlier failures)."""
+        cutoff = (datetime.now(timezone.utc) - timedelta(hours=BACKLOG_HOURS)).isoformat()
+        try:
+            result = self.db.table('pinterest_pins') \
+                .select('*') \
+                .eq('status', 'content_ready') \
+                .gte('created_at', cutoff) \
+                .execute()
+        except Exception as e:
+            logger.warning(f"Could not query content_ready pins: {e}")
+            self._report_error('render', 'all', e, severity='high')
+            return []
+        return result.data or []
+
+    def _article_missing(self, item):
+        """True if a checkpointed article's HTML is not on disk (fresh checkout on re-run)."""
+        path = item.article.get('path')
+        return bool(path) and not Path(path).exists()
+
+    def plan(self):
+        """Work items for this run, restored from the checkpoint when resuming."""
+        items = []
+        if self.checkpoint.resumed:
+            for key in self.checkpoint.plan:
+                item = PinWorkItem.from_state(key, self.checkpoint.state(key), self.checkpoint.done(key))
+                item.brand = item.brand or key.split(':')[1]
+                if 'article' in item.done and self._article_missing(item):
+                    item.done.discard('article')
+                items.append(item)
+        else:
+            items = self._new_items()
+
+        known = {item.pin.get('id') for item in items if item.pin.get('id')}
+        for pin in self._backlog():
+            if pin.get('id') in known:
+                continue
+            key = f"pin:{pin['id']}"
+            item = PinWorkItem(key=key, brand=pin['brand'], pin=pin, done={'generate'})
+            if self.checkpoint.resumed and key in self.checkpoint.items:
+                item = PinWorkItem.from_state(key, self.checkpoint.state(key), self.checkpoint.done(key))
+            items.append(item)
+
+        self.checkpoint.set_plan([item.key for item in items])
+        return items
+
+    # ── stages ───────────────────────────────────────────────────────────────
+
+    def _report_error(self, stage, brand, error, severity='medium'):
+        if self._log_error:
+            self._log_error(STAGE_PHASE.get(stage, stage), brand, error, severity=severity)
+
+    def _generate(self, item):
+        brand = item.brand
+        services = self.services
+        pin_data = services.generate_content(brand, self.db, history=self.history)
+        tips = pin_data.get('tips', [])
+        board_id = services.board_id(brand, pin_data.get('board', ''))
+        row = {
+            'brand': brand,
+            'title': pin_data.get('title', ''),
+            'description': pin_data.get('description', ''),
+            'overlay_headline': pin_data.get('graphic_title', pin_data.get('title', ''))[:60],
+            'overlay_subtext': tips[0] if tips else '',
+            'tips': tips,
+            'pexels_search_term': pin_data.get('image_search_query', ''),
+            'board_id': board_id,
+            'destination_url': pin_data.get('destination_url', ''),
+            'topic': pin_data.get('topic', ''),
+            'niche': pin_data.get('category', ''),
+            'visual_style': pin_data.get('visual_style', ''),
+            'status': 'content_ready',
+        }
+        if self.dry_run:
+            logger.info(f"[{brand}] Content ready (dry run): {row['title'][:50]}")
+            return None
+
+        # Schema may be missing extended columns — the core-column fallback row
+        # is inserted instead. Run 002_fix_pinterest_pins_schema.sql to fix permanently.
+        core = ('brand', 'title', 'description', 'board_id', 'destination_url', 'status')
+        inserted = self.batch.wait(self.batch.insert(
+            'pinterest_pins', row, fallback={c: row[c] for c in core},
+        ))
+        services.log_history(pin_data, self.db, history=self.history)
+        logger.info(f"[{brand}] Content ready: {row['title'][:50]}")
+
+        if not inserted.get('id'):
+            # Can't track the row; leave it content_ready for the next run's backlog
+            logger.warning(f"[{brand}] Insert returned no id; pin deferred to the next run")
+            return None
+        item.pin = {**row, **inserted}
+        return item
+
+    def _render_params(self, pin):
+        search_term = pin.get('pexels_search_term') or pin.get('title', 'lifestyle photo')
+        # Use the visual style from content_brain instead of always 'gradient'
+        style = map_visual_style(pin['visual_style']) if pin.get('visual_style') else 'gradient'
+        # For list-based styles, format all tips as numbered items for the renderer
+        tips = pin.get('tips', []) or []
+        if style in ('numbered_list', 'checklist', 'comparison') and tips:
+            subheadline = ' '.join(f'{i+1}. {t}' for i, t in enumerate(tips[:5]))
+        else:
+            subheadline = pin.get('overlay_subtext') or ''
+        return {'search_term': search_term,
+                'headline': pin.get('overlay_headline') or pin.get('title', ''),
+                'subheadline': subheadline, 'style': style,
+                'topic': pin.get('topic') or pin.get('title', '') or search_term}
+
+    def _render_photo(self, brand, params):
+        """Pick an unused Pexels photo and render the brand template on it.
+
+        Returns (rendered bytes, dHash of the background photo). The photo is
+        hashed before compositing: the shared brand template would otherwise
+        decide most of the bits and make different photos look alike. The
+        hash is None when no photo could be downloaded.
+        """
+        image = self.services.pick_image(params['search_term'], brand, self.db, history=self.history)
+        background = self.services.fetch_background(image['url'], brand)
+        rendered = self._render_pool.submit(
+            self.services.render_template, brand, params['headline'], params['subheadline'], background,
+        ).result()
+        return rendered, compute_perceptual_hash(background) if background else None
+
+    def _render(self, item):
+        from video_automation.content_brain import check_image_hash_exists
+
+        pin, brand = item.pin, item.brand
+        # Claim the pin; a pin this run already claimed before a crash may
+        # still be 'rendering'. Anything else means another run has it.
+        claim_from = ('content_ready', 'rendering') if item.key in self.checkpoint.items else ('content_ready',)
+        try:
+            claimed = self.batch.wait(self.batch.transition(pin['id'], 'rendering', from_status=claim_from))
+        except Exception as e:
+            logger.warning(f"[{brand}] Could not mark pin {pin['id']} rendering: {e}")
+            claimed = True
+        if not claimed:
+            logger.info(f"[{brand}] Pin {pin['id']} was claimed by another run, skipping")
+            return None
+        params = item.render = self._render_params(pin)
+
+        try:
+            image_bytes = self.services.generate_ai_image(brand, params['topic'])
+            item.nb_used = True
+            phash = compute_perceptual_hash(image_bytes)  # before the text overlay
+            logger.info(f"[{brand}] Nano Banana: {len(image_bytes)} bytes generated")
+        except Exception as e:
+            logger.info(f"[{brand}] Nano Banana failed ({e}), falling back to Pexels+PIL")
+            item.nb_used = False
+            image_bytes, phash = self._render_photo(brand, params)
+            # Deduplication: re-pick and re-render. Perceptual match on the
+            # background photo catches re-encodes/crops of the same photo
+            # across brands and templates; exact SHA covers legacy rows.
+            for _ in range(DEDUP_RETRIES):
+                dup = self.phash_index.nearest(phash) if phash else None
+                if dup is None and not check_image_hash_exists(
+                        compute_image_hash(image_bytes), self.db, history=self.history):
+                    break
+                why = f"{dup[0]} bits from a {dup[2]['brand']} pin" if dup else 'exact hash'
+                logger.info(f"[{brand}] Duplicate image detected ({why}), retrying...")
+                image_bytes, phash = self._render_photo(brand, params)
+
+        pin['image_hash'] = compute_image_hash(image_bytes)
+        pin['image_phash'] = phash
+        path = self.checkpoint.artifact_path(f"{item.key}.{'png' if item.nb_used else 'jpg'}")
+        path.write_bytes(image_bytes)
+        item.image_path = str(path)
+        return item
+
+    def _upload(self, item):
+        pin, brand = item.pin, item.brand
+        image_bytes = Path(item.image_path).read_bytes()
+        # Apply brand template to Nano Banana AI images only; the Pexels path
+        # already rendered the full template (overlaying again ghosts the text).
+        if item.nb_used:
+            image_bytes = self.services.add_overlay(image_bytes, item.render['headline'], brand)
+
+        timestamp = datetime.now(timezone.utc).strftime('%Y%m%d_%H%M%S')
+        filename = f"{brand}_{pin['id']}_{timestamp}.{'png' if item.nb_used else 'jpg'}"
+        image_url = self.services.upload_image(image_bytes, filename)
+        self.history.mark_image_used(brand, image_hash=pin.get('image_hash'))
+        self.phash_index.add(pin.get('image_phash'), brand=brand, ref=str(pin['id']))
+
+        # image_phash (migration 006) and generated_image_url may not exist yet
+        applied = self.batch.wait(self.batch.transition(
+            pin['id'], 'ready', from_status=('rendering', 'content_ready'),
+            optional=('image_phash', 'generated_image_url'),
+            image_url=image_url, generated_image_url=image_url, image_phash=pin.get('image_phash'),
+        ))
+        if not applied:
+            raise RuntimeError(f"pin {pin['id']} changed status while rendering")
+        pin['image_url'] = image_url
+        logger.info(f"[{brand}] Rendered: {pin.get('title', '')[:50]}")
+        return item
+
+    def _article_path(self, brand, slug):
+        """Where save_and_register_article writes the HTML (mirrors its layout)."""
+        output_dir = self.services.site_config.get(brand, {}).get('output_dir', '')
+        workspace = os.environ.get('GITHUB_WORKSPACE', str(Path(__file__).resolve().parent.parent))
+        return os.path.join(workspace, output_dir, f'{slug}.html')
+
+    def _set_destination(self, item, url, generated):
+        item.pin['destination_url'] = url
+        try:
+            self.batch.wait(self.batch.transition(
+                item.pin['id'], None, destination_url=url, article_generated=generated,
+            ))
+        except Exception:
+            pass
+
+    def _article(self, item):
+        pin, brand = item.pin, item.brand
+        services = self.services
+        pin_data = {
+            'title': pin.get('title', ''),
+            'description': pin.get('description', ''),
+            'topic': pin.get('topic', '') or pin.get('niche', ''),
+            'trending_topic': pin.get('topic', ''),
+            'destination_url': pin.get('destination_url', ''),
+            'image_url': pin.get('image_url', ''),
+            'board': pin.get('board_id', ''),
+            'pexels_search_term': pin.get('pexels_search_term', '') or pin.get('title', ''),
+            'tips': pin.get('tips', []) or pin.get('tips_list', []) or [],
+            'category': pin.get('category', ''),
+        }
+        base_url = services.site_config.get(brand, {}).get('base_url', '')
+
+        # Try article generation with one retry on failure
+        for attempt in range(2):
+            try:
+                slug, article_md = services.generate_article(brand, pin_data, self.db)
+                if slug and article_md:
+                    html = services.article_to_html(article_md, brand, slug, pin_data)
+                    article_url = services.save_article(html, brand, slug, pin_data, self.db)
+                    self._set_destination(item, article_url, True)
+                    item.article = {'slug': slug, 'url': article_url, 'generated': True,
+                                    'path': self._article_path(brand, slug)}
+                    logger.info(f"[{brand}] Article → {article_url}")
+                    return item
+                if slug:
+                    article_url = f'{base_url}/articles/{slug}.html'
+                    self._set_destination(item, article_url, True)
+                    item.article = {'slug': slug, 'url': article_url, 'generated': False}
+                    logger.info(f"[{brand}] Article exists: {article_url}")
+                    return item
+                logger.info(f"[{brand}] No topic/slug (attempt {attempt + 1})")
+            except Exception as e:
+                logger.warning(f"[{brand}] Article attempt {attempt + 1} failed: {e}")
+                if attempt == 1:
+                    self._report_error('article', brand, e)
+
+        # Both attempts failed — fall back to /articles/ index, NOT homepage
+        fallback_url = f'{base_url}/articles/' if base_url else ''
+        self._set_destination(item, fallback_url, False)
+        item.article = {'url': fallback_url, 'generated': False}
+        logger.warning(f"[{brand}] Article generation failed — falling back to: {fallback_url}")
+        self._report_error(
+            'article', brand,
+            f"Article gen failed after 2 attempts for pin {pin.get('id', '?')}. Fallback: {fallback_url}",
+            severity='high',
+        )
+        return item
+
+    def _on_generate_error(self, item, error):
+        self._report_error('generate', item.brand, error, severity='high')
+
+    def _on_render_error(self, item, error):
+        """Log a render/upload failure and put the pin back to content_ready."""
+        self._report_error('render', item.brand, error)
+        if not item.pin.get('id'):
+            return
+        try:
+            self.batch.wait(self.batch.transition(item.pin['id'], 'content_ready', from_status='rendering'))
+        except Exception:
+            pass
+
+    def stages(self):
+        stages = [
+            Stage('generate', self._generate, self.workers['generate'], self._on_generate_error),
+            Stage('render', self._render, self.workers['render'], self._on_render_error),
+            Stage('upload', self._upload, self.workers['upload'], self._on_render_error),
+        ]
+        if self.articles:
+            stages.append(Stage('article', self._article, self.workers['article']))
+        return stages
+
+    # ── run ──────────────────────────────────────────────────────────────────
+
+    def run(self, items=None) -> PinRunResult:
+        """Run every planned item through the stages and collect the results."""
+        items = self.plan() if items is None else items
+        self.checkpoint.prune()
+        logger.info(f"Pin pipeline {self.checkpoint.run_id}: {len(items)} item(s), workers {self.workers}")
+
+        from video_automation.pin_batch_renderer import default_workers as render_processes
+
+        pool_cls = ProcessPoolExecutor if self.render_processes else ThreadPoolExecutor
+        with pool_cls(max_workers=min(render_processes(), self.workers['render'])) as self._render_pool:
+            report = StagePipeline(self.stages(), queue_size=self.queue_size,
+                                   checkpoint=self.checkpoint).run(items)
+
+        ready = [item for item in report.completed if item.pin.get('image_url')]
+        result = PinRunResult(
+            rendered_pins=[item.pin for item in ready],
+            articles_generated=[f"{item.brand}: {item.article['slug']}" for item in ready
+                                if item.article.get('generated')],
+            picked_up=[item.pin for item in items
+                       if item.pin.get('id') and 'generate' in item.done],
+            report=report,
+        )
+        logger.info(f"Pin pipeline timings: {report.summary()}")
+        return result
@@ -0,0 +1,360 @@
+"""In-memory Supabase and simulated services for running the pin pipeline locally.
+
+FakeSupabase implements the slice of the supabase-py query builder the
+content engine uses (select/eq/in_/gte/gt/order/limit/range/not_.is_,
+insert/update/upsert, count='exact') plus the transition_pinterest_pins RPC
+(migration 007); rows live in plain dicts and inserts get an id and
+created_at like the real tables.
+
+fake_services() returns PinServices whose calls sleep for a configurable
+latency instead of hitting Gemini, Pexels or Storage, so stage overlap and
+worker counts can be benchmarked without credentials:
+
+    python -m pin_pipeline --fake --pins-per-brand 4 --compare
+"""
+
+import itertools
+import threading
+import time
+from datetime import datetime, timezone
+from io import BytesIO
+from pathlib import Path
+
+from pin_pipeline.engine import PinServices
+
+FAKE_BRANDS = ('fitness', 'deals', 'menopause')
+
+
+# ═══════════════════════════════════════════════════════════════
+# FAKE SUPABASE
+# ═══════════════════════════════════════════════════════════════
+
+class FakeResult:
+    def __init__(self, data, count=None):
+        self.data = data
+        self.count = count
+
+
+class _Not:
+    def __init__(self, query):
+        self._query = query
+
+    def is_(self, column, value):
+        return self._query._filter(lambda r: not _is(r.get(column), value))
+
+
+def _is(actual, value):
+    return actual is None if value == 'null' else actual == value
+
+
+class FakeQuery:
+    """Chainable query against one FakeSupabase table."""
+
+    def __init__(self, db, table):
+        self.db = db
+        self.table = table
+        self._filters = []
+        self._order = []
+        self._slice = None
+        self._count = None
+        self._write = None  # ('insert'|'update'|'upsert', payload)
+
+    def _filter(self, predicate):
+        self._filters.append(predicate)
+        return self
+
+    def select(self, columns='*', count=None):
+        self._count = count
+        return self
+
+    def eq(self, column, value):
+        return self._filter(lambda r: r.get(column) == value)
+
+    def neq(self, column, value):
+        return self._filter(lambda r: r.get(column) != value)
+
+    def in_(self, column, values):
+        values = list(values)
+        return self._filter(lambda r: r.get(column) in values)
+
+    def gte(self, column, value):
+        return self._filter(lambda r: r.get(column) is not None and r.get(column) >= value)
+
+    def gt(self, column, value):
+        return self._filter(lambda r: r.get(column) is not None and r.get(column) > value)
+
+    def lt(self, column, value):
+        return self._filter(lambda r: r.get(column) is not None and r.get(column) < value)
+
+    def is_(self, column, value):
+        return self._filter(lambda r: _is(r.get(column), value))
+
+    @property
+    def not_(self):
+        return _Not(self)
+
+    def order(self, column, desc=False):
+        self._order.append((column, desc))
+        return self
+
+    def limit(self, n):
+        self._slice = (0, n)
+        return self
+
+    def range(self, start, end):
+        self._slice = (start, end + 1)
+        return self
+
+    def insert(self, rows):
+        self._write = ('insert', rows)
+        return self
+
+    def update(self, values):
+        self._write = ('update', values)
+        return self
+
+    def upsert(self, rows, on_conflict=''):
+        self._write = ('upsert', (rows, [c.strip() for c in on_conflict.split(',') if c.strip()]))
+        return self
+
+    def execute(self):
+        if self.db.latency:
+            time.sleep(self.db.latency)
+        with self.db.lock:
+            self.db.calls.append((self.table, self._write[0] if self._write else 'select'))
+            rows = self.db.tables.setdefault(self.table, [])
+            if self._write:
+                return FakeResult(self._apply_write(rows))
+            matched = [r for r in rows if all(f(r) for f in self._filters)]
+            for column, desc in reversed(self._order):
+                matched.sort(key=lambda r: (r.get(column) is None, r.get(column) or ''), reverse=desc)
+            count = len(matched) if self._count else None
+            if self._slice:
+                matched = matched[self._slice[0]:self._slice[1]]
+            return FakeResult([dict(r) for r in matched], count)
+
+    def _check_columns(self, values):
+        unknown = set(values) - self.db.columns.get(self.table, set(values))
+        if unknown:
+            raise RuntimeError(f"column {sorted(unknown)[0]} does not exist")
+
+    def _apply_write(self, rows):
+        kind, payload = self._write
+        if kind == 'update':
+            changed = []
+            for row in rows:
+                if all(f(row) for f in self._filters):
+                    self._check_columns(payload)
+                    row.update(payload)
+                    changed.append(dict(row))
+            return changed
+        if kind == 'upsert':
+            payload, keys = payload
+            for new in payload if isinstance(payload, list) else [payload]:
+                existing = next((r for r in rows if keys and all(r.get(k) == new.get(k) for k in keys)), None)
+                if existing:
+                    existing.update(new)
+                else:
+                    rows.append(self.db.stamp(new))
+            return []
+        payload = payload if isinstance(payload, list) else [payload]
+        for row in payload:
+            self._check_columns(row)
+        return [dict(self.db.stamp(row, rows)) for row in payload]
+
+
+class _FakeRpc:
+    def __init__(self, db, name, params):
+        self.db = db
+        self.name = name
+        self.params = params
+
+    def execute(self):
+        if self.db.latency:
+            time.sleep(self.db.latency)
+        with self.db.lock:
+            self.db.calls.append((self.name, 'rpc'))
+            if self.name not in self.db.functions:
+                raise RuntimeError(f"Could not find the function public.{self.name}")
+            return FakeResult(self.db.functions[self.name](**self.params))
+
+
+class FakeSupabase:
+    """In-memory stand-in for a supabase-py Client.
+
+    tables: initial rows per table. columns: optional per-table column sets;
+    updates naming other columns raise like PostgREST does (to exercise the
+    schema fallbacks). latency: seconds slept per query. rpc=False leaves
+    out the SQL functions, as on a database without migration 007.
+    """
+
+    def __init__(self, tables=None, columns=None, latency=0.0, rpc=True):
+        self.tables = {name: [dict(r) for r in rows] for name, rows in (tables or {}).items()}
+        self.columns = columns or {}
+        self.latency = latency
+        self.lock = threading.RLock()
+        self.calls = []
+        self._ids = itertools.count(1)
+        self.functions = {'transition_pinterest_pins': self._transition_pins} if rpc else {}
+
+    @property
+    def client(self):
+        """So a FakeSupabase can stand in for database.supabase_client's wrapper too."""
+        return self
+
+    def table(self, name):
+        return FakeQuery(self, name)
+
+    def rpc(self, name, params):
+        return _FakeRpc(self, name, params)
+
+    def _transition_pins(self, p_changes):
+        """Same semantics as the SQL function in 007_pin_transitions.sql."""
+        applied = []
+        for change in p_changes:
+            for row in self.tables.get('pinterest_pins', []):
+                if row.get('id') != change['id']:
+                    continue
+                if change['from_status'] is not None and row.get('status') not in change['from_status']:
+                    continue
+                if change['to_status'] is not None:
+                    row['status'] = change['to_status']
+                row.update(change['v'])
+                applied.append({'id': row['id']})
+        return applied
+
+    def stamp(self, row, rows=None):
+        row = dict(row)
+        row.setdefault('id', next(self._ids))
+        row.setdefault('created_at', datetime.now(timezone.utc).isoformat())
+        if rows is not None:
+            rows.append(row)
+        return row
+
+    def rows(self, table, **equals):
+        return [dict(r) for r in self.tables.get(table, [])
+                if all(r.get(k) == v for k, v in equals.items())]
+
+
+# ═══════════════════════════════════════════════════════════════
+# FAKE SERVICES
+# ═══════════════════════════════════════════════════════════════
+
+def fake_photo(seed, size=(500, 750)):
+    """Deterministic smooth 'photo' JPEG; different seeds hash far apart."""
+    import numpy as np
+    from PIL import Image
+
+    rng = np.random.default_rng(seed)
+    small = rng.integers(0, 255, (6, 4, 3), dtype=np.uint8)
+    out = BytesIO()
+    Image.fromarray(small).resize(size, Image.BICUBIC).save(out, 'JPEG', quality=85)
+    return out.getvalue()
+
+
+def fake_render(brand, headline, subheadline, image_bytes, cpu_seconds=0.0):
+    """Brand-template stand-in: re-encode the background at pin size (picklable)."""
+    from PIL import Image, ImageDraw
+
+    deadline = time.perf_counter() + cpu_seconds
+    while time.perf_counter() < deadline:  # simulate CPU-bound compose
+        pass
+    img = Image.open(BytesIO(image_bytes)).convert('RGB') if image_bytes else Image.new('RGB', (1000, 1500))
+    img = img.resize((1000, 1500))
+    ImageDraw.Draw(img).rectangle([0, 1400, 1000, 1500], fill=(0, 0, 0))
+    out = BytesIO()
+    img.save(out, 'JPEG', quality=85)
+    return out.getvalue()
+
+
+class _FakeRender:
+    """Picklable fake_render with a fixed CPU cost (for process pools)."""
+
+    def __init__(self, cpu_seconds):
+        self.cpu_seconds = cpu_seconds
+
+    def __call__(self, brand, headline, subheadline, image_bytes):
+        return fake_render(brand, headline, subheadline, image_bytes, self.cpu_seconds)
+
+
+def fake_services(article_dir, llm=0.3, network=0.1, cpu=0.05, ai_images=False):
+    """PinServices with simulated latencies (seconds) and no external calls.
+
+    llm: per content/article generation; network: per photo pick, download
+    and upload; cpu: busy-wait per template render. ai_images=False makes
+    every pin take the Pexels+template path.
+    """
+    article_dir = Path(article_dir)
+    counter = itertools.count(1)
+    lock = threading.Lock()
+
+    def next_id():
+        with lock:
+            return next(counter)
+
+    def generate_content(brand, supabase_client, history=None):
+        time.sleep(llm)
+        n = next_id()
+        return {
+            'brand': brand, 'title': f'{brand.title()} tip #{n}', 'description': f'Fake description {n}',
+            'graphic_title': f'Tip {n}', 'tips': [f'tip {n}a', f'tip {n}b'],
+            'image_search_query': f'{brand} photo', 'board': 'Main',
+            'destination_url': f'https://example.com/{brand}', 'topic': f'{brand} topic {n}',
+            'category': 'fake', 'visual_style': 'bold_text',
+        }
+
+    def log_history(pin_data, supabase_client, history=None):
+        row = {'brand': pin_data.get('brand', ''), 'topic': pin_data.get('topic', ''),
+               'title': pin_data.get('title', '')}
+        supabase_client.table('content_history').insert(row).execute()
+        if history is not None:
+            history.record(row)
+
+    def generate_ai_image(brand, topic):
+        if not ai_images:
+            raise RuntimeError('AI images disabled')
+        time.sleep(llm)
+        return fake_photo(next_id())
+
+    def pick_image(search_term, brand, supabase_client, history=None):
+        time.sleep(network)
+        n = next_id()
+        if history is not None:
+            history.mark_image_used(brand, image_id=n)
+        return {'id': n, 'url': f'https://images.example.com/{n}.jpg'}
+
+    def fetch_background(url, brand=''):
+        time.sleep(network)
+        return fake_photo(int(url.rsplit('/', 1)[-1].split('.')[0]))
+
+    def upload_image(image_bytes, filename):
+        time.sleep(network)
+        return f'https://storage.example.com/{filename}'
+
+    def generate_article(brand, pin_data, supabase_client):
+        time.sleep(llm)
+        slug = f"{brand}-{pin_data['title'].lower().replace(' ', '-').replace('#', '')}"
+        return slug, f"# {pin_data['title']}\n\n{pin_data['description']}"
+
+    def save_article(html, brand, slug, pin_data, supabase_client):
+        path = article_dir / brand / f'{slug}.html'
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(html)
+        return f'https://{brand}.example.com/articles/{slug}.html'
+
+    return PinServices(
+        generate_content=generate_content,
+        log_history=log_history,
+        board_id=lambda brand, board: f'{brand}-board',
+        generate_ai_image=generate_ai_image,
+        pick_image=pick_image,
+        fetch_background=fetch_background,
+        render_template=_FakeRender(cpu),
+        add_overlay=lambda image_bytes, headline, brand: image_bytes,
+        upload_image=upload_image,
+        generate_article=generate_article,
+        article_to_html=lambda md, brand, slug, pin_data: f'<html><body>{md}</body></html>',
+        save_article=save_article,
+        site_config={b: {'base_url': f'https://{b}.example.com',
+                         'output_dir': str(article_dir / b)} for b in FAKE_BRANDS},
+    )
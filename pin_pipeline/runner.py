@@ -0,0 +1,163 @@
+"""Generic staged runner: bounded queues between stages, a worker pool per stage.
+
+Items flow through an ordered list of Stages. Each stage has its own thread
+pool and reads from a bounded queue, so a slow stage applies back-pressure
+upstream instead of letting work pile up in memory, and every stage is busy
+at the same time once the pipeline fills.
+
+Each item carries the names of the stages it has already completed (restored
+from a Checkpoint on resume), and enters the pipeline at the first stage it
+has not finished. A stage that raises drops the item and calls the stage's
+on_error hook; one bad item never stops the run.
+
+Usage:
+    pipeline = StagePipeline([
+        Stage('generate', generate, workers=4),
+        Stage('render', render, workers=2, on_error=revert),
+    ], checkpoint=checkpoint)
+    report = pipeline.run(items)
+"""
+
+import logging
+import queue
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_QUEUE_SIZE = 8
+_STOP = object()
+
+
+@dataclass
+class Stage:
+    """One pipeline step.
+
+    func(item) returns the item to hand downstream, or None to finish the
+    item early (e.g. a dry run that stops after generation).
+    """
+
+    name: str
+    func: Callable[[Any], Any]
+    workers: int = 1
+    on_error: Optional[Callable[[Any, Exception], None]] = None
+
+
+@dataclass
+class PipelineReport:
+    """Outcome of StagePipeline.run.
+
+    completed — items that left the last stage (or finished early)
+    failed    — (item, stage name, error) for items a stage raised on
+    busy      — seconds each stage's workers spent inside func, summed
+    counts    — items each stage processed successfully
+    wall      — seconds from start to the last worker exiting
+    """
+
+    completed: List[Any] = field(default_factory=list)
+    failed: List[Tuple[Any, str, Exception]] = field(default_factory=list)
+    busy: Dict[str, float] = field(default_factory=dict)
+    counts: Dict[str, int] = field(default_factory=dict)
+    wall: float = 0.0
+
+    def summary(self) -> Dict[str, Any]:
+        """Flat dict for logging."""
+        out = {'completed': len(self.completed), 'failed': len(self.failed),
+               'wall': round(self.wall, 3)}
+        for name, seconds in self.busy.items():
+            out[f'{name}_n'] = self.counts.get(name, 0)
+            out[f'{name}_busy'] = round(seconds, 3)
+        return out
+
+
+class StagePipeline:
+    """Run items through stages concurrently; see the module docstring."""
+
+    def __init__(self, stages, queue_size=DEFAULT_QUEUE_SIZE, checkpoint=None,
+                 key=lambda item: item.key, done=lambda item: item.done):
+        self.stages = list(stages)
+        self.queue_size = queue_size
+        self.checkpoint = checkpoint
+        self._key = key
+        self._done = done
+
+    def _entry(self, item):
+        """Index of the first stage item has not completed (len(stages) if none)."""
+        done = self._done(item)
+        for i, stage in enumerate(self.stages):
+            if stage.name not in done:
+                return i
+        return len(self.stages)
+
+    def run(self, items) -> PipelineReport:
+        report = PipelineReport(busy={s.name: 0.0 for s in self.stages},
+                                counts={s.name: 0 for s in self.stages})
+        lock = threading.Lock()
+        queues = [queue.Queue(maxsize=self.queue_size) for _ in self.stages]
+        started = time.perf_counter()
+
+        def work(index):
+            stage = self.stages[index]
+            inbox = queues[index]
+            while True:
+                item = inbox.get()
+                if item is _STOP:
+                    return
+                t0 = time.perf_counter()
+                try:
+                    result = stage.func(item)
+                except Exception as e:
+                    with lock:
+                        report.busy[stage.name] += time.perf_counter() - t0
+                        report.failed.append((item, stage.name, e))
+                    logger.warning(f"[{stage.name}] {self._key(item)} failed: {e}")
+                    if stage.on_error:
+                        try:
+                            stage.on_error(item, e)
+                        except Exception as hook_error:
+                            logger.warning(f"[{stage.name}] on_error hook failed: {hook_error}")
+                    continue
+                with lock:
+                    report.busy[stage.name] += time.perf_counter() - t0
+                    report.counts[stage.name] += 1
+                if result is None:
+                    with lock:
+                        report.completed.append(item)
+                    continue
+                self._done(result).add(stage.name)
+                if self.checkpoint is not None:
+                    self.checkpoint.record(self._key(result), result)
+                if index + 1 < len(self.stages):
+                    queues[index + 1].put(result)
+                else:
+                    with lock:
+                        report.completed.append(result)
+
+        pools = []
+        for index, stage in enumerate(self.stages):
+            threads = [threading.Thread(target=work, args=(index,), daemon=True,
+                                        name=f'{stage.name}-{n}')
+                       for n in range(max(1, stage.workers))]
+            for t in threads:
+                t.start()
+            pools.append(threads)
+
+        for item in items:
+            entry = self._entry(item)
+            if entry == len(self.stages):
+                report.completed.append(item)  # finished in an earlier attempt
+            else:
+                queues[entry].put(item)
+
+        # Stage i only receives from the feeder and stage i-1, so once both
+        # are finished its queue can be closed.
+        for index, threads in enumerate(pools):
+            for _ in threads:
+                queues[index].put(_STOP)
+            for t in threads:
+                t.join()
+
+        report.wall = time.perf_counter() - started
+        return report
@@ -1,16 +1,22 @@
 #!/usr/bin/env python3
 """Add contextual internal links between articles within each brand site.
 
-Scans all HTML articles per brand, builds a keyword-to-article relevance map,
-then inserts 3-5 inline links per article using descriptive anchor text.
-Uses relative paths (same /articles/ directory). Skips existing links.
+Ranks related articles per brand with the cached TF-IDF index in
+utils/related_articles.py (title, slug and body text; only changed articles
+are re-parsed), then inserts 3-5 inline links per article using descriptive
+anchor text. Uses relative paths (same /articles/ directory). Skips existing links.
 """
 
 import os
 import re
+import sys
 import argparse
 from pathlib import Path
-from collections import Counter
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from utils.related_articles import RelatedArticleIndex
+from utils.site_build import BuildGraph, deps_digest, write_if_changed
 
 BRANDS = {
     'fitness': 'outputs/fitover35-website/articles',
@@ -18,92 +24,6 @@ BRANDS = {
     'menopause': 'outputs/menopause-planner-website/articles',
 }
 
-# Stop words to exclude from keyword extraction
-STOP_WORDS = {
-    'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for',
-    'of', 'with', 'by', 'from', 'is', 'are', 'was', 'were', 'be', 'been',
-    'being', 'have', 'has', 'had', 'do', 'does', 'did', 'will', 'would',
-    'could', 'should', 'may', 'might', 'shall', 'can', 'need', 'dare',
-    'that', 'this', 'these', 'those', 'i', 'me', 'my', 'we', 'our', 'you',
-    'your', 'he', 'him', 'his', 'she', 'her', 'it', 'its', 'they', 'them',
-    'their', 'what', 'which', 'who', 'whom', 'when', 'where', 'why', 'how',
-    'all', 'each', 'every', 'both', 'few', 'more', 'most', 'other', 'some',
-    'such', 'no', 'not', 'only', 'own', 'same', 'so', 'than', 'too', 'very',
-    'just', 'because', 'as', 'if', 'then', 'else', 'about', 'up', 'out',
-    'into', 'over', 'after', 'before', 'between', 'under', 'again', 'here',
-    'there', 'once', 'during', 'while', 'also', 'still', 'new', 'old',
-    'best', 'top', 'good', 'great', 'really', 'actually', 'vs', 'guide',
-    'tips', 'ways', 'things', 'men', 'women', '2024', '2025', '2026',
-}
-
-
-def extract_keywords_from_title(title):
-    """Extract meaningful keywords from an article title."""
-    # Remove brand suffixes
-    title = re.sub(r'\s*[—\-|]\s*(FitOver35|Daily Deal Darling|The Menopause Planner).*$', '', title, flags=re.IGNORECASE)
-    # Split into words, lowercase, remove non-alpha
-    words = re.findall(r'[a-z]+', title.lower())
-    # Filter stop words and short words
-    return [w for w in words if w not in STOP_WORDS and len(w) > 2]
-
-
-def extract_keywords_from_filename(filename):
-    """Extract keywords from the filename (slug)."""
-    name = filename.replace('.html', '').replace('.md', '')
-    words = name.split('-')
-    return [w for w in words if w not in STOP_WORDS and len(w) > 2]
-
-
-def get_article_data(articles_dir):
-    """Read all HTML files, extract titles and keywords."""
-    articles = {}
-    for f in sorted(Path(articles_dir).glob('*.html')):
-        try:
-            content = f.read_text(encoding='utf-8', errors='ignore')
-            title_match = re.search(r'<title>(.*?)</title>', content, re.IGNORECASE)
-            if title_match:
-                raw_title = title_match.group(1).strip()
-                # Clean title: remove brand suffix for display
-                clean_title = re.sub(
-                    r'\s*[—\-|]\s*(FitOver35|Daily Deal Darling|The Menopause Planner).*$',
-                    '', raw_title, flags=re.IGNORECASE
-                ).strip()
-                keywords = set(extract_keywords_from_title(raw_title) +
-                              extract_keywords_from_filename(f.name))
-                articles[f.name] = {
-                    'title': clean_title,
-                    'keywords': keywords,
-                    'path': str(f),
-                }
-        except Exception as e:
-            print(f"  Warning: Could not read {f.name}: {e}")
-    return articles
-
-
-def score_relevance(article_keywords, candidate_keywords):
-    """Score how related two articles are based on keyword overlap."""
-    if not article_keywords or not candidate_keywords:
-        return 0
-    overlap = article_keywords & candidate_keywords
-    # Score = number of shared keywords, weighted by specificity
-    return len(overlap)
-
-
-def find_related_articles(current_filename, current_keywords, all_articles, max_results=8):
-    """Find the most contextually related articles for a given article."""
-    scores = []
-    for filename, data in all_articles.items():
-        if filename == current_filename:
-            continue
-        score = score_relevance(current_keywords, data['keywords'])
-        if score > 0:
-            scores.append((filename, score, data))
-
-    # Sort by relevance score (descending), then alphabetically for stability
-    scores.sort(key=lambda x: (-x[1], x[0]))
-    return scores[:max_results]
-
-
 def get_body_content(html):
     """Extract body content from HTML, avoiding head/script/style."""
     body_match = re.search(r'<body[^>]*>(.*?)</body>', html, re.IGNORECASE | re.DOTALL)
@@ -112,6 +32,14 @@ def get_body_content(html):
     return html
 
 
+PARAGRAPH_RE = re.compile(r'(<p[^>]*>)(.*?)(</p>)', re.DOTALL | re.IGNORECASE)
+TEXT_DIV_RE = re.compile(r'(<div\s+class="(?:bottom-line|ba-text|faq-a)"[^>]*>)(.*?)(</div>)',
+                         re.DOTALL | re.IGNORECASE)
+ANCHOR_OPEN_RE = re.compile(r'<a\s', re.IGNORECASE)
+ARTICLE_LINK_RE = re.compile(r'<a\s+href="[^"]*\.html"', re.IGNORECASE)
+BODY_SPLIT_RE = re.compile(r'(<body[^>]*>)(.*?)(</body>)', re.IGNORECASE | re.DOTALL)
+
+
 def find_safe_insertion_points(body_html):
     """Find <p> tags, .verdict p, .bottom-line, .faq-a, .ba-text, and other
     text-containing elements that are safe for link insertion.
@@ -122,14 +50,14 @@ def find_safe_insertion_points(body_html):
     points = []
 
     # Find all <p> tags with content (the primary target)
-    for m in re.finditer(r'(<p[^>]*>)(.*?)(</p>)', body_html, re.DOTALL | re.IGNORECASE):
+    for m in PARAGRAPH_RE.finditer(body_html):
         tag_open = m.group(1)
         inner = m.group(2)
         tag_close = m.group(3)
         # Skip if it's a very short snippet or already contains many links
         if len(inner.strip()) < 40:
             continue
-        existing_links = len(re.findall(r'<a\s', inner, re.IGNORECASE))
+        existing_links = len(ANCHOR_OPEN_RE.findall(inner))
         if existing_links >= 2:
             continue
         points.append({
@@ -143,12 +71,11 @@ def find_safe_insertion_points(body_html):
         })
 
     # Also target verdict paragraphs and bottom-line divs
-    for m in re.finditer(r'(<div\s+class="(?:bottom-line|ba-text|faq-a)"[^>]*>)(.*?)(</div>)',
-                         body_html, re.DOTALL | re.IGNORECASE):
+    for m in TEXT_DIV_RE.finditer(body_html):
         inner = m.group(2)
         if len(inner.strip()) < 40:
             continue
-        existing_links = len(re.findall(r'<a\s', inner, re.IGNORECASE))
+        existing_links = len(ANCHOR_OPEN_RE.findall(inner))
         if existing_links >= 2:
             continue
         points.append({
@@ -227,33 +154,52 @@ def insert_link_in_text(text, anchor_text, href, title):
     return text[:insert_pos] + link_html + text[insert_pos:], True
 
 
-def add_links_to_article(filepath, all_articles, max_links=5):
-    """Add contextual internal links to an article. Returns count of links added."""
+def add_links_to_article(filepath, index, max_links=5, graph=None):
+    """Add contextual internal links to an article. Returns count of links added.
+
+    With a build graph, an article is skipped without being read when neither
+    it nor its related-article list changed since the last run.
+    """
+    # Find related articles ranked by TF-IDF similarity
+    related = index.related(Path(filepath).name, k=10)
+    deps = deps_digest(max_links, [(name, data['title']) for name, _, data in related])
+    if graph is not None and graph.is_fresh(filepath, deps):
+        return 0
+
     try:
         content = Path(filepath).read_text(encoding='utf-8', errors='ignore')
     except Exception as e:
         print(f"  Error reading {filepath}: {e}")
         return 0
 
-    current_filename = Path(filepath).name
-    current_data = all_articles.get(current_filename)
-    if not current_data:
+    new_content, links_added = link_related_articles(content, related, max_links)
+    try:
+        if links_added and graph is not None:
+            graph.write(filepath, new_content, deps)
+        elif links_added:
+            write_if_changed(filepath, new_content)
+        elif graph is not None:
+            graph.record(filepath, deps)
+    except Exception as e:
+        print(f"  Error writing {filepath}: {e}")
         return 0
+    return links_added
 
+
+def link_related_articles(content, related, max_links=5):
+    """Insert links to `related` articles into an article's HTML.
+
+    Returns (html, links_added); html is unchanged when nothing was added.
+    """
     # Count existing internal links (to other articles in same directory)
-    existing_internal_links = len(re.findall(r'<a\s+href="[^"]*\.html"', content, re.IGNORECASE))
+    existing_internal_links = len(ARTICLE_LINK_RE.findall(content))
     if existing_internal_links >= max_links:
-        return 0
+        return content, 0
 
     links_remaining = max_links - existing_internal_links
 
-    # Find related articles ranked by relevance
-    related = find_related_articles(
-        current_filename, current_data['keywords'], all_articles, max_results=10
-    )
-
     if not related:
-        return 0
+        return content, 0
 
     # Filter out articles already linked in this page
     candidates = []
@@ -262,12 +208,12 @@ def add_links_to_article(filepath, all_articles, max_links=5):
             candidates.append((filename, score, data))
 
     if not candidates:
-        return 0
+        return content, 0
 
     # Get body section to work with
-    body_match = re.search(r'(<body[^>]*>)(.*?)(</body>)', content, re.IGNORECASE | re.DOTALL)
+    body_match = BODY_SPLIT_RE.search(content)
     if not body_match:
-        return 0
+        return content, 0
 
     body_before = content[:body_match.start(2)]
     body_html = body_match.group(2)
@@ -277,7 +223,7 @@ def add_links_to_article(filepath, all_articles, max_links=5):
     insertion_points = find_safe_insertion_points(body_html)
 
     if not insertion_points:
-        return 0
+        return content, 0
 
     links_added = 0
     used_points = set()  # Track which insertion points we've used
@@ -319,19 +265,16 @@ def add_links_to_article(filepath, all_articles, max_links=5):
                     links_added += 1
                     break
 
-    if links_added > 0:
-        new_content = body_before + body_html + body_after
-        try:
-            Path(filepath).write_text(new_content, encoding='utf-8')
-        except Exception as e:
-            print(f"  Error writing {filepath}: {e}")
-            return 0
+    if links_added == 0:
+        return content, 0
+    return body_before + body_html + body_after, links_added
 
-    return links_added
 
+def update_sitemap(sitemap_path, articles_dir, base_url, index=None):
+    """Regenerate sitemap with all articles and fresh lastmod dates.
 
-def update_sitemap(sitemap_path, articles_dir, base_url):
-    """Regenerate sitemap with all articles and fresh lastmod dates."""
+    Article filenames come from the related-articles index when one is passed.
+    """
     from datetime import date
     today = date.today().isoformat()
 
@@ -372,9 +315,11 @@ def update_sitemap(sitemap_path, articles_dir, base_url):
 
     # Add all HTML articles
     article_count = 0
-    for f in sorted(Path(articles_dir).glob('*.html')):
+    names = list(index.articles) if index is not None else \
+        [f.name for f in sorted(Path(articles_dir).glob('*.html'))]
+    for name in names:
         article_count += 1
-        loc = f"{base_url}/articles/{f.name}"
+        loc = f"{base_url}/articles/{name}"
         lines.append('  <url>')
         lines.append(f'    <loc>{loc}</loc>')
         lines.append(f'    <lastmod>{today}</lastmod>')
@@ -384,7 +329,7 @@ def update_sitemap(sitemap_path, articles_dir, base_url):
 
     lines.append('</urlset>')
 
-    Path(sitemap_path).write_text('\n'.join(lines) + '\n', encoding='utf-8')
+    write_if_changed(sitemap_path, '\n'.join(lines) + '\n')
     print(f"  Sitemap updated: {article_count} articles, lastmod={today}")
 
 
@@ -426,6 +371,7 @@ def main():
         },
     }
 
+    graph = BuildGraph.load('internal_links')
     grand_total = 0
     for brand, articles_dir in brands_to_process.items():
         if not os.path.exists(articles_dir):
@@ -436,26 +382,28 @@ def main():
         print(f"Processing {brand} ({articles_dir})")
         print(f"{'='*60}")
 
-        # Build article index for this brand
-        all_articles = get_article_data(articles_dir)
-        print(f"  Indexed {len(all_articles)} articles")
+        # Build (or incrementally refresh) the related-article index for this brand
+        index = RelatedArticleIndex.open(articles_dir)
+        print(f"  Indexed {len(index)} articles")
 
-        if len(all_articles) < 2:
+        if len(index) < 2:
             print(f"  Not enough articles to link")
             continue
 
         # Process each article
         total_links = 0
         articles_modified = 0
-        for filepath in sorted(Path(articles_dir).glob('*.html')):
-            links = add_links_to_article(filepath, all_articles, max_links=args.max_links)
+        article_paths = sorted(Path(articles_dir).glob('*.html'))
+        graph.prune(articles_dir, article_paths)
+        for filepath in article_paths:
+            links = add_links_to_article(filepath, index, max_links=args.max_links, graph=graph)
             if links > 0:
                 print(f"  +{links} links: {filepath.name}")
                 total_links += links
                 articles_modified += 1
 
         print(f"\n  Summary for {brand}:")
-        print(f"    Articles processed: {len(all_articles)}")
+        print(f"    Articles processed: {len(index)}")
         print(f"    Articles modified:  {articles_modified}")
         print(f"    Total links added:  {total_links}")
         grand_total += total_links
@@ -463,7 +411,10 @@ def main():
         # Update sitemap if requested
         if args.update_sitemaps and brand in SITEMAP_CONFIG:
             cfg = SITEMAP_CONFIG[brand]
-            update_sitemap(cfg['sitemap'], articles_dir, cfg['base_url'])
+            index.refresh()  # pick up the articles just rewritten
+            update_sitemap(cfg['sitemap'], articles_dir, cfg['base_url'], index=index)
+
+    graph.save()
 
     print(f"\n{'='*60}")
     print(f"GRAND TOTAL: {grand_total} internal links added across all brands")
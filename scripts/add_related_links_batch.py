@@ -5,15 +5,24 @@ Batch SEO fixes across all 3 brand sites:
   Task 2: Fix DDD canonical URLs (bare domain → www)
   Task 3: Regenerate FitOver35 sitemap
   Task 4: Add Pinterest Pin-It button to all articles
+
+Tasks 1, 2 and 4 record each page in the site build graph (utils/site_build.py),
+so pages already handled and not edited since are skipped without being read.
 """
 
 import os
 import re
+import sys
 import glob
 from datetime import datetime
 from collections import defaultdict
 
-BASE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "outputs")
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BASE = os.path.join(ROOT, "outputs")
+
+sys.path.insert(0, ROOT)
+
+from utils.site_build import WRITTEN, BuildGraph, deps_digest, write_if_changed
 
 BRANDS = {
     "fitness": {
@@ -171,6 +180,7 @@ def task1_add_related_links():
     print("=" * 60)
 
     stats = {}
+    graph = BuildGraph.load("related_links_batch")
     for brand_key, config in BRANDS.items():
         articles_dir = config["dir"]
         if not os.path.isdir(articles_dir):
@@ -178,10 +188,10 @@ def task1_add_related_links():
             continue
 
         all_files = sorted(glob.glob(os.path.join(articles_dir, "*.html")))
-        # Pre-cache titles
+        graph.prune(articles_dir, all_files)
+        deps = deps_digest(config)
+        # Titles are only read for articles actually being linked to
         titles = {}
-        for f in all_files:
-            titles[f] = extract_title(f)
 
         added = 0
         skipped = 0
@@ -189,11 +199,15 @@ def task1_add_related_links():
             if os.path.basename(filepath) == 'index.html':
                 skipped += 1
                 continue
+            if graph.is_fresh(filepath, deps):
+                skipped += 1
+                continue
 
             with open(filepath, 'r', encoding='utf-8', errors='replace') as f:
                 content = f.read()
 
             if has_related_section(content):
+                graph.record(filepath, deps)
                 skipped += 1
                 continue
 
@@ -206,21 +220,23 @@ def task1_add_related_links():
             # Build links HTML
             links_html = ""
             for rel_file in related:
+                if rel_file not in titles:
+                    titles[rel_file] = extract_title(rel_file)
                 links_html += config["link_template"].format(
                     filename=os.path.basename(rel_file),
-                    title=titles.get(rel_file, os.path.basename(rel_file))
+                    title=titles[rel_file]
                 )
 
             section_html = config["template"].format(links=links_html)
             new_content = insert_before_closing_tag(content, section_html)
 
-            with open(filepath, 'w', encoding='utf-8') as f:
-                f.write(new_content)
+            graph.write(filepath, new_content, deps)
             added += 1
 
         stats[brand_key] = {"added": added, "skipped": skipped, "total": len(all_files)}
         print(f"  {brand_key}: {added} articles updated, {skipped} skipped (already had related or index)")
 
+    graph.save()
     return stats
 
 
@@ -234,11 +250,16 @@ def task2_fix_ddd_canonicals():
 
     ddd_dir = os.path.join(BASE, "dailydealdarling-website")
     all_html = glob.glob(os.path.join(ddd_dir, "**", "*.html"), recursive=True)
+    graph = BuildGraph.load("ddd_canonicals")
+    graph.prune(ddd_dir, all_html)
+    deps = deps_digest("https://www.dailydealdarling.com")
 
     fixed_files = 0
     total_replacements = 0
 
     for filepath in sorted(all_html):
+        if graph.is_fresh(filepath, deps):
+            continue
         with open(filepath, 'r', encoding='utf-8', errors='replace') as f:
             content = f.read()
 
@@ -253,10 +274,12 @@ def task2_fix_ddd_canonicals():
         if new_content != content:
             count = content.count('https://dailydealdarling.com') - content.count('https://www.dailydealdarling.com')
             total_replacements += count
-            with open(filepath, 'w', encoding='utf-8') as f:
-                f.write(new_content)
+            graph.write(filepath, new_content, deps)
             fixed_files += 1
+        else:
+            graph.record(filepath, deps)
 
+    graph.save()
     print(f"  Fixed {fixed_files} files, {total_replacements} URL replacements")
     return {"files_fixed": fixed_files, "replacements": total_replacements}
 
@@ -325,8 +348,7 @@ def task3_regenerate_sitemap():
 
     lines.append('</urlset>')
 
-    with open(sitemap_path, 'w', encoding='utf-8') as f:
-        f.write('\n'.join(lines) + '\n')
+    write_if_changed(sitemap_path, '\n'.join(lines) + '\n')
 
     total_urls = len(static_entries) + article_count
     print(f"  Sitemap regenerated: {total_urls} total URLs ({len(static_entries)} static + {article_count} articles)")
@@ -342,31 +364,32 @@ def task4_add_pinterest():
     print("=" * 60)
 
     stats = {}
+    graph = BuildGraph.load("pinterest_js")
+    deps = deps_digest(PINTEREST_JS)
     for brand_key, config in BRANDS.items():
         articles_dir = config["dir"]
         if not os.path.isdir(articles_dir):
             continue
 
         all_files = sorted(glob.glob(os.path.join(articles_dir, "*.html")))
+        graph.prune(articles_dir, all_files)
         added = 0
         skipped = 0
 
         for filepath in all_files:
-            with open(filepath, 'r', encoding='utf-8', errors='replace') as f:
-                content = f.read()
-
-            if has_pinterest_js(content):
+            status = graph.build(
+                filepath, deps,
+                lambda content: None if has_pinterest_js(content) else insert_pinterest_js(content),
+            )
+            if status == WRITTEN:
+                added += 1
+            else:
                 skipped += 1
-                continue
-
-            new_content = insert_pinterest_js(content)
-            with open(filepath, 'w', encoding='utf-8') as f:
-                f.write(new_content)
-            added += 1
 
         stats[brand_key] = {"added": added, "skipped": skipped}
         print(f"  {brand_key}: {added} articles updated, {skipped} already had Pinterest JS")
 
+    graph.save()
     return stats
 
 
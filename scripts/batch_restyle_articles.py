@@ -4,6 +4,10 @@ Batch restyle articles from old gimmicky template to new clean brand-specific te
 Strips old elements (payment icons, before/after cards, comparison tables, trust badges,
 pick badges, product badges) and rebuilds with clean HTML while preserving all content,
 Amazon affiliate links, AdSense tags, Google Analytics, and ConvertKit forms.
+
+Pages are tracked in the site build graph (utils/site_build.py): a page is only
+re-read when it or its brand config changed since the last run, or when
+TEMPLATE_VERSION is bumped.
 """
 
 import os
@@ -14,6 +18,10 @@ import traceback
 from bs4 import BeautifulSoup, NavigableString, Tag
 from datetime import datetime
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.site_build import BuildGraph, deps_digest, write_if_changed
+
 # ── Brand configurations ──────────────────────────────────────────────────────
 
 BRANDS = {
@@ -66,6 +74,9 @@ OLD_TEMPLATE_MARKERS = [
 
 SKIP_FILENAMES = {"index.html", "preview.html", "template.html", "_template.html"}
 
+# Bump when the build_*_html templates change so every page is re-checked
+TEMPLATE_VERSION = 1
+
 
 def is_old_template(html_content):
     """Check if the HTML uses the old gimmicky template."""
@@ -891,7 +902,7 @@ def build_menopause_html(data, brand_config, filename):
 
 # ── Main processing ──────────────────────────────────────────────────────────
 
-def process_file(filepath, brand_key, brand_config):
+def process_file(filepath, brand_key, brand_config, graph=None):
     """Process a single article file."""
     filename = os.path.basename(filepath)
 
@@ -901,6 +912,10 @@ def process_file(filepath, brand_key, brand_config):
     if filename.startswith("_") or filename.startswith("preview"):
         return "skipped", "preview/template"
 
+    deps = deps_digest(brand_key, brand_config)
+    if graph is not None and graph.is_fresh(filepath, deps):
+        return "skipped", "unchanged since last build"
+
     try:
         with open(filepath, "r", encoding="utf-8", errors="replace") as f:
             html_content = f.read()
@@ -909,6 +924,8 @@ def process_file(filepath, brand_key, brand_config):
 
     # Check if old template
     if not is_old_template(html_content):
+        if graph is not None:
+            graph.record(filepath, deps)
         return "skipped", "already new template"
 
     # Parse
@@ -975,10 +992,12 @@ def process_file(filepath, brand_key, brand_config):
     new_amazon_links = extract_all_amazon_links(new_html)
     # We just verify the product CTAs have Amazon links — inline links in body text are preserved
 
-    # Write
+    # Write (atomically, and only if the bytes differ)
     try:
-        with open(filepath, "w", encoding="utf-8") as f:
-            f.write(new_html)
+        if graph is not None:
+            graph.write(filepath, new_html, deps)
+        else:
+            write_if_changed(filepath, new_html)
     except Exception as e:
         return "error", f"write error: {e}"
 
@@ -993,6 +1012,8 @@ def main():
                "deals": {"restyled": 0, "skipped": 0, "errors": []},
                "menopause": {"restyled": 0, "skipped": 0, "errors": []}}
 
+    graph = BuildGraph.load("restyle_articles", version=TEMPLATE_VERSION)
+
     for brand_key, brand_config in BRANDS.items():
         articles_dir = brand_config["dir"]
         if not os.path.isdir(articles_dir):
@@ -1000,13 +1021,14 @@ def main():
             continue
 
         html_files = sorted([f for f in os.listdir(articles_dir) if f.endswith(".html")])
+        graph.prune(articles_dir, [os.path.join(articles_dir, f) for f in html_files])
         print(f"\n{'='*60}")
         print(f"Processing {brand_key}: {len(html_files)} HTML files in {articles_dir}")
         print(f"{'='*60}")
 
         for filename in html_files:
             filepath = os.path.join(articles_dir, filename)
-            status, detail = process_file(filepath, brand_key, brand_config)
+            status, detail = process_file(filepath, brand_key, brand_config, graph)
 
             if status == "restyled":
                 results[brand_key]["restyled"] += 1
@@ -1017,6 +1039,8 @@ def main():
                 results[brand_key]["errors"].append((filename, detail))
                 print(f"  ✗ {filename}: {detail[:100]}")
 
+    graph.save()
+
     # Summary
     print(f"\n{'='*60}")
     print("SUMMARY")
@@ -1035,6 +1059,7 @@ def main():
                 print(f"    ERROR: {fn}: {detail[:120]}")
 
     print(f"\n  TOTAL: {total_restyled} restyled, {total_skipped} skipped, {total_errors} errors")
+    print(f"  Files written: {len(graph.written)}")
 
     return 0 if total_errors == 0 else 1
 
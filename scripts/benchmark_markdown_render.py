@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""Benchmark utils.markdown_renderer over the generated Markdown articles.
+
+Renders every outputs/*-website/articles/*.md (the articles the generators
+actually produced) with each renderer configuration used in the repo and
+reports ms/article and articles/sec. No network access is needed.
+
+Usage:
+    python scripts/benchmark_markdown_render.py
+    python scripts/benchmark_markdown_render.py --rounds 200
+"""
+
+import argparse
+import glob
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from utils.markdown_renderer import (
+    ARTICLE_LINE_HOOKS, MarkdownRenderer, amazon_link_attrs, sponsored_link_attrs,
+)
+
+BASE = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CORPUS_GLOB = os.path.join(BASE, 'outputs', '*-website', 'articles', '*.md')
+
+RENDERERS = {
+    'pin_article': MarkdownRenderer(link_attrs=amazon_link_attrs, line_hooks=ARTICLE_LINE_HOOKS),
+    'netlify': MarkdownRenderer(),
+    'seo_machine': MarkdownRenderer(link_attrs=sponsored_link_attrs, skip_h1=True),
+}
+
+
+def load_corpus(pattern=CORPUS_GLOB):
+    """Article bodies, minus the ```markdown fence some generations were saved with."""
+    docs = []
+    for path in sorted(glob.glob(pattern)):
+        with open(path, encoding='utf-8') as f:
+            text = f.read().strip()
+        if text.startswith('```'):
+            text = text.split('\n', 1)[1] if '\n' in text else ''
+            text = text.removesuffix('```')
+        docs.append(text)
+    return docs
+
+
+def run(renderer, docs, rounds):
+    """Render the corpus `rounds` times; return (ms/article, articles/sec)."""
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for doc in docs:
+            renderer.render(doc)
+    wall = time.perf_counter() - start
+    count = rounds * len(docs)
+    return wall / count * 1000, count / wall
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--rounds', type=int, default=50, help='Passes over the corpus')
+    parser.add_argument('--corpus', default=CORPUS_GLOB, help='Glob of Markdown articles')
+    args = parser.parse_args()
+
+    docs = load_corpus(args.corpus)
+    if not docs:
+        sys.exit(f'No articles match {args.corpus}')
+    size_kb = sum(len(d) for d in docs) / 1024
+    print(f'{len(docs)} articles, {size_kb:.0f} KB, {args.rounds} rounds')
+    print(f'{"renderer":<12} {"ms/article":>10} {"articles/s":>11}')
+    for name, renderer in RENDERERS.items():
+        ms, rate = run(renderer, docs, args.rounds)
+        print(f'{name:<12} {ms:10.3f} {rate:11.0f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""Benchmark video_pipeline FFmpeg renders: encode fps per render profile.
+
+Renders the same synthetic clip (gradient "photos", title + 3 bullets, no
+audio) once per profile in video_pipeline.video_renderer.RENDER_PROFILES and
+reports frames/sec, wall time and output size. No network access is needed.
+
+Usage:
+    python scripts/benchmark_video_render.py --seconds 20
+    python scripts/benchmark_video_render.py --profiles draft,standard --threads 2
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from PIL import Image, ImageDraw
+
+from video_pipeline.config import BrandColors
+from video_pipeline.video_renderer import FPS, RENDER_PROFILES, render_video
+
+COLORS = BrandColors(primary='#1A1A2E', accent='#E94560', text='#FFFFFF')
+TITLE = '5 Morning Habits That Actually Boost Energy'
+POINTS = ['Drink water before coffee', 'Ten minutes of daylight', 'Protein at breakfast']
+
+
+def _images(directory, count=5, width=2000, height=3000):
+    """Gradient JPEGs with a few shapes, roughly the size of Pexels large2x photos."""
+    paths = []
+    for i in range(count):
+        img = Image.linear_gradient('L').resize((width, height)).convert('RGB')
+        draw = ImageDraw.Draw(img)
+        for k in range(8):
+            x, y = (k * 331 + i * 97) % width, (k * 577 + i * 151) % height
+            draw.ellipse((x, y, x + 300, y + 300), fill=((50 * k) % 255, (90 * i) % 255, 160))
+        path = Path(directory) / f'img_{i:02d}.jpg'
+        img.save(path, 'JPEG', quality=85)
+        paths.append(path)
+    return paths
+
+
+def run(profile, images, seconds, directory):
+    """Render one clip; return (fps, wall seconds, MB)."""
+    output = Path(directory) / f'bench_{profile}.mp4'
+    start = time.perf_counter()
+    render_video(images, None, output, TITLE, POINTS, COLORS, seconds, profile=profile)
+    wall = time.perf_counter() - start
+    return seconds * FPS / wall, wall, output.stat().st_size / 1_000_000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--seconds', type=float, default=15.0, help='Clip length')
+    parser.add_argument('--profiles', default=','.join(RENDER_PROFILES))
+    parser.add_argument('--threads', type=int, help='Override VIDEO_RENDER_THREADS (e.g. 2 for CI runners)')
+    args = parser.parse_args()
+
+    if args.threads:
+        os.environ['VIDEO_RENDER_THREADS'] = str(args.threads)
+
+    with tempfile.TemporaryDirectory(prefix='render_bench_') as tmp:
+        images = _images(tmp)
+        print(f'{args.seconds:.0f}s clip, {int(args.seconds * FPS)} frames, {os.cpu_count()} CPU(s)')
+        print(f'{"profile":<10} {"fps":>8} {"wall":>8} {"size":>8}')
+        for profile in args.profiles.split(','):
+            fps, wall, size = run(profile, images, args.seconds, tmp)
+            print(f'{profile:<10} {fps:8.1f} {wall:7.1f}s {size:6.1f}MB')
+
+
+if __name__ == '__main__':
+    main()
@@ -1,11 +1,15 @@
 """Phase 5: Internal linking boost across all 3 brands.
 
 Adds 'Related Articles' section and contextual inline links to each article.
+Related articles come from the shared TF-IDF index in utils/related_articles.py.
 """
 
 import os
-import re
-from collections import defaultdict
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from utils.related_articles import RelatedArticleIndex
 
 BRANDS = {
     'fitness': {
@@ -28,62 +32,8 @@ BRANDS = {
 WORKSPACE = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 
 
-def extract_keywords(title):
-    """Extract meaningful keywords from article title."""
-    stop_words = {
-        'the', 'a', 'an', 'for', 'and', 'or', 'but', 'in', 'on', 'at', 'to',
-        'of', 'is', 'are', 'was', 'were', 'be', 'been', 'being', 'have', 'has',
-        'had', 'do', 'does', 'did', 'will', 'would', 'could', 'should', 'may',
-        'might', 'shall', 'can', 'need', 'dare', 'ought', 'used', 'with',
-        'this', 'that', 'these', 'those', 'it', 'its', 'my', 'your', 'our',
-        'their', 'his', 'her', 'we', 'they', 'you', 'i', 'me', 'us', 'him',
-        'them', 'who', 'what', 'which', 'when', 'where', 'why', 'how', 'all',
-        'each', 'every', 'both', 'few', 'more', 'most', 'other', 'some', 'such',
-        'no', 'nor', 'not', 'only', 'own', 'same', 'so', 'than', 'too', 'very',
-        'just', 'because', 'as', 'until', 'while', 'about', 'between', 'through',
-        'during', 'before', 'after', 'above', 'below', 'from', 'up', 'down',
-        'out', 'off', 'over', 'under', 'again', 'further', 'then', 'once',
-        'men', 'women', 'best', 'top', 'guide', 'review', 'complete', 'ultimate',
-        '2024', '2025', '2026', 'over', '35', '40', '45', '50',
-    }
-    words = re.findall(r'[a-z]+', title.lower())
-    return set(w for w in words if w not in stop_words and len(w) > 2)
-
-
-def get_article_info(filepath):
-    """Extract title and meta description from an article."""
-    try:
-        with open(filepath, 'r', encoding='utf-8', errors='replace') as f:
-            content = f.read(3000)  # Only need the head section
-    except Exception:
-        return None, None
-
-    title_match = re.search(r'<title>(.*?)</title>', content)
-    title = title_match.group(1) if title_match else ''
-    # Strip brand suffix
-    for suffix in [' — FitOver35', ' | FitOver35', ' — Daily Deal Darling',
-                   ' | Daily Deal Darling', ' — The Menopause Planner',
-                   ' | The Menopause Planner']:
-        title = title.replace(suffix, '')
-
-    desc_match = re.search(r'<meta name="description" content="(.*?)"', content)
-    desc = desc_match.group(1) if desc_match else ''
-
-    return title, desc
-
-
-def find_related_articles(target_file, target_keywords, all_articles, max_related=5):
-    """Find related articles by keyword overlap."""
-    scores = []
-    for filepath, (title, desc, keywords) in all_articles.items():
-        if filepath == target_file:
-            continue
-        overlap = len(target_keywords & keywords)
-        if overlap >= 2:
-            scores.append((overlap, filepath, title))
-
-    scores.sort(reverse=True)
-    return scores[:max_related]
+# Cosine similarity below this isn't worth a "Related Articles" slot
+MIN_RELATED_SCORE = 0.1
 
 
 def build_related_section(related, brand_key):
@@ -92,8 +42,8 @@ def build_related_section(related, brand_key):
         return ''
 
     items = ''
-    for _, filepath, title in related:
-        filename = os.path.basename(filepath)
+    for filename, _, data in related:
+        title = data['title']
         items += (
             f'<li style="padding:6px 0">'
             f'<a href="{filename}" style="color:var(--accent);text-decoration:none;'
@@ -109,9 +59,8 @@ def build_related_section(related, brand_key):
     )
 
 
-def count_existing_internal_links(content, articles_dir):
+def count_existing_internal_links(content, files):
     """Count how many internal article links already exist."""
-    files = set(os.path.basename(f) for f in os.listdir(articles_dir) if f.endswith('.html'))
     count = 0
     for f in files:
         if f in content:
@@ -126,24 +75,16 @@ def process_brand(brand_key, config):
         print(f"  Directory not found: {articles_dir}")
         return 0
 
-    # Build article index
-    all_articles = {}
-    for fname in sorted(os.listdir(articles_dir)):
-        if not fname.endswith('.html'):
-            continue
-        filepath = os.path.join(articles_dir, fname)
-        title, desc = get_article_info(filepath)
-        if title:
-            keywords = extract_keywords(title)
-            if desc:
-                keywords |= extract_keywords(desc)
-            all_articles[filepath] = (title, desc, keywords)
-
-    print(f"  Indexed {len(all_articles)} articles")
+    # Build (or incrementally refresh) the related-article index
+    index = RelatedArticleIndex.open(articles_dir)
+    print(f"  Indexed {len(index)} articles")
 
     total_links_added = 0
+    related_by_file = index.top_k(k=5, min_score=MIN_RELATED_SCORE)
+    filenames = list(index.articles)
 
-    for filepath, (title, desc, keywords) in all_articles.items():
+    for fname, related in related_by_file.items():
+        filepath = os.path.join(articles_dir, fname)
         try:
             with open(filepath, 'r', encoding='utf-8', errors='replace') as f:
                 content = f.read()
@@ -154,11 +95,10 @@ def process_brand(brand_key, config):
         if 'Related Articles</h3>' in content:
             continue
 
-        existing_count = count_existing_internal_links(content, articles_dir)
+        existing_count = count_existing_internal_links(content, filenames)
         if existing_count >= 8:
             continue  # Max 8 internal links
 
-        related = find_related_articles(filepath, keywords, all_articles, max_related=5)
         if not related:
             continue
 
@@ -191,6 +131,7 @@ def process_brand(brand_key, config):
                 f.write(content)
             total_links_added += len(related)
 
+    index.refresh()
     return total_links_added
 
 
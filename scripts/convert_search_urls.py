@@ -4,13 +4,21 @@
 Step 2a: Remove garbage/CTA search URLs (article titles used as queries)
 Step 2b: Use consolidated ASIN maps from fix_*_links.py scripts
 Step 2c: Fuzzy match remaining search URLs to product ASINs
+
+Only articles that the link index (automation/links/link_index.py) lists
+as containing Amazon search URLs are opened and rewritten.
 """
 
 import os
 import re
+import sys
 import html as htmlmod
 from urllib.parse import urlparse, parse_qs, unquote_plus, quote_plus
-from difflib import SequenceMatcher
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from automation.links.link_index import get_link_index
+from automation.links.product_matcher import ProductMatcher
 
 # Brand directories and tags
 BRANDS = {
@@ -632,6 +640,9 @@ BRAND_ASIN_MAP = {
     "menopause": MENOPAUSE_ASINS,
 }
 
+# Built once per brand: key lookups no longer scan the whole map per query
+BRAND_MATCHERS = {brand: ProductMatcher(asins) for brand, asins in BRAND_ASIN_MAP.items()}
+
 # Filler words to strip during matching
 FILLER_WORDS = {
     'the', 'best', 'top', 'amazon', 'under', 'worth', 'buying',
@@ -680,56 +691,22 @@ def normalize_query(query):
     return ' '.join(words)
 
 
-def find_asin(query, asin_map):
-    """Find ASIN using 4-tier fuzzy matching."""
+def find_asin(query, matcher):
+    """Find ASIN using 4-tier fuzzy matching against a brand's ProductMatcher."""
     normalized = normalize_query(query)
     if not normalized:
         return None
 
-    # Tier 1: Exact match
-    if normalized in asin_map:
-        return asin_map[normalized]
-
-    # Also try the raw lowercase
-    raw = query.lower().strip()
-    if raw in asin_map:
-        return asin_map[raw]
-
-    # Tier 2: Substring match
-    for key, asin in asin_map.items():
-        if key in normalized or normalized in key:
-            return asin
-
-    # Tier 3: Word overlap (70%+)
-    query_words = set(normalized.split())
-    best_overlap = 0
-    best_asin = None
-    for key, asin in asin_map.items():
-        key_words = set(key.split())
-        if len(key_words) == 0:
-            continue
-        overlap = len(query_words & key_words)
-        ratio = overlap / len(key_words)
-        if ratio >= 0.7 and overlap > best_overlap:
-            best_overlap = overlap
-            best_asin = asin
-
-    if best_asin:
-        return best_asin
-
-    # Tier 4: SequenceMatcher
-    best_ratio = 0
-    best_asin = None
-    for key, asin in asin_map.items():
-        ratio = SequenceMatcher(None, normalized, key).ratio()
-        if ratio > best_ratio:
-            best_ratio = ratio
-            best_asin = asin
-
-    if best_ratio > 0.6:
-        return best_asin
+    # Tier 1: Exact match (normalized, then the raw lowercase)
+    asin = matcher.get(normalized) or matcher.get(query.lower().strip())
+    if asin:
+        return asin
 
-    return None
+    # Tier 2: Substring match, Tier 3: word overlap (70%+), Tier 4: SequenceMatcher
+    hit = (matcher.first_substring_match(normalized)
+           or matcher.best_word_overlap(normalized, min_ratio=0.7)
+           or matcher.closest(normalized, cutoff=0.6))
+    return hit[1] if hit else None
 
 
 def process_file(filepath, correct_tag, brand_name):
@@ -738,7 +715,7 @@ def process_file(filepath, correct_tag, brand_name):
         content = f.read()
 
     original = content
-    asin_map = BRAND_ASIN_MAP[brand_name]
+    matcher = BRAND_MATCHERS[brand_name]
     stats = {"converted": 0, "garbage_removed": 0, "unmatched": 0}
 
     def replace_search_href(match):
@@ -767,7 +744,7 @@ def process_file(filepath, correct_tag, brand_name):
             return inner_html  # Keep text, remove link
 
         # Try ASIN match
-        asin = find_asin(query, asin_map)
+        asin = find_asin(query, matcher)
         if asin:
             new_url = f"https://www.amazon.com/dp/{asin}?tag={correct_tag}"
             stats["converted"] += 1
@@ -796,6 +773,9 @@ def main():
     total = {"converted": 0, "garbage_removed": 0, "unmatched": 0}
     files_modified = 0
 
+    dirs = [os.path.join(base, d) for d in BRANDS if os.path.isdir(os.path.join(base, d))]
+    index = get_link_index(dirs)
+
     for brand_dir, config in BRANDS.items():
         full_dir = os.path.join(base, brand_dir)
         if not os.path.isdir(full_dir):
@@ -805,10 +785,9 @@ def main():
         brand_stats = {"converted": 0, "garbage_removed": 0, "unmatched": 0}
         brand_files = 0
 
-        for fn in sorted(os.listdir(full_dir)):
-            if not fn.endswith('.html'):
-                continue
-            filepath = os.path.join(full_dir, fn)
+        for filepath in index.files_with([full_dir], kinds={"search"}):
+            if os.path.dirname(filepath) != full_dir:
+                continue  # top-level articles only, as before
             stats = process_file(filepath, config["tag"], config["name"])
             if any(v > 0 for v in stats.values()):
                 brand_files += 1
@@ -831,6 +810,10 @@ def main():
     print(f"Garbage URLs removed: {total['garbage_removed']}")
     print(f"Unmatched remaining: {total['unmatched']}")
 
+    # Rewritten files are re-parsed on the next index update
+    index.update(dirs)
+    index.save()
+
 
 if __name__ == "__main__":
     main()
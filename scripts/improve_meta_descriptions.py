@@ -3,14 +3,22 @@ Phase 7: Meta Description Improvement Script
 
 Scans all HTML articles across 3 brands and improves meta descriptions
 using pattern-based templates (no AI API calls).
+
+Articles already checked (and not edited since) are skipped via the site build
+graph (utils/site_build.py) instead of being re-parsed on every run.
 """
 
 import os
 import re
+import sys
 from datetime import datetime
 from bs4 import BeautifulSoup
 from pathlib import Path
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.site_build import BuildGraph, deps_digest, write_if_changed
+
 # Audience mapping by brand
 AUDIENCE_MAP = {
     'fitness': 'men over 35',
@@ -108,8 +116,12 @@ def generate_improved_description(title, brand, date_published=None):
     # Default template
     return f"Discover the best {keyword} for {audience}. Expert reviews, comparisons & recommendations. Updated {month} {year}."
 
-def process_article(filepath, brand):
+def process_article(filepath, brand, graph=None):
     """Process a single article HTML file"""
+    deps = deps_digest(brand, AUDIENCE_MAP[brand])
+    if graph is not None and graph.is_fresh(filepath, deps):
+        return None, None, None  # Checked last run, nothing changed since
+
     with open(filepath, 'r', encoding='utf-8') as f:
         html = f.read()
 
@@ -138,6 +150,8 @@ def process_article(filepath, brand):
     should_improve, reason = should_flag(current_desc, title)
 
     if not should_improve:
+        if graph is not None:
+            graph.record(filepath, deps)
         return None, None, None  # No improvement needed
 
     # Generate improved description
@@ -180,14 +194,17 @@ def process_article(filepath, brand):
             soup.head.append(new_twitter)
 
     if updated:
-        # Write back to file
-        with open(filepath, 'w', encoding='utf-8') as f:
-            f.write(str(soup))
+        # Write back to file (atomically, only if the bytes differ)
+        if graph is not None:
+            graph.write(filepath, str(soup), deps)
+        else:
+            write_if_changed(filepath, str(soup))
 
     return current_desc, new_desc, reason
 
 def main():
-    base_path = Path('C:/Users/talha/Desktop/social-media-empire/outputs')
+    base_path = Path(__file__).resolve().parent.parent / 'outputs'
+    graph = BuildGraph.load('improve_meta_descriptions')
 
     # Define article directories for each brand
     directories = {
@@ -222,12 +239,13 @@ def main():
 
         # Find all HTML files
         html_files = list(dir_path.glob('*.html'))
+        graph.prune(dir_path, html_files)
 
         for filepath in html_files:
             stats['total'] += 1
             stats['by_brand'][brand]['total'] += 1
 
-            current, new, reason = process_article(filepath, brand)
+            current, new, reason = process_article(filepath, brand, graph)
 
             if new:  # Improvement was made
                 stats['flagged'] += 1
@@ -244,6 +262,8 @@ def main():
                 print(f"    New: {new[:80]}...")
                 print()
 
+    graph.save()
+
     # Print summary
     print()
     print("=" * 60)
@@ -5,6 +5,9 @@ video generation pipeline: script -> video -> audio -> composite -> upload.
 
 Features:
 - Per-video error isolation in batch processing
+- Pipelined batches: scripts, TTS and stock footage for upcoming videos are
+  prepared on a thread pool while earlier videos encode in a process pool
+- Per-stage timing on every result
 - Automatic temp file cleanup via try/finally
 - Memory management with gc.collect() between videos
 - Optional upload to Supabase storage
@@ -12,12 +15,14 @@ Features:
 
 import gc
 import logging
+import os
 import re
 import time
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, ThreadPoolExecutor, wait
 from dataclasses import dataclass, field
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 
 from src.models.brand import BrandConfig
 from src.models.content import Script, AudioResult
@@ -29,6 +34,12 @@ from src.video.compositor import VideoCompositor
 from src.video.timing import group_words_into_sentences, SentenceTiming
 from src.utils.brand_loader import BrandLoader
 
+# Batch pipeline stages, in order (see GenerationResult.stage_ms)
+STAGES = ("script", "fetch", "tts", "encode", "upload")
+
+# Videos being prepared (script/footage/TTS) at once, ahead of the encoders
+DEFAULT_PREFETCH_WORKERS = 2
+
 
 @dataclass
 class GenerationResult:
@@ -41,6 +52,7 @@ class GenerationResult:
         error: Error message if generation failed
         duration_ms: Time taken for generation in milliseconds
         script: The generated script text (for social media posting)
+        stage_ms: Milliseconds spent in each completed stage (see STAGES)
     """
 
     success: bool = False
@@ -49,6 +61,7 @@ class GenerationResult:
     error: Optional[str] = None
     duration_ms: float = 0.0
     script: Optional[str] = None
+    stage_ms: Dict[str, float] = field(default_factory=dict)
 
 
 @dataclass
@@ -58,10 +71,22 @@ class BatchResult:
     Attributes:
         results: List of GenerationResult for each video attempted
         total_duration_ms: Total time for batch processing in milliseconds
+        stage_ms: Milliseconds spent in each stage, summed over all videos.
+            Stages overlap, so the sum can exceed total_duration_ms.
     """
 
     results: List[GenerationResult] = field(default_factory=list)
     total_duration_ms: float = 0.0
+    stage_ms: Dict[str, float] = field(default_factory=dict)
+
+    @staticmethod
+    def sum_stages(results: List[GenerationResult]) -> Dict[str, float]:
+        """Total stage_ms across results, in STAGES order."""
+        totals = {name: 0.0 for name in STAGES}
+        for result in results:
+            for name, ms in result.stage_ms.items():
+                totals[name] = totals.get(name, 0.0) + ms
+        return {name: ms for name, ms in totals.items() if ms}
 
     @property
     def success_count(self) -> int:
@@ -86,6 +111,40 @@ class BatchResult:
         return self.success_count / self.total_count
 
 
+@dataclass
+class _PreparedVideo:
+    """Everything a video needs before encoding (script, footage, narration)."""
+
+    brand_config: BrandConfig
+    script: Script
+    stock_video_path: Path
+    audio_result: AudioResult
+    output_path: Path
+    stage_ms: Dict[str, float] = field(default_factory=dict)
+
+
+def _encode_video(
+    brand_config: BrandConfig,
+    video_path: str,
+    audio_path: str,
+    word_timings: list,
+    output_path: str,
+) -> float:
+    """Compose one video; runs in a batch encoder process. Returns elapsed ms."""
+    start = time.time()
+    compositor = VideoCompositor(brand_config)
+    try:
+        compositor.compose_video(
+            video_path=video_path,
+            audio_path=audio_path,
+            word_timings=word_timings,
+            output_path=output_path
+        )
+    finally:
+        compositor.cleanup()
+    return (time.time() - start) * 1000
+
+
 class VideoGenerator:
     """Orchestrates the complete video generation pipeline.
 
@@ -97,6 +156,12 @@ class VideoGenerator:
     5. Compose final video (VideoCompositor)
     6. Upload to storage (SupabaseClient) - optional
 
+    Batches (generate_batch, generate_for_brands) run the same stages as a
+    pipeline: steps 1-3 for upcoming videos run on prefetch_workers threads
+    while up to encode_workers videos compose in a process pool, so network
+    waits hide behind encoding. At most encode_workers + prefetch_workers
+    videos are in flight, which bounds downloaded footage and audio on disk.
+
     Error handling:
     - Each video generation is isolated with try/except
     - Compositor cleanup() always runs via finally block
@@ -119,6 +184,9 @@ class VideoGenerator:
         storage_client: Optional[SupabaseClient] = None,
         output_dir: Optional[Path] = None,
         temp_dir: Optional[Path] = None,
+        encode_workers: Optional[int] = None,
+        prefetch_workers: int = DEFAULT_PREFETCH_WORKERS,
+        encode_processes: bool = True,
     ) -> None:
         """Initialize VideoGenerator.
 
@@ -129,11 +197,17 @@ class VideoGenerator:
             storage_client: SupabaseClient instance (creates default if None)
             output_dir: Directory for final video outputs (default: output/)
             temp_dir: Directory for temporary files (default: temp/)
+            encode_workers: Concurrent encodes in batch mode (default: CPU count)
+            prefetch_workers: Videos prepared concurrently ahead of encoding
+            encode_processes: Encode in worker processes (False: threads)
         """
         self.script_generator = script_generator or ScriptGenerator()
         self.video_fetcher = video_fetcher or VideoFetcher()
         self.audio_synthesizer = audio_synthesizer or AudioSynthesizer()
         self.storage_client = storage_client
+        self.encode_workers = max(1, encode_workers or os.cpu_count() or 1)
+        self.prefetch_workers = max(1, prefetch_workers)
+        self.encode_processes = encode_processes
 
         self.output_dir = output_dir or Path("output")
         self.temp_dir = temp_dir or Path("temp")
@@ -164,16 +238,19 @@ class VideoGenerator:
         # Filter out empty strings
         return [s.strip() for s in sentences if s.strip()]
 
-    def _generate_output_filename(self, brand_slug: str) -> str:
+    def _generate_output_filename(self, brand_slug: str, suffix: Optional[str] = None) -> str:
         """Generate unique output filename with timestamp.
 
         Args:
             brand_slug: Brand identifier for filename prefix
+            suffix: Disambiguates videos started in the same second (batches)
 
         Returns:
-            Filename in format: {brand_slug}_{YYYYMMDD_HHMMSS}.mp4
+            Filename in format: {brand_slug}_{YYYYMMDD_HHMMSS}[_{suffix}].mp4
         """
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        if suffix:
+            return f"{brand_slug}_{timestamp}_{suffix}.mp4"
         return f"{brand_slug}_{timestamp}.mp4"
 
     def _cleanup_temp_files(self, temp_files: List[Path]) -> None:
@@ -190,6 +267,137 @@ class VideoGenerator:
             except Exception as e:
                 self.logger.warning(f"Failed to cleanup {path}: {e}")
 
+    def _prepare(
+        self,
+        brand_config: BrandConfig,
+        topic_seed: Optional[str] = None,
+        output_filename: Optional[str] = None,
+    ) -> _PreparedVideo:
+        """Run steps 1-4: script, stock footage, TTS audio and word timings."""
+        stage_ms: Dict[str, float] = {}
+
+        # Step 1: Generate script
+        self.logger.info(
+            f"[1/6] Generating script for {brand_config.slug}",
+            extra={"topic_seed": topic_seed}
+        )
+        step_start = time.time()
+        script: Script = self.script_generator.generate(brand_config, topic_seed)
+        stage_ms["script"] = (time.time() - step_start) * 1000
+        self.logger.info(
+            f"Script generated in {stage_ms['script']:.0f}ms",
+            extra={"topic": script.topic[:50], "search_terms": script.search_terms}
+        )
+
+        # Step 2: Fetch stock video
+        self.logger.info(
+            f"[2/6] Fetching video for terms: {script.search_terms}",
+        )
+        step_start = time.time()
+        stock_video_path: Path = self.video_fetcher.fetch(
+            script.search_terms,
+            target_duration=script.estimated_duration
+        )
+        stage_ms["fetch"] = (time.time() - step_start) * 1000
+        self.logger.info(
+            f"Video fetched in {stage_ms['fetch']:.0f}ms",
+            extra={"path": str(stock_video_path)}
+        )
+
+        # Step 3: Synthesize audio
+        self.logger.info(
+            f"[3/6] Synthesizing audio with voice: {brand_config.tts_voice}",
+        )
+        step_start = time.time()
+        audio_result: AudioResult = self.audio_synthesizer.synthesize(
+            script.voiceover,
+            brand_config
+        )
+        stage_ms["tts"] = (time.time() - step_start) * 1000
+        self.logger.info(
+            f"Audio synthesized in {stage_ms['tts']:.0f}ms",
+            extra={"duration_ms": audio_result.duration_ms}
+        )
+
+        # Step 4: Prepare word timings for karaoke captions
+        self.logger.info("[4/6] Preparing word timings for captions")
+        step_start = time.time()
+        word_timings = audio_result.word_timings
+        self.logger.info(
+            f"Word timings ready in {(time.time() - step_start)*1000:.0f}ms",
+            extra={"word_count": len(word_timings)}
+        )
+
+        output_filename = output_filename or self._generate_output_filename(brand_config.slug)
+        return _PreparedVideo(
+            brand_config=brand_config,
+            script=script,
+            stock_video_path=stock_video_path,
+            audio_result=audio_result,
+            output_path=self.output_dir / output_filename,
+            stage_ms=stage_ms,
+        )
+
+    def _upload(self, prepared: _PreparedVideo) -> str:
+        """Run step 6: upload the composed video and return its public URL."""
+        self.logger.info("[6/6] Uploading to storage")
+        step_start = time.time()
+
+        if self.storage_client is None:
+            # Create storage client lazily (may not have credentials during testing)
+            self.storage_client = SupabaseClient()
+
+        destination = f"{prepared.brand_config.slug}/{prepared.output_path.name}"
+        upload_result = self.storage_client.upload(prepared.output_path, destination)
+        public_url = upload_result.public_url
+        prepared.stage_ms["upload"] = (time.time() - step_start) * 1000
+        self.logger.info(
+            f"Uploaded in {prepared.stage_ms['upload']:.0f}ms",
+            extra={"public_url": public_url}
+        )
+        return public_url
+
+    def _success(self, prepared: _PreparedVideo, public_url: Optional[str], start_time: float) -> GenerationResult:
+        duration_ms = (time.time() - start_time) * 1000
+        self.logger.info(
+            f"Video generation complete for {prepared.brand_config.slug}",
+            extra={
+                "duration_ms": duration_ms,
+                "output_path": str(prepared.output_path),
+                "public_url": public_url,
+                "stage_ms": prepared.stage_ms,
+            }
+        )
+        return GenerationResult(
+            success=True,
+            video_path=prepared.output_path,
+            public_url=public_url,
+            duration_ms=duration_ms,
+            script=prepared.script.voiceover,
+            stage_ms=dict(prepared.stage_ms),
+        )
+
+    def _failure(
+        self,
+        brand_slug: str,
+        error: Exception,
+        start_time: float,
+        stage_ms: Optional[Dict[str, float]] = None,
+    ) -> GenerationResult:
+        duration_ms = (time.time() - start_time) * 1000
+        error_msg = str(error)
+        self.logger.error(
+            f"Video generation failed for {brand_slug}: {error_msg}",
+            extra={"duration_ms": duration_ms},
+            exc_info=error
+        )
+        return GenerationResult(
+            success=False,
+            error=error_msg,
+            duration_ms=duration_ms,
+            stage_ms=dict(stage_ms or {}),
+        )
+
     def generate_one(
         self,
         brand_config: BrandConfig,
@@ -217,129 +425,41 @@ class VideoGenerator:
         start_time = time.time()
         temp_files: List[Path] = []
         compositor: Optional[VideoCompositor] = None
+        prepared: Optional[_PreparedVideo] = None
 
         try:
-            # Step 1: Generate script
-            self.logger.info(
-                f"[1/6] Generating script for {brand_config.slug}",
-                extra={"topic_seed": topic_seed}
-            )
-            step_start = time.time()
-            script: Script = self.script_generator.generate(brand_config, topic_seed)
-            self.logger.info(
-                f"Script generated in {(time.time() - step_start)*1000:.0f}ms",
-                extra={"topic": script.topic[:50], "search_terms": script.search_terms}
-            )
-
-            # Step 2: Fetch stock video
-            self.logger.info(
-                f"[2/6] Fetching video for terms: {script.search_terms}",
-            )
-            step_start = time.time()
-            stock_video_path: Path = self.video_fetcher.fetch(
-                script.search_terms,
-                target_duration=script.estimated_duration
-            )
-            self.logger.info(
-                f"Video fetched in {(time.time() - step_start)*1000:.0f}ms",
-                extra={"path": str(stock_video_path)}
-            )
-
-            # Step 3: Synthesize audio
-            self.logger.info(
-                f"[3/6] Synthesizing audio with voice: {brand_config.tts_voice}",
-            )
-            step_start = time.time()
-            audio_result: AudioResult = self.audio_synthesizer.synthesize(
-                script.voiceover,
-                brand_config
-            )
-            self.logger.info(
-                f"Audio synthesized in {(time.time() - step_start)*1000:.0f}ms",
-                extra={"duration_ms": audio_result.duration_ms}
-            )
-
-            # Step 4: Prepare word timings for karaoke captions
-            self.logger.info("[4/6] Preparing word timings for captions")
-            step_start = time.time()
-            word_timings = audio_result.word_timings
-            self.logger.info(
-                f"Word timings ready in {(time.time() - step_start)*1000:.0f}ms",
-                extra={"word_count": len(word_timings)}
-            )
+            prepared = self._prepare(brand_config, topic_seed)
 
             # Step 5: Compose video with karaoke captions
             self.logger.info("[5/6] Composing video with karaoke captions")
             step_start = time.time()
 
-            # Generate output path
-            output_filename = self._generate_output_filename(brand_config.slug)
-            output_path = self.output_dir / output_filename
-
             # Create compositor and compose with word-level timings
             compositor = VideoCompositor(brand_config)
             compositor.compose_video(
-                video_path=str(stock_video_path),
-                audio_path=str(audio_result.audio_path),
-                word_timings=word_timings,
-                output_path=str(output_path)
+                video_path=str(prepared.stock_video_path),
+                audio_path=str(prepared.audio_result.audio_path),
+                word_timings=prepared.audio_result.word_timings,
+                output_path=str(prepared.output_path)
             )
+            prepared.stage_ms["encode"] = (time.time() - step_start) * 1000
             self.logger.info(
-                f"Video composed in {(time.time() - step_start)*1000:.0f}ms",
-                extra={"output_path": str(output_path)}
+                f"Video composed in {prepared.stage_ms['encode']:.0f}ms",
+                extra={"output_path": str(prepared.output_path)}
             )
 
             # Step 6: Upload (if enabled)
             public_url = None
             if upload:
-                self.logger.info("[6/6] Uploading to storage")
-                step_start = time.time()
-
-                if self.storage_client is None:
-                    # Create storage client lazily (may not have credentials during testing)
-                    self.storage_client = SupabaseClient()
-
-                destination = f"{brand_config.slug}/{output_filename}"
-                upload_result = self.storage_client.upload(output_path, destination)
-                public_url = upload_result.public_url
-                self.logger.info(
-                    f"Uploaded in {(time.time() - step_start)*1000:.0f}ms",
-                    extra={"public_url": public_url}
-                )
+                public_url = self._upload(prepared)
             else:
                 self.logger.info("[6/6] Skipping upload (disabled)")
 
-            duration_ms = (time.time() - start_time) * 1000
-            self.logger.info(
-                f"Video generation complete for {brand_config.slug}",
-                extra={
-                    "duration_ms": duration_ms,
-                    "output_path": str(output_path),
-                    "public_url": public_url
-                }
-            )
-
-            return GenerationResult(
-                success=True,
-                video_path=output_path,
-                public_url=public_url,
-                duration_ms=duration_ms,
-                script=script.voiceover
-            )
+            return self._success(prepared, public_url, start_time)
 
         except Exception as e:
-            duration_ms = (time.time() - start_time) * 1000
-            error_msg = str(e)
-            self.logger.error(
-                f"Video generation failed for {brand_config.slug}: {error_msg}",
-                extra={"duration_ms": duration_ms},
-                exc_info=True
-            )
-            return GenerationResult(
-                success=False,
-                error=error_msg,
-                duration_ms=duration_ms
-            )
+            return self._failure(brand_config.slug, e, start_time,
+                                 prepared.stage_ms if prepared else None)
 
         finally:
             # CRITICAL: Always clean up compositor resources
@@ -353,6 +473,108 @@ class VideoGenerator:
             # Clean up any tracked temp files
             self._cleanup_temp_files(temp_files)
 
+    def _run_pipelined(
+        self,
+        jobs: List[Tuple[BrandConfig, str]],
+        upload: bool,
+    ) -> List[GenerationResult]:
+        """Generate (brand_config, topic_seed) jobs as an overlapping pipeline.
+
+        Steps 1-4 and uploads run on prefetch threads; step 5 runs on the
+        encoder pool. Results come back in job order, one per job, and a
+        failure at any stage only affects its own video.
+        """
+        results: List[Optional[GenerationResult]] = [None] * len(jobs)
+        started: List[float] = [0.0] * len(jobs)
+        max_in_flight = self.encode_workers + self.prefetch_workers
+        pending: Dict[Future, Tuple[int, str, Optional[_PreparedVideo]]] = {}
+        next_job = 0
+        in_flight = 0
+
+        finished = 0
+
+        def finish(index: int, result: GenerationResult) -> None:
+            nonlocal in_flight, finished
+            results[index] = result
+            in_flight -= 1
+            finished += 1
+            brand_slug = jobs[index][0].slug
+            if result.success:
+                self.logger.info(f"Video {index + 1}/{len(jobs)} succeeded ({brand_slug})",
+                                 extra={"duration_ms": result.duration_ms, "stage_ms": result.stage_ms})
+            else:
+                self.logger.warning(f"Video {index + 1}/{len(jobs)} failed ({brand_slug}): {result.error}")
+
+        if self.encode_processes:
+            encoder = ProcessPoolExecutor(max_workers=self.encode_workers)
+        else:
+            encoder = ThreadPoolExecutor(max_workers=self.encode_workers, thread_name_prefix="video-encode")
+        prefetch = ThreadPoolExecutor(max_workers=self.prefetch_workers, thread_name_prefix="video-prefetch")
+
+        with prefetch, encoder:
+            while next_job < len(jobs) or pending:
+                while next_job < len(jobs) and in_flight < max_in_flight:
+                    brand_config, topic_seed = jobs[next_job]
+                    started[next_job] = time.time()
+                    filename = self._generate_output_filename(brand_config.slug, suffix=str(next_job + 1))
+                    future = prefetch.submit(self._prepare, brand_config, topic_seed, filename)
+                    pending[future] = (next_job, "prepare", None)
+                    next_job += 1
+                    in_flight += 1
+
+                if finished:
+                    # Force garbage collection after each video, once the
+                    # freed slots have been refilled so the pipeline never
+                    # waits on a collection
+                    for _ in range(finished):
+                        gc.collect()
+                    finished = 0
+
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    index, stage, prepared = pending.pop(future)
+                    brand_slug = jobs[index][0].slug
+                    try:
+                        value = future.result()
+                    except Exception as e:
+                        finish(index, self._failure(brand_slug, e, started[index],
+                                                    prepared.stage_ms if prepared else None))
+                        continue
+
+                    if stage == "prepare":
+                        prepared = value
+                        self.logger.info(f"[5/6] Queueing encode for video {index + 1}/{len(jobs)} ({brand_slug})")
+                        future = encoder.submit(
+                            _encode_video,
+                            prepared.brand_config,
+                            str(prepared.stock_video_path),
+                            str(prepared.audio_result.audio_path),
+                            list(prepared.audio_result.word_timings),
+                            str(prepared.output_path),
+                        )
+                        pending[future] = (index, "encode", prepared)
+                    elif stage == "encode" and upload:
+                        prepared.stage_ms["encode"] = value
+                        pending[prefetch.submit(self._upload, prepared)] = (index, "upload", prepared)
+                    else:
+                        if stage == "encode":
+                            prepared.stage_ms["encode"] = value
+                            self.logger.info("[6/6] Skipping upload (disabled)")
+                        finish(index, self._success(prepared, value if stage == "upload" else None,
+                                                    started[index]))
+
+        for _ in range(finished):
+            gc.collect()
+        return results
+
+    def _log_stage_summary(self, label: str, batch_result: BatchResult) -> None:
+        """Log where a batch spent its time (stage totals vs wall clock)."""
+        stages = ", ".join(f"{name} {ms / 1000:.1f}s" for name, ms in batch_result.stage_ms.items())
+        self.logger.info(
+            f"{label}: {batch_result.success_count}/{batch_result.total_count} videos in "
+            f"{batch_result.total_duration_ms / 1000:.1f}s wall ({stages or 'no stages completed'})"
+        )
+
     def generate_batch(
         self,
         brand_config: BrandConfig,
@@ -362,7 +584,8 @@ class VideoGenerator:
         """Generate multiple videos for a brand.
 
         Each video is isolated - a failure in one video does not affect others.
-        Garbage collection runs after each video to prevent memory accumulation.
+        Videos are pipelined (see class docstring) and garbage collection runs
+        after each video completes to prevent memory accumulation.
 
         Args:
             brand_config: Brand configuration
@@ -370,7 +593,8 @@ class VideoGenerator:
             upload: Whether to upload videos to storage
 
         Returns:
-            BatchResult with all individual results and aggregate stats
+            BatchResult with all individual results, aggregate stats and
+            per-stage timing
         """
         if count <= 0:
             return BatchResult(results=[], total_duration_ms=0.0)
@@ -381,50 +605,15 @@ class VideoGenerator:
         )
 
         batch_start = time.time()
-        results: List[GenerationResult] = []
-
-        for i in range(count):
-            self.logger.info(
-                f"Generating video {i + 1}/{count} for {brand_config.slug}"
-            )
-
-            # Use unique topic seed for each video
-            topic_seed = f"{i}_{time.time()}"
-
-            try:
-                result = self.generate_one(brand_config, topic_seed=topic_seed, upload=upload)
-                results.append(result)
-
-                if result.success:
-                    self.logger.info(
-                        f"Video {i + 1}/{count} succeeded",
-                        extra={"duration_ms": result.duration_ms}
-                    )
-                else:
-                    self.logger.warning(
-                        f"Video {i + 1}/{count} failed: {result.error}"
-                    )
-
-            except Exception as e:
-                # Belt-and-suspenders: generate_one should catch all errors
-                self.logger.error(
-                    f"Unexpected error in video {i + 1}/{count}: {e}",
-                    exc_info=True
-                )
-                results.append(GenerationResult(
-                    success=False,
-                    error=str(e),
-                    duration_ms=0.0
-                ))
-
-            finally:
-                # Force garbage collection after each video
-                gc.collect()
+        # Use unique topic seed for each video
+        jobs = [(brand_config, f"{i}_{time.time()}") for i in range(count)]
+        results = self._run_pipelined(jobs, upload)
 
         batch_duration_ms = (time.time() - batch_start) * 1000
         batch_result = BatchResult(
             results=results,
-            total_duration_ms=batch_duration_ms
+            total_duration_ms=batch_duration_ms,
+            stage_ms=BatchResult.sum_stages(results),
         )
 
         self.logger.info(
@@ -433,9 +622,11 @@ class VideoGenerator:
                 "success_count": batch_result.success_count,
                 "failure_count": batch_result.failure_count,
                 "total_duration_ms": batch_duration_ms,
-                "success_rate": f"{batch_result.success_rate:.1%}"
+                "success_rate": f"{batch_result.success_rate:.1%}",
+                "stage_ms": batch_result.stage_ms,
             }
         )
+        self._log_stage_summary(f"Batch {brand_config.slug}", batch_result)
 
         return batch_result
 
@@ -447,8 +638,10 @@ class VideoGenerator:
     ) -> Dict[str, BatchResult]:
         """Generate videos for multiple brands.
 
-        Loads each brand config and generates videos. A failure in one brand
-        does not affect processing of other brands.
+        Loads each brand config, then runs every brand's videos through one
+        shared pipeline (interleaved across brands) so encoders never idle
+        between brands. A failure in one brand does not affect processing of
+        other brands. Each brand's total_duration_ms is the shared wall time.
 
         Args:
             brand_slugs: List of brand slugs to process
@@ -466,20 +659,15 @@ class VideoGenerator:
             }
         )
 
+        run_start = time.time()
         loader = BrandLoader()
         results: Dict[str, BatchResult] = {}
+        brand_configs: Dict[str, BrandConfig] = {}
 
         for slug in brand_slugs:
             try:
                 self.logger.info(f"Loading brand config for {slug}")
-                brand_config = loader.load(slug)
-                batch_result = self.generate_batch(
-                    brand_config,
-                    count=count_per_brand,
-                    upload=upload
-                )
-                results[slug] = batch_result
-
+                brand_configs[slug] = loader.load(slug)
             except Exception as e:
                 self.logger.error(
                     f"Failed to process brand {slug}: {e}",
@@ -491,6 +679,27 @@ class VideoGenerator:
                     total_duration_ms=0.0
                 )
 
+        # Round-robin across brands so every brand makes progress early
+        jobs: List[Tuple[BrandConfig, str]] = []
+        owners: List[str] = []
+        for i in range(max(count_per_brand, 0)):
+            for slug, brand_config in brand_configs.items():
+                jobs.append((brand_config, f"{i}_{time.time()}"))
+                owners.append(slug)
+
+        generated = self._run_pipelined(jobs, upload) if jobs else []
+        run_duration_ms = (time.time() - run_start) * 1000
+
+        for slug in brand_slugs:
+            if slug in results or slug not in brand_configs:
+                continue
+            brand_results = [r for r, owner in zip(generated, owners) if owner == slug]
+            results[slug] = BatchResult(
+                results=brand_results,
+                total_duration_ms=run_duration_ms,
+                stage_ms=BatchResult.sum_stages(brand_results),
+            )
+
         # Log summary
         total_success = sum(r.success_count for r in results.values())
         total_failure = sum(r.failure_count for r in results.values())
@@ -502,5 +711,10 @@ class VideoGenerator:
                 "total_failure": total_failure
             }
         )
+        self._log_stage_summary(
+            "Multi-brand",
+            BatchResult(results=generated, total_duration_ms=run_duration_ms,
+                        stage_ms=BatchResult.sum_stages(generated)),
+        )
 
-        return results
+        return {slug: results[slug] for slug in brand_slugs if slug in results}
@@ -4,9 +4,11 @@ This module provides:
 - VideoCompositor: Main class for compositing videos
 - create_karaoke_captions: Karaoke-style word-by-word captions
 - KaraokeConfig: Configuration for karaoke styling
+- KaraokeCaptionEngine / stream_karaoke_video: Sprite-atlas captions streamed through ffmpeg
 - Timing utilities: For audio-text synchronization
 """
 
+from src.video.caption_engine import KaraokeCaptionEngine, stream_karaoke_video
 from src.video.compositor import VideoCompositor
 from src.video.text_overlay import create_karaoke_captions, KaraokeConfig, CaptionConfig
 from src.video.timing import (
@@ -20,6 +22,8 @@ __all__ = [
     "VideoCompositor",
     "create_karaoke_captions",
     "KaraokeConfig",
+    "KaraokeCaptionEngine",
+    "stream_karaoke_video",
     "CaptionConfig",
     "WordTiming",
     "SentenceTiming",
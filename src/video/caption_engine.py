@@ -0,0 +1,481 @@
+"""Streaming karaoke caption renderer backed by a sprite atlas.
+
+create_karaoke_captions() builds one MoviePy TextClip per word per highlight
+state, and CompositeVideoClip walks every one of them on every frame, so a
+60s short with ~150 words means ~450 clips held in memory and scanned 1,440
+times. This module renders the same captions without MoviePy:
+
+- Each unique word/colour/size (and emoji) is rasterized once with PIL into
+  a premultiplied-alpha sprite atlas, and released once the timeline has
+  passed its last use.
+- Each unique phrase/highlight state is a tuple of sprite placements, and a
+  sorted interval index over the WordTiming list maps a timestamp to the
+  active state with one bisect.
+- Background frames are decoded, cropped and scaled by one ffmpeg process,
+  captions are alpha-blended in NumPy, and raw frames are piped into a second
+  ffmpeg process that encodes and muxes the audio.
+
+Per-frame work is one lookup plus a handful of blits, and only a few frames
+are ever in flight, so peak memory and render time depend on video length,
+not on the number of words.
+
+Usage:
+    from src.video.caption_engine import stream_karaoke_video
+    stream_karaoke_video(video_path, audio_path, word_timings, output_path)
+"""
+
+import logging
+import os
+import queue
+import subprocess
+import tempfile
+import threading
+import time
+from bisect import bisect_right
+from dataclasses import dataclass
+from typing import Dict, Hashable, List, Optional, Sequence, Tuple
+
+import numpy as np
+from PIL import Image, ImageDraw, ImageFont
+
+from src.video.text_overlay import (
+    CAPTION_Y_POSITION,
+    SAFE_MARGIN_SIDES,
+    VIDEO_HEIGHT,
+    VIDEO_WIDTH,
+    KaraokeConfig,
+    _get_phrase_emoji,
+)
+from src.video.timing import WordTiming
+
+logger = logging.getLogger(__name__)
+
+# Matches VideoCompositor's export settings
+TARGET_FPS = 24
+DEFAULT_PRESET = "medium"
+DEFAULT_CRF = 23
+
+# Layout constants shared with create_karaoke_captions()
+SPACE_WIDTH = 20
+EMOJI_GAP = 10
+WORD_PADDING = 30
+SMALL_WORD_PADDING = 25
+SMALL_FONT_SCALE = 0.7
+MIN_WORD_DURATION = 0.02
+
+# Frames buffered between the compositor and the encoder
+WRITE_QUEUE_SIZE = 4
+
+Placement = Tuple[Hashable, int, int]  # (sprite key, x, y) in frame coordinates
+
+
+# ═══════════════════════════════════════════════════════════════
+# SPRITE ATLAS
+# ═══════════════════════════════════════════════════════════════
+
+@dataclass(frozen=True)
+class _Sprite:
+    """A cropped, premultiplied sprite and its offset from the anchor it is drawn at."""
+    color: np.ndarray  # (h, w, 3) uint8, premultiplied by alpha
+    inv_alpha: np.ndarray  # (h, w, 1) uint8, 255 - alpha
+    dx: int
+    dy: int
+
+
+class SpriteAtlas:
+    """Rasterized caption sprites, keyed by what they depict.
+
+    Sprites are cropped to their alpha bounding box, colour is stored
+    premultiplied and alpha inverted, so blitting is one multiply, one
+    integer divide and one add per channel with no float math. Entries can be
+    released once the timeline is past their last use, which keeps the atlas
+    to the handful of sprites on screen around the current frame.
+    """
+
+    def __init__(self) -> None:
+        self._sprites: Dict[Hashable, Optional[_Sprite]] = {}
+        self.rasterized = 0
+
+    def __len__(self) -> int:
+        return len(self._sprites)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._sprites
+
+    @property
+    def nbytes(self) -> int:
+        return sum(s.color.nbytes + s.inv_alpha.nbytes for s in self._sprites.values() if s)
+
+    def add(self, key: Hashable, image: Image.Image, offset: Tuple[int, int]) -> None:
+        """Store an RGBA image drawn at `offset` from its anchor."""
+        self.rasterized += 1
+        bbox = image.getchannel("A").getbbox()
+        if bbox is None:
+            self._sprites[key] = None
+            return
+        rgba = np.asarray(image.crop(bbox), dtype=np.uint16)
+        alpha = rgba[:, :, 3:4]
+        self._sprites[key] = _Sprite(
+            color=(rgba[:, :, :3] * alpha // 255).astype(np.uint8),
+            inv_alpha=(255 - alpha).astype(np.uint8),
+            dx=offset[0] + bbox[0],
+            dy=offset[1] + bbox[1],
+        )
+
+    def release(self, key: Hashable) -> None:
+        self._sprites.pop(key, None)
+
+    def blit(self, frame: np.ndarray, key: Hashable, x: int, y: int) -> None:
+        """Alpha-blend sprite `key` onto an RGB uint8 frame in place at anchor (x, y)."""
+        sprite = self._sprites[key]
+        if sprite is None:
+            return
+        h, w = sprite.inv_alpha.shape[:2]
+        x0, y0 = x + sprite.dx, y + sprite.dy
+        fx0, fy0 = max(x0, 0), max(y0, 0)
+        fx1, fy1 = min(x0 + w, frame.shape[1]), min(y0 + h, frame.shape[0])
+        if fx0 >= fx1 or fy0 >= fy1:
+            return
+        sx, sy = fx0 - x0, fy0 - y0
+        sw, sh = fx1 - fx0, fy1 - fy0
+
+        region = frame[fy0:fy1, fx0:fx1]
+        blended = region * sprite.inv_alpha[sy:sy + sh, sx:sx + sw].astype(np.uint16)
+        blended //= 255
+        blended += sprite.color[sy:sy + sh, sx:sx + sw]
+        region[:] = blended
+
+
+# ═══════════════════════════════════════════════════════════════
+# TIMELINE
+# ═══════════════════════════════════════════════════════════════
+
+class CaptionTimeline:
+    """Sorted interval index from time to caption state.
+
+    Cues are (start, end, state) triples. state_at(t) bisects the start
+    times and returns the latest-starting cue still covering t, so overlapping
+    word timings resolve to the word being spoken most recently.
+    """
+
+    def __init__(self, cues: Sequence[Tuple[float, float, int]]) -> None:
+        ordered = sorted(cues, key=lambda c: (c[0], c[1]))
+        self.starts = [c[0] for c in ordered]
+        self.ends = [c[1] for c in ordered]
+        self.states = [c[2] for c in ordered]
+        # Running max of end times: no cue at or before i reaches past reach[i]
+        self.reach = np.maximum.accumulate(self.ends).tolist() if ordered else []
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def state_at(self, t: float) -> Optional[int]:
+        """Return the state id active at time t, or None between cues."""
+        i = bisect_right(self.starts, t) - 1
+        # Walk back only while some earlier cue could still cover t; word
+        # timings rarely overlap, so this is almost always a single step.
+        while i >= 0 and t < self.reach[i]:
+            if t < self.ends[i]:
+                return self.states[i]
+            i -= 1
+        return None
+
+
+# ═══════════════════════════════════════════════════════════════
+# LAYOUT
+# ═══════════════════════════════════════════════════════════════
+
+class KaraokeCaptionEngine:
+    """Karaoke captions laid out once and drawn onto frames by timestamp.
+
+    Layout follows create_karaoke_captions(): phrases of words_per_phrase
+    words, the spoken word in alternating highlight colours, the phrase emoji
+    next to the last word, and a 70% font fallback for phrases too wide for
+    the safe zone. Layout only measures text; each sprite is rasterized the
+    first time a frame needs it and released after the last cue that uses it
+    has ended, so drawing frames in order rasterizes every sprite once.
+    """
+
+    def __init__(
+        self,
+        word_timings: List[WordTiming],
+        config: Optional[KaraokeConfig] = None,
+        width: int = VIDEO_WIDTH,
+        height: int = VIDEO_HEIGHT,
+    ) -> None:
+        self.config = config or KaraokeConfig()
+        self.width = width
+        self.height = height
+        self.atlas = SpriteAtlas()
+        self._fonts: Dict[int, ImageFont.FreeTypeFont] = {}
+        self._boxes: Dict[Hashable, Tuple[int, int]] = {}
+
+        self.states: List[Tuple[Placement, ...]] = []
+        state_ids: Dict[Tuple[Placement, ...], int] = {}
+        cues = []
+        last_use: Dict[Hashable, float] = {}
+        for start, end, placements in self._layout(word_timings):
+            state_id = state_ids.setdefault(placements, len(self.states))
+            if state_id == len(self.states):
+                self.states.append(placements)
+            cues.append((start, end, state_id))
+            for key, _, _ in placements:
+                last_use[key] = max(end, last_use.get(key, end))
+
+        self.timeline = CaptionTimeline(cues)
+        self._releases = sorted((end, i, key) for i, (key, end) in enumerate(last_use.items()))
+        self._next_release = 0
+        logger.debug(f"Caption layout: {len(last_use)} sprites, {len(self.states)} states, "
+                     f"{len(self.timeline)} cues")
+
+    # ── measurement and rasterization ──
+
+    def _font(self, size: int) -> ImageFont.FreeTypeFont:
+        if size not in self._fonts:
+            self._fonts[size] = ImageFont.truetype(self.config.font, size)
+        return self._fonts[size]
+
+    def _word_box(self, text: str, size: int, color: str, stroke: int, padding: int) -> Tuple[Hashable, int, int]:
+        """Sprite key and padded box size for a word."""
+        key = ("word", text, size, color, stroke, padding)
+        if key not in self._boxes:
+            ascent, descent = self._font(size).getmetrics()
+            self._boxes[key] = (int(self._font(size).getlength(text)) + padding * 2,
+                                ascent + descent + padding * 2)
+        return (key,) + self._boxes[key]
+
+    def _emoji_box(self, emoji: str, size: int) -> Tuple[Hashable, int, int]:
+        """Sprite key and box size for an emoji label."""
+        key = ("emoji", emoji, size)
+        if key not in self._boxes:
+            ascent, descent = self._font(size).getmetrics()
+            self._boxes[key] = (int(self._font(size).getlength(emoji)), ascent + descent)
+        return (key,) + self._boxes[key]
+
+    def _rasterize(self, key: Hashable) -> None:
+        kind, text, size = key[:3]
+        font = self._font(size)
+        if kind == "word":
+            color, stroke, padding = key[3:]
+            stroke_fill = self.config.stroke_color if stroke else None
+        else:  # emoji labels are unstroked in the default colour, like TextClip
+            color, stroke, padding, stroke_fill = "black", 0, 0, None
+        left, top, right, bottom = font.getbbox(text, stroke_width=stroke)
+        image = Image.new("RGBA", (max(1, right - left), max(1, bottom - top)), (0, 0, 0, 0))
+        ImageDraw.Draw(image).text((-left, -top), text, font=font, fill=color,
+                                   stroke_width=stroke, stroke_fill=stroke_fill)
+        self.atlas.add(key, image, (padding + left, padding + top))
+
+    # ── layout ──
+
+    def _phrase_state(self, words: List[str], highlight_idx: int, emoji: str) -> Tuple[Placement, ...]:
+        cfg = self.config
+        highlight = cfg.highlight_color if highlight_idx % 2 == 0 else cfg.alt_highlight
+        with_emoji = bool(emoji) and highlight_idx == len(words) - 1
+
+        def measure(size, stroke, padding):
+            boxes = [self._word_box(w, size, highlight if i == highlight_idx else cfg.base_color,
+                                    stroke, padding)
+                     for i, w in enumerate(words)]
+            emoji_box = self._emoji_box(emoji, size) if with_emoji else None
+            total = sum(b[1] for b in boxes) + SPACE_WIDTH * (len(boxes) - 1)
+            if emoji_box:
+                total += emoji_box[1] + EMOJI_GAP
+            return boxes, emoji_box, total
+
+        stroke = cfg.stroke_width if cfg.stroke_color else 0
+        boxes, emoji_box, total = measure(cfg.font_size, stroke, WORD_PADDING)
+        if total > self.width - 2 * SAFE_MARGIN_SIDES:
+            small_stroke = max(1, cfg.stroke_width - 1) if stroke else 0
+            boxes, emoji_box, total = measure(int(cfg.font_size * SMALL_FONT_SCALE), small_stroke,
+                                              SMALL_WORD_PADDING)
+
+        x = max(SAFE_MARGIN_SIDES, (self.width - total) // 2)
+        y = CAPTION_Y_POSITION - boxes[0][2] // 2
+        placements = []
+        for key, box_w, _ in boxes:
+            safe_x = max(SAFE_MARGIN_SIDES, min(x, self.width - box_w - SAFE_MARGIN_SIDES))
+            placements.append((key, safe_x, y))
+            x += box_w + SPACE_WIDTH
+        if emoji_box:
+            key, box_w, _ = emoji_box
+            emoji_x = x - SPACE_WIDTH + EMOJI_GAP
+            placements.append((key, max(SAFE_MARGIN_SIDES, min(emoji_x, self.width - box_w - SAFE_MARGIN_SIDES)), y))
+        return tuple(placements)
+
+    def _layout(self, word_timings: List[WordTiming]):
+        per_phrase = self.config.words_per_phrase
+        for phrase_idx in range(0, len(word_timings), per_phrase):
+            phrase = word_timings[phrase_idx:phrase_idx + per_phrase]
+            texts = [w.text for w in phrase]
+            emoji = _get_phrase_emoji(texts)
+            for highlight_idx, word in enumerate(phrase):
+                if word.end - word.start <= MIN_WORD_DURATION:
+                    continue
+                yield word.start, word.end, self._phrase_state(texts, highlight_idx, emoji)
+
+    # ── drawing ──
+
+    def draw(self, frame: np.ndarray, t: float) -> bool:
+        """Draw the caption active at time t onto frame in place; return whether one was drawn.
+
+        Frames can be drawn in any order; sprites released after an earlier
+        pass are simply rasterized again.
+        """
+        while self._next_release < len(self._releases) and self._releases[self._next_release][0] <= t:
+            self.atlas.release(self._releases[self._next_release][2])
+            self._next_release += 1
+
+        state = self.timeline.state_at(t)
+        if state is None:
+            return False
+        for key, x, y in self.states[state]:
+            if key not in self.atlas:
+                self._rasterize(key)
+            self.atlas.blit(frame, key, x, y)
+        return True
+
+
+# ═══════════════════════════════════════════════════════════════
+# FFMPEG STREAMING
+# ═══════════════════════════════════════════════════════════════
+
+def _ffmpeg_binary() -> str:
+    from moviepy.config import FFMPEG_BINARY
+    return FFMPEG_BINARY
+
+
+def _media_duration(path: str) -> float:
+    from moviepy.video.io.ffmpeg_reader import ffmpeg_parse_infos
+    return float(ffmpeg_parse_infos(path)["duration"])
+
+
+def _vertical_filter(width: int, height: int, fps: int) -> str:
+    """Center-crop to the target aspect ratio, scale, and resample the frame rate."""
+    return (
+        f"crop=w='min(iw,trunc(ih*{width}/{height}/2)*2)':h='min(ih,trunc(iw*{height}/{width}/2)*2)',"
+        f"scale={width}:{height},setsar=1,fps={fps}"
+    )
+
+
+def stream_karaoke_video(
+    video_path: str,
+    audio_path: str,
+    word_timings: List[WordTiming],
+    output_path: str,
+    config: Optional[KaraokeConfig] = None,
+    fps: int = TARGET_FPS,
+    preset: str = DEFAULT_PRESET,
+    crf: int = DEFAULT_CRF,
+    engine: Optional[KaraokeCaptionEngine] = None,
+) -> int:
+    """Render background video + karaoke captions + audio to an MP4.
+
+    The background is center-cropped to the engine's size, looped if it is
+    shorter than the audio, and trimmed to the audio's duration.
+
+    Args:
+        video_path: Stock background video (any aspect ratio)
+        audio_path: Narration audio; sets the output duration
+        word_timings: WordTiming list for the captions
+        output_path: Where to write the MP4
+        config: Caption styling
+        fps: Output frame rate
+        preset: libx264 preset
+        crf: libx264 constant rate factor
+        engine: Pre-built caption engine (overrides word_timings/config)
+
+    Returns:
+        Number of frames written
+
+    Raises:
+        FileNotFoundError: If video or audio files don't exist
+        RuntimeError: If ffmpeg fails
+    """
+    for path in (video_path, audio_path):
+        if not os.path.exists(path):
+            raise FileNotFoundError(path)
+
+    started = time.perf_counter()
+    engine = engine or KaraokeCaptionEngine(word_timings, config)
+    width, height = engine.width, engine.height
+    duration = _media_duration(audio_path)
+    n_frames = max(1, int(round(duration * fps)))
+    frame_bytes = width * height * 3
+    ffmpeg = _ffmpeg_binary()
+
+    decoder = subprocess.Popen(
+        [ffmpeg, "-v", "error", "-stream_loop", "-1", "-i", video_path, "-an",
+         "-vf", _vertical_filter(width, height, fps), "-frames:v", str(n_frames),
+         "-f", "rawvideo", "-pix_fmt", "rgb24", "-"],
+        stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, bufsize=frame_bytes,
+    )
+    encoder_log = tempfile.TemporaryFile()
+    encoder = subprocess.Popen(
+        [ffmpeg, "-y", "-v", "error",
+         "-f", "rawvideo", "-pix_fmt", "rgb24", "-s", f"{width}x{height}", "-r", str(fps), "-i", "-",
+         "-i", audio_path, "-map", "0:v", "-map", "1:a",
+         "-c:v", "libx264", "-preset", preset, "-crf", str(crf), "-pix_fmt", "yuv420p",
+         "-c:a", "aac", "-t", f"{n_frames / fps:.3f}", "-movflags", "+faststart", output_path],
+        stdin=subprocess.PIPE, stderr=encoder_log,
+    )
+
+    # Encoding runs on its own thread so compositing the next frame overlaps
+    # with the pipe write; the bounded queue caps frames in flight.
+    frames: "queue.Queue[Optional[bytearray]]" = queue.Queue(maxsize=WRITE_QUEUE_SIZE)
+    write_error: List[BaseException] = []
+
+    def write_frames():
+        try:
+            while (buf := frames.get()) is not None:
+                encoder.stdin.write(buf)
+        except BaseException as e:  # BrokenPipe when the encoder dies
+            write_error.append(e)
+            while frames.get() is not None:
+                pass
+
+    writer = threading.Thread(target=write_frames, name="caption-encoder", daemon=True)
+    writer.start()
+
+    written, last = 0, bytearray(frame_bytes)
+    try:
+        for index in range(n_frames):
+            buf = bytearray(frame_bytes)
+            got = 0
+            while got < frame_bytes:
+                more = decoder.stdout.readinto(memoryview(buf)[got:])
+                if not more:
+                    break
+                got += more
+            if got == frame_bytes:
+                last[:] = buf
+            elif index == 0:
+                raise RuntimeError(f"ffmpeg decoded no frames from {video_path}")
+            else:
+                buf[:] = last  # background ran short; hold its last frame
+            engine.draw(np.frombuffer(buf, dtype=np.uint8).reshape(height, width, 3), index / fps)
+            frames.put(buf)
+            written += 1
+            if write_error:
+                break
+    finally:
+        frames.put(None)
+        writer.join()
+        decoder.kill()
+        decoder.wait()
+        if encoder.stdin:
+            try:
+                encoder.stdin.close()
+            except BrokenPipeError:
+                pass
+        code = encoder.wait()
+        encoder_log.seek(0)
+        stderr = encoder_log.read().decode(errors="replace").strip()
+        encoder_log.close()
+
+    if code != 0 or write_error:
+        raise RuntimeError(f"ffmpeg encode failed ({code}): {stderr[-500:] or write_error}")
+
+    logger.info(f"Streamed {written} frames ({written / fps:.1f}s) with {len(engine.timeline)} caption cues "
+                f"in {time.perf_counter() - started:.1f}s")
+    return written
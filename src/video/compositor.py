@@ -3,6 +3,7 @@
 This module implements the VideoCompositor class which handles:
 - 16:9 to 9:16 aspect ratio conversion via center-cropping
 - Karaoke-style word-by-word caption highlighting
+- Streaming render through caption_engine (default) or a MoviePy composite
 - Clip tracking for memory management
 """
 
@@ -12,6 +13,7 @@ from typing import TYPE_CHECKING, List, Optional
 from moviepy import VideoFileClip, AudioFileClip, CompositeVideoClip
 
 from src.models.brand import BrandConfig
+from src.video.caption_engine import stream_karaoke_video
 from src.video.text_overlay import create_karaoke_captions, KaraokeConfig
 from src.video.timing import WordTiming, SentenceTiming
 
@@ -33,13 +35,17 @@ class VideoCompositor:
     audio composition, and memory management for MoviePy clips.
     """
 
-    def __init__(self, brand_config: BrandConfig) -> None:
+    def __init__(self, brand_config: BrandConfig, streaming: bool = True) -> None:
         """Initialize compositor with brand configuration.
 
         Args:
             brand_config: Brand-specific settings for colors, voice, and CTAs
+            streaming: Render captions from a sprite atlas and stream frames
+                through ffmpeg (constant memory). False uses the MoviePy
+                TextClip/CompositeVideoClip path.
         """
         self.brand_config = brand_config
+        self.streaming = streaming
         self.clips_to_close: list = []
 
     def convert_to_vertical(self, video_path: str) -> VideoFileClip:
@@ -112,6 +118,16 @@ class VideoCompositor:
         Note:
             Call cleanup() after this method completes to release memory.
         """
+        if self.streaming:
+            stream_karaoke_video(
+                video_path=video_path,
+                audio_path=audio_path,
+                word_timings=word_timings,
+                output_path=output_path,
+                fps=TARGET_FPS,
+            )
+            return
+
         # Convert stock video to vertical
         bg_clip = self.convert_to_vertical(video_path)
 
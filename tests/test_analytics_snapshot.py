@@ -0,0 +1,174 @@
+"""Tests for analytics.snapshot and the reports computed from it."""
+
+import numpy as np
+
+from analytics import snapshot as snap
+from analytics.snapshot import AnalyticsSnapshot, ColumnTable, SNAPSHOT_TABLES
+
+
+class Query:
+    def __init__(self, rows, log):
+        self.rows, self.log, self.since = rows, log, None
+
+    def select(self, columns):
+        self.columns = [c.strip() for c in columns.split(",")]
+        return self
+
+    def order(self, column):
+        return self
+
+    def gte(self, column, value):
+        self.since = snap.to_micros(value)
+        return self
+
+    def range(self, start, end):
+        self.start, self.end = start, end
+        return self
+
+    def execute(self):
+        rows = sorted(self.rows, key=lambda r: r["created_at"])
+        if self.since is not None:
+            rows = [r for r in rows if snap.to_micros(r["created_at"]) >= self.since]
+        page = [{c: r.get(c) for c in self.columns} for r in rows[self.start:self.end + 1]]
+        self.log.append(len(page))
+        return type("Result", (), {"data": page})()
+
+
+class Client:
+    def __init__(self, tables):
+        self.tables, self.pages = tables, []
+
+    def table(self, name):
+        return Query(self.tables.get(name, []), self.pages)
+
+
+def _ts(day, hour=12):
+    return f"2026-10-{day:02d}T{hour:02d}:00:00+00:00"
+
+
+def _history(n=2500):
+    rng = np.random.default_rng(0)
+    brands = ["fitness", "deals", "menopause", None]
+    return [{"id": i, "created_at": _ts(1 + int(rng.integers(0, 17)), int(rng.integers(0, 24))),
+             "brand": brands[int(rng.integers(0, 4))], "status": "posted",
+             "trending_topic": f"topic {int(rng.integers(0, 5))}", "board": None, "visual_style": "bold"}
+            for i in range(n)]
+
+
+def test_sync_pages_incrementally_and_upserts_by_id(tmp_path, monkeypatch):
+    monkeypatch.setattr(snap, "SYNC_PAGE_SIZE", 1000)
+    rows = _history()
+    client = Client({"content_history": rows})
+    first = AnalyticsSnapshot.open(client, ["content_history"], directory=tmp_path)
+    assert len(first["content_history"]) == 2500
+    assert client.pages == [1000, 1000, 500]
+
+    # A changed row inside the refresh window and a new row; old rows are not re-read
+    latest = max(rows, key=lambda r: r["created_at"])
+    latest["status"] = "failed"
+    rows.append({**rows[0], "id": 9999, "created_at": _ts(17, 23)})
+    client.pages.clear()
+    second = AnalyticsSnapshot.open(client, ["content_history"], directory=tmp_path)
+    table = second["content_history"]
+    assert len(table) == 2501
+    assert sum(client.pages) < 500
+    assert table.count_by("status") == {"posted": 2500, "failed": 1}
+
+
+def test_rows_deleted_inside_the_refresh_window_are_dropped(tmp_path):
+    rows = [{"id": i, "created_at": _ts(day), "brand": "deals"} for i, day in enumerate([1, 16, 17], 1)]
+    client = Client({"generated_articles": rows})
+    AnalyticsSnapshot.open(client, ["generated_articles"], directory=tmp_path)
+
+    del rows[1]  # id 2, inside the 2-day window
+    table = AnalyticsSnapshot.open(client, ["generated_articles"], directory=tmp_path)["generated_articles"]
+    assert sorted(r["id"] for r in table.records(["id"])) == [1, 3]
+
+
+def test_aggregates_match_row_loops():
+    rows = _history()
+    table = ColumnTable("content_history", SNAPSHOT_TABLES["content_history"])
+    table.upsert(rows)
+    days = ["2026-10-17", "2026-10-10", "2026-09-30"]
+    brands = ["fitness", "deals", "menopause", "unknown-brand"]
+
+    counts = table.daily_counts("brand", brands, days)
+    for i, brand in enumerate(brands):
+        for j, day in enumerate(days):
+            assert counts[i, j] == sum(r["brand"] == brand and r["created_at"][:10] == day for r in rows)
+
+    window = table.between("2026-10-05", "2026-10-09")
+    expected = {}
+    for r in rows:
+        if "2026-10-05" <= r["created_at"][:10] <= "2026-10-09":
+            expected[r["brand"] or ""] = expected.get(r["brand"] or "", 0) + 1
+    assert table.count_by("brand", where=window) == expected
+
+    newest = table.records(["id", "brand", "created_at"], limit=3)
+    by_time = sorted(rows, key=lambda r: r["created_at"], reverse=True)
+    assert [r["created_at"] for r in newest] == [r["created_at"] for r in by_time[:3]]
+
+
+def test_errors_and_board_metrics():
+    errors = ColumnTable("errors", SNAPSHOT_TABLES["errors"])
+    errors.upsert([
+        {"id": 1, "created_at": _ts(17, 1), "severity": "high", "error_type": "a"},
+        {"id": 2, "created_at": _ts(17, 2), "severity": "low", "error_type": "b"},
+        {"id": 3, "created_at": _ts(16, 2), "severity": "high", "error_type": "c"},
+    ])
+    from analytics.daily_report import count_errors_for_date
+    assert count_errors_for_date(errors, "2026-10-17") == {
+        "total": 2, "by_severity": {"high": 1, "medium": 0, "low": 1}}
+
+    board = ColumnTable("pinterest_analytics", SNAPSHOT_TABLES["pinterest_analytics"])
+    board.upsert([
+        {"id": i, "created_at": _ts(17), "collected_at": _ts(day), "brand": brand,
+         "impressions": 100 * i, "saves": i, "clicks": None, "pin_clicks": 1}
+        for i, (brand, day) in enumerate([("fitness", 16), ("fitness", 17), ("deals", 1)], 1)
+    ])
+    from analytics.pin_tracker import analyze_board_analytics
+    assert analyze_board_analytics(board, board.between("2026-10-10", "2026-10-17", "collected_at")) == {
+        "fitness": {"impressions": 300, "saves": 3, "clicks": 0, "pin_clicks": 2, "boards": 2}}
+
+
+def test_analyze_pins_matches_previous_summary():
+    pins = ColumnTable("pinterest_pins", SNAPSHOT_TABLES["pinterest_pins"])
+    pins.upsert([
+        {"id": 1, "created_at": _ts(17), "brand": "fitness", "status": "posted", "topic": "creatine",
+         "visual_style": "bold"},
+        {"id": 2, "created_at": _ts(17), "brand": "fitness", "status": "failed", "niche": "creatine",
+         "visual_style": "unknown"},
+        {"id": 3, "created_at": _ts(16), "brand": "deals", "status": "posted", "topic": "kitchen"},
+        {"id": 4, "created_at": _ts(1), "brand": "deals", "status": "posted", "topic": "old"},
+    ])
+    from analytics.pin_tracker import analyze_pins
+    result = analyze_pins(pins, pins.between("2026-10-10", "2026-10-17"))
+    assert result["total_pins"] == 3
+    assert result["brand_summary"]["fitness"] == {"total": 2, "posted": 1, "failed": 1, "success_rate": 50.0}
+    assert result["brand_summary"]["menopause"]["total"] == 0
+    assert result["status_breakdown"] == {"posted": 2, "failed": 1}
+    assert result["top_topics"] == [("creatine", 2), ("kitchen", 1)]
+    assert result["top_styles"] == [("bold", 1)]
+
+
+def test_layout_change_resyncs_from_scratch(tmp_path, monkeypatch):
+    client = Client({"generated_articles": [{"id": 1, "created_at": _ts(17), "brand": "deals"}]})
+    AnalyticsSnapshot.open(client, ["generated_articles"], directory=tmp_path)
+    monkeypatch.setitem(SNAPSHOT_TABLES, "generated_articles",
+                        snap.TableSpec({"brand": snap.STR, "slug": snap.STR}))
+    reloaded = AnalyticsSnapshot.load(tmp_path, ["generated_articles"])
+    assert len(reloaded["generated_articles"]) == 0
+
+
+def test_unresolved_errors_are_read_live():
+    from unittest.mock import MagicMock
+
+    from analytics.daily_report import get_unresolved_errors
+
+    db = MagicMock()
+    query = db.client.table.return_value.select.return_value.eq.return_value
+    query.order.return_value.limit.return_value.execute.return_value.data = [{"error_type": "a"}]
+
+    assert get_unresolved_errors(db) == [{"error_type": "a"}]
+    db.client.table.assert_called_once_with("errors")
+    db.client.table.return_value.select.return_value.eq.assert_called_once_with("resolved", False)
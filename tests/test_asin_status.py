@@ -0,0 +1,103 @@
+"""Tests for automation.links.asin_status — cached, shared ASIN verification."""
+
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+
+import httpx
+
+from automation.links.asin_status import AsinStatusCache, AsinVerifier, product_url
+from automation.links.link_engine import LinkChecker
+
+GOOD, DEAD, MOVED, THROTTLED = "B002DYIZEO", "B000000404", "B0000MOVED", "B000000503"
+
+
+def _handler(calls):
+    def handler(request):
+        calls.append(request.url.path)
+        asin = request.url.path.rsplit("/", 1)[-1]
+        if asin == DEAD:
+            return httpx.Response(404)
+        if asin == MOVED:
+            return httpx.Response(301, headers={"Location": "https://www.amazon.com/s?k=creatine"})
+        if asin == THROTTLED:
+            return httpx.Response(503, headers={"Retry-After": "0"})
+        return httpx.Response(200)
+    return handler
+
+
+def _verifier(tmp_path, calls, clock=None):
+    cache = AsinStatusCache(tmp_path / "asin_status.json", ttl=3600, **({"clock": clock} if clock else {}))
+    transport = httpx.MockTransport(_handler(calls))
+    factory = lambda: LinkChecker(host_rate=1000, max_retries=0, transport=transport)
+    return AsinVerifier(cache=cache, checker_factory=factory)
+
+
+def test_classifies_and_caches_only_definitive_answers(tmp_path):
+    calls = []
+    verifier = _verifier(tmp_path, calls)
+    statuses = verifier.verify([GOOD, DEAD, MOVED, THROTTLED, GOOD])
+    assert {a: s.status for a, s in statuses.items()} == {
+        GOOD: "ok", DEAD: "broken", MOVED: "broken", THROTTLED: "unknown"}
+    assert statuses[GOOD].http_status == 200 and not statuses[GOOD].cached
+
+    calls.clear()
+    again = verifier.verify([GOOD, DEAD, MOVED, THROTTLED])
+    assert all(again[a].cached for a in (GOOD, DEAD, MOVED))
+    assert calls and all(path.endswith(THROTTLED) for path in calls)   # only the non-answer is retried
+
+    # Persisted: a fresh process reuses it without any request
+    calls.clear()
+    reloaded = AsinStatusCache.load(tmp_path / "asin_status.json", ttl=3600)
+    assert len(reloaded) == 3 and reloaded.get(DEAD).broken
+
+
+def test_entries_expire_after_ttl(tmp_path):
+    now = [time.time()]
+    calls = []
+    verifier = _verifier(tmp_path, calls, clock=lambda: now[0])
+    verifier.verify([GOOD])
+    assert verifier.cache.get(GOOD) is not None
+    now[0] += 3601
+    assert verifier.cache.get(GOOD) is None
+
+
+def test_seed_from_verify_asins_report(tmp_path):
+    fresh = datetime.now(timezone.utc).isoformat()
+    stale = (datetime.now(timezone.utc) - timedelta(days=3)).isoformat()
+    report = {"results": [
+        {"asin": GOOD, "status": "valid", "verified_at": fresh},
+        {"asin": DEAD, "status": "invalid", "verified_at": fresh, "error": "Product not found"},
+        {"asin": MOVED, "status": "error", "verified_at": fresh},
+        {"asin": THROTTLED, "status": "valid", "verified_at": stale},
+    ]}
+    calls = []
+    verifier = _verifier(tmp_path, calls)
+    assert verifier.cache.seed_from_report(report) == 1
+    assert verifier.cache.get(DEAD) is None   # "invalid" may be a failed lookup
+
+    statuses = verifier.verify([GOOD, DEAD])
+    assert calls and all(path.endswith(DEAD) for path in calls)
+    assert statuses[GOOD].source == "rainforest" and statuses[GOOD].cached
+    assert statuses[DEAD].broken and statuses[DEAD].source == "http"
+
+
+def test_concurrent_callers_share_one_fetch(tmp_path):
+    calls = []
+    verifier = _verifier(tmp_path, calls)
+    barrier = threading.Barrier(4)
+    results = []
+
+    def save_article():
+        barrier.wait()
+        results.append(verifier.verify([GOOD, DEAD]))
+
+    threads = [threading.Thread(target=save_article) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert calls.count(f"/dp/{GOOD}") == 1
+    assert all(r[GOOD].status == "ok" and r[DEAD].broken for r in results)
+    assert product_url(GOOD) == f"https://www.amazon.com/dp/{GOOD}"
@@ -0,0 +1,104 @@
+"""Tests for the sprite-atlas karaoke caption engine and ffmpeg streaming."""
+
+import subprocess
+
+import numpy as np
+import pytest
+
+from src.video.caption_engine import (
+    CaptionTimeline,
+    KaraokeCaptionEngine,
+    stream_karaoke_video,
+    _ffmpeg_binary,
+)
+from src.video.timing import WordTiming
+
+
+def _timings(texts, step=0.5):
+    return [WordTiming(text, i * step, i * step + step * 0.9) for i, text in enumerate(texts)]
+
+
+def _blank():
+    return np.zeros((1920, 1080, 3), dtype=np.uint8)
+
+
+# ── CaptionTimeline ───────────────────────────────────────────────────────────
+
+def test_timeline_lookup():
+    timeline = CaptionTimeline([(1.0, 2.0, 1), (0.0, 0.5, 0), (3.0, 4.0, 2)])
+    assert timeline.state_at(0.2) == 0
+    assert timeline.state_at(0.5) is None  # end is exclusive
+    assert timeline.state_at(1.99) == 1
+    assert timeline.state_at(2.5) is None
+    assert timeline.state_at(-1) is None
+    assert timeline.state_at(10) is None
+
+
+def test_timeline_overlap_prefers_latest_start_and_sees_long_earlier_cue():
+    timeline = CaptionTimeline([(0.0, 5.0, 0), (1.0, 1.5, 1), (2.0, 2.5, 2)])
+    assert timeline.state_at(1.2) == 1
+    assert timeline.state_at(1.7) == 0
+    assert timeline.state_at(3.0) == 0
+
+
+# ── KaraokeCaptionEngine ──────────────────────────────────────────────────────
+
+def test_repeated_phrases_share_states_and_sprites():
+    engine = KaraokeCaptionEngine(_timings(["one", "two", "three"] * 4))
+    assert len(engine.timeline) == 12
+    assert len(engine.states) == 3  # one per highlight position
+
+    frame = _blank()
+    for i in range(24 * 6):
+        engine.draw(frame, i / 24)
+    # 3 white + 3 highlighted words, each rasterized once across all repeats
+    assert engine.atlas.rasterized == 6
+    assert len(engine.atlas) == 0  # all released after their last cue
+
+
+def test_draw_highlights_spoken_word():
+    engine = KaraokeCaptionEngine(_timings(["alpha", "beta"]))
+    frame = _blank()
+    assert engine.draw(frame, 0.1)
+    cyan = (frame[:, :, 0] < 40) & (frame[:, :, 1] > 200) & (frame[:, :, 2] > 200)
+    white = (frame > 200).all(axis=2)
+    assert cyan.any() and white.any()
+    ys = np.nonzero(cyan | white)[0]
+    assert 1200 < ys.mean() < 1500  # lower-third caption band
+
+    assert not engine.draw(_blank(), 5.0)
+
+
+def test_long_phrase_falls_back_to_smaller_font():
+    engine = KaraokeCaptionEngine(_timings(["extraordinarily", "uncharacteristically", "words"]))
+    sizes = {key[2] for key, _, _ in engine.states[0]}
+    assert sizes == {int(engine.config.font_size * 0.7)}
+
+
+def test_short_words_are_skipped():
+    engine = KaraokeCaptionEngine([WordTiming("a", 0.0, 0.01), WordTiming("b", 0.0, 0.5)])
+    assert len(engine.timeline) == 1
+
+
+# ── stream_karaoke_video ──────────────────────────────────────────────────────
+
+def test_stream_renders_video_with_audio(tmp_path):
+    ffmpeg = _ffmpeg_binary()
+    background, audio, output = tmp_path / "bg.mp4", tmp_path / "a.m4a", tmp_path / "out.mp4"
+    subprocess.run([ffmpeg, "-v", "error", "-f", "lavfi", "-i", "testsrc=size=320x180:rate=30",
+                    "-t", "0.5", "-pix_fmt", "yuv420p", str(background)], check=True)
+    subprocess.run([ffmpeg, "-v", "error", "-f", "lavfi", "-i", "sine=frequency=440",
+                    "-t", "1", str(audio)], check=True)
+
+    frames = stream_karaoke_video(str(background), str(audio), _timings(["hello", "world"], step=0.4),
+                                  str(output), preset="ultrafast")
+
+    assert frames == 24  # background looped to the audio's length
+    info = subprocess.run([ffmpeg, "-i", str(output)], capture_output=True, text=True).stderr
+    assert "1080x1920" in info and "Audio:" in info
+
+
+def test_stream_missing_input(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        stream_karaoke_video(str(tmp_path / "nope.mp4"), str(tmp_path / "nope.mp3"), [],
+                             str(tmp_path / "out.mp4"))
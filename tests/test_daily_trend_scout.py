@@ -0,0 +1,166 @@
+"""Tests for video_automation.daily_trend_scout — concurrent fetching and batched storage."""
+
+import json
+import time
+
+import video_automation.daily_trend_scout as scout
+
+RSS = """<?xml version="1.0"?><rss version="2.0"><channel><title>t</title>
+<item><title>{title}</title><link>https://example.com/1</link></item>
+</channel></rss>"""
+
+
+class Response:
+    def __init__(self, status_code, text="", headers=None):
+        self.status_code, self.text, self.headers = status_code, text, headers or {}
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise RuntimeError(f"HTTP {self.status_code}")
+
+
+class Session:
+    """Answers 304 when the request carries the feed's current ETag."""
+
+    def __init__(self):
+        self.requests = []
+
+    def get(self, url, headers=None, timeout=None):
+        self.requests.append(headers)
+        if headers.get("If-None-Match") == '"v1"':
+            return Response(304)
+        return Response(200, RSS.format(title="Creatine timing"),
+                        {"ETag": '"v1"', "Content-Type": "application/rss+xml; charset=utf-8"})
+
+
+def test_fetch_feed_uses_conditional_get(tmp_path):
+    cache = scout.FeedCache(tmp_path / "feeds.json")
+    session = Session()
+    first = scout.fetch_feed("https://example.com/a.rss", session, cache)
+    second = scout.fetch_feed("https://example.com/a.rss", session, cache)
+
+    assert "If-None-Match" not in session.requests[0]
+    assert session.requests[1]["If-None-Match"] == '"v1"'
+    assert [e.title for e in first.entries] == [e.title for e in second.entries] == ["Creatine timing"]
+
+    cache.save()
+    assert len(scout.FeedCache.load(tmp_path / "feeds.json")) == 1
+
+
+def _fake_sources(monkeypatch, delay=0.2, hang=None):
+    def feed(url, cutoff, session=None, cache=None, source="pinterest_rss"):
+        time.sleep(2 if url == hang else delay)
+        return [{"topic": url, "source": source}]
+
+    monkeypatch.setattr(scout, "_pinterest_feed_trends", feed)
+    monkeypatch.setattr(scout, "_news_keyword_trends",
+                        lambda kw, cutoff, session=None, cache=None: feed(kw, cutoff, source="google_news"))
+    active, peak = [0], [0]
+
+    def related(seeds, pytrends=None):
+        active[0] += 1
+        peak[0] = max(peak[0], active[0])
+        time.sleep(delay / 4)
+        active[0] -= 1
+        return [{"topic": s, "source": "pytrends_images"} for s in seeds]
+
+    monkeypatch.setattr(scout, "_pytrends_session", object)
+    monkeypatch.setattr(scout, "_related_query_trends", related)
+    monkeypatch.setattr(scout, "_daily_trending_searches",
+                        lambda pytrends=None: [{"topic": "daily", "source": "pytrends_daily"}])
+    return peak
+
+
+def test_fetch_all_trends_runs_every_source_at_once_in_order(monkeypatch):
+    pytrends_peak = _fake_sources(monkeypatch)
+    brands = ["fitness", "deals", "menopause"]
+    started = time.perf_counter()
+    fetched = scout.fetch_all_trends(brands, deadline_seconds=10)
+    # 33 feeds and keywords at 0.2s each, sharing a 16-thread pool
+    assert time.perf_counter() - started < 2
+
+    config = scout.SCOUT_CONFIGS["fitness"]
+    assert [t["topic"] for t in fetched["fitness"]["pinterest_rss"]] == config["rss_feeds"]
+    assert [t["topic"] for t in fetched["fitness"]["pytrends"]] == config["pytrends_seeds"] + ["daily"]
+    assert [t["topic"] for t in fetched["deals"]["google_news"]] == scout.SCOUT_CONFIGS["deals"]["news_keywords"]
+    assert pytrends_peak == [1]  # one pytrends session at a time
+
+
+def test_sources_past_the_deadline_are_dropped(monkeypatch):
+    slow = scout.SCOUT_CONFIGS["fitness"]["rss_feeds"][0]
+    _fake_sources(monkeypatch, delay=0, hang=slow)
+    started = time.perf_counter()
+    fetched = scout.fetch_all_trends(["fitness"], deadline_seconds=0.5)
+    assert time.perf_counter() - started < 1.5
+    assert slow not in [t["topic"] for t in fetched["fitness"]["pinterest_rss"]]
+    assert len(fetched["fitness"]["pinterest_rss"]) == 3
+
+
+class Table:
+    def __init__(self, db, name):
+        self.db, self.name, self.calls = db, name, []
+
+    def __getattr__(self, method):
+        def call(*args, **kwargs):
+            self.calls.append((method, args, kwargs))
+            return self
+        return call
+
+    def execute(self):
+        self.db.executed.append((self.name, self.calls))
+        methods = [c[0] for c in self.calls]
+        for method, args, _ in self.calls:
+            rows = args[0] if method == "upsert" and isinstance(args[0], list) else [args[0]] if args else []
+            if method == "upsert" and any(isinstance(r, dict) and r.get("brand") == self.db.reject_brand
+                                          for r in rows):
+                raise RuntimeError("invalid row")
+        if "select" in methods:
+            topics = json.dumps([{"topic": "old fitness topic"}])
+            return type("Result", (), {"data": [{"brand": "fitness", "topics": topics}]})()
+        return type("Result", (), {"data": []})()
+
+
+class Supabase:
+    def __init__(self, reject_brand=None):
+        self.executed = []
+        self.reject_brand = reject_brand
+
+    def table(self, name):
+        return Table(self, name)
+
+
+def test_scout_reads_yesterday_and_upserts_in_one_query_each(monkeypatch, tmp_path):
+    monkeypatch.setenv("TREND_FEED_CACHE_PATH", str(tmp_path / "feeds.json"))
+    _fake_sources(monkeypatch, delay=0)
+    seen = {}
+
+    def synthesize(brand_key, raw_trends, yesterday_topics):
+        seen[brand_key] = yesterday_topics
+        return [{"rank": 1, "topic": f"{brand_key} pick", "trend_score": 90}]
+
+    monkeypatch.setattr(scout, "synthesize_daily_trends", synthesize)
+    db = Supabase()
+    results = scout.run_daily_trend_scout(db)
+
+    daily = [calls for name, calls in db.executed if name == "daily_trending"]
+    assert len(daily) == 2
+    select, upsert = daily
+    assert ("in_", ("brand", ["fitness", "deals", "menopause"]), {}) in select
+    rows = upsert[0][1][0]
+    assert [row["brand"] for row in rows] == ["fitness", "deals", "menopause"]
+    assert seen == {"fitness": ["old fitness topic"], "deals": [], "menopause": []}
+    assert results["deals"]["topics"][0]["topic"] == "deals pick"
+
+
+def test_rejected_batch_falls_back_to_per_brand_upserts(monkeypatch, tmp_path):
+    monkeypatch.setenv("TREND_FEED_CACHE_PATH", str(tmp_path / "feeds.json"))
+    _fake_sources(monkeypatch, delay=0)
+    monkeypatch.setattr(scout, "synthesize_daily_trends",
+                        lambda brand_key, raw, yesterday: [{"rank": 1, "topic": "t", "trend_score": 1}])
+    db = Supabase(reject_brand="deals")
+    scout.run_daily_trend_scout(db)
+
+    upserts = [calls[0][1][0] for name, calls in db.executed
+               if name == "daily_trending" and calls[0][0] == "upsert"]
+    assert [row["brand"] for row in upserts[0]] == ["fitness", "deals", "menopause"]
+    assert [row["brand"] for row in upserts[1:]] == ["fitness", "deals", "menopause"]
@@ -0,0 +1,101 @@
+"""Tests for font_registry.py — cached fonts and the binary-search text fitter."""
+
+import pytest
+from unittest.mock import patch
+
+from PIL import ImageFont
+
+from video_automation import font_registry
+
+
+@pytest.fixture(autouse=True)
+def _clear_registry():
+    font_registry.clear()
+    yield
+    font_registry.clear()
+
+
+# Built up front: load_default itself calls ImageFont.truetype, which the
+# tests patch out.
+_DEFAULT_FONTS = {size: ImageFont.load_default(size) for size in range(40, 141)}
+
+
+def _fake_truetype(path, size):
+    """Stand-in for ImageFont.truetype that needs no TTF on disk."""
+    return _DEFAULT_FONTS[size]
+
+
+def _linear_fit(text, max_width, max_height, start_size=130, min_size=60):
+    """The original top-down 4pt ladder walk, used as the reference result."""
+    for size in range(start_size, min_size - 1, -4):
+        font = _fake_truetype(None, size)
+        lines = font_registry.wrap_text(text, font, max_width)
+        too_wide = any(font_registry.text_width(font, l) > max_width for l in lines)
+        if len(lines) * (size + 18) <= max_height and not too_wide:
+            return size, lines
+    return min_size, None
+
+
+# ── get_font ──────────────────────────────────────────────────────────────────
+
+def test_get_font_parses_each_path_size_once():
+    with patch("video_automation.font_registry.ImageFont.truetype",
+               side_effect=_fake_truetype) as truetype:
+        a = font_registry.get_font("Montserrat-Bold.ttf", 98)
+        b = font_registry.get_font("Montserrat-Bold.ttf", 98)
+        font_registry.get_font("Montserrat-Bold.ttf", 50)
+
+    assert a is b
+    assert truetype.call_count == 2
+
+
+# ── wrap_text ─────────────────────────────────────────────────────────────────
+
+def test_wrap_text_respects_max_width():
+    font = ImageFont.load_default(60)
+    lines = font_registry.wrap_text("EIGHT EXERCISES FOR MEN OVER THIRTY FIVE", font, 500)
+    assert len(lines) > 1
+    assert all(font_registry.text_width(font, line) <= 500 for line in lines)
+
+
+def test_wrap_text_checks_the_bbox_when_advances_fit():
+    class OverhangFont:
+        """Advances say 'AW AW' fits in 100px; the drawn bbox is wider."""
+        size = 20
+
+        def getlength(self, text):
+            return 45 if text != " " else 5
+
+        def getbbox(self, text):
+            return (0, 0, 48 * len(text.split()) + 6 * text.count(" "), 20)
+
+    assert font_registry.wrap_text("AW AW", OverhangFont(), 100) == ["AW", "AW"]
+
+
+def test_wrap_text_keeps_overlong_word_on_its_own_line():
+    font = ImageFont.load_default(60)
+    lines = font_registry.wrap_text("a SUPERCALIFRAGILISTIC b", font, 100)
+    assert lines == ["a", "SUPERCALIFRAGILISTIC", "b"]
+
+
+def test_wrap_text_empty():
+    assert font_registry.wrap_text("   ", ImageFont.load_default(20), 100) == []
+
+
+# ── fit_text ──────────────────────────────────────────────────────────────────
+
+@pytest.mark.parametrize("text,max_w,max_h", [
+    ("8 EXERCISES FOR MEN", 880, 485),
+    ("HOT FLASH RELIEF TONIGHT", 600, 300),
+    ("KITCHEN FINDS", 880, 485),
+    ("A VERY LONG HOOK THAT WILL NEVER FIT IN THIS TINY BOX", 300, 100),
+])
+def test_fit_text_matches_linear_ladder(text, max_w, max_h):
+    with patch("video_automation.font_registry.ImageFont.truetype",
+               side_effect=_fake_truetype):
+        font, lines = font_registry.fit_text(text, "Montserrat-ExtraBold.ttf", max_w, max_h)
+
+    expected_size, expected_lines = _linear_fit(text, max_w, max_h)
+    assert font.size == expected_size
+    if expected_lines is not None:
+        assert lines == expected_lines
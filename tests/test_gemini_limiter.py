@@ -0,0 +1,146 @@
+"""Tests for gemini_limiter.py and concurrent generation in gemini_client."""
+
+import threading
+import time
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from video_automation import gemini_client
+from video_automation.gemini_limiter import (
+    RateLimiter,
+    TokenBucket,
+    backoff_delay,
+    retry_delay_from_error,
+)
+from video_automation.gemini_router import ModelRouter
+
+
+@pytest.fixture(autouse=True)
+def no_llm_cache(monkeypatch):
+    monkeypatch.setenv("LLM_CACHE_MODE", "off")
+
+
+class FakeClock:
+    """Clock whose sleep() advances time instead of blocking."""
+
+    def __init__(self):
+        self.now = 0.0
+        self.slept = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.slept.append(seconds)
+        self.now += seconds
+
+
+# ── TokenBucket / RateLimiter ─────────────────────────────────────────────────
+
+def test_bucket_allows_burst_then_paces():
+    clock = FakeClock()
+    bucket = TokenBucket(rate=1.0, capacity=3, clock=clock, sleep=clock.sleep)
+    assert [bucket.acquire() for _ in range(3)] == [0.0, 0.0, 0.0]
+    assert bucket.acquire() == pytest.approx(1.0)
+    assert bucket.acquire() == pytest.approx(1.0)
+
+
+def test_limiter_waits_for_token_quota():
+    clock = FakeClock()
+    limiter = RateLimiter(rpm=100, tpm=6000, clock=clock, sleep=clock.sleep)
+    limiter.acquire(6000)
+    # TPM bucket is empty; 1000 tokens refill at 100/s
+    assert limiter.acquire(1000) == pytest.approx(10.0)
+
+
+def test_pause_blocks_next_acquire():
+    clock = FakeClock()
+    limiter = RateLimiter(rpm=100, tpm=100_000, clock=clock, sleep=clock.sleep)
+    limiter.pause(7.5)
+    assert limiter.acquire(10) == pytest.approx(7.5)
+    assert limiter.acquire(10) == 0.0
+
+
+# ── backoff ───────────────────────────────────────────────────────────────────
+
+@pytest.mark.parametrize("attempt", [0, 1, 2, 10])
+def test_backoff_is_jittered_and_capped(attempt):
+    low = backoff_delay(attempt, base=4, cap=60, rng=lambda: 0.0)
+    high = backoff_delay(attempt, base=4, cap=60, rng=lambda: 1.0)
+    assert low == high / 2
+    assert high == min(60, 4 * 2 ** attempt)
+
+
+def test_retry_delay_parsed_from_429():
+    err = RuntimeError("429 RESOURCE_EXHAUSTED {'retryDelay': '27s'}")
+    assert retry_delay_from_error(err) == 27.0
+    assert retry_delay_from_error(RuntimeError("Please retry in 3.5s.")) == 3.5
+    assert retry_delay_from_error(RuntimeError("500 INTERNAL")) is None
+
+
+# ── gemini_client integration ─────────────────────────────────────────────────
+
+@pytest.fixture
+def router(tmp_path):
+    return ModelRouter(discover=lambda: ["gemini-2.5-flash"], state_path=tmp_path / "m.json")
+
+
+def test_generate_many_runs_concurrently_in_order(router):
+    active = []
+    peak = []
+    lock = threading.Lock()
+
+    def slow_call(model, contents, config):
+        with lock:
+            active.append(contents)
+            peak.append(len(active))
+        time.sleep(0.2)
+        with lock:
+            active.remove(contents)
+        return MagicMock(text=f'{{"p": "{contents}"}}')
+
+    client = MagicMock()
+    client.models.generate_content.side_effect = slow_call
+    limiter = RateLimiter(rpm=1000, tpm=1_000_000)
+
+    with patch.object(gemini_client, "_router", router), \
+         patch.object(gemini_client, "_limiter", limiter), \
+         patch.object(gemini_client, "get_client", return_value=client):
+        started = time.perf_counter()
+        results = gemini_client.generate_many(["a", "b", "c", "d"], max_workers=4)
+        elapsed = time.perf_counter() - started
+
+    assert results == ['{"p": "a"}', '{"p": "b"}', '{"p": "c"}', '{"p": "d"}']
+    assert max(peak) > 1
+    assert elapsed < 0.6  # close to one call, not the sum of four
+
+
+def test_rate_limit_pauses_limiter_instead_of_sleeping(router):
+    client = MagicMock()
+    client.models.generate_content.side_effect = [
+        RuntimeError("429 RESOURCE_EXHAUSTED {'retryDelay': '12s'}"),
+        MagicMock(text='{"ok": true}'),
+    ]
+    limiter = MagicMock()
+
+    with patch.object(gemini_client, "_router", router), \
+         patch.object(gemini_client, "_limiter", limiter), \
+         patch.object(gemini_client, "get_client", return_value=client), \
+         patch("time.sleep") as sleep:
+        assert gemini_client.generate_json("prompt") == '{"ok": true}'
+
+    limiter.pause.assert_called_once_with(12.0)
+    assert limiter.acquire.call_count == 2
+    sleep.assert_not_called()
+
+
+def test_map_concurrent_returns_exceptions_in_place():
+    def work(n):
+        if n == 2:
+            raise ValueError("bad")
+        return n * 10
+
+    results = gemini_client.map_concurrent(work, [1, 2, 3], max_workers=3)
+    assert results[0] == 10 and results[2] == 30
+    assert isinstance(results[1], ValueError)
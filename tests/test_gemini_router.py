@@ -0,0 +1,123 @@
+"""Tests for gemini_router.py and its use in gemini_client._generate."""
+
+import json
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from video_automation import gemini_client
+from video_automation.gemini_router import ModelRouter
+
+
+@pytest.fixture(autouse=True)
+def no_llm_cache(monkeypatch):
+    monkeypatch.setenv("LLM_CACHE_MODE", "off")
+
+
+class FakeClock:
+    def __init__(self, now=1_000_000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def state_path(tmp_path):
+    return tmp_path / "gemini_model.json"
+
+
+def _router(state_path, models=("gemini-2.5-flash", "gemini-2.0-flash"), clock=None):
+    discover = MagicMock(return_value=list(models))
+    return ModelRouter(discover=discover, state_path=state_path, clock=clock or FakeClock()), discover
+
+
+# ── catalog / last known good ─────────────────────────────────────────────────
+
+def test_catalog_is_cached_until_ttl(state_path):
+    clock = FakeClock()
+    router, discover = _router(state_path, clock=clock)
+    router.catalog()
+    router.catalog()
+    assert discover.call_count == 1
+
+    clock.now += router.catalog_ttl + 1
+    router.catalog()
+    assert discover.call_count == 2
+
+
+def test_last_good_is_persisted_and_skips_discovery(state_path):
+    router, _ = _router(state_path)
+    router.record_success("gemini-2.0-flash", 0.5)
+    assert json.loads(state_path.read_text())["model"] == "gemini-2.0-flash"
+
+    cold, discover = _router(state_path)
+    assert next(cold.candidates()) == "gemini-2.0-flash"
+    discover.assert_not_called()
+
+
+# ── circuit breaking ──────────────────────────────────────────────────────────
+
+def test_circuit_opens_after_repeated_failures(state_path):
+    clock = FakeClock()
+    router, _ = _router(state_path, clock=clock)
+    for _ in range(router.failure_threshold):
+        router.record_failure("gemini-2.5-flash", RuntimeError("500 INTERNAL"))
+
+    assert list(router.candidates()) == ["gemini-2.0-flash", "gemini-2.5-flash"]
+
+    clock.now += router.cooldown + 1
+    assert list(router.candidates())[0] == "gemini-2.5-flash"
+
+
+def test_not_found_opens_circuit_immediately(state_path):
+    router, _ = _router(state_path)
+    router.record_success("gemini-2.5-flash", 0.1)
+    router.record_failure("gemini-2.5-flash", RuntimeError("404 NOT_FOUND"))
+    assert router.last_good is None
+    assert list(router.candidates())[0] == "gemini-2.0-flash"
+    # ...and the next run doesn't start with it either
+    assert _router(state_path)[0].last_good is None
+
+
+def test_stats_count_fallbacks_and_latency(state_path):
+    router, _ = _router(state_path)
+    router.record_failure("gemini-2.5-flash", RuntimeError("boom"), 0.2)
+    router.record_success("gemini-2.0-flash", 0.4, fallback=True)
+    stats = router.stats()
+    assert stats["gemini-2.5-flash"]["failures"] == 1
+    assert stats["gemini-2.0-flash"]["fallbacks"] == 1
+    assert stats["gemini-2.0-flash"]["avg_latency_ms"] == 400.0
+
+
+# ── gemini_client integration ─────────────────────────────────────────────────
+
+def test_generate_does_not_rediscover_per_call(state_path):
+    response = MagicMock(text='{"ok": true}')
+    client = MagicMock()
+    client.models.generate_content.return_value = response
+    discover = MagicMock(return_value=["gemini-2.5-flash"])
+    router = ModelRouter(discover=discover, state_path=state_path)
+
+    with patch.object(gemini_client, "_router", router), \
+         patch.object(gemini_client, "get_client", return_value=client):
+        for _ in range(5):
+            assert gemini_client.generate_json("prompt") == '{"ok": true}'
+
+    assert discover.call_count == 1
+    assert router.stats()["gemini-2.5-flash"]["successes"] == 5
+
+
+def test_rate_limit_retry_on_the_same_model_is_not_a_fallback(state_path):
+    client = MagicMock()
+    client.models.generate_content.side_effect = [RuntimeError("429 RESOURCE_EXHAUSTED"),
+                                                  MagicMock(text='{"ok": true}')]
+    router = ModelRouter(discover=MagicMock(return_value=["gemini-2.5-flash"]), state_path=state_path)
+
+    with patch.object(gemini_client, "_router", router), \
+         patch.object(gemini_client, "get_client", return_value=client), \
+         patch.object(gemini_client, "get_limiter", return_value=MagicMock()):
+        assert gemini_client.generate_json("prompt") == '{"ok": true}'
+
+    stats = router.stats()["gemini-2.5-flash"]
+    assert stats["successes"] == 1 and stats["fallbacks"] == 0
@@ -0,0 +1,125 @@
+"""Tests for monitoring.health_checker — concurrent probes, deadline, latency history."""
+
+import threading
+import time
+
+import pytest
+
+from monitoring.health_checker import HealthChecker, HealthCheckResult
+from monitoring.latency_store import LatencyStore, percentile
+
+
+@pytest.fixture
+def store(tmp_path):
+    return LatencyStore(tmp_path / "latency.sqlite")
+
+
+def _probe(service, ms, delay=0.0, status="healthy"):
+    def run():
+        time.sleep(delay)
+        return HealthCheckResult(service=service, status=status, response_time_ms=ms)
+    return service, run
+
+
+# ── LatencyStore ──────────────────────────────────────────────────────────────
+
+def test_percentile_nearest_rank():
+    values = list(range(1, 101))
+    assert percentile(values, 50) == 50
+    assert percentile(values, 95) == 95
+    assert percentile([7], 95) == 7
+    assert percentile([], 50) is None
+
+
+def test_baseline_uses_recent_window_only(tmp_path):
+    now = [1_000_000.0]
+    store = LatencyStore(tmp_path / "l.sqlite", window=20, window_days=1, clock=lambda: now[0])
+    store.record("api", "healthy", 9999.0)       # falls out of the day window
+    now[0] += 2 * 86400
+    for ms in range(1, 31):
+        store.record("api", "healthy", float(ms))  # only the last 20 count
+    store.record("api", "unhealthy", None)
+    store.record("other", "healthy", 5.0)
+
+    baseline = store.baseline("api")
+    assert (baseline.samples, baseline.p50_ms, baseline.p95_ms) == (20, 20.0, 29.0)
+
+
+def test_regression_needs_history_and_a_real_jump(store):
+    for ms in [100.0] * 9:
+        store.record("api", "healthy", ms)
+    assert not store.regression(1000.0, store.baseline("api"))  # too few samples
+    store.record("api", "healthy", 140.0)
+    baseline = store.baseline("api")
+    assert not store.regression(180.0, baseline)   # above p95 but < 2x p50
+    assert store.regression(450.0, baseline)
+
+
+# ── HealthChecker.run_probes ──────────────────────────────────────────────────
+
+def test_probes_run_concurrently_and_keep_order(store):
+    checker = HealthChecker(latency_store=store, max_workers=8)
+    probes = [_probe(f"svc{i}", 10.0, delay=0.1) for i in range(8)]
+
+    started = time.perf_counter()
+    results = checker.run_probes(probes)
+
+    assert time.perf_counter() - started < 0.5
+    assert [r.service for r in results] == [f"svc{i}" for i in range(8)]
+    assert len(store) == 8
+
+
+def test_deadline_marks_slow_probes_unhealthy(store):
+    release = threading.Event()
+
+    def hang():
+        release.wait(5)
+        return HealthCheckResult(service="slow", status="healthy", response_time_ms=1.0)
+
+    def boom():
+        raise RuntimeError("probe crashed")
+
+    checker = HealthChecker(latency_store=store, deadline_seconds=0.2)
+    started = time.perf_counter()
+    fast, slow, broken = checker.run_probes([_probe("fast", 5.0), ("slow", hang), ("broken", boom)])
+    release.set()
+
+    assert time.perf_counter() - started < 1.0
+    assert fast.status == "healthy"
+    assert slow.status == "unhealthy" and "deadline" in slow.error
+    assert broken.status == "unhealthy" and broken.error == "probe crashed"
+
+
+def test_latency_regression_degrades_healthy_service(store):
+    for _ in range(10):
+        store.record("supabase", "healthy", 200.0)
+
+    checker = HealthChecker(latency_store=store)
+    (result,) = checker.run_probes([_probe("supabase", 900.0)])
+
+    assert result.status == "degraded"
+    assert "Latency regression" in result.error
+    assert result.details["latency_baseline"]["p50_ms"] == 200.0
+
+
+def test_check_all_dedupes_gemini_and_critical_only_reuses_engine(store, monkeypatch):
+    calls = []
+
+    def fake(name):
+        def check(self):
+            calls.append(name)
+            return HealthCheckResult(service=name, status="healthy", response_time_ms=1.0)
+        return check
+
+    checker = HealthChecker(latency_store=store)
+    for service, probe in checker._probes():
+        monkeypatch.setattr(HealthChecker, probe.__name__, fake(service))
+
+    report = checker.check_all()
+    assert report["overall_status"] == "healthy"
+    assert report["summary"]["total"] == 17
+    assert calls.count("gemini") == 1
+
+    calls.clear()
+    critical = checker.check_critical_only()
+    assert critical["healthy"] and sorted(calls) == ["gemini", "pexels", "supabase"]
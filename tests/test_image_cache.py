@@ -0,0 +1,116 @@
+"""Tests for utils/image_cache.py — shared background image cache and cover sizing."""
+
+import os
+import time
+from io import BytesIO
+from unittest.mock import MagicMock, patch
+
+import pytest
+from PIL import Image
+
+from utils.image_cache import ImageCache, _cache_key, open_for_cover, pexels_cover_url
+
+PEXELS_ORIGINAL = "https://images.pexels.com/photos/841130/pexels-photo-841130.jpeg"
+
+
+def _jpeg(width, height):
+    out = BytesIO()
+    Image.new("RGB", (width, height), (120, 80, 40)).save(out, "JPEG")
+    return out.getvalue()
+
+
+# ── keys ──────────────────────────────────────────────────────────────────────
+
+def test_pexels_key_uses_photo_id_and_variant():
+    small = _cache_key(PEXELS_ORIGINAL + "?auto=compress&cs=tinysrgb&w=1000")
+    reordered = _cache_key(PEXELS_ORIGINAL + "?w=1000&cs=tinysrgb&auto=compress")
+    assert small.startswith("pexels_841130_")
+    assert small == reordered
+    assert _cache_key(PEXELS_ORIGINAL) == "pexels_841130_original"
+
+
+def test_non_pexels_key_is_url_hash():
+    assert _cache_key("https://example.com/a.jpg").startswith("url_")
+
+
+# ── ImageCache ────────────────────────────────────────────────────────────────
+
+def test_fetch_downloads_once(tmp_path):
+    cache = ImageCache(tmp_path, max_bytes=10_000)
+    resp = MagicMock(content=b"jpeg-bytes")
+    with patch("utils.image_cache.requests.get", return_value=resp) as get:
+        assert cache.fetch(PEXELS_ORIGINAL) == b"jpeg-bytes"
+        assert cache.fetch(PEXELS_ORIGINAL) == b"jpeg-bytes"
+    assert get.call_count == 1
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_lru_eviction_keeps_recently_used(tmp_path):
+    cache = ImageCache(tmp_path, max_bytes=250)
+    cache.put("https://example.com/a", b"a" * 100)
+    cache.put("https://example.com/b", b"b" * 100)
+    # Age both entries, then touch "a" so "b" is least recently used
+    past = time.time() - 100
+    for name in os.listdir(tmp_path):
+        os.utime(tmp_path / name, (past, past))
+    assert cache.get("https://example.com/a") is not None
+
+    cache.put("https://example.com/c", b"c" * 100)
+
+    assert cache.get("https://example.com/b") is None
+    assert cache.get("https://example.com/a") is not None
+    assert cache.get("https://example.com/c") is not None
+
+
+# ── pexels_cover_url ──────────────────────────────────────────────────────────
+
+@pytest.mark.parametrize("width,height,expected", [
+    (4000, 6000, "w=1000"),   # exact 2:3 portrait — width binds
+    (4000, 8000, "w=1000"),   # taller than 2:3 — width binds
+    (6000, 4000, "h=1500"),   # landscape — height binds
+])
+def test_cover_url_constrains_binding_side(width, height, expected):
+    photo = {"width": width, "height": height, "src": {"original": PEXELS_ORIGINAL}}
+    url = pexels_cover_url(photo, 1000, 1500)
+    assert url.startswith(PEXELS_ORIGINAL + "?")
+    assert expected in url
+
+
+def test_cover_url_small_photo_uses_original():
+    photo = {"width": 800, "height": 1200, "src": {"original": PEXELS_ORIGINAL}}
+    assert pexels_cover_url(photo, 1000, 1500) == PEXELS_ORIGINAL
+
+
+# ── open_for_cover ────────────────────────────────────────────────────────────
+
+def test_open_for_cover_decodes_reduced_but_still_covers():
+    img = open_for_cover(_jpeg(4000, 6000), 1000, 1500)
+    assert img.mode == "RGB"
+    assert img.width >= 1000 and img.height >= 1500
+    assert img.width <= 2000  # never a full 4000px decode
+
+
+def test_open_for_cover_png_uses_reduce():
+    out = BytesIO()
+    Image.new("RGB", (3000, 4500), (0, 0, 0)).save(out, "PNG")
+    img = open_for_cover(out.getvalue(), 1000, 1500)
+    assert img.size == (1000, 1500)
+
+
+# ── article hero lookup ───────────────────────────────────────────────────────
+
+def test_hero_lookup_caches_only_successful_searches(monkeypatch):
+    import video_automation.pin_article_generator as pag
+
+    monkeypatch.setenv("PEXELS_API_KEY", "key")
+    monkeypatch.setattr(pag, "_PEXELS_HERO_CACHE", {})
+    found = MagicMock(status_code=200)
+    found.json.return_value = {"photos": [{"src": {"large": PEXELS_ORIGINAL}}]}
+    get = MagicMock(side_effect=[TimeoutError("read timeout"), found])
+    monkeypatch.setattr(pag.requests, "get", get)
+
+    fallback = pag._fetch_pexels_image("kitchen gadgets")
+    assert fallback != PEXELS_ORIGINAL
+    assert pag._fetch_pexels_image("kitchen gadgets") == PEXELS_ORIGINAL  # timeout not remembered
+    assert pag._fetch_pexels_image("kitchen gadgets") == PEXELS_ORIGINAL
+    assert get.call_count == 2
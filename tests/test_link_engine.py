@@ -0,0 +1,214 @@
+"""Tests for automation.links.link_engine — dedupe, per-host limits, Retry-After, TTL cache."""
+
+import asyncio
+import time
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+
+import httpx
+import pytest
+
+from automation.links import check_links, link_engine
+from automation.links.link_engine import (
+    LinkCache,
+    LinkCheck,
+    LinkChecker,
+    TokenBucket,
+    retry_after_seconds,
+)
+
+
+@pytest.fixture(autouse=True)
+def no_backoff(monkeypatch):
+    monkeypatch.setattr(link_engine, "BACKOFF_BASE_SECONDS", 0.01)
+    monkeypatch.setattr(link_engine, "_backoff", lambda attempt, base=0.01: base)
+
+
+def _transport(handler):
+    return httpx.MockTransport(handler)
+
+
+def _checker(handler, **kwargs):
+    kwargs.setdefault("host_rate", 1000)
+    return LinkChecker(transport=_transport(handler), **kwargs)
+
+
+# ── Retry-After / token bucket ────────────────────────────────────────────────
+
+def test_retry_after_parsing():
+    now = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    assert retry_after_seconds("3") == 3.0
+    assert retry_after_seconds(format_datetime(now + timedelta(seconds=30), usegmt=True), now) == 30.0
+    assert retry_after_seconds("soon") is None
+    assert retry_after_seconds(None) is None
+
+
+def test_token_bucket_queues_callers_in_order():
+    clock = [0.0]
+    bucket = TokenBucket(rate=2, capacity=2, clock=lambda: clock[0])
+    assert [bucket.reserve() for _ in range(4)] == [0.0, 0.0, 0.5, 1.0]
+    clock[0] = 10.0
+    assert bucket.reserve() == 0.0
+
+
+# ── LinkChecker ───────────────────────────────────────────────────────────────
+
+def test_duplicates_are_fetched_once_and_head_falls_back_to_get():
+    seen = []
+
+    def handler(request):
+        seen.append((request.method, str(request.url)))
+        if request.url.path == "/nohead" and request.method == "HEAD":
+            return httpx.Response(405)
+        return httpx.Response(404 if request.url.path == "/gone" else 200)
+
+    urls = ["https://a.test/ok", "https://a.test/gone", "https://a.test/nohead"] * 5
+    checks = _checker(handler).check(urls)
+
+    assert {u: c.http_status for u, c in checks.items()} == {
+        "https://a.test/ok": 200, "https://a.test/gone": 404, "https://a.test/nohead": 200}
+    assert sorted(seen) == sorted([("HEAD", "https://a.test/ok"), ("HEAD", "https://a.test/gone"),
+                                   ("HEAD", "https://a.test/nohead"), ("GET", "https://a.test/nohead")])
+
+
+def test_per_host_concurrency_is_capped_but_hosts_run_in_parallel():
+    active, peak = {}, {}
+
+    async def handler(request):
+        host = request.url.host
+        active[host] = active.get(host, 0) + 1
+        peak[host] = max(peak.get(host, 0), active[host])
+        await asyncio.sleep(0.02)
+        active[host] -= 1
+        return httpx.Response(200)
+
+    urls = [f"https://{host}/{i}" for host in ("a.test", "b.test") for i in range(12)]
+    started = time.perf_counter()
+    _checker(handler, host_concurrency=3).check(urls)
+
+    assert peak == {"a.test": 3, "b.test": 3}
+    assert time.perf_counter() - started < 12 * 0.02  # well under sequential time
+
+
+def test_retry_after_pauses_host_then_retries():
+    calls = []
+
+    def handler(request):
+        calls.append(time.monotonic())
+        if len(calls) == 1:
+            return httpx.Response(429, headers={"Retry-After": "0.2"})
+        return httpx.Response(200)
+
+    checker = _checker(handler)
+    check = checker.check(["https://a.test/x"])["https://a.test/x"]
+
+    assert check.http_status == 200
+    assert calls[1] - calls[0] >= 0.2
+    assert checker.stats["retries"] == 1
+
+
+def test_amazon_503_is_a_definitive_block_without_retry_or_pause():
+    calls = []
+
+    def handler(request):
+        calls.append((request.method, request.url.path))
+        return httpx.Response(503 if request.url.path.startswith("/dp/") else 200)
+
+    urls = [f"https://www.amazon.com/dp/B00000000{i}" for i in range(3)] + ["https://www.amazon.com/ok"]
+    checker = _checker(handler)
+    started = time.perf_counter()
+    checks = checker.check(urls)
+
+    blocked = checks[urls[0]]
+    assert (blocked.http_status, blocked.blocked, blocked.definitive) == (503, True, True)
+    assert not checks["https://www.amazon.com/ok"].blocked
+    assert checker.stats["retries"] == 0
+    assert len(calls) == 3 * 2 + 1  # HEAD + GET per blocked page, nothing more
+    assert time.perf_counter() - started < 0.5
+    assert check_links.classify_http_check(blocked)["status"] == "error"
+
+
+def test_503_from_other_hosts_is_still_retried():
+    calls = []
+
+    def handler(request):
+        calls.append(request.method)
+        return httpx.Response(503 if len(calls) <= 2 else 200)
+
+    checker = _checker(handler)
+    check = checker.check(["https://a.test/x"])["https://a.test/x"]
+    assert (check.http_status, check.blocked) == (200, False)
+    assert checker.stats["retries"] == 1
+
+
+def test_transport_errors_are_retried_then_reported():
+    def handler(request):
+        raise httpx.ConnectError("reset by peer")
+
+    check = _checker(handler, max_retries=1).check(["https://a.test/x"])["https://a.test/x"]
+    assert check.error_kind == "connection"
+    assert check.error.startswith("Connection error")
+    assert not check.definitive
+
+
+# ── LinkCache ─────────────────────────────────────────────────────────────────
+
+def test_cache_skips_fresh_results_and_expires_old_ones(tmp_path):
+    path = tmp_path / "link_checks.json"
+    hits = []
+
+    def handler(request):
+        hits.append(str(request.url))
+        return httpx.Response(503 if request.url.path == "/flaky" else 200)
+
+    urls = ["https://a.test/ok", "https://a.test/flaky"]
+    _checker(handler, cache=LinkCache.load(path), max_retries=0).check(urls)
+    assert len(hits) == 3  # flaky: HEAD + GET fallback
+
+    hits.clear()
+    checks = _checker(handler, cache=LinkCache.load(path), max_retries=0).check(urls)
+    assert hits == ["https://a.test/flaky"] * 2  # 503 is never cached
+    assert checks["https://a.test/ok"].cached
+
+    later = lambda: time.time() + 3600  # noqa: E731
+    assert len(LinkCache.load(path, ttl=60, clock=later)) == 0
+    assert len(LinkCache.load(path, ttl=7200, clock=later)) == 1
+
+
+def test_cache_round_trip(tmp_path):
+    cache = LinkCache(tmp_path / "c.json", ttl=60)
+    cache.put(LinkCheck("https://a.test/x", 301, "https://a.test/y", checked_at=time.time()))
+    cache.save()
+    hit = LinkCache.load(tmp_path / "c.json", ttl=60).get("https://a.test/x")
+    assert (hit.http_status, hit.final_url, hit.cached) == (301, "https://a.test/y", True)
+
+
+# ── check_links integration ───────────────────────────────────────────────────
+
+def test_run_checks_uses_engine(tmp_path, monkeypatch):
+    monkeypatch.delenv("RAINFOREST_API_KEY", raising=False)
+    monkeypatch.setenv("LINK_INDEX_PATH", str(tmp_path / "link_index.json"))
+    page = tmp_path / "index.html"
+    page.write_text(
+        '<a href="https://www.amazon.com/dp/B000000001?tag=x-20">one</a>\n'
+        '<a href="https://www.amazon.com/dp/B000000002?tag=x-20">two</a>\n'
+        '<a href="https://www.amazon.com/dp/B000000001?tag=x-20">one again</a>\n'
+    )
+
+    def handler(request):
+        if "B000000002" in request.url.path:
+            return httpx.Response(302, headers={"Location": "https://www.amazon.com/errors/404"})
+        return httpx.Response(200)
+
+    original = LinkChecker.__init__
+
+    def init(self, *args, **kwargs):
+        original(self, *args, transport=_transport(handler), host_rate=1000, **kwargs)
+
+    monkeypatch.setattr(LinkChecker, "__init__", init)
+    report = check_links.run_checks([str(page)], str(tmp_path), use_cache=False)
+
+    assert report["summary"] == {"total": 2, "valid": 1, "broken": 1, "errors": 0}
+    broken = [r for r in report["results"] if r["status"] == "broken"][0]
+    assert broken["asin"] == "B000000002"
+    assert "Redirected to error page" in broken["error"]
@@ -0,0 +1,88 @@
+"""Tests for automation.links.link_index — single-pass scanning and incremental updates."""
+
+import os
+
+import pytest
+
+from automation.links import link_index
+from automation.links.extract_asins import extract_all_asins, extract_asins_from_file
+from automation.links.link_index import LinkIndex, scan_html
+
+PAGE = """<html><body>
+<a href="https://www.amazon.com/dp/b000000001?tag=good-20" class="btn">Buy <b>Creatine</b></a>
+<img src="https://m.media-amazon.com/images/I/abc.jpg" alt="Creatine tub">
+<p>See (https://www.amazon.com/s?k=protein+powder&tag=bad-20)</p>
+<a href="https://smile.amazon.com/gp/product/B000000002" title="Old smile link">x</a>
+</body></html>
+"""
+
+
+@pytest.fixture(autouse=True)
+def index_path(tmp_path, monkeypatch):
+    monkeypatch.setenv("LINK_INDEX_PATH", str(tmp_path / "cache" / "link_index.json"))
+
+
+def _site(tmp_path, pages):
+    site = tmp_path / "site"
+    for name, content in pages.items():
+        (site / name).parent.mkdir(parents=True, exist_ok=True)
+        (site / name).write_text(content)
+    return site
+
+
+def test_scan_extracts_every_field_in_one_pass():
+    rows = scan_html(PAGE)
+    assert [r[:5] for r in rows] == [
+        [2, "https://www.amazon.com/dp/b000000001?tag=good-20", "link", "B000000001", "good-20"],
+        [3, "https://m.media-amazon.com/images/I/abc.jpg", "image", None, None],
+        [4, "https://www.amazon.com/s?k=protein+powder&tag=bad-20", "search", None, "bad-20"],
+        [5, "https://smile.amazon.com/gp/product/B000000002", "other", "B000000002", None],
+    ]
+    assert rows[0][6] == "Buy Creatine"      # anchor text
+    assert rows[1][5] == "Creatine tub"      # alt context
+    assert rows[3][5] == "Old smile link"    # title context
+
+
+def test_update_is_incremental(tmp_path):
+    site = _site(tmp_path, {"a.html": PAGE, "b/c.html": PAGE, "notes.txt": PAGE})
+    index = LinkIndex.load()
+    assert index.update([site]) == {"scanned": 2, "unchanged": 0, "removed": 0}
+    assert len(index) == 8
+
+    # Touched but identical content is not re-parsed; edits and deletions are picked up
+    os.utime(site / "a.html", ns=(1, 1))
+    (site / "b" / "c.html").write_text('<a href="https://www.amazon.com/dp/B000000009">z</a>')
+    (site / "d.html").write_text("<p>no links</p>")
+    assert index.update([site]) == {"scanned": 2, "unchanged": 1, "removed": 0}
+    (site / "d.html").unlink()
+    assert index.update([site])["removed"] == 1
+    index.save()
+
+    reloaded = LinkIndex.load()
+    assert reloaded.update([site]) == {"scanned": 0, "unchanged": 2, "removed": 0}
+    files = [link.file for link in reloaded.links([str(site) + "/"], kinds={"link"})]
+    assert files == [str(site) + "/a.html", str(site) + "/b/c.html"]
+
+
+def test_parallel_scan_matches_serial(tmp_path, monkeypatch):
+    site = _site(tmp_path, {f"p{i}.html": PAGE for i in range(6)})
+    monkeypatch.setattr(link_index, "PARALLEL_MIN_FILES", 2)
+    parallel = LinkIndex(tmp_path / "p.json", workers=2)
+    parallel.update([site])
+    serial = LinkIndex(tmp_path / "s.json", workers=1)
+    serial.update([site])
+    assert list(parallel.links([site])) == list(serial.links([site]))
+
+
+def test_extract_all_asins_via_index(tmp_path):
+    site = _site(tmp_path, {"a.html": PAGE, "b.html": PAGE})
+    result = extract_all_asins([str(site)])
+    assert result["total_links_found"] == 4
+    assert [a["asin"] for a in result["asins"]] == ["B000000001", "B000000002"]
+    assert result["asins"][0]["locations"][1] == {
+        "file": os.path.join(str(site), "b.html"), "line": 2,
+        "url": "https://www.amazon.com/dp/b000000001?tag=good-20"}
+    assert (tmp_path / "cache" / "link_index.json").exists()
+
+    links = extract_asins_from_file(site / "a.html")
+    assert [(link.asin, link.line_number) for link in links] == [("B000000001", 2), ("B000000002", 5)]
@@ -0,0 +1,112 @@
+"""Tests for utils/llm_cache.py and its use in gemini_client / ClaudeClient."""
+
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from utils import llm_cache
+from utils.llm_cache import CacheMiss, ResponseCache, cached_generate, make_key
+from video_automation import gemini_client
+
+
+class FakeClock:
+    def __init__(self, now=1_000_000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def cache(tmp_path, monkeypatch):
+    """Fresh process-wide cache in tmp_path."""
+    cache = ResponseCache(tmp_path / "llm.sqlite")
+    monkeypatch.setattr(llm_cache, "_default_cache", cache)
+    monkeypatch.setenv("LLM_CACHE_MODE", "on")
+    return cache
+
+
+# ── keys / ResponseCache ──────────────────────────────────────────────────────
+
+def test_key_covers_every_parameter():
+    base = make_key("m", "prompt", 1000, True)
+    assert base == make_key("m", "prompt", 1000, True)
+    assert base != make_key("m2", "prompt", 1000, True)
+    assert base != make_key("m", "prompt", 2000, True)
+    assert base != make_key("m", "prompt", 1000, False)
+    assert base != make_key("m", "prompt", 1000, True, temperature=0.2)
+
+
+def test_ttl_expires_entries(tmp_path):
+    clock = FakeClock()
+    cache = ResponseCache(tmp_path / "c.sqlite", ttl=60, clock=clock)
+    cache.put("k", "v")
+    assert cache.get("k") == "v"
+    clock.now += 61
+    assert cache.get("k") is None
+    assert cache.get("k", ignore_ttl=True) == "v"
+
+
+def test_size_eviction_drops_least_recently_used(tmp_path):
+    clock = FakeClock()
+    cache = ResponseCache(tmp_path / "c.sqlite", max_bytes=250, clock=clock)
+    cache.put("a", "a" * 100)
+    clock.now += 1
+    cache.put("b", "b" * 100)
+    clock.now += 1
+    assert cache.get("a")  # "b" is now least recently used
+    clock.now += 1
+    cache.put("c", "c" * 100)
+    assert cache.get("b") is None
+    assert cache.get("a") and cache.get("c")
+    assert len(cache) == 2
+
+
+# ── modes ─────────────────────────────────────────────────────────────────────
+
+def test_on_mode_calls_api_once(cache):
+    produce = MagicMock(return_value="resp")
+    for _ in range(3):
+        assert cached_generate("m", "p", 100, False, produce) == "resp"
+    assert produce.call_count == 1
+
+
+def test_replay_mode_never_calls_api(cache, monkeypatch):
+    cached_generate("m", "p", 100, False, lambda: "resp")
+    monkeypatch.setenv("LLM_CACHE_MODE", "replay")
+    produce = MagicMock()
+    assert cached_generate("m", "p", 100, False, produce) == "resp"
+    with pytest.raises(CacheMiss):
+        cached_generate("m", "other", 100, False, produce)
+    produce.assert_not_called()
+
+
+def test_refresh_mode_overwrites(cache, monkeypatch):
+    cached_generate("m", "p", 100, False, lambda: "old")
+    monkeypatch.setenv("LLM_CACHE_MODE", "refresh")
+    assert cached_generate("m", "p", 100, False, lambda: "new") == "new"
+    monkeypatch.setenv("LLM_CACHE_MODE", "on")
+    assert cached_generate("m", "p", 100, False, lambda: "newer") == "new"
+
+
+def test_invalid_responses_are_not_cached(cache):
+    cached_generate("m", "p", 100, True, lambda: "not json", validate=lambda r: r.startswith("{"))
+    assert len(cache) == 0
+
+
+# ── gemini_client integration ─────────────────────────────────────────────────
+
+def test_generate_json_served_from_cache(cache):
+    with patch.object(gemini_client, "_generate", return_value='{"a": 1}') as generate:
+        assert gemini_client.generate_json("prompt") == '{"a": 1}'
+        assert gemini_client.generate_json("prompt") == '{"a": 1}'
+        assert gemini_client.generate_json("prompt", cache=False) == '{"a": 1}'
+    assert generate.call_count == 2
+
+
+def test_health_check_bypasses_cache(cache):
+    with patch.object(gemini_client, "_generate", return_value='{"status": "ok"}') as generate:
+        gemini_client.health_check()
+        gemini_client.health_check()
+    assert generate.call_count == 2
+    assert len(cache) == 0
@@ -0,0 +1,96 @@
+"""Tests for utils.markdown_renderer — golden output of the article converter."""
+
+from utils.markdown_renderer import (
+    ARTICLE_LINE_HOOKS, MarkdownRenderer, amazon_link_attrs, sponsored_link_attrs,
+)
+
+ARTICLE = """---
+title: "Best Foam Rollers"
+meta_description: "x"
+---
+
+# Best Foam Rollers for Recovery
+
+Rolling out *daily* helps. See [our pick](https://www.amazon.com/dp/B0040EKZDY?tag=fitover3509-20) or [the guide](/blog/recovery/).
+
+## Top Picks
+- **Firm:** best for *quads*
+* Soft: good for beginners
+| Roller | Density | Price |
+| --- | :-: | ---: |
+| **TriggerPoint** | Firm | $35 |
+| AmazonBasics | Soft | $15 |
+> Tip: roll **slowly**.
+<!--PRODUCT_CARD:foam roller-->
+Want more? [SIGNUP_FORM_PLACEHOLDER]
+#notaheading
+"""
+
+# Output of the previous pin_article_generator._markdown_to_html_body for ARTICLE
+GOLDEN = """<h1>Best Foam Rollers for Recovery</h1>
+<p>Rolling out <em>daily</em> helps. See <a href="https://www.amazon.com/dp/B0040EKZDY?tag=fitover3509-20" target="_blank" rel="nofollow sponsored">our pick</a> or <a href="/blog/recovery/">the guide</a>.</p>
+<h2>Top Picks</h2>
+<ul>
+  <li><strong>Firm:</strong> best for <em>quads</em></li>
+  <li>Soft: good for beginners</li>
+</ul>
+<div style="overflow-x:auto"><table>
+<thead><tr><th>Roller</th><th>Density</th><th>Price</th></tr></thead>
+<tbody>
+<tr><td><strong>TriggerPoint</strong></td><td>Firm</td><td>$35</td></tr>
+<tr><td>AmazonBasics</td><td>Soft</td><td>$15</td></tr>
+</tbody>
+</table></div>
+<blockquote>Tip: roll <strong>slowly</strong>.</blockquote>
+<!--PRODUCT_CARD:foam roller-->
+Want more? <!-- email-signup-placeholder -->
+<p>#notaheading</p>"""
+
+
+def test_article_renderer_matches_golden_output():
+    renderer = MarkdownRenderer(link_attrs=amazon_link_attrs, line_hooks=ARTICLE_LINE_HOOKS)
+    assert renderer.render(ARTICLE) == GOLDEN
+
+
+def test_pin_article_generator_uses_shared_renderer():
+    from video_automation.pin_article_generator import _markdown_to_html_body
+
+    assert _markdown_to_html_body(ARTICLE, 'fitness') == GOLDEN
+
+
+def test_hook_lines_keep_an_open_table_and_close_a_list():
+    renderer = MarkdownRenderer(link_attrs=amazon_link_attrs, line_hooks=ARTICLE_LINE_HOOKS)
+    html = renderer.render("| a |\n| 1 |\n<!--PRODUCT_CARD:x-->\n| 2 |\n"
+                           "[SIGNUP_FORM_PLACEHOLDER]\n- i\n<!--PRODUCT_CARD:y-->\ntext")
+    # Same as the previous pin_article_generator._markdown_to_html_body
+    assert html == ('<div style="overflow-x:auto"><table>\n<thead><tr><th>a</th></tr></thead>\n'
+                    "<tbody>\n<tr><td>1</td></tr>\n<!--PRODUCT_CARD:x-->\n<tr><td>2</td></tr>\n"
+                    "<!-- email-signup-placeholder -->\n</tbody>\n</table></div>\n"
+                    "<ul>\n  <li>i</li>\n</ul>\n<!--PRODUCT_CARD:y-->\n<p>text</p>")
+
+
+def test_keep_frontmatter_renders_it_as_text():
+    html = MarkdownRenderer(keep_frontmatter=True).render("---\ntitle: x\n---\n\n## Hi")
+    assert html == "<p>---</p>\n<p>title: x</p>\n<p>---</p>\n<h2>Hi</h2>"
+    assert MarkdownRenderer().render("---\ntitle: x\n---\n\n## Hi") == "<h2>Hi</h2>"
+
+
+def test_open_blocks_close_on_blank_lines_and_at_the_end():
+    html = MarkdownRenderer().render("- a\n- b\n\n| x |\n| y |")
+    assert html == ("<ul>\n  <li>a</li>\n  <li>b</li>\n</ul>\n"
+                    '<div style="overflow-x:auto"><table>\n<thead><tr><th>x</th></tr></thead>\n'
+                    "<tbody>\n<tr><td>y</td></tr>\n</tbody>\n</table></div>")
+
+
+def test_hooks_can_decline_and_skip_h1():
+    renderer = MarkdownRenderer(link_attrs=sponsored_link_attrs, skip_h1=True,
+                                line_hooks=ARTICLE_LINE_HOOKS)
+    html = renderer.render("# Title\nsee <!--PRODUCT_CARD:x--> and [shop](/go)")
+    assert html == ('<p>see <!--PRODUCT_CARD:x--> and '
+                    '<a href="/go" target="_blank" rel="nofollow sponsored">shop</a></p>')
+
+
+def test_plain_text_is_left_alone():
+    renderer = MarkdownRenderer()
+    assert renderer.inline("no markup here") == "no markup here"
+    assert renderer.render("a [b] c * d") == "<p>a [b] c * d</p>"
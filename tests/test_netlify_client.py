@@ -0,0 +1,101 @@
+"""Tests for core.netlify_client — batched digest deploys and the cached manifest."""
+
+import hashlib
+import threading
+
+import pytest
+
+from core.netlify_client import NetlifyClient
+
+
+class FakeResponse:
+    def __init__(self, payload=None):
+        self._payload = payload
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return self._payload
+
+
+class FakeNetlify:
+    """Just enough of the Netlify API: a live file map, digest deploys, uploads."""
+
+    def __init__(self, live_files=None):
+        self.live = dict(live_files or {})   # path -> sha
+        self.stored = set(self.live.values())
+        self.published = "d0"
+        self.calls = []
+        self.uploads = {}
+        self._lock = threading.Lock()
+        self._deploys = 0
+
+    def get(self, url, **kwargs):
+        self.calls.append(("GET", url.split("/api/v1")[1]))
+        if url.endswith("/files"):
+            return FakeResponse([{"id": p, "path": p, "sha": s} for p, s in self.live.items()])
+        return FakeResponse({"ssl_url": "https://blog.example", "published_deploy": {"id": self.published}})
+
+    def post(self, url, json=None, **kwargs):
+        self.calls.append(("POST", url.split("/api/v1")[1]))
+        self._deploys += 1
+        self.published = f"d{self._deploys}"
+        self.live = dict(json["files"])
+        return FakeResponse({"id": self.published,
+                             "required": sorted({s for s in json["files"].values()} - self.stored)})
+
+    def put(self, url, data=None, **kwargs):
+        with self._lock:
+            self.uploads[url.split("/files", 1)[1]] = data
+            self.stored.add(hashlib.sha1(data).hexdigest())
+        return FakeResponse()
+
+
+@pytest.fixture
+def api():
+    return FakeNetlify({"/index.html": "a" * 40})
+
+
+@pytest.fixture
+def client(api, tmp_path, monkeypatch):
+    monkeypatch.setenv("NETLIFY_API_TOKEN", "token")
+    monkeypatch.setenv("NETLIFY_SITE_ID", "site-1")
+    return NetlifyClient(manifest_dir=tmp_path, session=api)
+
+
+def _article(slug, body="Hello"):
+    return {"slug": slug, "title": slug.title(), "meta_description": "d", "content_html": f"<p>{body}</p>"}
+
+
+def test_publish_articles_uses_one_deploy_and_keeps_existing_files(client, api):
+    result = client.publish_articles([_article("one"), _article("two")], {"display_name": "Blog"})
+
+    assert result["success"]
+    assert [c[0] for c in api.calls] == ["GET", "GET", "POST"]   # site, live files, one deploy
+    assert sorted(api.uploads) == ["/blog/one/index.html", "/blog/two/index.html"]
+    assert "/index.html" in api.live                               # not dropped from the site
+    assert result["articles"][1]["published_url"] == "https://blog.example/blog/two/"
+    stats = result["stats"]
+    assert (stats["files_total"], stats["files_uploaded"], stats["files_skipped"]) == (3, 2, 0)
+    assert stats["bytes_uploaded"] == sum(len(d) for d in api.uploads.values())
+
+
+def test_unchanged_pages_are_not_uploaded_again(client, api):
+    pages = {"/a.html": b"same", "/b.html": b"old"}
+    client.deploy_files(pages)
+    api.calls.clear()
+    api.uploads.clear()
+
+    result = client.deploy_files({"/a.html": b"same", "/b.html": b"new"})
+
+    # Manifest matched the live deploy, so no file listing was fetched
+    assert [c[0] for c in api.calls] == ["GET", "POST"]
+    assert list(api.uploads) == ["/b.html"]
+    assert (result["stats"]["files_changed"], result["stats"]["files_skipped"]) == (1, 1)
+
+
+def test_publish_article_keeps_single_article_shape(client):
+    result = client.publish_article(_article("solo"), {})
+    assert result["success"] and result["published_url"].endswith("/blog/solo/")
+    assert set(result) >= {"deploy_id", "published_at"}
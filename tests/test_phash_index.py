@@ -0,0 +1,101 @@
+"""Tests for phash_index.py — perceptual-hash dedup index."""
+
+import random
+from io import BytesIO
+from unittest.mock import MagicMock
+
+import numpy as np
+from PIL import Image, ImageDraw
+
+from video_automation.phash_index import (
+    PerceptualHashIndex,
+    dhash,
+    hamming,
+    hamming_distances,
+)
+
+
+def _photo(seed, size=(600, 900)):
+    """Deterministic 'photo': smooth random blobs, so gradients are meaningful."""
+    rng = np.random.default_rng(seed)
+    small = rng.integers(0, 255, (6, 4, 3), dtype=np.uint8)
+    return Image.fromarray(small).resize(size, Image.BICUBIC)
+
+
+def _jpeg(img, quality=90):
+    out = BytesIO()
+    img.save(out, "JPEG", quality=quality)
+    return out.getvalue()
+
+
+def _random_hashes(n, seed=0):
+    rng = random.Random(seed)
+    return [f"{rng.getrandbits(64):016x}" for _ in range(n)]
+
+
+# ── dhash ─────────────────────────────────────────────────────────────────────
+
+def test_dhash_survives_reencode_and_resize():
+    img = _photo(1)
+    original = dhash(_jpeg(img))
+    assert len(original) == 16
+    assert hamming(original, dhash(_jpeg(img.resize((300, 450)), quality=40))) <= 2
+
+
+def test_dhash_tolerates_small_overlay_but_separates_photos():
+    img = _photo(1)
+    overlaid = img.copy()
+    ImageDraw.Draw(overlaid).rectangle([0, 800, 600, 900], fill=(0, 0, 0))
+    assert hamming(dhash(img), dhash(overlaid)) <= 6
+    assert hamming(dhash(img), dhash(_photo(2))) > 6
+
+
+def test_hamming_distances_matches_scalar():
+    hashes = _random_hashes(50)
+    query = hashes[7]
+    expected = [hamming(query, h) for h in hashes]
+    assert hamming_distances(query, hashes).tolist() == expected
+
+
+# ── PerceptualHashIndex ───────────────────────────────────────────────────────
+
+def test_find_matches_bruteforce():
+    index = PerceptualHashIndex(path="unused.json", max_distance=6)
+    hashes = _random_hashes(500)
+    # Plant near neighbours of hashes[0] at distances 1..8
+    hashes += [f"{int(hashes[0], 16) ^ ((1 << k) - 1):016x}" for k in range(1, 9)]
+    for h in hashes:
+        index.add(h, brand="fitness")
+    dists = hamming_distances(hashes[0], hashes)
+
+    for radius in (6, 20):  # multi-index lookup, then NumPy scan fallback
+        found = {h for _, h, _ in index.find(hashes[0], max_distance=radius)}
+        assert found == {h for h, d in zip(hashes, dists) if d <= radius}
+
+    query = f"{int(hashes[3], 16) ^ 0b1011:016x}"  # 3 bits from hashes[3]
+    assert index.nearest(query)[:2] == (3, hashes[3])
+
+
+def test_save_and_load_round_trip(tmp_path):
+    path = tmp_path / "phash.json"
+    index = PerceptualHashIndex(path)
+    index.add("00000000000000ff", brand="deals", ref="42")
+    index.save()
+
+    loaded = PerceptualHashIndex.load(path)
+    assert "00000000000000ff" in loaded
+    assert loaded.nearest("00000000000000fe")[2] == {"brand": "deals", "ref": "42"}
+
+
+def test_sync_pages_and_resumes_from_last_created_at(tmp_path):
+    index = PerceptualHashIndex(tmp_path / "phash.json")
+    rows = [{"brand": "fitness", "image_phash": h, "created_at": f"2026-01-01T00:00:{i:02d}"}
+            for i, h in enumerate(_random_hashes(3))]
+    client = MagicMock()
+    query = client.table.return_value.select.return_value.not_.is_.return_value.order.return_value
+    query.range.return_value.execute.return_value.data = rows
+    query.gt.return_value.range.return_value.execute.return_value.data = []
+
+    assert index.sync(client, tables=("content_history",)) == 3
+    assert index.sync(client, tables=("content_history",)) == 0
+    query.gt.assert_called_once_with("created_at", "2026-01-01T00:00:02")
@@ -0,0 +1,61 @@
+"""Tests for pin_batch_renderer.py — concurrent fetch/render of brand-template pins."""
+
+import time
+from unittest.mock import patch
+
+from video_automation.pin_batch_renderer import PinJob, render_pins_batch, summarize_timings
+
+
+def _slow_fetch(url, brand=""):
+    """Fake download: the 'slow' URL takes much longer than the others."""
+    time.sleep(0.3 if url == "slow" else 0.01)
+    return f"bg:{url}".encode()
+
+
+def _fake_render(brand, headline, subheadline, image_bytes=None):
+    return f"{brand}|{headline}|{image_bytes.decode() if image_bytes else ''}".encode()
+
+
+def _jobs(urls):
+    return [PinJob(brand="fitness", headline=f"h{i}", keyword_or_url=u, key=i)
+            for i, u in enumerate(urls)]
+
+
+def test_batch_renders_every_job_with_timings():
+    with patch("video_automation.pin_batch_renderer.fetch_background_bytes", side_effect=_slow_fetch), \
+         patch("video_automation.pin_batch_renderer.render_brand_pin", side_effect=_fake_render):
+        results = list(render_pins_batch(_jobs(["a", "b", "c"]), workers=2, use_processes=False))
+
+    assert sorted(r.key for r in results) == [0, 1, 2]
+    for r in results:
+        assert r.ok
+        assert r.image_bytes == f"fitness|h{r.key}|bg:{'abc'[r.key]}".encode()
+        assert set(r.timings) == {"fetch", "queue", "render", "total"}
+
+
+def test_slow_fetch_does_not_block_other_pins():
+    with patch("video_automation.pin_batch_renderer.fetch_background_bytes", side_effect=_slow_fetch), \
+         patch("video_automation.pin_batch_renderer.render_brand_pin", side_effect=_fake_render):
+        results = list(render_pins_batch(_jobs(["slow", "a", "b"]), workers=2, use_processes=False))
+
+    assert results[-1].key == 0  # the slow fetch finishes last, others stream first
+
+
+def test_render_failure_is_reported_not_raised():
+    def flaky_render(brand, headline, subheadline, image_bytes=None):
+        if headline == "h1":
+            raise ValueError("bad font")
+        return b"jpeg"
+
+    with patch("video_automation.pin_batch_renderer.fetch_background_bytes", return_value=None), \
+         patch("video_automation.pin_batch_renderer.render_brand_pin", side_effect=flaky_render):
+        results = {r.key: r for r in render_pins_batch(_jobs(["", "", ""]), workers=2,
+                                                        use_processes=False)}
+
+    assert not results[1].ok and "bad font" in results[1].error
+    assert results[0].ok and results[2].ok
+    assert summarize_timings(results.values())["ok"] == 2
+
+
+def test_empty_batch_yields_nothing():
+    assert list(render_pins_batch([])) == []
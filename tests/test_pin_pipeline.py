@@ -0,0 +1,202 @@
+"""Tests for pin_pipeline — staged runner, checkpoint/resume, content-engine stages."""
+
+import threading
+import time
+from dataclasses import dataclass, field
+from unittest.mock import MagicMock
+
+import pytest
+
+from pin_pipeline import Checkpoint, PinPipeline, Stage, StagePipeline
+from pin_pipeline.fakes import FakeSupabase, fake_photo, fake_services
+from video_automation.brand_history import BrandHistorySnapshot
+from video_automation.phash_index import PerceptualHashIndex, dhash
+
+
+@pytest.fixture(autouse=True)
+def no_llm_cache(monkeypatch):
+    monkeypatch.setenv("LLM_CACHE_MODE", "off")
+
+
+@dataclass
+class Item:
+    key: str
+    done: set = field(default_factory=set)
+    trail: list = field(default_factory=list)
+
+
+# ── StagePipeline ─────────────────────────────────────────────────────────────
+
+def _tag(name, delay=0.0):
+    def func(item):
+        time.sleep(delay)
+        item.trail.append(name)
+        return item
+    return func
+
+
+def test_runner_passes_every_item_through_every_stage():
+    pipeline = StagePipeline([Stage('a', _tag('a'), workers=3), Stage('b', _tag('b'), workers=2)],
+                             queue_size=1)
+    report = pipeline.run([Item(str(i)) for i in range(20)])
+    assert sorted(i.key for i in report.completed) == sorted(str(i) for i in range(20))
+    assert all(i.trail == ['a', 'b'] and i.done == {'a', 'b'} for i in report.completed)
+    assert report.counts == {'a': 20, 'b': 20}
+
+
+def test_stages_overlap():
+    active, peak, lock = set(), [0], threading.Lock()
+
+    def track(name):
+        def func(item):
+            with lock:
+                active.add(name)
+                peak[0] = max(peak[0], len(active))
+            time.sleep(0.02)
+            with lock:
+                active.discard(name)
+            return item
+        return func
+
+    StagePipeline([Stage('a', track('a')), Stage('b', track('b'))]).run([Item(str(i)) for i in range(6)])
+    assert peak[0] == 2
+
+
+def test_failures_call_hook_and_items_resume_at_first_unfinished_stage():
+    def boom(item):
+        raise ValueError(item.key)
+
+    on_error = MagicMock()
+    pipeline = StagePipeline([Stage('a', _tag('a')), Stage('b', boom, on_error=on_error),
+                              Stage('c', _tag('c'))])
+    report = pipeline.run([Item('x'), Item('y', done={'a', 'b'}), Item('z', done={'a', 'b', 'c'})])
+
+    assert [(i.key, stage) for i, stage, _ in report.failed] == [('x', 'b')]
+    on_error.assert_called_once()
+    assert {i.key: i.trail for i in report.completed} == {'y': ['c'], 'z': []}
+
+
+# ── PinPipeline ───────────────────────────────────────────────────────────────
+
+def _pipeline(tmp_path, db, services=None, run_id='run', **kwargs):
+    services = services or fake_services(tmp_path / 'articles', llm=0, network=0, cpu=0)
+    return PinPipeline(
+        db, ['fitness', 'deals'], history=BrandHistorySnapshot(trending={}),
+        phash_index=PerceptualHashIndex(tmp_path / 'phash.json'), services=services,
+        checkpoint=Checkpoint.open(run_id, directory=tmp_path / 'ckpt'),
+        workers={'generate': 2, 'render': 2, 'upload': 2, 'article': 2},
+        render_processes=False, **kwargs,
+    )
+
+
+def test_run_generates_renders_uploads_and_writes_articles(tmp_path):
+    db = FakeSupabase()
+    result = _pipeline(tmp_path, db).run()
+
+    assert len(result.rendered_pins) == 2
+    assert len(result.articles_generated) == 2
+    pins = db.rows('pinterest_pins')
+    assert {p['status'] for p in pins} == {'ready'}
+    assert all(p['image_url'].startswith('https://storage.example.com/') for p in pins)
+    assert all(p['destination_url'].endswith('.html') and p['article_generated'] for p in pins)
+    assert len(db.rows('content_history')) == 2
+
+
+def test_daily_cap_skips_brand_and_backlog_is_rendered(tmp_path):
+    today = time.strftime('%Y-%m-%dT%H:%M:%S+00:00', time.gmtime())
+    db = FakeSupabase({
+        'content_history': [{'brand': 'fitness', 'created_at': today}] * 3,
+        'pinterest_pins': [{'id': 500, 'brand': 'deals', 'title': 'Promo', 'status': 'content_ready',
+                            'created_at': today}],
+    })
+    result = _pipeline(tmp_path, db).run()
+
+    assert sorted(p['brand'] for p in result.rendered_pins) == ['deals', 'deals']
+    assert 500 in {p['id'] for p in result.picked_up}
+
+
+def test_dry_run_stops_after_generation(tmp_path):
+    db = FakeSupabase()
+    result = _pipeline(tmp_path, db, dry_run=True).run()
+    assert result.rendered_pins == []
+    assert db.rows('pinterest_pins') == []
+
+
+def test_crashed_run_resumes_without_regenerating(tmp_path):
+    db = FakeSupabase()
+    services = fake_services(tmp_path / 'articles', llm=0, network=0, cpu=0)
+    upload = services.upload_image
+    services.upload_image = MagicMock(side_effect=RuntimeError('storage down'))
+
+    first = _pipeline(tmp_path, db, services).run()
+    assert first.rendered_pins == []
+    assert {p['status'] for p in db.rows('pinterest_pins')} == {'content_ready'}  # reverted
+
+    generate = services.generate_content = MagicMock(wraps=services.generate_content)
+    services.upload_image = upload
+    second = _pipeline(tmp_path, db, services).run()
+
+    generate.assert_not_called()
+    assert second.report.counts['render'] == 0  # rendered images came from the checkpoint
+    assert len(second.rendered_pins) == 2
+    assert len(db.rows('pinterest_pins')) == 2  # no duplicates from the backlog query
+
+
+def test_duplicate_photo_is_repicked(tmp_path):
+    db = FakeSupabase()
+    services = fake_services(tmp_path / 'articles', llm=0, network=0, cpu=0)
+    first_pick = fake_photo(2)  # ids: content 1, photo 2
+    pipeline = _pipeline(tmp_path, db, services)
+    pipeline.brands = ['fitness']
+    pipeline.phash_index.add(dhash(first_pick), brand='deals')
+    pick = services.pick_image = MagicMock(wraps=services.pick_image)
+
+    result = pipeline.run()
+
+    assert pick.call_count == 2
+    assert len(result.rendered_pins) == 1
+    assert result.rendered_pins[0]['image_phash'] != dhash(first_pick)
+
+
+def _heavy_template(brand, headline, subheadline, image_bytes):
+    """Brand template that covers all but a small window of the photo."""
+    from io import BytesIO
+    from PIL import Image
+
+    canvas = Image.new('RGB', (1000, 1500), (240, 225, 200))
+    photo = Image.open(BytesIO(image_bytes)).convert('RGB').resize((200, 300))
+    canvas.paste(photo, (400, 600))
+    out = BytesIO()
+    canvas.save(out, 'JPEG', quality=85)
+    return out.getvalue()
+
+
+def test_different_photos_in_the_same_template_are_not_duplicates(tmp_path):
+    db = FakeSupabase()
+    services = fake_services(tmp_path / 'articles', llm=0, network=0, cpu=0)
+    services.render_template = _heavy_template
+    rendered = [_heavy_template('deals', '', '', fake_photo(seed)) for seed in (2, 5)]
+    assert dhash(rendered[0]) == dhash(rendered[1])  # the finished pins look alike
+
+    pipeline = _pipeline(tmp_path, db, services)
+    pipeline.brands = ['deals']
+    pipeline.phash_index.add(dhash(fake_photo(5)), brand='deals')  # earlier pin's photo
+    pick = services.pick_image = MagicMock(wraps=services.pick_image)
+
+    result = pipeline.run()
+
+    assert pick.call_count == 1  # photo 2 is new despite the identical template
+    assert result.rendered_pins[0]['image_phash'] == dhash(fake_photo(2))
+    assert pipeline.phash_index.nearest(dhash(fake_photo(2)))[2]['brand'] == 'deals'
+
+
+def test_schema_fallback_when_image_phash_column_missing(tmp_path):
+    columns = {'pinterest_pins': {
+        'brand', 'title', 'description', 'overlay_headline', 'overlay_subtext', 'tips',
+        'pexels_search_term', 'board_id', 'destination_url', 'topic', 'niche', 'visual_style',
+        'status', 'image_url', 'generated_image_url', 'article_generated',
+    }}
+    db = FakeSupabase(columns=columns, rpc=False)
+    result = _pipeline(tmp_path, db).run()
+    assert len(result.rendered_pins) == 2
+    assert all('image_phash' not in p for p in db.rows('pinterest_pins'))
@@ -0,0 +1,95 @@
+"""Tests for monitoring.preflight — concurrent probes, result cache, scenario readiness."""
+
+import time
+
+import pytest
+
+from monitoring.health_checker import HealthCheckResult
+from monitoring.preflight import HealthResultCache, Preflight, ScenarioActivation
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return HealthResultCache(tmp_path / "preflight.json", ttl_seconds=300)
+
+
+def _slow(service, delay, status="healthy"):
+    def probe(self):
+        time.sleep(delay)
+        return HealthCheckResult(service=service, status=status, response_time_ms=delay * 1000)
+    return probe
+
+
+def test_probes_run_concurrently_and_classify_failures(cache, monkeypatch):
+    monkeypatch.setattr(Preflight, "check_pexels", _slow("pexels", 0.2, status="unhealthy"))
+    monkeypatch.setattr(Preflight, "check_gemini", _slow("gemini", 0.2))
+    monkeypatch.setattr(Preflight, "check_gemini_generate", _slow("gemini_generate", 0.2, "unhealthy"))
+    monkeypatch.setattr(Preflight, "check_supabase_table",
+                        lambda self, t: _slow(f"supabase:{t}", 0.2)(self))
+    monkeypatch.setenv("GEMINI_API_KEY", "g" * 20)
+    monkeypatch.setenv("SUPABASE_URL", "https://db.example.co")
+    monkeypatch.setenv("SUPABASE_KEY", "s" * 20)
+    monkeypatch.delenv("PEXELS_API_KEY", raising=False)
+
+    started = time.perf_counter()
+    report = Preflight(["env", "supabase", "pexels", "gemini", "gemini_generate"], cache=cache).run()
+
+    assert time.perf_counter() - started < 0.6          # 8 probes x 0.2s, not serial
+    assert [r.service for r in report.results][:2] == ["env", "supabase:content_history"]
+    # Missing PEXELS key, a failing Pexels and a failing generation check are warnings only
+    assert report.critical_failures == []
+    assert len(report.warnings) == 3
+    assert report.timings["gemini"] == pytest.approx(200.0)
+
+
+def test_deadline_caps_the_stage(cache, monkeypatch):
+    monkeypatch.setattr(Preflight, "check_gemini", _slow("gemini", 2.0))
+    started = time.perf_counter()
+    report = Preflight(["gemini"], deadline_seconds=0.2, cache=cache).run()
+
+    assert time.perf_counter() - started < 1.0
+    assert report.critical_failures and "deadline" in report.critical_failures[0]
+
+
+def test_passing_results_are_reused_across_runs(cache, monkeypatch):
+    calls = []
+
+    def generate(self):
+        calls.append(1)
+        return HealthCheckResult(service="gemini_generate", status="healthy",
+                                 response_time_ms=900.0, details={"model": "m"})
+
+    monkeypatch.setattr(Preflight, "check_gemini_generate", generate)
+    Preflight(["gemini_generate"], cache=cache).run()
+    report = Preflight(["gemini_generate"], cache=cache).run()
+
+    assert len(calls) == 1
+    result = report.result("gemini_generate")
+    assert result.details["cached"] and result.details["model"] == "m"
+    assert result.response_time_ms == 0.0
+
+    expired = HealthResultCache(cache.path, ttl_seconds=300, clock=lambda: time.time() + 301)
+    assert expired.get("gemini_generate") is None
+
+
+def test_failures_are_not_cached(cache):
+    cache.put(HealthCheckResult(service="gemini", status="unhealthy", error="boom"))
+    assert cache.get("gemini") is None
+
+
+def test_activation_wait_only_covers_the_remaining_grace():
+    now = [100.0]
+    slept = []
+
+    def sleep(seconds):
+        slept.append(seconds)
+        now[0] += seconds
+
+    activation = ScenarioActivation("https://hook.example", grace_seconds=5,
+                                     clock=lambda: now[0], sleep=sleep)
+    assert activation.wait_ready() == 0          # never triggered: nothing to wait for
+
+    activation.ready_at = now[0] + 5
+    now[0] += 4                                  # rendering took 4s
+    assert activation.wait_ready() == pytest.approx(1.0)
+    assert activation.wait_ready() == 0
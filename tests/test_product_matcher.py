@@ -0,0 +1,142 @@
+"""Tests for automation.links.product_matcher and the one-pass affiliate sanitizer."""
+
+from difflib import SequenceMatcher
+
+import pytest
+
+from automation.links.product_matcher import AhoCorasick, ProductMatcher
+
+LINKS = {
+    "creatine monohydrate": "https://www.amazon.com/dp/B002DYIZEO?tag=t-20",
+    "creatine": "https://www.amazon.com/dp/B00EIY7AXE?tag=t-20",
+    "Vitamin D3": "https://www.amazon.com/dp/B00GB85JR4?tag=t-20",
+    "resistance bands set": "https://www.amazon.com/dp/B01AVDVHTI?tag=t-20",
+    "_default": "https://www.amazon.com/dp/B0DPFW7F4B?tag=t-20",
+}
+
+
+def _brute_first(mapping, query):
+    """The loop the matcher replaces."""
+    for key, value in mapping.items():
+        if key != "_default" and (key.lower() in query or query in key.lower()):
+            return key, value
+    return None
+
+
+def test_aho_corasick_reports_overlapping_matches():
+    automaton = AhoCorasick(["he", "she", "hers", "his"])
+    assert sorted(automaton.iter_matches("ushers")) == [(4, 0), (4, 1), (6, 2)]
+    assert automaton.first_key("this") == 3
+    assert automaton.first_key("xyz") is None
+
+
+@pytest.mark.parametrize("query", [
+    "best creatine monohydrate powder",   # two keys inside the query: map order wins
+    "creatine",                           # exact key, also inside an earlier key
+    "vitamin d3 for men",                 # keys match case-insensitively
+    "bands",                              # query inside a key
+    "protein powder",
+])
+def test_first_substring_match_follows_map_order(query):
+    assert ProductMatcher(LINKS).first_substring_match(query) == _brute_first(LINKS, query)
+
+
+def test_empty_query_or_map_matches_nothing():
+    assert ProductMatcher(LINKS).first_substring_match("") is None
+    assert ProductMatcher({}).first_substring_match("") is None
+    assert ProductMatcher({"_default": "x"}).first_substring_match("creatine") is None
+
+
+def test_word_overlap_and_closest():
+    matcher = ProductMatcher({"adjustable dumbbells": "A", "dumbbells": "B", "pull up bar": "C"})
+    assert matcher.best_word_overlap("heavy adjustable dumbbells") == ("adjustable dumbbells", "A")
+    assert matcher.best_word_overlap("pull up") is None          # 2/3 < 70%
+
+    keys = ["foam roller", "foam rollers set", "yoga mat", "jump rope"]
+    matcher = ProductMatcher({k: k for k in keys})
+    for query in ("foam rollr", "yoga mats", "jump", "zzz"):
+        ratios = [SequenceMatcher(None, query, k).ratio() for k in keys]
+        best = max(range(len(keys)), key=lambda i: (ratios[i], -i))
+        expected = (keys[best], keys[best]) if ratios[best] > 0.6 else None
+        assert matcher.closest(query) == expected
+
+
+def test_values_for_asin():
+    matcher = ProductMatcher(LINKS)
+    assert matcher.values_for_asin("B002DYIZEO") == [LINKS["creatine monohydrate"]]
+    assert matcher.values_for_asin("B0DPFW7F4B") == []           # _default is not matchable
+
+
+@pytest.fixture
+def pag(monkeypatch):
+    import video_automation.pin_article_generator as pag
+
+    monkeypatch.setitem(pag.AMAZON_AFFILIATE_LINKS, "fitness", {
+        k: v.replace("t-20", "fitover3509-20") for k, v in LINKS.items()})
+    pag._brand_matcher.cache_clear()
+    yield pag
+    pag._brand_matcher.cache_clear()
+
+
+def test_sanitize_rewrites_every_rule_in_one_pass(pag):
+    html = "\n".join([
+        '<a href="https://www.amazon.com/s?k=best+creatine+powder&tag=fitover3509-20">Creatine</a>',
+        '<a href="https://www.amazon.com/s?k=mystery+gadget">Gadget</a>',
+        '<a href="https://www.amazon.com/dp/XXXXXXXXXX?tag=menopauseplan-20">Fake</a>',
+        '<a href="https://www.amazon.com/dp/B00GB85JR4?tag=wrongtag-21">D3</a>',
+        '<a href="https://www.amazon.com/dp/B000BD0RT0">Magnesium</a>',
+        '<p>Use tag menopauseplan-20 or fitover3509-20.</p>',
+    ])
+    assert pag._sanitize_affiliate_links(html, "fitness").split("\n") == [
+        '<a href="https://www.amazon.com/dp/B00EIY7AXE?tag=fitover3509-20">Creatine</a>',
+        '<a href="https://www.amazon.com/dp/B0DPFW7F4B?tag=fitover3509-20">Gadget</a>',
+        '<a href="https://www.amazon.com/dp/B0DPFW7F4B?tag=fitover3509-20">Fake</a>',
+        '<a href="https://www.amazon.com/dp/B00GB85JR4?tag=fitover3509-20">D3</a>',
+        '<a href="https://www.amazon.com/dp/B000BD0RT0?tag=fitover3509-20">Magnesium</a>',
+        '<p>Use tag dailydealdarl-20 or fitover3509-20.</p>',
+    ]
+
+
+def test_validate_replaces_exact_urls_only(pag, monkeypatch):
+    from automation.links.asin_status import AsinStatus
+
+    class Verifier:
+        def verify(self, asins):
+            return {a: AsinStatus(asin=a, status="ok", http_status=200) for a in asins}
+
+    monkeypatch.setattr(pag, "get_asin_verifier", lambda: Verifier())
+    truncated = "https://www.amazon.com/dp/B002DYIZEO?tag=fitover3509-2"
+    longer = truncated + "0"
+    html, log = pag.validate_amazon_links(f'<a href="{truncated}">a</a><a href="{longer}">b</a>', "fitness")
+
+    # The mistagged link is fixed; the longer, correct link that starts with
+    # the same text is left alone
+    assert html == f'<a href="{longer}">a</a><a href="{longer}">b</a>'
+    assert log.count("Fixed tag: fitover3509-2 → fitover3509-20") == 1
+
+
+def test_validate_checks_each_asin_once_through_the_verifier(pag, monkeypatch):
+    from automation.links.asin_status import AsinStatus, AsinVerifier
+
+    statuses = {"B00GB85JR4": "broken", "B002DYIZEO": "ok", "B01AVDVHTI": "unknown"}
+    batches = []
+
+    class Verifier(AsinVerifier):
+        def _fetch(self, asins):
+            batches.append(sorted(asins))
+            return {a: AsinStatus(asin=a, status=statuses[a], http_status=200) for a in asins}
+
+    monkeypatch.setattr(pag, "get_asin_verifier", lambda: Verifier())
+    dead = "https://www.amazon.com/dp/B00GB85JR4"
+    wrong_tag = "https://www.amazon.com/dp/B002DYIZEO?tag=wrongtag-21"
+    html, log = pag.validate_amazon_links("".join([
+        f'<a href="{dead}">a</a>', f'<a href="{dead}?th=1">b</a>', f'<a href="{wrong_tag}">c</a>',
+        '<a href="https://www.amazon.com/dp/B01AVDVHTI">d</a>']), "fitness")
+
+    assert batches == [["B002DYIZEO", "B00GB85JR4", "B01AVDVHTI"]]
+    approved = LINKS["Vitamin D3"].replace("t-20", "fitover3509-20")
+    assert html == "".join([
+        f'<a href="{approved}">a</a>', f'<a href="{approved}">b</a>',
+        '<a href="https://www.amazon.com/dp/B002DYIZEO?tag=fitover3509-20">c</a>',
+        '<a href="https://www.amazon.com/dp/B01AVDVHTI">d</a>'])
+    assert any(line.startswith("SKIP: https://www.amazon.com/dp/B01AVDVHTI") for line in log)
@@ -0,0 +1,98 @@
+"""Tests for utils.related_articles — TF-IDF ranking and the incremental cache."""
+
+import os
+
+import pytest
+
+from utils.related_articles import RelatedArticleIndex, parse_article
+
+
+def _page(title, body):
+    return (f"<html><head><title>{title} — FitOver35</title></head>"
+            f"<body><nav>home workouts supplements</nav><p>{body}</p></body></html>")
+
+
+ARTICLES = {
+    "creatine-dosage.html": _page("Creatine Dosage Explained", "creatine loading phase monohydrate grams"),
+    "creatine-timing.html": _page("When to Take Creatine", "creatine monohydrate before workout grams"),
+    "protein-powder.html": _page("Protein Powder Picks", "whey protein isolate scoops grams"),
+    "protein-recipes.html": _page("High Protein Recipes", "whey protein pancakes oats"),
+    "sleep-recovery.html": _page("Sleep and Recovery", "deep sleep hours recovery hormones"),
+}
+
+
+@pytest.fixture
+def articles_dir(tmp_path):
+    root = tmp_path / "articles"
+    root.mkdir()
+    for name, html in ARTICLES.items():
+        (root / name).write_text(html)
+    return root
+
+
+def _open(articles_dir, tmp_path):
+    return RelatedArticleIndex.open(articles_dir, cache_path=tmp_path / "cache" / "related.json")
+
+
+def test_parse_article_weights_title_slug_and_skips_nav():
+    article = parse_article(ARTICLES["creatine-dosage.html"], "creatine-dosage.html")
+    assert article["title"] == "Creatine Dosage Explained"
+    # title x3 + slug x2 + body x1
+    assert article["terms"]["creatine"] == 6
+    assert "workouts" not in article["terms"]
+    assert parse_article("<p>no title</p>", "x.html") is None
+
+
+def test_parse_article_ignores_injected_related_links():
+    from scripts.add_internal_links import insert_link_in_text
+    from scripts.boost_internal_links import build_related_section
+
+    linked = [("sleep-recovery.html", 0.5, {"title": "Sleep and Recovery"})]
+    paragraph, added = insert_link_in_text("Creatine monohydrate works. Take five grams daily.",
+                                           "Protein Powder Picks", "protein-powder.html", "Protein Powder Picks")
+    assert added
+    html = _page("Creatine Dosage Explained", paragraph).replace(
+        "</body>", build_related_section(linked, "fitness") + "</body>")
+
+    terms = parse_article(html, "creatine-dosage.html")["terms"]
+    assert terms["monohydrate"] == 1
+    assert not {"sleep", "recovery", "protein", "powder", "picks"} & set(terms)
+
+
+def test_related_ranks_by_shared_specific_terms(articles_dir, tmp_path):
+    index = _open(articles_dir, tmp_path)
+    assert len(index) == 5
+
+    related = index.related("creatine-dosage.html", k=2)
+    assert related[0][0] == "creatine-timing.html"
+    assert related[0][2]["title"] == "When to Take Creatine"
+    assert all(name != "creatine-dosage.html" for name, _, _ in related)
+    assert index.related("sleep-recovery.html", k=3, min_score=0.0) == []
+    assert index.related("missing.html") == []
+
+
+def test_top_k_matches_per_article_queries(articles_dir, tmp_path):
+    index = _open(articles_dir, tmp_path)
+    everything = index.top_k(k=3)
+    assert list(everything) == sorted(ARTICLES)
+    for name, related in everything.items():
+        assert related == index.related(name, k=3)
+
+
+def test_refresh_only_reparses_changed_articles(articles_dir, tmp_path):
+    index = _open(articles_dir, tmp_path)
+    assert (tmp_path / "cache" / "related.json").exists()
+
+    # A fresh process loads term counts from the cache without re-parsing
+    reopened = RelatedArticleIndex(articles_dir, cache_path=tmp_path / "cache" / "related.json")
+    reopened._load()
+    assert reopened.refresh() == 0
+    assert reopened.top_k(k=2) == index.top_k(k=2)
+
+    (articles_dir / "sleep-recovery.html").write_text(
+        _page("Sleep for Protein Synthesis", "whey protein before sleep recovery"))
+    os.utime(articles_dir / "sleep-recovery.html", ns=(1, 1))
+    (articles_dir / "protein-recipes.html").unlink()
+    assert reopened.refresh() == 1
+    assert len(reopened) == 4
+    assert reopened.related("protein-powder.html", k=1)[0][0] == "sleep-recovery.html"
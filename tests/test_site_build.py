@@ -0,0 +1,90 @@
+"""Tests for utils.site_build — per-page input tracking and write-if-changed."""
+
+import os
+
+import pytest
+
+from utils.site_build import FRESH, UNCHANGED, WRITTEN, BuildGraph, deps_digest, write_if_changed
+
+
+@pytest.fixture
+def page(tmp_path):
+    path = tmp_path / "site" / "a.html"
+    path.parent.mkdir()
+    path.write_text("<p>hello</p>")
+    return path
+
+
+def _graph(tmp_path, version=1):
+    return BuildGraph.load("step", version=version, path=tmp_path / "state" / "step.json")
+
+
+def test_write_if_changed_skips_identical_bytes(tmp_path):
+    path = tmp_path / "p.html"
+    assert write_if_changed(path, "<p>x</p>")
+    os.utime(path, ns=(1, 1))
+    assert not write_if_changed(path, "<p>x</p>")
+    assert path.stat().st_mtime_ns == 1
+    assert write_if_changed(path, "<p>y</p>")
+    assert path.read_text() == "<p>y</p>"
+    assert [p.name for p in tmp_path.iterdir()] == ["p.html"]   # no temp files left
+
+
+def test_deps_digest_is_order_independent_for_dicts():
+    assert deps_digest({"a": 1, "b": 2}) == deps_digest({"b": 2, "a": 1})
+    assert deps_digest({"a": 1}) != deps_digest({"a": 2})
+
+
+def test_build_skips_pages_whose_inputs_did_not_change(page, tmp_path):
+    calls = []
+
+    def render(html):
+        calls.append(html)
+        return html.replace("hello", "hi")
+
+    graph = _graph(tmp_path)
+    deps = deps_digest({"brand": "fitness"})
+    assert graph.build(page, deps, render) == WRITTEN
+    assert graph.build(page, deps, render) == FRESH
+    graph.save()
+
+    # A new process: still fresh; a touch without edits is also fresh
+    graph = _graph(tmp_path)
+    os.utime(page, ns=(5, 5))
+    assert graph.build(page, deps, render) == FRESH
+    assert len(calls) == 1
+
+    # New deps re-render; identical output is not rewritten
+    assert graph.build(page, deps_digest({"brand": "deals"}), render) == UNCHANGED
+    assert page.stat().st_mtime_ns == 5
+
+    # An edit by someone else re-renders
+    page.write_text("<p>hello again</p>")
+    assert graph.build(page, deps_digest({"brand": "deals"}), render) == WRITTEN
+    assert page.read_text() == "<p>hi again</p>"
+    assert graph.written == [str(page)]
+
+
+def test_version_bump_and_prune(page, tmp_path):
+    graph = _graph(tmp_path)
+    deps = deps_digest("x")
+    graph.record(page, deps)
+    graph.save()
+    assert _graph(tmp_path).is_fresh(page, deps)
+    assert not _graph(tmp_path, version=2).is_fresh(page, deps)
+
+    graph = _graph(tmp_path)
+    assert graph.prune(page.parent, []) == 1
+    assert not graph.is_fresh(page, deps)
+
+
+def test_failed_render_is_retried(page, tmp_path):
+    graph = _graph(tmp_path)
+
+    def broken(html):
+        raise ValueError("bad page")
+
+    with pytest.raises(ValueError):
+        graph.build(page, "d", broken)
+    assert graph.build(page, "d", lambda html: None) == UNCHANGED
+    assert graph.build(page, "d", broken) == FRESH
@@ -0,0 +1,90 @@
+"""Tests for database/supabase_client.py — PinBatch bulk inserts and transitions."""
+
+import threading
+
+from database.supabase_client import PinBatch
+from pin_pipeline.fakes import FakeSupabase
+
+
+def _db(rpc=True, statuses=('content_ready', 'content_ready', 'ready'), **kwargs):
+    pins = [{'id': i, 'brand': 'fitness', 'status': s} for i, s in enumerate(statuses, 1)]
+    return FakeSupabase({'pinterest_pins': pins}, rpc=rpc, **kwargs)
+
+
+def test_inserts_flush_as_one_request_per_table():
+    db = FakeSupabase()
+    batch = PinBatch(db)
+    futures = [batch.insert('pinterest_pins', {'brand': 'fitness', 'title': f't{i}'}) for i in range(3)]
+    batch.insert('content_history', {'brand': 'fitness'})
+
+    result = batch.flush()
+
+    assert result.requests == 2
+    assert [f.result()['title'] for f in futures] == ['t0', 't1', 't2']
+    assert all(f.result()['id'] for f in futures)
+    assert len(batch) == 0
+
+
+def test_failed_bulk_insert_falls_back_per_row():
+    db = FakeSupabase(columns={'pinterest_pins': {'brand', 'status'}})
+    batch = PinBatch(db)
+    ok = batch.insert('pinterest_pins', {'brand': 'a', 'status': 'x'})
+    degraded = batch.insert('pinterest_pins', {'brand': 'b', 'tips': []}, fallback={'brand': 'b'})
+    batch.flush()
+    assert ok.result()['brand'] == 'a'
+    assert 'tips' not in degraded.result()
+
+
+def test_transitions_use_one_rpc_and_report_conflicts():
+    db = _db()
+    with PinBatch(db) as batch:
+        claims = [batch.transition(i, 'rendering', from_status='content_ready') for i in (1, 2, 3)]
+
+    assert [f.result() for f in claims] == [True, True, False]  # pin 3 is already ready
+    assert [r['status'] for r in db.rows('pinterest_pins')] == ['rendering', 'rendering', 'ready']
+    assert db.calls == [('transition_pinterest_pins', 'rpc')]
+
+
+def test_fallback_groups_identical_changes_into_one_update():
+    db = _db(rpc=False)
+    batch = PinBatch(db)
+    for i in (1, 2, 3):
+        batch.transition(i, 'rendering', from_status='content_ready')
+    batch.transition(1, None, image_url='u1')  # merged into pin 1's pending change
+
+    result = batch.flush()
+
+    assert sorted(result.applied) == [1, 2] and result.conflicts == [3]
+    assert db.rows('pinterest_pins', id=1)[0] == {'id': 1, 'brand': 'fitness', 'status': 'rendering',
+                                                   'image_url': 'u1'}
+    # rpc attempt, one update for pins 2+3, one for pin 1 (different values)
+    assert result.requests == 3
+
+
+def test_optional_columns_dropped_when_update_rejects_them():
+    db = _db(rpc=False, columns={'pinterest_pins': {'status', 'image_url'}})
+    batch = PinBatch(db)
+    done = batch.transition(1, 'ready', optional=('image_phash',), image_url='u', image_phash='ff')
+    batch.flush()
+    assert done.result() is True
+    assert db.rows('pinterest_pins', id=1)[0]['image_url'] == 'u'
+
+
+def test_wait_group_commits_concurrent_writers():
+    db = _db(statuses=['content_ready'] * 8, latency=0.01)
+    batch = PinBatch(db, window=0.05)
+    barrier = threading.Barrier(8)
+    results = {}
+
+    def worker(pin_id):
+        barrier.wait()
+        results[pin_id] = batch.wait(batch.transition(pin_id, 'rendering', from_status='content_ready'))
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(1, 9)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert all(results.values()) and len(results) == 8
+    assert len(db.calls) <= 2
@@ -9,6 +9,7 @@ Tests verify all Phase 6 success criteria:
 """
 
 import gc
+import time
 import pytest
 from pathlib import Path
 from unittest.mock import Mock, patch, MagicMock
@@ -757,3 +758,88 @@ class TestMultiBrandGeneration:
 
         # Working brand should succeed
         assert results["working-brand"].success_count == 1
+
+
+class TestPipelinedBatch:
+    """Tests for the pipelined batch executor."""
+
+    @staticmethod
+    def _slow_generator(output_dir, temp_dir, delay, **kwargs):
+        def slow(value):
+            def func(*a, **k):
+                time.sleep(delay)
+                return value
+            return func
+
+        mock_script_gen = Mock()
+        mock_script_gen.generate.side_effect = slow(Mock(
+            topic="Test topic", voiceover="Test.", search_terms=["test"], estimated_duration=30
+        ))
+        mock_video_fetch = Mock()
+        mock_video_fetch.fetch.side_effect = slow(Path("test.mp4"))
+        mock_audio_synth = Mock()
+        mock_audio_synth.synthesize.side_effect = slow(Mock(
+            word_timings=[WordTiming(text="Test.", start=0.0, end=1.0)],
+            duration_ms=1000,
+            audio_path=Path("test.mp3")
+        ))
+        mock_storage = Mock()
+        mock_storage.upload.side_effect = slow(Mock(public_url="https://example.com/video.mp4"))
+        return VideoGenerator(
+            script_generator=mock_script_gen,
+            video_fetcher=mock_video_fetch,
+            audio_synthesizer=mock_audio_synth,
+            storage_client=mock_storage,
+            output_dir=output_dir,
+            temp_dir=temp_dir,
+            **kwargs
+        )
+
+    def test_prepares_next_video_while_encoding(self, mock_brand_config, temp_dirs):
+        """Stages of different videos should overlap and report their timing."""
+        output_dir, temp_dir = temp_dirs
+        delay = 0.05
+        encoding = [0]
+        prepared_during_encode = []
+
+        def compose(**kwargs):
+            encoding[0] += 1
+            time.sleep(delay * 3)
+            encoding[0] -= 1
+
+        with patch("src.orchestration.video_generator.VideoCompositor") as MockCompositor:
+            MockCompositor.return_value.compose_video.side_effect = compose
+            vg = self._slow_generator(output_dir, temp_dir, delay, encode_workers=1,
+                                      prefetch_workers=2, encode_processes=False)
+            generate = vg.script_generator.generate.side_effect
+            vg.script_generator.generate.side_effect = lambda *a, **k: (
+                prepared_during_encode.append(encoding[0] > 0), generate(*a, **k))[1]
+            result = vg.generate_batch(mock_brand_config, count=4)
+
+        assert result.success_count == 4
+        assert any(prepared_during_encode)
+        assert set(result.stage_ms) == {"script", "fetch", "tts", "encode", "upload"}
+        assert result.stage_ms["encode"] >= 4 * delay * 3 * 1000 * 0.9
+        assert all(set(r.stage_ms) == set(result.stage_ms) for r in result.results)
+        assert len({r.video_path for r in result.results}) == 4
+
+    def test_encode_failure_is_isolated(self, mock_brand_config, temp_dirs):
+        """An encoder error should fail only its own video and keep earlier stage timing."""
+        output_dir, temp_dir = temp_dirs
+        calls = []
+
+        def compose(**kwargs):
+            calls.append(kwargs["output_path"])
+            if len(calls) == 2:
+                raise RuntimeError("ffmpeg encode failed")
+
+        with patch("src.orchestration.video_generator.VideoCompositor") as MockCompositor:
+            MockCompositor.return_value.compose_video.side_effect = compose
+            vg = self._slow_generator(output_dir, temp_dir, 0, encode_workers=1, encode_processes=False)
+            result = vg.generate_batch(mock_brand_config, count=3, upload=False)
+
+        assert result.success_count == 2
+        failed = [r for r in result.results if not r.success]
+        assert failed[0].error == "ffmpeg encode failed"
+        assert "tts" in failed[0].stage_ms and "encode" not in failed[0].stage_ms
+        assert "upload" not in result.stage_ms
@@ -0,0 +1,115 @@
+"""Tests for video_pipeline.video_renderer — render profiles, text panel, filter graph, prefetch."""
+
+import subprocess
+import threading
+import time
+
+import pytest
+from PIL import Image
+
+from video_pipeline import video_renderer
+from video_pipeline.config import BrandColors
+from video_pipeline.video_renderer import (
+    RENDER_PROFILES,
+    _build_filter_complex,
+    _fetch_pexels_images,
+    _render_text_panel,
+    get_render_profile,
+    render_video,
+)
+
+COLORS = BrandColors(primary='#1A1A2E', accent='#E94560', text='#FFFFFF')
+
+
+@pytest.fixture(autouse=True)
+def clean_env(monkeypatch):
+    monkeypatch.delenv('VIDEO_RENDER_PROFILE', raising=False)
+    monkeypatch.delenv('VIDEO_RENDER_THREADS', raising=False)
+
+
+# ── Profiles ──────────────────────────────────────────────────────────────────
+
+def test_profile_resolution(monkeypatch):
+    assert get_render_profile().name == 'standard'
+    assert get_render_profile('Draft') is RENDER_PROFILES['draft']
+
+    monkeypatch.setenv('VIDEO_RENDER_PROFILE', 'final')
+    monkeypatch.setenv('VIDEO_RENDER_THREADS', '2')
+    profile = get_render_profile()
+    assert (profile.name, profile.threads) == ('final', 2)
+    assert profile.codec_args() == ['-c:v', 'libx264', '-preset', 'slow', '-crf', '20',
+                                    '-tune', 'stillimage', '-threads', '2']
+
+    with pytest.raises(ValueError):
+        get_render_profile('ultra')
+
+
+# ── Filter graph and text panel ───────────────────────────────────────────────
+
+def test_filter_graph_overlays_panel_instead_of_drawtext(tmp_path):
+    images = [tmp_path / f'{i}.jpg' for i in range(3)]
+    graph, _ = _build_filter_complex(images, None, 'Title', ['a', 'b'], COLORS, 9.0,
+                                     panel_input=3, supersample=1)
+    assert 'drawtext' not in graph and 'drawbox' not in graph
+    assert '[vconcat][3:v]overlay=' in graph
+    assert graph.count('d=75:') == 3  # 3s per image at 25 fps
+    assert 'scale=720:1280' in graph
+
+
+def test_text_panel_is_translucent_with_text(tmp_path):
+    path = _render_text_panel('A fairly long title that will be shortened by textwrap',
+                              ['one', 'two', 'three', 'four'], COLORS, tmp_path / 'panel.png')
+    panel = Image.open(path)
+    assert panel.size == (video_renderer.VIDEO_W, video_renderer.PANEL_HEIGHT)
+    assert panel.mode == 'RGBA'
+    alphas = set(panel.getchannel('A').getdata())
+    assert int(0.55 * 255) in alphas and 255 in alphas
+    assert (255, 255, 255, 255) in set(panel.getdata())  # title in colors.text
+
+
+# ── Concurrent Pexels prefetch ────────────────────────────────────────────────
+
+def test_fetch_is_concurrent_ordered_and_replaces_failures(tmp_path, monkeypatch):
+    monkeypatch.setenv('PEXELS_API_KEY', 'test')
+    active, peak, lock = [0], [0], threading.Lock()
+
+    def fake_fetch(query, orientation, img_path, api_key):
+        with lock:
+            active[0] += 1
+            peak[0] = max(peak[0], active[0])
+        time.sleep(0.05)
+        with lock:
+            active[0] -= 1
+        return None if query == 'bad' else img_path
+
+    monkeypatch.setattr(video_renderer, '_fetch_pexels_image', fake_fetch)
+    paths = _fetch_pexels_images(['a', 'bad', 'c', 'd', 'e'], 3, 'portrait', tmp_path)
+
+    assert [p.name for p in paths] == ['img_00.jpg', 'img_02.jpg', 'img_03.jpg']
+    assert peak[0] == 3
+
+
+# ── End-to-end render ─────────────────────────────────────────────────────────
+
+def _ffmpeg():
+    try:
+        from moviepy.config import FFMPEG_BINARY
+        return FFMPEG_BINARY
+    except Exception:
+        pytest.skip('no ffmpeg binary available')
+
+
+def test_render_draft_has_requested_duration(tmp_path, monkeypatch):
+    ffmpeg = _ffmpeg()
+    monkeypatch.setattr(video_renderer, '_ffmpeg_bin', lambda: ffmpeg)
+    images = []
+    for i, color in enumerate(['red', 'blue']):
+        images.append(tmp_path / f'{i}.jpg')
+        Image.new('RGB', (400, 600), color).save(images[-1])
+
+    out = render_video(images, None, tmp_path / 'out.mp4', 'Title', ['Point'], COLORS, 2.0,
+                       profile='draft')
+
+    info = subprocess.run([ffmpeg, '-i', str(out)], capture_output=True, text=True).stderr
+    assert 'Duration: 00:00:02.00' in info
+    assert '720x1280' in info
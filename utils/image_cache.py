@@ -0,0 +1,220 @@
+"""Shared on-disk cache for downloaded background images.
+
+Pin templates, article heroes and video backgrounds all pull the same Pexels
+photos run after run. ImageCache stores each download once, keyed by Pexels
+photo id plus size variant (other hosts fall back to a URL hash), and evicts
+least-recently-used files once the directory grows past a byte budget.
+
+It also helps to never fetch or decode more pixels than a render needs:
+  - pexels_cover_url() picks the smallest Pexels rendition that still covers
+    the target box instead of src.original (often 4000-6000px tall)
+  - open_for_cover() uses Pillow's JPEG draft mode / reduce() so a large
+    photo is decoded at a fraction of its size before the final LANCZOS resize
+
+Usage:
+    from utils.image_cache import get_image_cache, pexels_cover_url
+
+    url = pexels_cover_url(photo, 1000, 1500)
+    image_bytes = get_image_cache().fetch(url)
+"""
+
+import hashlib
+import logging
+import os
+import re
+import tempfile
+import threading
+import time
+from io import BytesIO
+from pathlib import Path
+from typing import Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit
+
+import requests
+from PIL import Image
+
+logger = logging.getLogger(__name__)
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+DEFAULT_CACHE_DIR = PROJECT_ROOT / "cache" / "images"
+DEFAULT_MAX_BYTES = 500 * 1024 * 1024  # 500 MB
+
+_PEXELS_PHOTO_ID = re.compile(r"/photos/(\d+)/")
+
+
+def _cache_key(url: str) -> str:
+    """Return a filesystem-safe key: pexels_<id>_<variant> or url_<hash>."""
+    parts = urlsplit(url)
+    match = _PEXELS_PHOTO_ID.search(parts.path)
+    if match and "pexels.com" in parts.netloc:
+        query = urlencode(sorted(parse_qsl(parts.query)))
+        variant = hashlib.sha1(query.encode()).hexdigest()[:10] if query else "original"
+        return f"pexels_{match.group(1)}_{variant}"
+    return f"url_{hashlib.sha256(url.encode()).hexdigest()[:24]}"
+
+
+class ImageCache:
+    """Size-bounded LRU cache of image bytes on disk.
+
+    Recency is tracked with file mtimes (touched on every hit), so the cache
+    survives across processes and CI runs that restore the directory.
+    """
+
+    def __init__(
+        self,
+        cache_dir: Optional[Path] = None,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+    ) -> None:
+        self.cache_dir = Path(cache_dir or DEFAULT_CACHE_DIR)
+        self.max_bytes = max_bytes
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._total_bytes = sum(p.stat().st_size for p in self._files())
+        self.hits = 0
+        self.misses = 0
+
+    def _files(self):
+        return [p for p in self.cache_dir.iterdir() if p.is_file() and not p.name.startswith(".")]
+
+    def path_for(self, url: str) -> Path:
+        return self.cache_dir / _cache_key(url)
+
+    def get(self, url: str) -> Optional[bytes]:
+        """Return cached bytes for url, or None on a miss."""
+        path = self.path_for(url)
+        try:
+            data = path.read_bytes()
+        except OSError:
+            return None
+        try:
+            os.utime(path, None)  # mark as recently used
+        except OSError:
+            pass
+        return data
+
+    def put(self, url: str, data: bytes) -> None:
+        """Store bytes atomically, then evict LRU files over the budget."""
+        path = self.path_for(url)
+        fd, tmp = tempfile.mkstemp(dir=self.cache_dir, prefix=".tmp-")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            old_size = path.stat().st_size if path.exists() else 0
+            os.replace(tmp, path)
+        except OSError as e:
+            logger.warning(f"Image cache write failed for {path.name}: {e}")
+            Path(tmp).unlink(missing_ok=True)
+            return
+        with self._lock:
+            self._total_bytes += len(data) - old_size
+            if self._total_bytes > self.max_bytes:
+                self._evict()
+
+    def _evict(self) -> None:
+        """Delete least-recently-used files until under max_bytes (lock held)."""
+        entries = []
+        for p in self._files():
+            try:
+                st = p.stat()
+            except OSError:
+                continue
+            entries.append((st.st_mtime, st.st_size, p))
+        entries.sort()
+        total = sum(size for _, size, _ in entries)
+        removed = 0
+        for _, size, p in entries:
+            if total <= self.max_bytes:
+                break
+            try:
+                p.unlink()
+                total -= size
+                removed += 1
+            except OSError:
+                continue
+        self._total_bytes = total
+        if removed:
+            logger.info(f"Image cache: evicted {removed} file(s), {total / 1e6:.1f} MB kept")
+
+    def fetch(self, url: str, timeout: int = 30, headers: Optional[dict] = None) -> bytes:
+        """Return image bytes for url, downloading and caching on a miss.
+
+        Raises requests exceptions on download failure, like requests.get.
+        """
+        data = self.get(url)
+        if data is not None:
+            self.hits += 1
+            return data
+        self.misses += 1
+        started = time.perf_counter()
+        resp = requests.get(url, timeout=timeout, headers=headers)
+        resp.raise_for_status()
+        data = resp.content
+        self.put(url, data)
+        logger.debug(
+            f"Image cache MISS {_cache_key(url)}: {len(data) / 1e3:.0f} KB "
+            f"in {time.perf_counter() - started:.2f}s"
+        )
+        return data
+
+
+_default_cache = None
+_default_lock = threading.Lock()
+
+
+def get_image_cache() -> ImageCache:
+    """Process-wide cache configured from IMAGE_CACHE_DIR / IMAGE_CACHE_MAX_MB."""
+    global _default_cache
+    with _default_lock:
+        if _default_cache is None:
+            cache_dir = os.environ.get("IMAGE_CACHE_DIR") or DEFAULT_CACHE_DIR
+            max_mb = int(os.environ.get("IMAGE_CACHE_MAX_MB", DEFAULT_MAX_BYTES // (1024 * 1024)))
+            _default_cache = ImageCache(Path(cache_dir), max_mb * 1024 * 1024)
+        return _default_cache
+
+
+def fetch_image_bytes(url: str, timeout: int = 30, headers: Optional[dict] = None) -> bytes:
+    """Download url through the shared cache."""
+    return get_image_cache().fetch(url, timeout=timeout, headers=headers)
+
+
+def pexels_cover_url(photo: dict, min_width: int, min_height: int) -> str:
+    """Smallest Pexels rendition of `photo` that covers min_width x min_height.
+
+    The stock variants top out below a 1000x1500 pin (large2x is at most
+    1300px tall, portrait is an 800x1200 crop), so the CDN is asked for an
+    exact size from src.original by constraining whichever side binds when
+    covering the box. Falls back to src.original when the photo is already
+    too small or its dimensions are unknown.
+    """
+    src = photo.get("src", {})
+    original = src.get("original", "")
+    width, height = photo.get("width"), photo.get("height")
+    if not original or not width or not height:
+        return original
+    if width < min_width or height < min_height:
+        return original
+
+    # Cover: scale so both sides are >= the box; the side with the larger
+    # required scale factor binds.
+    if min_width / width >= min_height / height:
+        size = {"w": min_width}
+    else:
+        size = {"h": min_height}
+    base = original.split("?", 1)[0]
+    return f"{base}?{urlencode({'auto': 'compress', 'cs': 'tinysrgb', **size})}"
+
+
+def open_for_cover(image_bytes: bytes, width: int, height: int) -> Image.Image:
+    """Decode image bytes as RGB at no more than ~2x the size needed to cover width x height.
+
+    JPEGs are decoded with draft() (DCT scaling, never below the box);
+    other formats are shrunk with reduce() by the largest integer factor that
+    still covers the box. The caller does the final resize/crop.
+    """
+    img = Image.open(BytesIO(image_bytes))
+    if img.format == "JPEG":
+        img.draft("RGB", (width, height))
+    factor = min(img.width // width, img.height // height)
+    if factor >= 2:
+        img = img.reduce(factor)
+    return img.convert("RGB")
@@ -0,0 +1,208 @@
+"""Content-addressed cache for LLM responses (Gemini via gemini_client and ClaudeClient).
+
+Re-running a failed workflow used to regenerate every pin and article from
+scratch. ResponseCache stores each successful response in SQLite, keyed by a
+hash of (model, prompt, max_tokens, json_mode, extra params), with a TTL and
+a size budget enforced by least-recently-used eviction.
+
+Modes (LLM_CACHE_MODE):
+    on       serve fresh hits, call the API on a miss and store the result (default)
+    off      never read or write the cache
+    refresh  always call the API, overwrite the cached response
+    replay   serve only from cache (ignoring TTL); a miss raises CacheMiss.
+             Deterministic and free — for tests and content-engine dry runs
+
+Usage:
+    from utils.llm_cache import cached_generate
+
+    text = cached_generate("gemini-auto", prompt, max_tokens, json_mode,
+                           produce=lambda: call_the_api(prompt))
+"""
+
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+DEFAULT_CACHE_PATH = PROJECT_ROOT / "cache" / "llm_responses.sqlite"
+DEFAULT_TTL_SECONDS = 24 * 3600
+DEFAULT_MAX_BYTES = 100 * 1024 * 1024  # 100 MB
+
+MODES = ("on", "off", "refresh", "replay")
+
+
+class CacheMiss(RuntimeError):
+    """Raised in replay mode when a prompt has no cached response."""
+
+
+def make_key(model: str, prompt: str, max_tokens: int, json_mode: bool, **extra) -> str:
+    """Deterministic cache key for one LLM call."""
+    payload = json.dumps(
+        {"model": model, "prompt": prompt, "max_tokens": max_tokens,
+         "json_mode": bool(json_mode), **extra},
+        sort_keys=True, ensure_ascii=False,
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def cache_mode() -> str:
+    """Current mode from LLM_CACHE_MODE (unknown values fall back to "on")."""
+    mode = os.environ.get("LLM_CACHE_MODE", "on").strip().lower()
+    if mode not in MODES:
+        logger.warning(f"Unknown LLM_CACHE_MODE={mode!r} — using 'on'")
+        return "on"
+    return mode
+
+
+class ResponseCache:
+    """SQLite-backed LLM response store with TTL and LRU size eviction.
+
+    One connection is shared across threads behind a lock; SQLite's own
+    locking covers separate processes using the same file.
+    """
+
+    def __init__(
+        self,
+        path: Optional[Path] = None,
+        ttl: float = DEFAULT_TTL_SECONDS,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.path = Path(path or DEFAULT_CACHE_PATH)
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self._clock = clock
+        self._lock = threading.Lock()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.path), timeout=30, check_same_thread=False)
+        with self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                " key TEXT PRIMARY KEY, model TEXT, response TEXT NOT NULL,"
+                " size INTEGER NOT NULL, created_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed_at)"
+            )
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str, ignore_ttl: bool = False) -> Optional[str]:
+        """Return the cached response, or None if missing or older than the TTL."""
+        now = self._clock()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT response, created_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None or (not ignore_ttl and now - row[1] > self.ttl):
+                self.misses += 1
+                return None
+            with self._conn:
+                self._conn.execute("UPDATE responses SET accessed_at = ? WHERE key = ?", (now, key))
+            self.hits += 1
+            return row[0]
+
+    def put(self, key: str, response: str, model: str = "") -> None:
+        """Store a response, then evict least-recently-used rows over max_bytes."""
+        now = self._clock()
+        size = len(response.encode())
+        with self._lock:
+            try:
+                with self._conn:
+                    self._conn.execute(
+                        "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?)",
+                        (key, model, response, size, now, now),
+                    )
+                    self._evict()
+            except sqlite3.Error as e:
+                logger.warning(f"LLM cache write failed: {e}")
+
+    def _evict(self) -> None:
+        """Drop expired rows, then LRU rows until under max_bytes (lock held)."""
+        self._conn.execute("DELETE FROM responses WHERE created_at < ?", (self._clock() - self.ttl,))
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        removed = 0
+        for key, size in self._conn.execute(
+            "SELECT key, size FROM responses ORDER BY accessed_at"
+        ).fetchall():
+            if total <= self.max_bytes:
+                break
+            self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+            total -= size
+            removed += 1
+        logger.info(f"LLM cache: evicted {removed} response(s), {total / 1e6:.1f} MB kept")
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+
+
+_default_cache = None
+_default_lock = threading.Lock()
+
+
+def get_response_cache() -> ResponseCache:
+    """Process-wide cache configured from LLM_CACHE_PATH / LLM_CACHE_TTL_HOURS / LLM_CACHE_MAX_MB."""
+    global _default_cache
+    with _default_lock:
+        if _default_cache is None:
+            path = os.environ.get("LLM_CACHE_PATH") or DEFAULT_CACHE_PATH
+            ttl_hours = float(os.environ.get("LLM_CACHE_TTL_HOURS", DEFAULT_TTL_SECONDS / 3600))
+            max_mb = int(os.environ.get("LLM_CACHE_MAX_MB", DEFAULT_MAX_BYTES // (1024 * 1024)))
+            _default_cache = ResponseCache(Path(path), ttl_hours * 3600, max_mb * 1024 * 1024)
+        return _default_cache
+
+
+def cached_generate(
+    model: str,
+    prompt: str,
+    max_tokens: int,
+    json_mode: bool,
+    produce: Callable[[], str],
+    use_cache: bool = True,
+    validate: Optional[Callable[[str], bool]] = None,
+    **extra,
+) -> str:
+    """Return a cached response for this call, or produce() and cache it.
+
+    Only successful responses are stored: produce() raising, a non-string
+    result, or validate(response) failing skips the write. In replay mode
+    produce() is never called.
+    """
+    mode = cache_mode()
+    if not use_cache or mode == "off":
+        return produce()
+
+    cache = get_response_cache()
+    key = make_key(model, prompt, max_tokens, json_mode, **extra)
+    if mode != "refresh":
+        cached = cache.get(key, ignore_ttl=(mode == "replay"))
+        if cached is not None:
+            logger.debug(f"LLM cache HIT {key[:12]} ({model})")
+            return cached
+    if mode == "replay":
+        raise CacheMiss(f"LLM_CACHE_MODE=replay and no cached response for {model} prompt {key[:12]}")
+
+    response = produce()
+    if isinstance(response, str) and _is_valid(response, validate):
+        cache.put(key, response, model)
+    return response
+
+
+def _is_valid(response: str, validate: Optional[Callable[[str], bool]]) -> bool:
+    if validate is None:
+        return True
+    try:
+        return bool(validate(response))
+    except Exception:
+        return False
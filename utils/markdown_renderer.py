@@ -0,0 +1,223 @@
+"""Shared Markdown-to-HTML renderer for generated articles.
+
+pin_article_generator, core/netlify_client and seo_content_machine each had
+their own converter: a line loop or a stack of whole-document re.sub passes,
+with uncompiled patterns and (in pin_article_generator) a link closure
+rebuilt for every paragraph, list item and table cell.
+
+MarkdownRenderer does it in one pass:
+
+- Each line is tokenized once (blank, raw, table row, heading, quote,
+  list item, paragraph), dispatching on its first character
+- The open <ul>/<table> is tracked as a single block state and output goes
+  into one list, joined at the end
+- Inline formatting (links, bold, italic) uses precompiled patterns and is
+  skipped entirely for text without '[' or '*'
+- Line hooks let callers own special lines, e.g. the PRODUCT_CARD comments
+  and the signup placeholder in brand articles (see ARTICLE_LINE_HOOKS)
+
+The output is identical to the old pin_article_generator converter for the
+same options; tests/test_markdown_renderer.py holds golden output for it.
+
+Usage:
+    renderer = MarkdownRenderer(link_attrs=amazon_link_attrs,
+                                line_hooks=ARTICLE_LINE_HOOKS)
+    html = renderer.render(markdown)
+"""
+
+import re
+from typing import Callable, Dict, List, Optional
+
+FRONTMATTER_RE = re.compile(r'---\s*\n.*?\n---\s*\n?', re.DOTALL)
+HEADING_RE = re.compile(r'(#{1,6})\s+(.+)$')
+TABLE_SEPARATOR_RE = re.compile(r'\|[\s\-:|]+\|$')
+LINK_RE = re.compile(r'\[([^\]]+)\]\(([^)]+)\)')
+BOLD_RE = re.compile(r'\*\*([^*]+)\*\*')
+ITALIC_RE = re.compile(r'\*([^*]+)\*')
+
+SPONSORED_LINK_ATTRS = ' target="_blank" rel="nofollow sponsored"'
+
+PRODUCT_CARD_MARKER = '<!--PRODUCT_CARD:'
+SIGNUP_PLACEHOLDER = '[SIGNUP_FORM_PLACEHOLDER]'
+SIGNUP_COMMENT = '<!-- email-signup-placeholder -->'
+
+TABLE_OPEN = '<div style="overflow-x:auto"><table>'
+
+# Token kinds
+BLANK, RAW, ROW, HEADING, QUOTE, ITEM, PARAGRAPH = range(7)
+
+LineHook = Callable[[str], Optional[str]]
+
+
+def amazon_link_attrs(url: str) -> str:
+    """Affiliate Amazon links open in a new tab and are marked sponsored."""
+    if 'amazon.com' in url and 'tag=' in url:
+        return SPONSORED_LINK_ATTRS
+    return ''
+
+
+def sponsored_link_attrs(url: str) -> str:
+    """Every link is treated as sponsored (SEO cluster articles)."""
+    return SPONSORED_LINK_ATTRS
+
+
+def _product_card(line: str) -> Optional[str]:
+    # Product card comments are expanded later; pass them through unwrapped
+    return line if line.startswith(PRODUCT_CARD_MARKER) else None
+
+
+def _signup_placeholder(line: str) -> Optional[str]:
+    return line.replace(SIGNUP_PLACEHOLDER, SIGNUP_COMMENT)
+
+
+ARTICLE_LINE_HOOKS: Dict[str, LineHook] = {
+    PRODUCT_CARD_MARKER: _product_card,
+    SIGNUP_PLACEHOLDER: _signup_placeholder,
+}
+
+
+def strip_frontmatter(markdown: str) -> str:
+    """Drop a leading '---' YAML frontmatter block and surrounding whitespace."""
+    match = FRONTMATTER_RE.match(markdown)
+    if match:
+        markdown = markdown[match.end():]
+    return markdown.strip()
+
+
+class MarkdownRenderer:
+    """Single-pass Markdown renderer for the subset the article generators emit.
+
+    Handles headings, paragraphs, blockquotes, '-'/'*' lists, pipe tables,
+    links, bold and italic. Anything else is passed through as text.
+
+    Args:
+        link_attrs: url -> extra attributes for the <a> tag (e.g. amazon_link_attrs).
+        line_hooks: marker -> hook. For a line containing the marker, the
+            hook returns the HTML to emit verbatim, or None to render the
+            line normally. Hooks run in order, before any other rule.
+        skip_h1: Drop '# ' headings (for templates that render the title).
+        keep_frontmatter: Render a leading '---' block as text instead of
+            dropping it (core/netlify_client never stripped frontmatter).
+    """
+
+    def __init__(self, link_attrs: Optional[Callable[[str], str]] = None,
+                 line_hooks: Optional[Dict[str, LineHook]] = None,
+                 skip_h1: bool = False, keep_frontmatter: bool = False):
+        self.link_attrs = link_attrs
+        self.line_hooks = tuple((line_hooks or {}).items())
+        self.skip_h1 = skip_h1
+        self.keep_frontmatter = keep_frontmatter
+
+    # ── Block level ──
+
+    def tokens(self, markdown: str):
+        """Yield (kind, level, text) per line (frontmatter dropped unless kept)."""
+        hooks = self.line_hooks
+        body = markdown.strip() if self.keep_frontmatter else strip_frontmatter(markdown)
+        for line in body.split('\n'):
+            stripped = line.strip()
+            if not stripped:
+                yield BLANK, 0, ''
+                continue
+
+            html = None
+            for marker, hook in hooks:
+                if marker in stripped:
+                    html = hook(stripped)
+                    if html is not None:
+                        break
+            if html is not None:
+                yield RAW, 0, html
+                continue
+
+            first = stripped[0]
+            if first == '|' and '|' in stripped[1:]:
+                # Separator rows (| --- | :-: |) open the table but add no row
+                yield ROW, 0, None if TABLE_SEPARATOR_RE.match(stripped) else stripped
+            elif first == '#' and (heading := HEADING_RE.match(stripped)):
+                yield HEADING, len(heading.group(1)), heading.group(2)
+            elif first == '>' and stripped.startswith('> '):
+                yield QUOTE, 0, stripped[2:]
+            elif first in '-*' and stripped[1:2] == ' ':
+                yield ITEM, 0, stripped[2:]
+            else:
+                yield PARAGRAPH, 0, stripped
+
+    def render(self, markdown: str) -> str:
+        """Render a Markdown article to an HTML fragment."""
+        inline = self.inline
+        out: List[str] = []
+        block = None            # '</ul>' or the table's closing markup while one is open
+        header_done = False
+
+        for kind, level, text in self.tokens(markdown):
+            if kind == ROW:
+                if block is None or block == '</ul>':
+                    if block:
+                        out.append(block)
+                    out.append(TABLE_OPEN)
+                    block, header_done = '</table></div>', False
+                if text is None:
+                    continue
+                cells = [c for c in (c.strip() for c in text.strip('|').split('|')) if c]
+                if not header_done:
+                    out.append('<thead><tr>' + ''.join(f'<th>{inline(c)}</th>' for c in cells)
+                               + '</tr></thead>')
+                    header_done = True
+                else:
+                    if block == '</table></div>':
+                        out.append('<tbody>')
+                        block = '</tbody>\n</table></div>'
+                    out.append('<tr>' + ''.join(f'<td>{inline(c)}</td>' for c in cells) + '</tr>')
+                continue
+
+            if kind == ITEM:
+                if block != '</ul>':
+                    if block:
+                        out.append(block)
+                    out.append('<ul>')
+                    block = '</ul>'
+                out.append(f'  <li>{inline(text)}</li>')
+                continue
+
+            if kind == RAW:
+                # Hook lines end a list but not a table: the old converter
+                # emitted them in place and kept the table open
+                if block == '</ul>':
+                    out.append(block)
+                    block = None
+                out.append(text)
+                continue
+
+            if block:
+                out.append(block)
+                block = None
+
+            if kind == PARAGRAPH:
+                out.append(f'<p>{inline(text)}</p>')
+            elif kind == HEADING:
+                if level > 1 or not self.skip_h1:
+                    out.append(f'<h{level}>{inline(text)}</h{level}>')
+            elif kind == QUOTE:
+                out.append(f'<blockquote>{inline(text)}</blockquote>')
+
+        if block:
+            out.append(block)
+        return '\n'.join(out)
+
+    # ── Inline ──
+
+    def inline(self, text: str) -> str:
+        """Apply links, then bold, then italic to one line of text."""
+        if '[' in text:
+            text = LINK_RE.sub(self._link, text)
+        if '*' in text:
+            text = BOLD_RE.sub(r'<strong>\1</strong>', text)
+            if '*' in text:
+                text = ITALIC_RE.sub(r'<em>\1</em>', text)
+        return text
+
+    def _link(self, match) -> str:
+        url = match.group(2)
+        attrs = self.link_attrs(url) if self.link_attrs else ''
+        return f'<a href="{url}"{attrs}>{match.group(1)}</a>'
@@ -0,0 +1,280 @@
+"""TF-IDF related-article index for a brand's articles/ directory.
+
+scripts/add_internal_links.py and scripts/boost_internal_links.py each
+re-read every article on every run and scored each one against every other
+by Python set overlap of title words. RelatedArticleIndex replaces that with:
+
+- One document per article: title (x3), slug (x2) and body text, tokenized
+  with the shared STOP_WORDS list; injected "Related Articles" blocks and
+  inline related links are left out of the body
+- Per-file term counts cached on disk (cache/related_articles/), refreshed
+  incrementally by mtime/size, so only new or edited articles are re-parsed
+- A sublinear TF-IDF matrix (L2-normalized, float32) over the terms shared by
+  at least two articles, and one matrix product for all pairwise
+  similarities; top-k neighbours come from argpartition, not a sort per article
+
+SciPy isn't a dependency, so the matrix is dense; pruning terms that occur in
+only one article (they can't make two articles similar) keeps it small.
+
+Usage:
+    from utils.related_articles import RelatedArticleIndex
+
+    index = RelatedArticleIndex.open("outputs/fitover35-website/articles")
+    for filename, score, data in index.related("creatine-guide.html", k=5):
+        print(filename, score, data["title"])
+"""
+
+import hashlib
+import json
+import logging
+import math
+import os
+import re
+import tempfile
+from collections import Counter
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+DEFAULT_CACHE_DIR = PROJECT_ROOT / "cache" / "related_articles"
+CACHE_VERSION = 2
+
+TITLE_WEIGHT = 3
+SLUG_WEIGHT = 2
+BODY_WEIGHT = 1
+# Terms in more than this share of articles say nothing about relatedness
+MAX_DF_RATIO = 0.5
+
+STOP_WORDS = {
+    'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for',
+    'of', 'with', 'by', 'from', 'is', 'are', 'was', 'were', 'be', 'been',
+    'being', 'have', 'has', 'had', 'do', 'does', 'did', 'will', 'would',
+    'could', 'should', 'may', 'might', 'shall', 'can', 'need', 'dare',
+    'that', 'this', 'these', 'those', 'i', 'me', 'my', 'we', 'our', 'you',
+    'your', 'he', 'him', 'his', 'she', 'her', 'it', 'its', 'they', 'them',
+    'their', 'what', 'which', 'who', 'whom', 'when', 'where', 'why', 'how',
+    'all', 'each', 'every', 'both', 'few', 'more', 'most', 'other', 'some',
+    'such', 'no', 'not', 'only', 'own', 'same', 'so', 'than', 'too', 'very',
+    'just', 'because', 'as', 'if', 'then', 'else', 'about', 'up', 'out',
+    'into', 'over', 'after', 'before', 'between', 'under', 'again', 'here',
+    'there', 'once', 'during', 'while', 'also', 'still', 'new', 'old',
+    'best', 'top', 'good', 'great', 'really', 'actually', 'vs', 'guide',
+    'tips', 'ways', 'things', 'men', 'women', '2024', '2025', '2026',
+}
+
+_TITLE_RE = re.compile(r'<title>(.*?)</title>', re.IGNORECASE | re.DOTALL)
+_BRAND_SUFFIX_RE = re.compile(
+    r'\s*[—\-|]\s*(FitOver35|Daily Deal Darling|The Menopause Planner).*$', re.IGNORECASE
+)
+_BODY_RE = re.compile(r'<body[^>]*>(.*?)</body>', re.IGNORECASE | re.DOTALL)
+_SKIP_BLOCK_RE = re.compile(r'<(script|style|nav|footer|header)\b.*?</\1>', re.IGNORECASE | re.DOTALL)
+# Links to other articles injected by add_internal_links / boost_internal_links
+# (and the generators' own "Related Articles" cards): indexing them would pull
+# every article toward the ones it already links to
+_INJECTED_LINKS_RE = re.compile(
+    r'<section\b[^>]*class="[^"]*related-articles[^"]*"[^>]*>.*?</section>'
+    r'|<h[2-4]\b[^>]*>\s*Related Articles\s*</h[2-4]>\s*<ul\b.*?</ul>'
+    r'|\s(?:You may also like|For more, see) <a\b[^>]*>.*?</a>\.',
+    re.IGNORECASE | re.DOTALL,
+)
+_TAG_RE = re.compile(r'<[^>]+>')
+_WORD_RE = re.compile(r'[a-z]+')
+
+
+def clean_title(raw_title: str) -> str:
+    """Article title without the brand suffix."""
+    return _BRAND_SUFFIX_RE.sub('', raw_title).strip()
+
+
+def tokenize(text: str) -> list:
+    """Lowercase words longer than two letters, minus STOP_WORDS."""
+    return [w for w in _WORD_RE.findall(text.lower()) if w not in STOP_WORDS and len(w) > 2]
+
+
+def parse_article(html: str, filename: str) -> Optional[dict]:
+    """Title and weighted term counts for one article, or None without a <title>."""
+    title_match = _TITLE_RE.search(html)
+    if not title_match:
+        return None
+    title = clean_title(title_match.group(1).strip())
+    body_match = _BODY_RE.search(html)
+    body = _INJECTED_LINKS_RE.sub(' ', body_match.group(1) if body_match else html)
+    body = _SKIP_BLOCK_RE.sub(' ', body)
+
+    terms = Counter()
+    for word in tokenize(title):
+        terms[word] += TITLE_WEIGHT
+    for word in tokenize(filename.rsplit('.', 1)[0].replace('-', ' ')):
+        terms[word] += SLUG_WEIGHT
+    for word in tokenize(_TAG_RE.sub(' ', body)):
+        terms[word] += BODY_WEIGHT
+    return {'title': title, 'terms': dict(terms)}
+
+
+class RelatedArticleIndex:
+    """Cached per-article term counts plus a TF-IDF similarity matrix for one directory."""
+
+    def __init__(self, articles_dir, cache_path=None):
+        self.articles_dir = Path(articles_dir)
+        if cache_path is None:
+            key = hashlib.sha1(str(self.articles_dir.resolve()).encode()).hexdigest()[:12]
+            cache_dir = Path(os.environ.get('RELATED_ARTICLES_CACHE_DIR') or DEFAULT_CACHE_DIR)
+            cache_path = cache_dir / f'{self.articles_dir.name or "articles"}-{key}.json'
+        self.cache_path = Path(cache_path)
+        self._docs = {}   # filename -> {"mtime_ns", "size", "title", "terms"}
+        self._names = []
+        self._similarity = None
+        self._dirty = False
+
+    @classmethod
+    def open(cls, articles_dir, cache_path=None) -> 'RelatedArticleIndex':
+        """Load the cached index for articles_dir and bring it up to date."""
+        index = cls(articles_dir, cache_path)
+        index._load()
+        index.refresh()
+        return index
+
+    def __len__(self):
+        return len(self._docs)
+
+    # ── persistence ──────────────────────────────────────────────────────────
+
+    def _load(self):
+        try:
+            state = json.loads(self.cache_path.read_text())
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable related-articles cache {self.cache_path}: {e}")
+            return
+        if state.get('version') == CACHE_VERSION:
+            self._docs = state.get('docs', {})
+
+    def save(self):
+        """Atomically write the cached term counts if they changed."""
+        if not self._dirty:
+            return
+        try:
+            self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=self.cache_path.parent, prefix='.related-')
+            with os.fdopen(fd, 'w') as f:
+                json.dump({'version': CACHE_VERSION, 'docs': self._docs}, f)
+            os.replace(tmp, self.cache_path)
+            self._dirty = False
+        except OSError as e:
+            logger.warning(f"Could not persist related-articles cache: {e}")
+
+    # ── updates ──────────────────────────────────────────────────────────────
+
+    def refresh(self) -> int:
+        """Re-parse new/changed articles, drop deleted ones, save. Returns files parsed."""
+        seen, parsed = set(), 0
+        for path in sorted(self.articles_dir.glob('*.html')):
+            name = path.name
+            seen.add(name)
+            try:
+                st = path.stat()
+            except OSError:
+                continue
+            doc = self._docs.get(name)
+            if doc and doc['mtime_ns'] == st.st_mtime_ns and doc['size'] == st.st_size:
+                continue
+            try:
+                article = parse_article(path.read_text(encoding='utf-8', errors='ignore'), name)
+            except OSError as e:
+                logger.warning(f"Could not read {path}: {e}")
+                continue
+            parsed += 1
+            if article is None:
+                self._docs.pop(name, None)
+                continue
+            self._docs[name] = {'mtime_ns': st.st_mtime_ns, 'size': st.st_size, **article}
+
+        removed = [name for name in self._docs if name not in seen]
+        for name in removed:
+            del self._docs[name]
+        if parsed or removed:
+            self._dirty = True
+            self._similarity = None
+            self.save()
+        if self._similarity is None:
+            self._build()
+        logger.info(f"Related-articles index {self.articles_dir}: {len(self._docs)} articles, "
+                    f"{parsed} parsed, {len(removed)} removed")
+        return parsed
+
+    def _build(self):
+        """TF-IDF matrix over the cached term counts and all pairwise cosine similarities."""
+        self._names = sorted(self._docs)
+        n = len(self._names)
+        if n < 2:
+            self._similarity = np.zeros((n, n), dtype=np.float32)
+            return
+
+        df = Counter()
+        for name in self._names:
+            df.update(self._docs[name]['terms'].keys())
+        max_df = max(2, int(MAX_DF_RATIO * n))
+        vocab = {term: i for i, term in enumerate(t for t, c in df.items() if 2 <= c <= max_df)}
+
+        matrix = np.zeros((n, len(vocab)), dtype=np.float32)
+        for row, name in enumerate(self._names):
+            for term, count in self._docs[name]['terms'].items():
+                col = vocab.get(term)
+                if col is not None:
+                    matrix[row, col] = 1.0 + math.log(count)
+        idf = np.empty(len(vocab), dtype=np.float32)
+        for term, col in vocab.items():
+            idf[col] = math.log((1 + n) / (1 + df[term])) + 1.0
+        matrix *= idf
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        matrix /= np.where(norms > 0, norms, 1.0)
+
+        similarity = matrix @ matrix.T
+        np.fill_diagonal(similarity, 0.0)
+        self._similarity = similarity
+
+    # ── queries ──────────────────────────────────────────────────────────────
+
+    @property
+    def articles(self) -> dict:
+        """filename -> {"title", "path"} for every indexed article, in filename order."""
+        return {name: {'title': self._docs[name]['title'], 'path': str(self.articles_dir / name)}
+                for name in self._names}
+
+    def related(self, filename: str, k: int = 8, min_score: float = 0.0) -> list:
+        """Top-k (filename, score, data) most similar to filename, best first."""
+        try:
+            row = self._names.index(filename)
+        except ValueError:
+            return []
+        return self._neighbours(self._similarity[row:row + 1], k, min_score)[0]
+
+    def top_k(self, k: int = 8, min_score: float = 0.0) -> dict:
+        """Top-k neighbours of every article in one pass: filename -> [(filename, score, data)]."""
+        return dict(zip(self._names, self._neighbours(self._similarity, k, min_score)))
+
+    def _neighbours(self, sim, k, min_score) -> list:
+        """Per row of sim: [(filename, score, data)] for its k best columns."""
+        n = len(self._names)
+        if n < 2 or k <= 0:
+            return [[] for _ in range(len(sim))]
+        k = min(k, n - 1)
+        # argpartition finds each row's k best columns; only those k get sorted
+        top = np.argpartition(-sim, k - 1, axis=1)[:, :k]
+        scores = np.take_along_axis(sim, top, axis=1)
+        # Best first, ties broken by filename (column order) for stable output
+        order = np.lexsort((top, -scores), axis=1)
+        top = np.take_along_axis(top, order, axis=1)
+        scores = np.take_along_axis(scores, order, axis=1)
+
+        articles = self.articles
+        return [
+            [(self._names[col], float(score), articles[self._names[col]])
+             for col, score in zip(cols, row_scores) if score > min_score]
+            for cols, row_scores in zip(top, scores)
+        ]
@@ -0,0 +1,223 @@
+"""Incremental build graph for the generated brand websites.
+
+Pages under outputs/*-website/ are rewritten in place by a chain of
+independent scripts (batch_restyle_articles, add_internal_links,
+improve_meta_descriptions, add_related_links_batch, sitemap and blog index
+updaters). Each used to re-read, re-parse and re-write every page on every
+run, so every run touched every file and every deploy uploaded the whole site.
+
+A BuildGraph records, per step and per page, what the page was built from:
+
+- The page's own bytes (sha1 + mtime/size), as the step left them
+- A deps digest of everything else the step used: template/step version,
+  brand config, related-article links, etc. (see deps_digest())
+
+A page is rebuilt only when one of those changed, i.e. the page was edited
+by someone else (another step, a human, a regenerate) or its deps moved.
+Output goes through write_if_changed(): atomic, and skipped when the bytes
+are identical, so unchanged pages keep their mtime and their deploy digest.
+
+State lives in cache/site_build/<step>.json (SITE_BUILD_CACHE_DIR).
+
+Usage:
+    graph = BuildGraph.load("restyle_articles", version=TEMPLATE_VERSION)
+    deps = deps_digest(brand_config)
+    for path in pages:
+        graph.build(path, deps, lambda html: restyle(html))
+    graph.save()
+    print(graph.written)   # pages whose bytes actually changed this run
+"""
+
+import hashlib
+import json
+import logging
+import os
+import tempfile
+from pathlib import Path
+from typing import Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+DEFAULT_STATE_DIR = PROJECT_ROOT / "cache" / "site_build"
+STATE_VERSION = 1
+
+FRESH = "fresh"          # inputs unchanged since the last build: not even read
+UNCHANGED = "unchanged"  # re-rendered, but the output bytes were identical
+WRITTEN = "written"      # re-rendered and written
+
+
+def deps_digest(*parts) -> str:
+    """Stable sha1 of JSON-serializable build inputs (dicts are key-sorted)."""
+    blob = json.dumps(parts, sort_keys=True, default=str, ensure_ascii=False)
+    return hashlib.sha1(blob.encode("utf-8")).hexdigest()
+
+
+def write_if_changed(path, content: str, encoding: str = "utf-8") -> bool:
+    """Atomically write content to path unless the file already holds those bytes.
+
+    Returns True if the file was written.
+    """
+    path = Path(path)
+    data = content.encode(encoding)
+    try:
+        if path.stat().st_size == len(data) and path.read_bytes() == data:
+            return False
+    except FileNotFoundError:
+        pass
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        try:
+            os.chmod(tmp, path.stat().st_mode & 0o777)
+        except FileNotFoundError:
+            os.chmod(tmp, 0o644)
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
+    return True
+
+
+class BuildGraph:
+    """Per-page input hashes for one site-build step."""
+
+    def __init__(self, step: str, version=1, path=None):
+        self.step = step
+        self.version = version
+        if path is None:
+            state_dir = Path(os.environ.get("SITE_BUILD_CACHE_DIR") or DEFAULT_STATE_DIR)
+            path = state_dir / f"{step}.json"
+        self.path = Path(path)
+        self._pages = {}  # abs path -> {"deps", "sha1", "mtime_ns", "size"}
+        self._dirty = False
+        self.written = []
+        self.stats = {FRESH: 0, UNCHANGED: 0, WRITTEN: 0}
+
+    @classmethod
+    def load(cls, step: str, version=1, path=None) -> "BuildGraph":
+        """Graph for `step`; state recorded under another step version is discarded."""
+        graph = cls(step, version, path)
+        try:
+            state = json.loads(graph.path.read_text())
+        except FileNotFoundError:
+            return graph
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable build state {graph.path}: {e}")
+            return graph
+        if state.get("format") == STATE_VERSION and state.get("version") == version:
+            graph._pages = state.get("pages", {})
+        else:
+            logger.info(f"Build step {step} changed version; rebuilding all pages")
+            graph._dirty = True
+        return graph
+
+    def save(self):
+        """Atomically persist the graph if anything was recorded since load/save."""
+        if not self._dirty:
+            return
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=self.path.parent, prefix=f".{self.step}-")
+            with os.fdopen(fd, "w") as f:
+                json.dump({"format": STATE_VERSION, "version": self.version,
+                           "pages": self._pages}, f)
+            os.replace(tmp, self.path)
+            self._dirty = False
+        except OSError as e:
+            logger.warning(f"Could not persist build state for {self.step}: {e}")
+
+    # ── page state ───────────────────────────────────────────────────────────
+
+    @staticmethod
+    def _key(page) -> str:
+        return str(Path(page).resolve())
+
+    def is_fresh(self, page, deps: str) -> bool:
+        """True if the page and its deps are exactly as this step last left them."""
+        entry = self._pages.get(self._key(page))
+        if not entry or entry["deps"] != deps:
+            return False
+        try:
+            st = os.stat(page)
+        except OSError:
+            return False
+        if entry["mtime_ns"] == st.st_mtime_ns and entry["size"] == st.st_size:
+            return True
+        if entry["size"] != st.st_size:
+            return False
+        # Touched (e.g. a checkout) but maybe not edited: compare content
+        try:
+            digest = hashlib.sha1(Path(page).read_bytes()).hexdigest()
+        except OSError:
+            return False
+        if digest != entry["sha1"]:
+            return False
+        entry["mtime_ns"] = st.st_mtime_ns
+        self._dirty = True
+        return True
+
+    def record(self, page, deps: str, data: Optional[bytes] = None):
+        """Remember the page's current bytes as this step's output for `deps`."""
+        try:
+            st = os.stat(page)
+            if data is None:
+                data = Path(page).read_bytes()
+        except OSError as e:
+            logger.warning(f"Cannot record {page} for {self.step}: {e}")
+            return
+        self._pages[self._key(page)] = {
+            "deps": deps,
+            "sha1": hashlib.sha1(data).hexdigest(),
+            "mtime_ns": st.st_mtime_ns,
+            "size": st.st_size,
+        }
+        self._dirty = True
+
+    # ── building ─────────────────────────────────────────────────────────────
+
+    def build(self, page, deps: str, render: Callable[[str], Optional[str]]) -> str:
+        """Re-render page through render(html) unless its inputs are unchanged.
+
+        render returns the new HTML, or None to leave the page as it is.
+        Exceptions from render propagate and leave the page unrecorded, so it
+        is retried next run. Returns FRESH, UNCHANGED or WRITTEN.
+        """
+        if self.is_fresh(page, deps):
+            self.stats[FRESH] += 1
+            return FRESH
+        data = Path(page).read_bytes()
+        new_html = render(data.decode("utf-8", errors="replace"))
+        status = UNCHANGED
+        if new_html is not None and write_if_changed(page, new_html):
+            self.written.append(str(page))
+            status = WRITTEN
+            data = None
+        self.record(page, deps, data)
+        self.stats[status] += 1
+        return status
+
+    def write(self, page, html: str, deps: str) -> bool:
+        """Write html to page if it differs and record it as built from deps."""
+        written = write_if_changed(page, html)
+        if written:
+            self.written.append(str(page))
+        self.stats[WRITTEN if written else UNCHANGED] += 1
+        self.record(page, deps, html.encode("utf-8"))
+        return written
+
+    def prune(self, directory, pages) -> int:
+        """Drop state for pages under directory that are not in `pages` (deleted articles)."""
+        prefix = self._key(directory) + os.sep
+        keep = {self._key(p) for p in pages}
+        stale = [key for key in self._pages if key.startswith(prefix) and key not in keep]
+        for key in stale:
+            del self._pages[key]
+        if stale:
+            self._dirty = True
+        return len(stale)
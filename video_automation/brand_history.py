@@ -0,0 +1,213 @@
+"""Per-run, in-memory snapshot of recent content_history for dedup checks.
+
+generate_pin_content, generate_video_pin_content, image_selector and
+check_image_hash_exists each used to query Supabase for every pin (and every
+render attempt). BrandHistorySnapshot loads the recent history of all active
+brands once at the start of a run:
+
+- One content_history query (newest first, all brands, up to HISTORY_ROWS)
+  supplies topics, angles, styles, boards, openers, image queries, titles
+  and Pexels image ids
+- A paged image_hash-only query loads every image hash in the table, so the
+  exact-duplicate check covers all history, not just the recent rows
+- One daily_trending query supplies today's trending topics per brand
+
+Every dedup check is then a list slice or set lookup, and the snapshot is
+updated as pins are logged or images picked, so two pins in the same run
+still see each other.
+
+Usage:
+    history = BrandHistorySnapshot.load(db.client, brands)
+    pin_data = generate_pin_content(brand, db.client, history=history)
+    image = get_unique_pexels_image(query, brand, db.client, history=history)
+    check_image_hash_exists(img_hash, db.client, history=history)
+"""
+
+import json
+import logging
+import threading
+from collections import defaultdict
+from datetime import datetime, timezone
+
+logger = logging.getLogger(__name__)
+
+HISTORY_COLUMNS = (
+    'brand, topic, angle_framework, visual_style, board, description_opener, '
+    'image_query, title, pexels_image_id, image_hash, created_at'
+)
+# Without image_hash, for databases missing migration 006
+HISTORY_CORE_COLUMNS = HISTORY_COLUMNS.replace(' image_hash,', '')
+# Supabase caps a single select at 1000 rows by default
+HISTORY_ROWS = 1000
+# Largest per-brand window any dedup check uses (90-pin topic window)
+BRAND_WINDOW = 90
+HASH_PAGE_SIZE = 1000
+
+
+class BrandHistorySnapshot:
+    """Recent content_history rows per brand plus every known image hash.
+
+    image_hashes is the complete set of hashes in content_history; without
+    it, has_image_hash() only knows the hashes in `rows` and answers None
+    for the rest.
+    """
+
+    def __init__(self, rows=(), trending=None, image_hashes=None):
+        self._lock = threading.Lock()
+        self._rows = defaultdict(list)        # brand -> rows, newest first
+        self._image_hashes = set(image_hashes or ())
+        self._hashes_complete = image_hashes is not None
+        self._picked_image_ids = defaultdict(set)  # brand -> ids chosen this run
+        # brand -> list of topic dicts; None if daily_trending was not loaded
+        self._trending = dict(trending) if trending is not None else None
+        for row in rows:
+            self._add(row, newest=False)
+
+    @classmethod
+    def load(cls, supabase_client, brands, limit=HISTORY_ROWS):
+        """Load history for `brands` in one content_history query (plus one for trends).
+
+        If the combined result is truncated at `limit` and a brand got fewer
+        than BRAND_WINDOW rows, that brand alone is backfilled.
+        """
+        brands = list(brands)
+        rows = []
+        for columns in (HISTORY_COLUMNS, HISTORY_CORE_COLUMNS):
+            try:
+                result = supabase_client.table('content_history') \
+                    .select(columns) \
+                    .in_('brand', brands) \
+                    .order('created_at', desc=True) \
+                    .limit(limit) \
+                    .execute()
+                rows = result.data or []
+                break
+            except Exception as e:
+                logger.warning(f"Could not load content_history snapshot: {e}")
+
+        if len(rows) >= limit:
+            counts = defaultdict(int)
+            for row in rows:
+                counts[row.get('brand')] += 1
+            for brand in brands:
+                if counts[brand] < BRAND_WINDOW:
+                    backfill = _query_brand(supabase_client, brand, columns)
+                    if backfill:
+                        rows = [r for r in rows if r.get('brand') != brand] + backfill
+
+        snapshot = cls(rows, trending=_query_trending(supabase_client, brands),
+                       image_hashes=_query_image_hashes(supabase_client))
+        logger.info(
+            f"History snapshot: {len(rows)} rows for {len(brands)} brand(s), "
+            f"{len(snapshot._image_hashes)} image hashes"
+        )
+        return snapshot
+
+    # ── reads ────────────────────────────────────────────────────────────────
+
+    def rows(self, brand, n=BRAND_WINDOW):
+        """Up to n most recent rows for brand, newest first."""
+        with self._lock:
+            return list(self._rows[brand][:n])
+
+    def recent(self, brand, field, n):
+        """Values of `field` in the n most recent rows for brand, newest first."""
+        return [r.get(field, '') for r in self.rows(brand, n)]
+
+    def used_image_ids(self, brand, n=50):
+        """Pexels ids used in the last n pins plus any picked this run."""
+        with self._lock:
+            ids = {str(r['pexels_image_id']) for r in self._rows[brand][:n] if r.get('pexels_image_id')}
+            return ids | self._picked_image_ids[brand]
+
+    def has_image_hash(self, image_hash):
+        """True/False, or None if the hash is not here and the hash set is incomplete."""
+        with self._lock:
+            if image_hash in self._image_hashes:
+                return True
+            return False if self._hashes_complete else None
+
+    def trending_topics(self, brand):
+        """Today's trending topic dicts for brand ([] if none), or None if not loaded."""
+        if self._trending is None:
+            return None
+        return self._trending.get(brand, [])
+
+    # ── updates ──────────────────────────────────────────────────────────────
+
+    def _add(self, row, newest=True):
+        brand = row.get('brand')
+        if newest:
+            self._rows[brand].insert(0, row)
+        else:
+            self._rows[brand].append(row)
+        if row.get('image_hash'):
+            self._image_hashes.add(row['image_hash'])
+
+    def record(self, row):
+        """Add a freshly logged content_history row (see log_pin_to_history)."""
+        with self._lock:
+            self._add(dict(row))
+
+    def mark_image_used(self, brand, image_id=None, image_hash=None):
+        """Remember an image picked/rendered this run before it is logged."""
+        with self._lock:
+            if image_id:
+                self._picked_image_ids[brand].add(str(image_id))
+            if image_hash:
+                self._image_hashes.add(image_hash)
+
+
+def _query_image_hashes(supabase_client):
+    """Every image_hash in content_history, in pages; None if it can't be read."""
+    hashes = set()
+    start = 0
+    while True:
+        try:
+            result = supabase_client.table('content_history') \
+                .select('image_hash') \
+                .not_.is_('image_hash', 'null') \
+                .range(start, start + HASH_PAGE_SIZE - 1) \
+                .execute()
+        except Exception as e:
+            logger.warning(f"Could not load image hashes (checks will query Supabase): {e}")
+            return None
+        rows = result.data or []
+        hashes.update(r['image_hash'] for r in rows if r.get('image_hash'))
+        if len(rows) < HASH_PAGE_SIZE:
+            return hashes
+        start += HASH_PAGE_SIZE
+
+
+def _query_brand(supabase_client, brand, columns=HISTORY_COLUMNS):
+    try:
+        result = supabase_client.table('content_history') \
+            .select(columns) \
+            .eq('brand', brand) \
+            .order('created_at', desc=True) \
+            .limit(BRAND_WINDOW) \
+            .execute()
+        return result.data or []
+    except Exception as e:
+        logger.warning(f"[{brand}] Could not backfill content_history snapshot: {e}")
+        return []
+
+
+def _query_trending(supabase_client, brands):
+    """Today's daily_trending topics for every brand in one query (None on failure)."""
+    today = datetime.now(timezone.utc).strftime('%Y-%m-%d')
+    trending = {}
+    try:
+        result = supabase_client.table('daily_trending') \
+            .select('brand, topics') \
+            .in_('brand', list(brands)) \
+            .eq('trend_date', today) \
+            .execute()
+        for row in result.data or []:
+            raw = row.get('topics')
+            topics = json.loads(raw) if isinstance(raw, str) else raw
+            trending.setdefault(row.get('brand'), topics or [])
+    except Exception as e:
+        logger.warning(f"Could not load daily_trending snapshot: {e}")
+        return None
+    return trending
@@ -1195,25 +1195,57 @@ def _select_visual_style_weighted(recent_styles):
     return random.choice(weighted_pool)
 
 
-def generate_pin_content(brand_key, supabase_client):
+def _recent_history(brand_key, supabase_client, history=None, columns='topic', limit=90):
+    """Most recent content_history rows for a brand, from the run snapshot if given."""
+    if history is not None:
+        return history.rows(brand_key, limit)
+    try:
+        recent = supabase_client.table('content_history') \
+            .select(columns) \
+            .eq('brand', brand_key) \
+            .order('created_at', desc=True) \
+            .limit(limit) \
+            .execute()
+        return recent.data if recent.data else []
+    except Exception:
+        return []
+
+
+def _todays_trending_topics(brand_key, supabase_client, history=None):
+    """Today's daily_trending topic dicts for a brand (snapshot first, then Supabase)."""
+    if history is not None:
+        topics = history.trending_topics(brand_key)
+        if topics is not None:
+            return topics
+    today_str_topic = datetime.now(timezone.utc).strftime('%Y-%m-%d')
+    trend_result = supabase_client.table('daily_trending') \
+        .select('topics') \
+        .eq('brand', brand_key) \
+        .eq('trend_date', today_str_topic) \
+        .limit(1) \
+        .execute()
+    if not trend_result.data:
+        return []
+    raw_topics = trend_result.data[0]['topics']
+    return json.loads(raw_topics) if isinstance(raw_topics, str) else raw_topics
+
+
+def generate_pin_content(brand_key, supabase_client, history=None):
     """Generate a complete, UNIQUE pin for the specified brand.
 
+    history: optional BrandHistorySnapshot; when given, dedup windows and
+    trending topics come from memory instead of per-pin Supabase queries.
+
     Returns dict with title, description, image_query, visual_style,
     board, destination_url, text_overlay, and metadata.
     """
     config = BRAND_CONFIGS[brand_key]
 
     # ── Step 1: Check what was recently used to ensure variety ──
-    try:
-        recent = supabase_client.table('content_history') \
-            .select('topic, angle_framework, visual_style, board, description_opener, image_query, title') \
-            .eq('brand', brand_key) \
-            .order('created_at', desc=True) \
-            .limit(90) \
-            .execute()
-        recent_data = recent.data if recent.data else []
-    except Exception:
-        recent_data = []
+    recent_data = _recent_history(
+        brand_key, supabase_client, history,
+        columns='topic, angle_framework, visual_style, board, description_opener, image_query, title',
+    )
 
     # Dedup window: 90 pins (~30 days at 3 pins/day) to prevent topic repetition
     recent_topics = [r.get('topic', '') for r in recent_data[:90]]
@@ -1230,27 +1262,18 @@ def generate_pin_content(brand_key, supabase_client):
 
     # Try daily_trending table first for fresh, relevant topics
     try:
-        today_str_topic = datetime.now(timezone.utc).strftime('%Y-%m-%d')
-        trend_result = supabase_client.table('daily_trending') \
-            .select('topics') \
-            .eq('brand', brand_key) \
-            .eq('trend_date', today_str_topic) \
-            .limit(1) \
-            .execute()
-        if trend_result.data:
-            raw_topics = trend_result.data[0]['topics']
-            trending_topics = json.loads(raw_topics) if isinstance(raw_topics, str) else raw_topics
-            # Find a trending topic not already used in the last 90 pins
-            for t in trending_topics:
-                topic_text = t.get('topic', '')
-                if topic_text and topic_text not in recent_topics:
-                    selected_topic = {
-                        "category": "daily_trending",
-                        "topic": topic_text,
-                        "trending_data": t,  # Carry along why_trending, content_angle, etc.
-                    }
-                    logger.info(f"[{brand_key}] Using trending topic: {topic_text}")
-                    break
+        trending_topics = _todays_trending_topics(brand_key, supabase_client, history)
+        # Find a trending topic not already used in the last 90 pins
+        for t in trending_topics:
+            topic_text = t.get('topic', '')
+            if topic_text and topic_text not in recent_topics:
+                selected_topic = {
+                    "category": "daily_trending",
+                    "topic": topic_text,
+                    "trending_data": t,  # Carry along why_trending, content_angle, etc.
+                }
+                logger.info(f"[{brand_key}] Using trending topic: {topic_text}")
+                break
     except Exception as e:
         logger.warning(f"[{brand_key}] Could not query daily_trending: {e}")
 
@@ -1530,8 +1553,12 @@ def validate_destination_link(url, timeout=10):
     return None
 
 
-def log_pin_to_history(pin_data, supabase_client):
-    """Log generated pin to content_history for variety tracking."""
+def log_pin_to_history(pin_data, supabase_client, history=None):
+    """Log generated pin to content_history for variety tracking.
+
+    If a BrandHistorySnapshot is given it is updated too once the insert
+    succeeds, so later pins in the same run see this one.
+    """
     try:
         row = {
             'brand': pin_data['brand'],
@@ -1554,13 +1581,36 @@ def log_pin_to_history(pin_data, supabase_client):
         # Include image hash for deduplication if available
         if pin_data.get('image_hash'):
             row['image_hash'] = pin_data['image_hash']
-        supabase_client.table('content_history').insert(row).execute()
+        if pin_data.get('image_phash'):
+            row['image_phash'] = pin_data['image_phash']
+        logged = dict(row)
+        try:
+            supabase_client.table('content_history').insert(row).execute()
+        except Exception as insert_err:
+            if 'image_hash' not in row and 'image_phash' not in row:
+                raise
+            # Hash columns come from migration 006 — log without them if missing
+            logger.warning(f"History insert with image hashes failed ({insert_err}), retrying without")
+            row.pop('image_hash', None)
+            row.pop('image_phash', None)
+            supabase_client.table('content_history').insert(row).execute()
+        # Only once the row is stored: a failed insert must not count as history
+        if history is not None:
+            history.record(logged)
     except Exception as e:
         logger.error(f"Failed to log pin to history: {e}")
 
 
-def check_image_hash_exists(image_hash, supabase_client):
-    """Check if an image hash already exists in content_history (deduplication)."""
+def check_image_hash_exists(image_hash, supabase_client, history=None):
+    """Check if an image hash already exists in content_history (deduplication).
+
+    With a BrandHistorySnapshot this is an in-memory set lookup; Supabase is
+    only queried if the snapshot could not load the full hash set.
+    """
+    if history is not None:
+        known = history.has_image_hash(image_hash)
+        if known is not None:
+            return known
     try:
         result = supabase_client.table('content_history') \
             .select('id') \
@@ -2060,7 +2110,7 @@ def build_destination_url(base_url, brand, posting_method, campaign="pins",
 # VIDEO PIN CONTENT GENERATION
 # ═══════════════════════════════════════════════════════════════
 
-def generate_video_pin_content(brand_key, supabase_client):
+def generate_video_pin_content(brand_key, supabase_client, history=None):
     """Generate content specifically for a video pin (hook/solution/CTA format).
 
     Uses Claude to create short, punchy text optimized for video pins.
@@ -2072,39 +2122,22 @@ def generate_video_pin_content(brand_key, supabase_client):
 
     Returns dict with: hook, solution, cta, title, description, board_id,
     search_query, tips (list[5]), topic, category.
+
+    history: optional BrandHistorySnapshot (see generate_pin_content).
     """
     config = BRAND_CONFIGS[brand_key]
 
     # ── Select topic (avoid recent — 90-pin dedup window) ──
-    try:
-        recent = supabase_client.table('content_history') \
-            .select('topic') \
-            .eq('brand', brand_key) \
-            .order('created_at', desc=True) \
-            .limit(90) \
-            .execute()
-        recent_topics = [r.get('topic', '') for r in (recent.data or [])]
-    except Exception:
-        recent_topics = []
+    recent_topics = [r.get('topic', '') for r in _recent_history(brand_key, supabase_client, history)]
 
     # Try daily_trending first for video topics too
     selected_topic = None
     try:
-        today_str_vid = datetime.now(timezone.utc).strftime('%Y-%m-%d')
-        trend_result = supabase_client.table('daily_trending') \
-            .select('topics') \
-            .eq('brand', brand_key) \
-            .eq('trend_date', today_str_vid) \
-            .limit(1) \
-            .execute()
-        if trend_result.data:
-            raw_topics = trend_result.data[0]['topics']
-            trending_topics = json.loads(raw_topics) if isinstance(raw_topics, str) else raw_topics
-            for t in trending_topics:
-                topic_text = t.get('topic', '')
-                if topic_text and topic_text not in recent_topics:
-                    selected_topic = {"category": "daily_trending", "topic": topic_text}
-                    break
+        for t in _todays_trending_topics(brand_key, supabase_client, history):
+            topic_text = t.get('topic', '')
+            if topic_text and topic_text not in recent_topics:
+                selected_topic = {"category": "daily_trending", "topic": topic_text}
+                break
     except Exception:
         pass
 
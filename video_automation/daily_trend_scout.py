@@ -9,6 +9,19 @@ Fetches real-time signals from 3 sources:
 Claude synthesizes all signals into exactly 8 ranked topics per brand,
 stored in the `daily_trending` Supabase table for content-engine to consume.
 More topics = more variety and less repetition across the 3 daily pin runs.
+
+Every brand × source × feed fetch runs at once under one deadline
+(TREND_SCOUT_DEADLINE_SECONDS), so the scout costs roughly its slowest feed:
+
+- Feeds are fetched with per-request timeouts over one pooled session, as
+  conditional GETs (ETag / Last-Modified kept in cache/trend_feeds.json);
+  an unchanged feed answers 304 and its cached body is re-parsed
+- All pytrends requests run as one serial task on one session (Google
+  throttles parallel sessions); the daily trending searches are the same
+  for every brand and are fetched once
+- Yesterday's topics for all brands are read in one query, synthesis runs
+  for all brands concurrently, and the rows are upserted in one batch
+  (per row if the batch is rejected)
 """
 
 import os
@@ -16,7 +29,12 @@ import json
 import random
 import logging
 import re
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait
 from datetime import datetime, timedelta, timezone
+from functools import partial
+from pathlib import Path
 from typing import Optional
 
 from google import genai
@@ -24,21 +42,40 @@ import time as _time
 import feedparser
 import requests
 from pytrends.request import TrendReq
+from requests.adapters import HTTPAdapter
 
 logger = logging.getLogger(__name__)
 
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+DEFAULT_FEED_CACHE_PATH = PROJECT_ROOT / "cache" / "trend_feeds.json"
+DEFAULT_DEADLINE_SECONDS = 60
+FEED_TIMEOUT_SECONDS = 10
+# (connect, read) per pytrends request
+PYTRENDS_TIMEOUT = (2, 5)
+MAX_FETCH_WORKERS = 16
+# Feeds that have not been fetched for this long are dropped from the cache
+FEED_CACHE_MAX_AGE_SECONDS = 7 * 24 * 3600
+SCOUT_BRANDS = ['fitness', 'deals', 'menopause']
+
 _client = None
+_client_lock = threading.Lock()
 
 
 def _get_gemini_client():
-    """Lazy initialization of Gemini client."""
+    """Lazy initialization of Gemini client (shared by the per-brand synthesis threads)."""
     global _client
-    if _client is None:
-        api_key = os.environ.get('GEMINI_API_KEY') or os.environ.get('ANTHROPIC_API_KEY', '')
-        if not api_key:
-            raise ValueError("GEMINI_API_KEY environment variable is required")
-        _client = genai.Client(api_key=api_key)
-    return _client
+    with _client_lock:
+        if _client is None:
+            api_key = os.environ.get('GEMINI_API_KEY') or os.environ.get('ANTHROPIC_API_KEY', '')
+            if not api_key:
+                raise ValueError("GEMINI_API_KEY environment variable is required")
+            _client = genai.Client(api_key=api_key)
+        return _client
+
+
+def get_deadline_seconds() -> float:
+    """Deadline for fetching all trend sources (TREND_SCOUT_DEADLINE_SECONDS)."""
+    return float(os.environ.get('TREND_SCOUT_DEADLINE_SECONDS') or DEFAULT_DEADLINE_SECONDS)
 
 
 # ═══════════════════════════════════════════════════════════════
@@ -138,49 +175,181 @@ SCOUT_CONFIGS = {
 }
 
 
+# ═══════════════════════════════════════════════════════════════
+# CONCURRENT, CONDITIONAL FEED FETCHING
+# ═══════════════════════════════════════════════════════════════
+
+class FeedCache:
+    """ETag / Last-Modified and body of each feed's last successful fetch."""
+
+    def __init__(self, path=None, clock=_time.time):
+        self.path = Path(path or os.environ.get('TREND_FEED_CACHE_PATH') or DEFAULT_FEED_CACHE_PATH)
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._entries = {}
+        self._dirty = False
+
+    def __len__(self):
+        return len(self._entries)
+
+    @classmethod
+    def load(cls, path=None, clock=_time.time):
+        cache = cls(path, clock)
+        try:
+            entries = json.loads(cache.path.read_text()).get('entries', {})
+        except FileNotFoundError:
+            return cache
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable feed cache {cache.path}: {e}")
+            return cache
+        now = clock()
+        cache._entries = {url: entry for url, entry in entries.items()
+                          if now - entry.get('fetched_at', 0) < FEED_CACHE_MAX_AGE_SECONDS}
+        cache._dirty = len(cache._entries) != len(entries)
+        return cache
+
+    def get(self, url):
+        with self._lock:
+            return self._entries.get(url)
+
+    def put(self, url, entry):
+        with self._lock:
+            self._entries[url] = {**entry, 'fetched_at': self._clock()}
+            self._dirty = True
+
+    def save(self):
+        """Atomically write the cache if it changed since load/save."""
+        with self._lock:
+            if not self._dirty:
+                return
+            entries = dict(self._entries)
+            self._dirty = False
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=self.path.parent, prefix='.trend-feeds-')
+            with os.fdopen(fd, 'w') as f:
+                json.dump({'entries': entries}, f)
+            os.replace(tmp, self.path)
+        except OSError as e:
+            logger.warning(f"Could not persist feed cache: {e}")
+
+
+def fetch_feed(url, session=None, cache=None, timeout=FEED_TIMEOUT_SECONDS):
+    """GET a feed (conditionally when cached) and parse it with feedparser.
+
+    A 304 re-parses the cached body. HTTP errors and timeouts raise.
+    """
+    cached = cache.get(url) if cache is not None else None
+    headers = {'User-Agent': feedparser.USER_AGENT}
+    if cached:
+        if cached.get('etag'):
+            headers['If-None-Match'] = cached['etag']
+        if cached.get('last_modified'):
+            headers['If-Modified-Since'] = cached['last_modified']
+
+    resp = (session or requests).get(url, headers=headers, timeout=timeout)
+    if resp.status_code == 304 and cached:
+        body, content_type = cached['body'], cached.get('content_type', '')
+        cache.put(url, cached)
+    else:
+        resp.raise_for_status()
+        body, content_type = resp.text, resp.headers.get('Content-Type', '')
+        etag, last_modified = resp.headers.get('ETag'), resp.headers.get('Last-Modified')
+        if cache is not None and (etag or last_modified):
+            cache.put(url, {'etag': etag, 'last_modified': last_modified,
+                            'content_type': content_type, 'body': body})
+    return feedparser.parse(body, response_headers={'content-type': content_type} if content_type else None)
+
+
+def _run_concurrently(tasks, deadline_seconds, max_workers=MAX_FETCH_WORKERS):
+    """Run (label, fn) tasks at once under one deadline; results keep input order.
+
+    A task that raises, or is still running at the deadline, yields None.
+    Stragglers' threads are abandoned, not waited for.
+    """
+    if not tasks:
+        return []
+    pool = ThreadPoolExecutor(max_workers=min(max_workers, len(tasks)), thread_name_prefix='trend-scout')
+    try:
+        futures = [pool.submit(fn) for _, fn in tasks]
+        wait(futures, timeout=deadline_seconds)
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+    results = []
+    for (label, _), future in zip(tasks, futures):
+        if future.cancelled() or not future.done():
+            logger.warning(f"{label}: no response within the {deadline_seconds:g}s scout deadline")
+            results.append(None)
+        elif future.exception() is not None:
+            logger.warning(f"{label} failed: {future.exception()}")
+            results.append(None)
+        else:
+            results.append(future.result())
+    return results
+
+
+def _feed_session():
+    """One pooled session for all feed fetches of a run."""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=MAX_FETCH_WORKERS, pool_maxsize=MAX_FETCH_WORKERS)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
+
+
+def _flatten(results):
+    return [trend for result in results if result for trend in result]
+
+
 # ═══════════════════════════════════════════════════════════════
 # DATA SOURCE 1: PINTEREST RSS FEEDS
 # ═══════════════════════════════════════════════════════════════
 
-def fetch_pinterest_rss_trends(brand_key):
+def _pinterest_feed_trends(feed_url, cutoff, session=None, cache=None):
+    """Entries from one Pinterest RSS feed newer than cutoff ([] if the feed is unavailable)."""
+    trends = []
+    try:
+        feed = fetch_feed(feed_url, session, cache)
+        if feed.bozo and not feed.entries:
+            logger.debug(f"RSS feed unavailable: {feed_url}")
+            return []
+
+        for entry in feed.entries[:10]:
+            # Parse published date if available
+            published = entry.get("published_parsed") or entry.get("updated_parsed")
+            if published:
+                entry_dt = datetime(*published[:6], tzinfo=timezone.utc)
+                if entry_dt < cutoff:
+                    continue
+
+            title = entry.get("title", "").strip()
+            summary = entry.get("summary", "").strip()
+            link = entry.get("link", "")
+
+            if title:
+                trends.append({
+                    "topic": title,
+                    "description": summary[:200] if summary else "",
+                    "source": "pinterest_rss",
+                    "source_url": link,
+                })
+    except Exception as e:
+        logger.debug(f"RSS feed error ({feed_url}): {e}")
+    return trends
+
+
+def fetch_pinterest_rss_trends(brand_key, session=None, cache=None, deadline_seconds=None):
     """Parse RSS feeds from popular Pinterest accounts in this niche.
 
     Pinterest RSS is unreliable — many boards have disabled feeds or return 404.
-    Each feed is wrapped in try/except so failures don't block other sources.
+    Feeds are fetched concurrently and each failure is isolated, so one dead
+    or slow feed doesn't block the others.
     """
-    config = SCOUT_CONFIGS[brand_key]
-    trends = []
     cutoff = datetime.now(timezone.utc) - timedelta(hours=48)
-
-    for feed_url in config["rss_feeds"]:
-        try:
-            feed = feedparser.parse(feed_url)
-            if feed.bozo and not feed.entries:
-                logger.debug(f"RSS feed unavailable: {feed_url}")
-                continue
-
-            for entry in feed.entries[:10]:
-                # Parse published date if available
-                published = entry.get("published_parsed") or entry.get("updated_parsed")
-                if published:
-                    entry_dt = datetime(*published[:6], tzinfo=timezone.utc)
-                    if entry_dt < cutoff:
-                        continue
-
-                title = entry.get("title", "").strip()
-                summary = entry.get("summary", "").strip()
-                link = entry.get("link", "")
-
-                if title:
-                    trends.append({
-                        "topic": title,
-                        "description": summary[:200] if summary else "",
-                        "source": "pinterest_rss",
-                        "source_url": link,
-                    })
-        except Exception as e:
-            logger.debug(f"RSS feed error ({feed_url}): {e}")
-            continue
+    tasks = [(f"RSS {feed_url}", partial(_pinterest_feed_trends, feed_url, cutoff, session, cache))
+             for feed_url in SCOUT_CONFIGS[brand_key]["rss_feeds"]]
+    trends = _flatten(_run_concurrently(tasks, deadline_seconds or get_deadline_seconds()))
 
     logger.info(f"Pinterest RSS for {brand_key}: {len(trends)} entries")
     return trends
@@ -190,18 +359,16 @@ def fetch_pinterest_rss_trends(brand_key):
 # DATA SOURCE 2: PYTRENDS IMAGE SEARCH (Pinterest proxy)
 # ═══════════════════════════════════════════════════════════════
 
-def fetch_image_search_trends(brand_key):
-    """Use pytrends with gprop='images' — Google Image Search rising queries.
+def _pytrends_session():
+    return TrendReq(hl='en-US', tz=480, timeout=PYTRENDS_TIMEOUT)
 
-    This is the best proxy for Pinterest trends without requiring Pinterest auth,
-    since Pinterest content is heavily indexed in Google Images.
-    """
-    config = SCOUT_CONFIGS[brand_key]
+
+def _related_query_trends(keywords, pytrends=None):
+    """Rising and top Google Image Search queries related to each seed keyword."""
     trends = []
-    pytrends = TrendReq(hl='en-US', tz=480)
+    pytrends = pytrends or _pytrends_session()
 
-    # Method 1: Related queries for seed keywords (image search)
-    for keyword in config["pytrends_seeds"]:
+    for keyword in keywords:
         try:
             pytrends.build_payload(
                 [keyword], timeframe='now 7-d', geo='US', gprop='images'
@@ -230,10 +397,14 @@ def fetch_image_search_trends(brand_key):
         except Exception as e:
             logger.warning(f"pytrends images error for '{keyword}': {e}")
             continue
+    return trends
 
-    # Method 2: General trending searches filtered for relevance
+
+def _daily_trending_searches(pytrends=None):
+    """Today's general US trending searches (the same for every brand)."""
+    trends = []
     try:
-        daily_trending = pytrends.trending_searches(pn='united_states')
+        daily_trending = (pytrends or _pytrends_session()).trending_searches(pn='united_states')
         if not daily_trending.empty:
             for topic in daily_trending[0].head(20).tolist():
                 trends.append({
@@ -243,55 +414,150 @@ def fetch_image_search_trends(brand_key):
                 })
     except Exception as e:
         logger.warning(f"Daily trending searches error: {e}")
+    return trends
+
+
+def fetch_image_search_trends(brand_key):
+    """Use pytrends with gprop='images' — Google Image Search rising queries.
+
+    This is the best proxy for Pinterest trends without requiring Pinterest auth,
+    since Pinterest content is heavily indexed in Google Images. Seeds share one
+    pytrends session and run in order (Google throttles parallel sessions).
+    """
+    pytrends = _pytrends_session()
+    # Method 1: Related queries for seed keywords (image search)
+    trends = _related_query_trends(SCOUT_CONFIGS[brand_key]["pytrends_seeds"], pytrends)
+    # Method 2: General trending searches filtered for relevance
+    trends.extend(_daily_trending_searches(pytrends))
 
     logger.info(f"pytrends for {brand_key}: {len(trends)} entries")
     return trends
 
 
+def _pytrends_for_brands(brand_seeds, into):
+    """Every brand's seeds, then the daily trending searches, through one session.
+
+    Runs serially: Google throttles parallel pytrends sessions. Results are
+    stored in `into` as each brand finishes ("daily" for the trending
+    searches), so brands done before the scout deadline are kept.
+    """
+    try:
+        pytrends = _pytrends_session()
+    except Exception as e:
+        logger.warning(f"pytrends session error: {e}")
+        return
+    for brand_key, seeds in brand_seeds.items():
+        into[brand_key] = _related_query_trends(seeds, pytrends)
+    into["daily"] = _daily_trending_searches(pytrends)
+
+
 # ═══════════════════════════════════════════════════════════════
 # DATA SOURCE 3: GOOGLE NEWS RSS
 # ═══════════════════════════════════════════════════════════════
 
-def fetch_google_news_trends(brand_key):
+def _google_news_url(keyword):
+    return f"https://news.google.com/rss/search?q={requests.utils.quote(keyword)}&hl=en-US&gl=US&ceid=US:en"
+
+
+def _news_keyword_trends(keyword, cutoff, session=None, cache=None):
+    """Google News entries for one keyword newer than cutoff."""
+    trends = []
+    try:
+        feed = fetch_feed(_google_news_url(keyword), session, cache)
+
+        for entry in feed.entries[:5]:
+            published = entry.get("published_parsed")
+            if published:
+                entry_dt = datetime(*published[:6], tzinfo=timezone.utc)
+                if entry_dt < cutoff:
+                    continue
+
+            title = entry.get("title", "").strip()
+            link = entry.get("link", "")
+
+            if title:
+                trends.append({
+                    "topic": title,
+                    "source": "google_news",
+                    "source_url": link,
+                    "keyword": keyword,
+                })
+    except Exception as e:
+        logger.warning(f"Google News RSS error for '{keyword}': {e}")
+    return trends
+
+
+def fetch_google_news_trends(brand_key, session=None, cache=None, deadline_seconds=None):
     """Parse Google News RSS for breaking news in each niche.
 
     Uses news.google.com/rss/search?q={keyword} — no auth required.
-    Filters to entries from the last 48 hours.
+    Filters to entries from the last 48 hours. Keywords are fetched concurrently.
     """
-    config = SCOUT_CONFIGS[brand_key]
-    trends = []
     cutoff = datetime.now(timezone.utc) - timedelta(hours=48)
-
-    for keyword in config["news_keywords"]:
-        try:
-            url = f"https://news.google.com/rss/search?q={requests.utils.quote(keyword)}&hl=en-US&gl=US&ceid=US:en"
-            feed = feedparser.parse(url)
-
-            for entry in feed.entries[:5]:
-                published = entry.get("published_parsed")
-                if published:
-                    entry_dt = datetime(*published[:6], tzinfo=timezone.utc)
-                    if entry_dt < cutoff:
-                        continue
-
-                title = entry.get("title", "").strip()
-                link = entry.get("link", "")
-
-                if title:
-                    trends.append({
-                        "topic": title,
-                        "source": "google_news",
-                        "source_url": link,
-                        "keyword": keyword,
-                    })
-        except Exception as e:
-            logger.warning(f"Google News RSS error for '{keyword}': {e}")
-            continue
+    tasks = [(f"Google News '{keyword}'", partial(_news_keyword_trends, keyword, cutoff, session, cache))
+             for keyword in SCOUT_CONFIGS[brand_key]["news_keywords"]]
+    trends = _flatten(_run_concurrently(tasks, deadline_seconds or get_deadline_seconds()))
 
     logger.info(f"Google News for {brand_key}: {len(trends)} entries")
     return trends
 
 
+# ═══════════════════════════════════════════════════════════════
+# ALL BRANDS × ALL SOURCES
+# ═══════════════════════════════════════════════════════════════
+
+def fetch_all_trends(brand_keys, cache=None, deadline_seconds=None):
+    """Fetch every brand × source × feed at once under one deadline.
+
+    Returns {brand: {"pinterest_rss": [...], "pytrends": [...], "google_news": [...]}}
+    with each list in the order the sequential scout produced it (feeds and
+    keywords in config order; pytrends seeds, then daily trending searches).
+    Sources that fail or miss the deadline contribute nothing. All pytrends
+    work is one serial task alongside the feeds.
+    """
+    deadline_seconds = deadline_seconds or get_deadline_seconds()
+    cutoff = datetime.now(timezone.utc) - timedelta(hours=48)
+    session = _feed_session()
+
+    pytrends = {}
+    tasks = [("pytrends", partial(_pytrends_for_brands,
+                                  {b: SCOUT_CONFIGS[b]["pytrends_seeds"] for b in brand_keys}, pytrends))]
+    slots = [None]
+    for brand_key in brand_keys:
+        config = SCOUT_CONFIGS[brand_key]
+        for feed_url in config["rss_feeds"]:
+            tasks.append((f"{brand_key} RSS {feed_url}",
+                          partial(_pinterest_feed_trends, feed_url, cutoff, session, cache)))
+            slots.append((brand_key, "pinterest_rss"))
+        for keyword in config["news_keywords"]:
+            tasks.append((f"{brand_key} Google News '{keyword}'",
+                          partial(_news_keyword_trends, keyword, cutoff, session, cache)))
+            slots.append((brand_key, "google_news"))
+
+    started = _time.perf_counter()
+    try:
+        results = _run_concurrently(tasks, deadline_seconds)
+    finally:
+        session.close()
+        if cache is not None:
+            cache.save()
+
+    fetched = {brand_key: {"pinterest_rss": [], "pytrends": [], "google_news": []}
+               for brand_key in brand_keys}
+    for slot, result in zip(slots, results):
+        if slot is not None:
+            brand_key, source = slot
+            fetched[brand_key][source].extend(result or [])
+    # The daily trending searches are identical for every brand: fetched once, shared
+    pytrends = dict(pytrends)
+    for brand_key, sources in fetched.items():
+        sources["pytrends"].extend(pytrends.get(brand_key, []) + pytrends.get("daily", []))
+
+    logger.info(f"Fetched {len(tasks)} trend sources for {len(brand_keys)} brands "
+                f"in {_time.perf_counter() - started:.1f}s")
+    return fetched
+
+
 # ═══════════════════════════════════════════════════════════════
 # CLAUDE SYNTHESIS — pick exactly 3 trending topics
 # ═══════════════════════════════════════════════════════════════
@@ -440,110 +706,120 @@ def _get_fallback_topics(brand_key):
 # MASTER ORCHESTRATOR
 # ═══════════════════════════════════════════════════════════════
 
-def run_daily_trend_scout(supabase_client):
+def _load_yesterday_topics(supabase_client, brand_keys):
+    """Yesterday's topic strings for every brand, in one query ({} on failure)."""
+    yesterday = (datetime.now(timezone.utc) - timedelta(days=1)).strftime('%Y-%m-%d')
+    try:
+        result = supabase_client.table('daily_trending') \
+            .select('brand, topics') \
+            .in_('brand', list(brand_keys)) \
+            .eq('trend_date', yesterday) \
+            .execute()
+    except Exception as e:
+        logger.warning(f"Could not fetch yesterday's topics: {e}")
+        return {}
+
+    topics = {}
+    for row in result.data or []:
+        raw = row['topics']
+        yesterday_data = json.loads(raw) if isinstance(raw, str) else raw
+        topics.setdefault(row['brand'], [t.get('topic', '') for t in yesterday_data])
+    return topics
+
+
+def _select_topics(brand_key, raw_trends, yesterday_topics):
+    """Synthesized topics, or the static fallback. Returns (topics, note for the log)."""
+    if not raw_trends:
+        return _get_fallback_topics(brand_key), "All sources returned nothing — using fallback topics"
+    try:
+        return synthesize_daily_trends(brand_key, raw_trends, yesterday_topics), None
+    except Exception as e:
+        logger.error(f"Claude synthesis failed for {brand_key}: {e}")
+        return _get_fallback_topics(brand_key), f"Claude synthesis failed: {e} — using fallback"
+
+
+def run_daily_trend_scout(supabase_client, brand_keys=None):
     """Discover today's trending topics for all 3 brands and store in Supabase.
 
     Returns dict of {brand: {"topics": [...], "raw_count": int}}.
     """
+    brand_keys = list(brand_keys or SCOUT_BRANDS)
     today_str = datetime.now(timezone.utc).strftime('%Y-%m-%d')
     results = {}
 
-    for brand_key in ['fitness', 'deals', 'menopause']:
+    # Yesterday's topics to avoid repeats, for all brands at once
+    yesterday_topics = _load_yesterday_topics(supabase_client, brand_keys)
+
+    print(f"\nTREND SCOUT: fetching {', '.join(brand_keys)} — {today_str}")
+    started = _time.perf_counter()
+    feed_cache = FeedCache.load()
+    fetched = fetch_all_trends(brand_keys, feed_cache)
+    raw_by_brand = {
+        brand_key: sources["pinterest_rss"] + sources["pytrends"] + sources["google_news"]
+        for brand_key, sources in fetched.items()
+    }
+    print(f"  Fetched all sources in {_time.perf_counter() - started:.1f}s")
+
+    # Synthesize every brand concurrently (independent LLM calls)
+    with ThreadPoolExecutor(max_workers=len(brand_keys), thread_name_prefix='trend-synth') as pool:
+        selections = dict(zip(brand_keys, pool.map(
+            lambda b: _select_topics(b, raw_by_brand[b], yesterday_topics.get(b, [])), brand_keys)))
+
+    rows = []
+    for brand_key in brand_keys:
+        raw_trends = raw_by_brand[brand_key]
+        topics, note = selections[brand_key]
+
         print(f"\n{'='*60}")
         print(f"TREND SCOUT: {brand_key.upper()} — {today_str}")
         print(f"{'='*60}")
-
-        # Fetch yesterday's topics to avoid repeats
-        yesterday_topics = []
-        try:
-            yesterday = (datetime.now(timezone.utc) - timedelta(days=1)).strftime('%Y-%m-%d')
-            yesterday_result = supabase_client.table('daily_trending') \
-                .select('topics') \
-                .eq('brand', brand_key) \
-                .eq('trend_date', yesterday) \
-                .limit(1) \
-                .execute()
-            if yesterday_result.data:
-                raw = yesterday_result.data[0]['topics']
-                yesterday_data = json.loads(raw) if isinstance(raw, str) else raw
-                yesterday_topics = [t.get('topic', '') for t in yesterday_data]
-                print(f"  Yesterday's topics: {yesterday_topics}")
-        except Exception as e:
-            logger.warning(f"Could not fetch yesterday's topics: {e}")
-
-        # Fetch from all 3 sources
-        raw_trends = []
-
-        print("  Fetching Pinterest RSS...")
-        try:
-            rss = fetch_pinterest_rss_trends(brand_key)
-            raw_trends.extend(rss)
-            print(f"    {len(rss)} entries")
-        except Exception as e:
-            print(f"    RSS failed: {e}")
-
-        print("  Fetching pytrends images...")
-        try:
-            images = fetch_image_search_trends(brand_key)
-            raw_trends.extend(images)
-            print(f"    {len(images)} entries")
-        except Exception as e:
-            print(f"    pytrends failed: {e}")
-
-        print("  Fetching Google News...")
-        try:
-            news = fetch_google_news_trends(brand_key)
-            raw_trends.extend(news)
-            print(f"    {len(news)} entries")
-        except Exception as e:
-            print(f"    Google News failed: {e}")
-
+        if yesterday_topics.get(brand_key):
+            print(f"  Yesterday's topics: {yesterday_topics[brand_key]}")
+        for source, entries in fetched[brand_key].items():
+            print(f"  {source}: {len(entries)} entries")
         print(f"  Total raw signals: {len(raw_trends)}")
-
-        # Synthesize with Claude or fall back
-        if raw_trends:
-            print("  Synthesizing with Claude...")
-            try:
-                topics = synthesize_daily_trends(brand_key, raw_trends, yesterday_topics)
-            except Exception as e:
-                logger.error(f"Claude synthesis failed for {brand_key}: {e}")
-                print(f"  Claude synthesis failed: {e} — using fallback")
-                topics = _get_fallback_topics(brand_key)
-        else:
-            print("  All sources returned nothing — using fallback topics")
-            topics = _get_fallback_topics(brand_key)
+        if note:
+            print(f"  {note}")
 
         # Print selected topics
         for t in topics:
             print(f"  #{t['rank']}: {t['topic']} (score: {t.get('trend_score', '?')})")
 
-        # Upsert into Supabase (ON CONFLICT brand + trend_date)
-        try:
-            supabase_client.table('daily_trending').upsert(
-                {
-                    'brand': brand_key,
-                    'trend_date': today_str,
-                    'topics': json.dumps(topics),
-                    'raw_data': json.dumps(raw_trends[:50]),
-                    'sources_summary': json.dumps({
-                        'pinterest_rss': len([t for t in raw_trends if t.get('source') == 'pinterest_rss']),
-                        'pytrends': len([t for t in raw_trends if 'pytrends' in t.get('source', '')]),
-                        'google_news': len([t for t in raw_trends if t.get('source') == 'google_news']),
-                        'total': len(raw_trends),
-                    }),
-                },
-                on_conflict='brand,trend_date'
-            ).execute()
-            print(f"  Saved to daily_trending table")
-        except Exception as e:
-            logger.error(f"Failed to save daily trends for {brand_key}: {e}")
-            print(f"  ERROR saving to Supabase: {e}")
-
+        rows.append({
+            'brand': brand_key,
+            'trend_date': today_str,
+            'topics': json.dumps(topics),
+            'raw_data': json.dumps(raw_trends[:50]),
+            'sources_summary': json.dumps({
+                'pinterest_rss': len([t for t in raw_trends if t.get('source') == 'pinterest_rss']),
+                'pytrends': len([t for t in raw_trends if 'pytrends' in t.get('source', '')]),
+                'google_news': len([t for t in raw_trends if t.get('source') == 'google_news']),
+                'total': len(raw_trends),
+            }),
+        })
         results[brand_key] = {
             "topics": topics,
             "raw_count": len(raw_trends),
         }
 
+    # Upsert all brands in one batch (ON CONFLICT brand + trend_date); if the
+    # batch is rejected, fall back to one row at a time so one bad row
+    # doesn't cost every brand its topics
+    try:
+        supabase_client.table('daily_trending').upsert(rows, on_conflict='brand,trend_date').execute()
+        print(f"\nSaved {len(rows)} brands to daily_trending table")
+    except Exception as e:
+        logger.warning(f"Batch save of daily trends failed ({e}), saving per brand")
+        saved = 0
+        for row in rows:
+            try:
+                supabase_client.table('daily_trending').upsert(row, on_conflict='brand,trend_date').execute()
+                saved += 1
+            except Exception as row_error:
+                logger.error(f"Failed to save daily trends for {row['brand']}: {row_error}")
+                print(f"\nERROR saving {row['brand']} to Supabase: {row_error}")
+        print(f"\nSaved {saved}/{len(rows)} brands to daily_trending table")
+
     # Update agent_runs
     try:
         supabase_client.table('agent_runs').upsert({
@@ -0,0 +1,156 @@
+"""Process-wide font registry for Pillow pin rendering.
+
+Parsing a TTF with ImageFont.truetype is the most expensive part of drawing
+text on a pin, and the pin templates ask for the same handful of
+(font file, size) pairs over and over. This module keeps one FreeTypeFont
+per (path, size) and memoizes text measurements per font, so a batch of
+pins parses each Montserrat file once per size instead of once per call.
+
+Usage:
+    from video_automation.font_registry import get_font, fit_text
+
+    font = get_font("assets/fonts/Montserrat-Bold.ttf", 98)
+    font, lines = fit_text("8 EXERCISES FOR MEN", font_path, 880, 485)
+"""
+
+import logging
+from functools import lru_cache
+
+from PIL import ImageFont
+
+logger = logging.getLogger(__name__)
+
+# Distinct (path, size) pairs across all templates is well under 100;
+# the headroom covers the size ladder walked by fit_text.
+FONT_CACHE_SIZE = 256
+WIDTH_CACHE_SIZE = 8192
+
+
+@lru_cache(maxsize=FONT_CACHE_SIZE)
+def get_font(path, size):
+    """Return a cached FreeTypeFont for (path, size).
+
+    Raises the same OSError as ImageFont.truetype if the file is unreadable,
+    so callers keep their existing fallback handling.
+    """
+    return ImageFont.truetype(str(path), size)
+
+
+@lru_cache(maxsize=FONT_CACHE_SIZE)
+def get_default_font(size):
+    """Return Pillow's built-in font at the given size (cached)."""
+    return ImageFont.load_default(size)
+
+
+@lru_cache(maxsize=WIDTH_CACHE_SIZE)
+def text_width(font, text):
+    """Pixel width of `text` as drawn by ImageDraw.textbbox at (0, 0).
+
+    Memoized per font object; fonts come from get_font so the same
+    (path, size) always maps to the same key.
+    """
+    bbox = font.getbbox(text)
+    return bbox[2] - bbox[0]
+
+
+@lru_cache(maxsize=WIDTH_CACHE_SIZE)
+def word_advance(font, word):
+    """Horizontal advance of a single word (memoized per font)."""
+    return font.getlength(word)
+
+
+def wrap_text(text, font, max_width):
+    """Greedy word-wrap; every accepted line is measured with its real bbox.
+
+    A line is only grown by a word if the joined line's bbox (memoized, the
+    same measure ImageDraw.textbbox uses) fits, so kerning and glyph
+    overhang can't push it past max_width. The summed word advances are only
+    used to skip that measurement for candidates that are over by more than
+    an em, which bearings and kerning can never make up.
+    """
+    words = text.split()
+    if not words:
+        return []
+
+    space = word_advance(font, " ")
+    slack = getattr(font, "size", 0)
+    lines = []
+    current = [words[0]]
+    current_w = word_advance(font, words[0])
+
+    for word in words[1:]:
+        candidate_w = current_w + space + word_advance(font, word)
+        if candidate_w <= max_width + slack and text_width(font, " ".join(current + [word])) <= max_width:
+            current.append(word)
+            current_w = candidate_w
+        else:
+            lines.append(" ".join(current))
+            current = [word]
+            current_w = word_advance(font, word)
+
+    lines.append(" ".join(current))
+    return lines
+
+
+def _fits(text, font_path, size, max_width, max_height, line_spacing):
+    """Return (font, lines) if text fits at this size, else None."""
+    try:
+        font = get_font(font_path, size)
+    except OSError:
+        return None
+    lines = wrap_text(text, font, max_width)
+    if len(lines) * (size + line_spacing) > max_height:
+        return None
+    if any(text_width(font, line) > max_width for line in lines):
+        return None
+    return font, lines
+
+
+def fit_text(text, font_path, max_width, max_height, start_size=130, min_size=60,
+             step=4, line_spacing=18):
+    """Find the largest ladder size where word-wrapped text fits the box.
+
+    The ladder is start_size, start_size - step, ... down to min_size. Larger
+    sizes never fit where smaller ones fail, so the ladder is binary searched
+    instead of walked top-down. Returns (font, lines); if nothing fits the
+    minimum size is used regardless.
+    """
+    font_path = str(font_path)
+    ladder = list(range(start_size, min_size - 1, -step))
+
+    best = None
+    lo, hi = 0, len(ladder) - 1
+    while lo <= hi:
+        mid = (lo + hi) // 2
+        result = _fits(text, font_path, ladder[mid], max_width, max_height, line_spacing)
+        if result:
+            best = result
+            hi = mid - 1
+        else:
+            lo = mid + 1
+
+    if best:
+        return best
+
+    try:
+        font = get_font(font_path, min_size)
+    except OSError:
+        font = get_default_font(min_size)
+    return font, wrap_text(text, font, max_width)
+
+
+def clear():
+    """Drop all cached fonts and measurements (used by benchmarks/tests)."""
+    get_font.cache_clear()
+    get_default_font.cache_clear()
+    text_width.cache_clear()
+    word_advance.cache_clear()
+
+
+def cache_info():
+    """Return hit/miss statistics for each registry cache."""
+    return {
+        "fonts": get_font.cache_info()._asdict(),
+        "text_width": text_width.cache_info()._asdict(),
+        "word_advance": word_advance.cache_info()._asdict(),
+    }
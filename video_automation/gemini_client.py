@@ -8,23 +8,51 @@ Features:
 - Auto-discovers available models at startup (no hardcoded model names to break)
 - Prefers flash models, falls back through a priority chain
 - Disables thinking for JSON calls (prevents response corruption)
-- Retries with exponential backoff on rate limits (429)
+- Client-side RPM/TPM token-bucket limiting (gemini_limiter), shared by all
+  threads, with jittered backoff on rate limits (429) instead of fixed sleeps
+- generate_many() / map_concurrent() run independent calls on a thread pool,
+  so a multi-brand run takes about as long as its slowest call
+- Successful responses are cached by prompt (utils.llm_cache), so a re-run
+  reuses them; LLM_CACHE_MODE=replay serves only from cache with no API calls
 - Logs every failure with full context for debugging
-- Caches working model name so subsequent calls are fast
+- Routes through gemini_router: the model catalog is cached with a TTL, the
+  last working model is persisted across runs, unhealthy models are
+  circuit-broken, and per-model call/fallback/latency counters are kept
 """
 
 import json
 import logging
 import os
 import re
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 
 from google import genai
 
+from utils.llm_cache import cache_mode, cached_generate
+from video_automation.gemini_limiter import (
+    DEFAULT_RPM,
+    DEFAULT_TPM,
+    RateLimiter,
+    backoff_delay,
+    estimate_tokens,
+    retry_delay_from_error,
+)
+from video_automation.gemini_router import ModelRouter
+
 logger = logging.getLogger(__name__)
 
 _client = None
 _working_model = None  # Cache of last model that worked
+_router = None
+_limiter = None
+_init_lock = threading.Lock()
+
+DEFAULT_MAX_CONCURRENCY = 4
+# Cache key "model" for routed calls: the serving model is picked at call
+# time, so responses are keyed by this logical name instead.
+CACHE_MODEL_KEY = "gemini-auto"
 
 # Priority order: prefer newest flash, fall back to older stable models
 MODEL_PRIORITY = [
@@ -93,6 +121,36 @@ def discover_models():
         return MODEL_PRIORITY.copy()
 
 
+def get_router():
+    """Lazy-initialize the process-wide model router."""
+    global _router
+    with _init_lock:
+        if _router is None:
+            _router = ModelRouter(discover=discover_models)
+        return _router
+
+
+def get_limiter():
+    """Lazy-initialize the process-wide rate limiter from GEMINI_RPM / GEMINI_TPM."""
+    global _limiter
+    with _init_lock:
+        if _limiter is None:
+            rpm = int(os.environ.get('GEMINI_RPM', DEFAULT_RPM))
+            tpm = int(os.environ.get('GEMINI_TPM', DEFAULT_TPM))
+            _limiter = RateLimiter(rpm=rpm, tpm=tpm)
+        return _limiter
+
+
+def max_concurrency():
+    """Worker count for generate_many / map_concurrent (GEMINI_MAX_CONCURRENCY)."""
+    return max(1, int(os.environ.get('GEMINI_MAX_CONCURRENCY', DEFAULT_MAX_CONCURRENCY)))
+
+
+def model_stats():
+    """Per-model counters (calls, successes, failures, fallbacks, avg latency)."""
+    return get_router().stats()
+
+
 def _get_thinking_config():
     """Build ThinkingConfig to disable thinking (prevents JSON corruption).
 
@@ -107,48 +165,59 @@ def _get_thinking_config():
         return None
 
 
-def generate_json(prompt, max_tokens=1000):
+def generate_json(prompt, max_tokens=1000, cache=True):
     """Generate a JSON response from Gemini. Most reliable method for structured output.
 
     - Forces response_mime_type: application/json
     - Disables thinking (prevents reasoning tokens in output)
     - Auto-discovers and falls back through available models
+    - Serves repeated prompts from the response cache unless cache=False
     - Returns the raw JSON string
 
-    Raises RuntimeError if all models fail.
+    Raises RuntimeError if all models fail (CacheMiss in replay mode).
     """
-    return _generate(prompt, max_tokens=max_tokens, json_mode=True)
+    return _generate_cached(prompt, max_tokens, json_mode=True, use_cache=cache)
 
 
-def generate_text(prompt, max_tokens=4000):
+def generate_text(prompt, max_tokens=4000, cache=True):
     """Generate a text response from Gemini.
 
     - Disables thinking for consistency
     - Auto-discovers and falls back through available models
+    - Serves repeated prompts from the response cache unless cache=False
     - Returns the raw text string
 
-    Raises RuntimeError if all models fail.
+    Raises RuntimeError if all models fail (CacheMiss in replay mode).
     """
-    return _generate(prompt, max_tokens=max_tokens, json_mode=False)
+    return _generate_cached(prompt, max_tokens, json_mode=False, use_cache=cache)
+
+
+def _generate_cached(prompt, max_tokens, json_mode, use_cache=True):
+    """_generate behind the prompt-keyed response cache."""
+    return cached_generate(
+        CACHE_MODEL_KEY, prompt, max_tokens, json_mode,
+        produce=lambda: _generate(prompt, max_tokens=max_tokens, json_mode=json_mode),
+        use_cache=use_cache,
+    )
 
 
 def _generate(prompt, max_tokens=1000, json_mode=True):
     """Core generation function with model fallback and retry logic."""
     global _working_model
 
-    # Build model list: try cached working model first, then discovery
-    if _working_model:
-        models_to_try = [_working_model] + [m for m in discover_models() if m != _working_model]
-    else:
-        models_to_try = discover_models()
-
-    if not models_to_try:
-        raise RuntimeError("No Gemini models available")
-
+    # Router yields the last known good model first and only runs discovery
+    # (cached with a TTL) if that model fails; open circuits are skipped.
+    router = get_router()
+    limiter = get_limiter()
+    # Quota cost is charged before the call: prompt estimate + the output cap
+    quota_tokens = estimate_tokens(prompt) + max_tokens
     last_error = None
+    fell_back = False  # an earlier model in the chain failed (429 retries don't count)
     thinking_config = _get_thinking_config()
+    tried_any = False
 
-    for model_name in models_to_try:
+    for model_name in router.candidates():
+        tried_any = True
         config = {"max_output_tokens": max_tokens}
         if json_mode:
             config["response_mime_type"] = "application/json"
@@ -156,6 +225,8 @@ def _generate(prompt, max_tokens=1000, json_mode=True):
             config["thinking_config"] = thinking_config
 
         for attempt in range(3):
+            limiter.acquire(quota_tokens)
+            started = time.perf_counter()
             try:
                 response = get_client().models.generate_content(
                     model=model_name,
@@ -194,10 +265,10 @@ def _generate(prompt, max_tokens=1000, json_mode=True):
                             else:
                                 raise ValueError(f"Response from {model_name} is not valid JSON: {text[:100]}")
 
-                # Success — cache this model
-                if _working_model != model_name:
-                    logger.info(f"Gemini model {model_name} working — caching for future calls")
-                    _working_model = model_name
+                # Success — router persists this model for future calls/runs
+                router.record_success(model_name, time.perf_counter() - started,
+                                      fallback=fell_back)
+                _working_model = model_name
                 return text
 
             except Exception as e:
@@ -205,26 +276,76 @@ def _generate(prompt, max_tokens=1000, json_mode=True):
                 err_str = str(e)
 
                 if "429" in err_str and attempt < 2:
-                    wait = 30 * (attempt + 1)
-                    logger.warning(f"Rate limit on {model_name} — waiting {wait}s (attempt {attempt + 1}/3)")
-                    time.sleep(wait)
+                    # Pause every thread, not just this one; the next
+                    # acquire() blocks until the pause is over.
+                    wait = retry_delay_from_error(e) or backoff_delay(attempt)
+                    logger.warning(f"Rate limit on {model_name} — waiting {wait:.1f}s (attempt {attempt + 1}/3)")
+                    limiter.pause(wait)
                     continue
                 else:
+                    router.record_failure(model_name, e, time.perf_counter() - started)
                     logger.warning(f"Model {model_name} failed: {err_str[:200]}")
+                    fell_back = True
                     break  # Try next model
 
+    if not tried_any:
+        raise RuntimeError("No Gemini models available")
+
     error_msg = f"All Gemini models failed. Last error: {last_error}"
     logger.error(error_msg)
     raise RuntimeError(error_msg)
 
 
+def map_concurrent(func, items, max_workers=None):
+    """Call func(item) for every item on a thread pool; results keep input order.
+
+    Intended for functions that make Gemini calls (generate_article_for_pin,
+    generate_pin_content, video script generators). All threads share the
+    process-wide rate limiter, so concurrency never exceeds the RPM/TPM
+    quota. A failed call returns its exception in place of a result rather
+    than aborting the batch.
+    """
+    items = list(items)
+    if not items:
+        return []
+
+    def call(item):
+        try:
+            return func(item)
+        except Exception as e:
+            logger.warning(f"Concurrent Gemini task failed: {str(e)[:200]}")
+            return e
+
+    workers = min(max_workers or max_concurrency(), len(items))
+    if workers == 1:
+        return [call(item) for item in items]
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(call, items))
+
+
+def generate_many(prompts, max_tokens=1000, json_mode=True, max_workers=None, cache=True):
+    """Run many independent prompts concurrently under the shared rate limiter.
+
+    Returns a list aligned with prompts: the response string, or the
+    exception (usually RuntimeError) for prompts where every model failed.
+    """
+    return map_concurrent(
+        lambda prompt: _generate_cached(prompt, max_tokens, json_mode, use_cache=cache),
+        prompts,
+        max_workers=max_workers,
+    )
+
+
 def health_check():
     """Quick health check — tries to generate a minimal response.
 
     Returns (True, model_name) on success, (False, error_message) on failure.
+    Never cached; in replay mode no API is needed, so it reports healthy.
     """
+    if cache_mode() == "replay":
+        return True, "replay"
     try:
-        text = generate_json('Return this exact JSON: {"status": "ok"}', max_tokens=50)
+        text = generate_json('Return this exact JSON: {"status": "ok"}', max_tokens=50, cache=False)
         parsed = json.loads(text)
         return True, _working_model or "unknown"
     except Exception as e:
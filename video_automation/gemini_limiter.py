@@ -0,0 +1,122 @@
+"""Client-side rate limiting for gemini_client: token buckets and jittered backoff.
+
+gemini_client used to be called strictly sequentially and handled 429s with
+a blocking 30s/60s sleep. RateLimiter lets many threads share one Gemini
+quota instead:
+
+- One token bucket for requests per minute (RPM) and one for estimated
+  tokens per minute (TPM); a call waits until both have capacity
+- A 429 pauses the whole limiter (every thread, not just the one that hit
+  it) for the server's retryDelay when given, else a jittered backoff
+- backoff_delay() replaces fixed sleeps with capped exponential backoff and
+  jitter so concurrent retries don't all land on the same second
+
+Quotas come from GEMINI_RPM / GEMINI_TPM (see gemini_client.get_limiter).
+
+Usage (via gemini_client, not directly):
+    limiter = RateLimiter(rpm=10, tpm=250_000)
+    limiter.acquire(estimate_tokens(prompt) + max_tokens)
+"""
+
+import logging
+import random
+import re
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_RPM = 10
+DEFAULT_TPM = 250_000
+BACKOFF_BASE_SECONDS = 4.0
+BACKOFF_CAP_SECONDS = 60.0
+
+_RETRY_DELAY = re.compile(r"retry(?:Delay'?\"?:\s*'?\"?| in )(\d+(?:\.\d+)?)s", re.IGNORECASE)
+
+
+def estimate_tokens(text):
+    """Rough token count for quota accounting (~4 characters per token)."""
+    return max(1, len(text or "") // 4)
+
+
+def backoff_delay(attempt, base=BACKOFF_BASE_SECONDS, cap=BACKOFF_CAP_SECONDS, rng=random.random):
+    """Capped exponential backoff with jitter: uniform in [d/2, d] for d = base * 2**attempt."""
+    delay = min(cap, base * (2 ** attempt))
+    return delay / 2 + rng() * delay / 2
+
+
+def retry_delay_from_error(error):
+    """Server-suggested wait in seconds from a 429 error message, or None."""
+    match = _RETRY_DELAY.search(str(error))
+    return float(match.group(1)) if match else None
+
+
+class TokenBucket:
+    """Thread-safe token bucket refilled continuously at `rate` per second."""
+
+    def __init__(self, rate, capacity, clock=time.monotonic, sleep=time.sleep):
+        self.rate = rate
+        self.capacity = capacity
+        self._clock = clock
+        self._sleep = sleep
+        self._lock = threading.Lock()
+        self._tokens = capacity
+        self._updated = clock()
+
+    def _refill(self, now):
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def reserve(self, amount=1):
+        """Take `amount` tokens and return how long the caller must wait before using them.
+
+        Tokens may go negative, so concurrent callers queue up in order
+        instead of all waking at once. Amounts above capacity are clamped so
+        an oversized request still goes through (after a full refill).
+        """
+        amount = min(amount, self.capacity)
+        with self._lock:
+            self._refill(self._clock())
+            self._tokens -= amount
+            return 0.0 if self._tokens >= 0 else -self._tokens / self.rate
+
+    def acquire(self, amount=1):
+        """Block until `amount` tokens are available. Returns seconds waited."""
+        wait = self.reserve(amount)
+        if wait > 0:
+            self._sleep(wait)
+        return wait
+
+
+class RateLimiter:
+    """RPM + TPM limiter shared by every thread calling Gemini."""
+
+    def __init__(self, rpm=DEFAULT_RPM, tpm=DEFAULT_TPM, clock=time.monotonic, sleep=time.sleep):
+        self.rpm = rpm
+        self.tpm = tpm
+        self._clock = clock
+        self._sleep = sleep
+        self._requests = TokenBucket(rpm / 60.0, rpm, clock=clock, sleep=sleep)
+        self._tokens = TokenBucket(tpm / 60.0, tpm, clock=clock, sleep=sleep)
+        self._lock = threading.Lock()
+        self._paused_until = 0.0
+        self.waited = 0.0  # total seconds callers spent blocked, for logging
+
+    def acquire(self, tokens=1):
+        """Block until one request and `tokens` tokens fit in the quota."""
+        with self._lock:
+            pause = max(0.0, self._paused_until - self._clock())
+        wait = max(pause, self._requests.reserve(1), self._tokens.reserve(tokens))
+        if wait > 0:
+            self._sleep(wait)
+            with self._lock:
+                self.waited += wait
+        return wait
+
+    def pause(self, seconds):
+        """Hold back every caller for `seconds` (after a 429)."""
+        with self._lock:
+            until = self._clock() + seconds
+            if until > self._paused_until:
+                self._paused_until = until
+                logger.warning(f"Gemini rate limited — pausing all calls for {seconds:.1f}s")
@@ -0,0 +1,225 @@
+"""Model routing for gemini_client: cached catalog, circuit breaking, and stats.
+
+gemini_client used to call discover_models() (a client.models.list() round
+trip) before every generation. ModelRouter replaces that with:
+
+- A TTL-cached model catalog, only fetched when the preferred model fails
+- A persisted "last known good" model, so a cold CI job starts with the
+  model that worked last run and never lists models at all on the happy path
+- Per-model health with a simple circuit breaker: after N consecutive
+  failures a model is skipped for a cooldown period (404/NOT_FOUND opens the
+  circuit immediately and clears the persisted last known good model, since
+  a discontinued model never comes back)
+- Per-model counters for calls, successes, failures, fallbacks and latency
+
+Usage (via gemini_client, not directly):
+    router = ModelRouter(discover=discover_models)
+    for model in router.candidates():
+        ...
+        router.record_success(model, latency)
+"""
+
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+DEFAULT_STATE_PATH = PROJECT_ROOT / "cache" / "gemini_model.json"
+
+CATALOG_TTL_SECONDS = 6 * 3600
+LAST_GOOD_TTL_SECONDS = 7 * 24 * 3600
+FAILURE_THRESHOLD = 3
+COOLDOWN_SECONDS = 300
+NOT_FOUND_COOLDOWN_SECONDS = 24 * 3600
+
+
+class ModelStats:
+    """Health and counters for one model."""
+
+    def __init__(self):
+        self.calls = 0
+        self.successes = 0
+        self.failures = 0
+        self.fallbacks = 0  # successes served after an earlier model failed
+        self.total_latency = 0.0
+        self.consecutive_failures = 0
+        self.open_until = 0.0
+        self.last_error = ""
+
+    def is_open(self, now):
+        return self.open_until > now
+
+    def as_dict(self):
+        return {
+            "calls": self.calls,
+            "successes": self.successes,
+            "failures": self.failures,
+            "fallbacks": self.fallbacks,
+            "avg_latency_ms": round(1000 * self.total_latency / self.calls, 1) if self.calls else 0.0,
+            "circuit_open": self.open_until > time.time(),
+            "last_error": self.last_error,
+        }
+
+
+class ModelRouter:
+    """Chooses which Gemini model to try next and remembers what worked."""
+
+    def __init__(self, discover, state_path=None, catalog_ttl=CATALOG_TTL_SECONDS,
+                 failure_threshold=FAILURE_THRESHOLD, cooldown=COOLDOWN_SECONDS,
+                 clock=time.time):
+        self._discover = discover
+        self.state_path = Path(state_path or os.environ.get("GEMINI_MODEL_STATE_PATH") or DEFAULT_STATE_PATH)
+        self.catalog_ttl = catalog_ttl
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._catalog = None
+        self._catalog_at = 0.0
+        self._stats = {}
+        self._persisted = None  # last good model as stored in state_path
+        self._last_good = self._load_last_good()
+
+    # ── persistence ──────────────────────────────────────────────────────────
+
+    def _load_last_good(self):
+        try:
+            state = json.loads(self.state_path.read_text())
+        except (OSError, ValueError):
+            return None
+        if self._clock() - state.get("updated_at", 0) > LAST_GOOD_TTL_SECONDS:
+            return None
+        model = state.get("model")
+        if model:
+            logger.info(f"Gemini last known good model: {model} (from {self.state_path.name})")
+        self._persisted = model
+        return model
+
+    def _save_last_good(self, model):
+        try:
+            self.state_path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=self.state_path.parent, prefix=".gemini-")
+            with os.fdopen(fd, "w") as f:
+                json.dump({"model": model, "updated_at": self._clock()}, f)
+            os.replace(tmp, self.state_path)
+            self._persisted = model
+        except OSError as e:
+            logger.debug(f"Could not persist Gemini model state: {e}")
+
+    def _forget_last_good(self):
+        try:
+            self.state_path.unlink()
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            logger.debug(f"Could not clear Gemini model state: {e}")
+        self._persisted = None
+
+    # ── catalog ──────────────────────────────────────────────────────────────
+
+    def catalog(self, refresh=False):
+        """Return the discovered model list, re-discovering after the TTL."""
+        with self._lock:
+            fresh = self._catalog is not None and self._clock() - self._catalog_at < self.catalog_ttl
+            if fresh and not refresh:
+                return list(self._catalog)
+        models = self._discover()
+        with self._lock:
+            self._catalog = list(models)
+            self._catalog_at = self._clock()
+            return list(self._catalog)
+
+    @property
+    def last_good(self):
+        return self._last_good
+
+    def candidates(self):
+        """Yield models to try, best first.
+
+        The last known good model is yielded before the catalog is touched,
+        so discovery only happens when it fails. Models with an open circuit
+        are skipped unless every model is open, in which case they are
+        retried anyway (better a long-shot call than no call).
+        """
+        tried = set()
+        skipped = []
+        now = self._clock()
+
+        if self._last_good:
+            tried.add(self._last_good)
+            if self._stat(self._last_good).is_open(now):
+                skipped.append(self._last_good)
+            else:
+                yield self._last_good
+
+        for model in self.catalog():
+            if model in tried:
+                continue
+            tried.add(model)
+            if self._stat(model).is_open(now):
+                skipped.append(model)
+                continue
+            yield model
+
+        for model in skipped:
+            logger.warning(f"All Gemini models unhealthy — retrying {model} despite open circuit")
+            yield model
+
+    # ── health ───────────────────────────────────────────────────────────────
+
+    def _stat(self, model):
+        with self._lock:
+            if model not in self._stats:
+                self._stats[model] = ModelStats()
+            return self._stats[model]
+
+    def record_success(self, model, latency, fallback=False):
+        stat = self._stat(model)
+        with self._lock:
+            stat.calls += 1
+            stat.successes += 1
+            stat.total_latency += latency
+            stat.consecutive_failures = 0
+            stat.open_until = 0.0
+            if fallback:
+                stat.fallbacks += 1
+            changed = self._last_good != model
+            self._last_good = model
+        if changed:
+            logger.info(f"Gemini model {model} working — caching for future calls")
+            self._save_last_good(model)
+
+    def record_failure(self, model, error, latency=0.0):
+        err_str = str(error)
+        stat = self._stat(model)
+        with self._lock:
+            stat.calls += 1
+            stat.failures += 1
+            stat.total_latency += latency
+            stat.consecutive_failures += 1
+            stat.last_error = err_str[:200]
+            not_found = "404" in err_str or "NOT_FOUND" in err_str
+            if not_found:
+                stat.open_until = self._clock() + NOT_FOUND_COOLDOWN_SECONDS
+            elif stat.consecutive_failures >= self.failure_threshold:
+                stat.open_until = self._clock() + self.cooldown
+            opened = stat.open_until > self._clock()
+            if opened and self._last_good == model:
+                self._last_good = None
+            # A discontinued model must not be tried first again next run
+            forget = not_found and self._persisted == model
+        if opened:
+            logger.warning(f"Gemini circuit open for {model}: {err_str[:120]}")
+        if forget:
+            self._forget_last_good()
+
+    def stats(self):
+        """Per-model counters, e.g. for end-of-run logging."""
+        with self._lock:
+            return {model: stat.as_dict() for model, stat in self._stats.items()}
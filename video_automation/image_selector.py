@@ -10,8 +10,14 @@ import random
 import os
 import logging
 
+from utils.image_cache import pexels_cover_url
+
 logger = logging.getLogger(__name__)
 
+# Pin canvas size; the returned URL is the smallest rendition that covers it
+PIN_WIDTH = 1000
+PIN_HEIGHT = 1500
+
 
 # Brand-specific image validation rules
 BRAND_IMAGE_RULES = {
@@ -146,16 +152,36 @@ def validate_image_query(query, brand):
     return query
 
 
-def get_unique_pexels_image(search_query, brand, supabase_client):
+def _recent_image_ids(brand, supabase_client, history=None):
+    """Pexels image ids used by this brand's last 50 pins."""
+    if history is not None:
+        return history.used_image_ids(brand, 50)
+    try:
+        recent = supabase_client.table('content_history') \
+            .select('pexels_image_id') \
+            .eq('brand', brand) \
+            .order('created_at', desc=True) \
+            .limit(50) \
+            .execute()
+        return {str(r['pexels_image_id']) for r in recent.data if r.get('pexels_image_id')}
+    except Exception as e:
+        logger.warning(f"Could not fetch recent images: {e}")
+        return set()
+
+
+def get_unique_pexels_image(search_query, brand, supabase_client, history=None):
     """Fetch a Pexels image that hasn't been used by this brand recently.
 
     Args:
         search_query: Detailed search query for Pexels
         brand: Brand key (fitness/deals/menopause)
         supabase_client: Supabase client instance
+        history: Optional BrandHistorySnapshot; used ids come from memory
+            and the chosen id is recorded so later pins in the run skip it
 
     Returns:
-        Dict with id, url, photographer, alt
+        Dict with id, url, photographer, alt. `url` is sized to cover a
+        1000x1500 pin rather than src.original.
     """
     # Validate query against brand guardrails before making API call
     search_query = validate_image_query(search_query, brand)
@@ -165,17 +191,7 @@ def get_unique_pexels_image(search_query, brand, supabase_client):
         raise ValueError("PEXELS_API_KEY not set")
 
     # Get recently used image IDs for this brand (last 50 pins)
-    used_ids = set()
-    try:
-        recent = supabase_client.table('content_history') \
-            .select('pexels_image_id') \
-            .eq('brand', brand) \
-            .order('created_at', desc=True) \
-            .limit(50) \
-            .execute()
-        used_ids = {str(r['pexels_image_id']) for r in recent.data if r.get('pexels_image_id')}
-    except Exception as e:
-        logger.warning(f"Could not fetch recent images: {e}")
+    used_ids = _recent_image_ids(brand, supabase_client, history)
 
     # Search Pexels — use portrait orientation for Pinterest
     headers = {"Authorization": api_key}
@@ -247,10 +263,12 @@ def get_unique_pexels_image(search_query, brand, supabase_client):
 
     # Pick randomly from top results for variety
     chosen = random.choice(new_photos[:min(10, len(new_photos))])
+    if history is not None:
+        history.mark_image_used(brand, image_id=chosen['id'])
 
     return {
         "id": str(chosen['id']),
-        "url": chosen['src']['original'],
+        "url": pexels_cover_url(chosen, PIN_WIDTH, PIN_HEIGHT),
         "photographer": chosen['photographer'],
         "alt": chosen.get('alt', '')
     }
@@ -0,0 +1,262 @@
+"""Perceptual-hash image dedup index (dHash + multi-index hashing), persisted to disk.
+
+compute_image_hash() is a SHA-256 of the JPEG bytes, so a re-encoded or
+slightly differently overlaid copy of the same photo never matched, and
+every check was a Supabase lookup. This module replaces that with:
+
+- dhash(): a 64-bit difference hash computed with NumPy from a tiny
+  grayscale thumbnail (JPEG draft mode, so large photos decode fast)
+- PerceptualHashIndex: multi-index hashing over Hamming distance, so "is
+  there any image within N bits of this one?" is a few dict lookups
+- Persistence to cache/phash_index.json (restored by the content-engine
+  cache step) plus incremental bulk sync of the image_phash column from
+  content_history and pinterest_pins
+
+Hashes are of the background photo (or the raw AI image), taken before the
+brand template is composited; see pin_pipeline.engine.
+
+Usage:
+    index = get_phash_index()
+    index.sync(db.client)
+    phash = dhash(background_bytes)
+    if index.is_duplicate(phash):
+        ...re-pick the image...
+    index.add(phash, brand=brand)
+    index.save()
+"""
+
+import json
+import logging
+import os
+import tempfile
+import threading
+from collections import defaultdict
+from io import BytesIO
+from pathlib import Path
+
+import numpy as np
+from PIL import Image
+
+logger = logging.getLogger(__name__)
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+DEFAULT_INDEX_PATH = PROJECT_ROOT / "cache" / "phash_index.json"
+
+HASH_SIZE = 8  # 8x8 gradient bits -> 64-bit hash
+# Max Hamming distance (of 64 bits) treated as "the same picture".
+DEFAULT_MAX_DISTANCE = 6
+SYNC_TABLES = ("content_history", "pinterest_pins")
+SYNC_PAGE_SIZE = 1000
+
+
+# ═══════════════════════════════════════════════════════════════
+# HASHING
+# ═══════════════════════════════════════════════════════════════
+
+def dhash(image, hash_size=HASH_SIZE):
+    """64-bit difference hash of image bytes or a PIL image, as 16 hex chars.
+
+    Each bit says whether a pixel is brighter than its right-hand neighbour
+    in a (hash_size+1) x hash_size grayscale thumbnail, so the hash survives
+    re-encoding, resizing and small overlay changes.
+    """
+    img = image if isinstance(image, Image.Image) else Image.open(BytesIO(image))
+    if img.format == "JPEG":
+        img.draft("L", (hash_size * 8, hash_size * 8))
+    thumb = img.convert("L").resize((hash_size + 1, hash_size), Image.BILINEAR)
+    px = np.asarray(thumb, dtype=np.int16)
+    bits = (px[:, 1:] > px[:, :-1]).ravel()
+    return np.packbits(bits).tobytes().hex()
+
+
+def hamming(a, b):
+    """Bit distance between two hex hashes."""
+    return (int(a, 16) ^ int(b, 16)).bit_count()
+
+
+def _popcount(values):
+    """Per-element set-bit count of a uint64 array."""
+    if hasattr(np, "bitwise_count"):
+        return np.bitwise_count(values).astype(np.int64)
+    return np.unpackbits(values.view(np.uint8).reshape(-1, 8), axis=1).sum(axis=1)
+
+
+def hamming_distances(query, hashes):
+    """Vectorized Hamming distance from one hex hash to many (NumPy uint64)."""
+    if not len(hashes):
+        return np.zeros(0, dtype=np.int64)
+    values = np.array([int(h, 16) for h in hashes], dtype=np.uint64)
+    return _popcount(values ^ np.uint64(int(query, 16)))
+
+
+# ═══════════════════════════════════════════════════════════════
+# MULTI-INDEX HASH TABLE
+# ═══════════════════════════════════════════════════════════════
+
+def _chunk_layout(max_distance, bits=HASH_SIZE * HASH_SIZE):
+    """Split the hash into max_distance+1 bit ranges as (shift, mask) pairs.
+
+    Pigeonhole: two hashes within max_distance bits must agree exactly on
+    at least one of max_distance+1 disjoint chunks.
+    """
+    m = max_distance + 1
+    sizes = [bits // m + (1 if i < bits % m else 0) for i in range(m)]
+    layout, shift = [], 0
+    for size in sizes:
+        layout.append((shift, (1 << size) - 1))
+        shift += size
+    return layout
+
+
+class PerceptualHashIndex:
+    """Hamming-distance nearest-neighbour index of perceptual image hashes.
+
+    Multi-index hashing: every hash is filed under each of its
+    max_distance+1 chunks, so a query only compares against hashes sharing
+    a chunk with it. Queries with a larger radius fall back to a NumPy scan.
+    """
+
+    def __init__(self, path=None, max_distance=DEFAULT_MAX_DISTANCE):
+        self.path = Path(path or os.environ.get("PHASH_INDEX_PATH") or DEFAULT_INDEX_PATH)
+        self.max_distance = max_distance
+        self._lock = threading.Lock()
+        self._layout = _chunk_layout(max_distance)
+        self._tables = [defaultdict(list) for _ in self._layout]
+        self._values = {}    # phash -> int value
+        self._meta = {}      # phash -> {"brand": ..., "ref": ...}
+        self._array = None   # uint64 snapshot of _values for scans, rebuilt lazily
+        self._synced_at = {}  # table -> newest created_at pulled
+        self._dirty = False
+
+    def __len__(self):
+        return len(self._meta)
+
+    def __contains__(self, phash):
+        return phash in self._meta
+
+    def add(self, phash, brand="", ref=""):
+        """Insert a hash (no-op if already present). Returns True if new."""
+        if not phash:
+            return False
+        value = int(phash, 16)
+        with self._lock:
+            if phash in self._meta:
+                return False
+            self._meta[phash] = {"brand": brand, "ref": ref}
+            self._values[phash] = value
+            for table, (shift, mask) in zip(self._tables, self._layout):
+                table[(value >> shift) & mask].append(phash)
+            self._array = None
+            self._dirty = True
+            return True
+
+    def find(self, phash, max_distance=None):
+        """All indexed hashes within max_distance bits, nearest first.
+
+        Returns a list of (distance, phash, meta).
+        """
+        limit = self.max_distance if max_distance is None else max_distance
+        value = int(phash, 16)
+        with self._lock:
+            if limit <= self.max_distance:
+                candidates = set()
+                for table, (shift, mask) in zip(self._tables, self._layout):
+                    candidates.update(table.get((value >> shift) & mask, ()))
+                matches = [((self._values[h] ^ value).bit_count(), h) for h in candidates]
+            else:
+                keys = list(self._values)
+                if self._array is None:
+                    self._array = np.array([self._values[h] for h in keys], dtype=np.uint64)
+                matches = list(zip(_popcount(self._array ^ np.uint64(value)).tolist(), keys))
+            found = [(d, h, self._meta[h]) for d, h in matches if d <= limit]
+        found.sort(key=lambda m: m[0])
+        return found
+
+    def nearest(self, phash, max_distance=None):
+        """Closest match within max_distance as (distance, phash, meta), or None."""
+        matches = self.find(phash, max_distance)
+        return matches[0] if matches else None
+
+    def is_duplicate(self, phash, max_distance=None):
+        return self.nearest(phash, max_distance) is not None
+
+    # ── persistence ──────────────────────────────────────────────────────────
+
+    @classmethod
+    def load(cls, path=None, max_distance=DEFAULT_MAX_DISTANCE):
+        """Load an index from disk; a missing or corrupt file gives an empty index."""
+        index = cls(path, max_distance)
+        try:
+            state = json.loads(index.path.read_text())
+        except (OSError, ValueError):
+            return index
+        for phash, brand, ref in state.get("entries", []):
+            index.add(phash, brand, ref)
+        index._synced_at = dict(state.get("synced_at", {}))
+        index._dirty = False
+        return index
+
+    def save(self):
+        """Atomically write the index if it changed since load/save."""
+        with self._lock:
+            if not self._dirty:
+                return
+            state = {
+                "synced_at": self._synced_at,
+                "entries": [[h, m["brand"], m["ref"]] for h, m in self._meta.items()],
+            }
+            self._dirty = False
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=self.path.parent, prefix=".phash-")
+            with os.fdopen(fd, "w") as f:
+                json.dump(state, f)
+            os.replace(tmp, self.path)
+        except OSError as e:
+            logger.warning(f"Could not persist phash index: {e}")
+
+    # ── sync ─────────────────────────────────────────────────────────────────
+
+    def sync(self, supabase_client, tables=SYNC_TABLES):
+        """Pull image_phash values newer than the last sync, in pages. Returns rows added."""
+        added = 0
+        for table in tables:
+            since = self._synced_at.get(table)
+            start = 0
+            while True:
+                try:
+                    query = supabase_client.table(table) \
+                        .select('brand, image_phash, created_at') \
+                        .not_.is_('image_phash', 'null') \
+                        .order('created_at')
+                    if since:
+                        query = query.gt('created_at', since)
+                    rows = query.range(start, start + SYNC_PAGE_SIZE - 1).execute().data or []
+                except Exception as e:
+                    logger.warning(f"phash sync from {table} failed: {e}")
+                    break
+                for row in rows:
+                    if self.add(row.get('image_phash'), row.get('brand', ''), table):
+                        added += 1
+                    if row.get('created_at'):
+                        self._synced_at[table] = row['created_at']
+                        self._dirty = True
+                if len(rows) < SYNC_PAGE_SIZE:
+                    break
+                start += SYNC_PAGE_SIZE
+        logger.info(f"phash index: {len(self)} hashes ({added} new from Supabase)")
+        return added
+
+
+_default_index = None
+_default_lock = threading.Lock()
+
+
+def get_phash_index():
+    """Process-wide index loaded from PHASH_INDEX_PATH (max distance from PHASH_MAX_DISTANCE)."""
+    global _default_index
+    with _default_lock:
+        if _default_index is None:
+            max_distance = int(os.environ.get("PHASH_MAX_DISTANCE", DEFAULT_MAX_DISTANCE))
+            _default_index = PerceptualHashIndex.load(max_distance=max_distance)
+        return _default_index
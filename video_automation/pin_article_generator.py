@@ -11,13 +11,21 @@ import re
 import json
 import logging
 import urllib.parse
+from functools import lru_cache
 from datetime import datetime, timezone
 
 import requests
+from automation.links.asin_status import get_asin_verifier
+from automation.links.product_matcher import ProductMatcher
+from utils.markdown_renderer import ARTICLE_LINE_HOOKS, MarkdownRenderer, amazon_link_attrs
 from video_automation.gemini_client import generate_json, generate_text, get_client
 
 logger = logging.getLogger(__name__)
 
+# Amazon affiliate links get nofollow + new tab; PRODUCT_CARD comments and the
+# signup placeholder pass through unwrapped
+_ARTICLE_RENDERER = MarkdownRenderer(link_attrs=amazon_link_attrs, line_hooks=ARTICLE_LINE_HOOKS)
+
 
 def _get_client():
     """Get the shared Gemini client (delegates to gemini_client module)."""
@@ -426,15 +434,29 @@ def _get_approved_asins():
 
 _APPROVED_ASINS = None  # lazy-loaded
 
+# (query, orientation) -> Pexels hero URL; successful searches only
+_PEXELS_HERO_CACHE = {}
+_PEXELS_HERO_CACHE_SIZE = 256
+
 
 def _fetch_pexels_image(query, orientation='landscape'):
-    """Fetch a stock photo URL from Pexels. Returns URL string or None."""
+    """Fetch a stock photo URL from Pexels. Returns URL string or None.
+
+    Successful searches are memoized per process: regenerating many articles
+    re-asks for the same hero queries, and the answer (first search result)
+    does not change. Failures and fallback images are not cached, so one
+    Pexels timeout doesn't pin a query to the fallback for the whole batch.
+    """
     pexels_key = os.environ.get('PEXELS_API_KEY', '')
     if not pexels_key:
         logger.info("No PEXELS_API_KEY — skipping hero image fetch")
         return None
     if not query:
         return None
+    cache_key = (query, orientation)
+    cached = _PEXELS_HERO_CACHE.get(cache_key)
+    if cached:
+        return cached
     # Shorten overly long queries (Pexels works best with 3-5 words)
     words = query.split()
     if len(words) > 6:
@@ -451,6 +473,9 @@ def _fetch_pexels_image(query, orientation='landscape'):
             if photos:
                 img_url = photos[0]['src']['large']
                 logger.info(f"Hero image found for '{query}': {img_url[:80]}...")
+                if len(_PEXELS_HERO_CACHE) >= _PEXELS_HERO_CACHE_SIZE:
+                    _PEXELS_HERO_CACHE.pop(next(iter(_PEXELS_HERO_CACHE)), None)
+                _PEXELS_HERO_CACHE[cache_key] = img_url
                 return img_url
             logger.warning(f"No Pexels results for query: '{query}'")
         else:
@@ -1130,161 +1155,9 @@ def _markdown_to_html_body(markdown_content, brand_key='deals'):
 
     Handles: headings, bold, italic, paragraphs, lists, links, tables,
     PRODUCT_CARD comments, and the SIGNUP_FORM_PLACEHOLDER.
+    Rendering is shared with the other generators (utils/markdown_renderer.py).
     """
-    # Strip frontmatter
-    body = re.sub(r'^---\s*\n.*?\n---\s*\n?', '', markdown_content, flags=re.DOTALL)
-    body = body.strip()
-
-    lines = body.split('\n')
-    html_lines = []
-    in_list = False
-    in_table = False
-    first_table_row = True
-    table_body_started = False
-
-    for line in lines:
-        stripped = line.strip()
-
-        # Empty line
-        if not stripped:
-            if in_list:
-                html_lines.append('</ul>')
-                in_list = False
-            if in_table:
-                if table_body_started:
-                    html_lines.append('</tbody>')
-                html_lines.append('</table></div>')
-                in_table = False
-            continue
-
-        # Product card comment — pass through without wrapping in <p>
-        if stripped.startswith('<!--PRODUCT_CARD:'):
-            if in_list:
-                html_lines.append('</ul>')
-                in_list = False
-            html_lines.append(stripped)
-            continue
-
-        # Signup form placeholder
-        if '[SIGNUP_FORM_PLACEHOLDER]' in stripped:
-            if in_list:
-                html_lines.append('</ul>')
-                in_list = False
-            html_lines.append(stripped.replace('[SIGNUP_FORM_PLACEHOLDER]', '<!-- email-signup-placeholder -->'))
-            continue
-
-        # Table rows
-        if stripped.startswith('|') and '|' in stripped[1:]:
-            if in_list:
-                html_lines.append('</ul>')
-                in_list = False
-            if not in_table:
-                html_lines.append('<div style="overflow-x:auto"><table>')
-                in_table = True
-                first_table_row = True
-                table_body_started = False
-            # Skip separator rows like | --- | --- |
-            if re.match(r'^\|[\s\-:|]+\|$', stripped):
-                continue
-            cells = [c.strip() for c in stripped.strip('|').split('|')]
-            cells = [c for c in cells if c]
-            if first_table_row:
-                html_lines.append(
-                    '<thead><tr>'
-                    + ''.join(f'<th>{_inline_format(c, brand_key)}</th>' for c in cells)
-                    + '</tr></thead>'
-                )
-                first_table_row = False
-            else:
-                if not table_body_started:
-                    html_lines.append('<tbody>')
-                    table_body_started = True
-                html_lines.append(
-                    '<tr>'
-                    + ''.join(f'<td>{_inline_format(c, brand_key)}</td>' for c in cells)
-                    + '</tr>'
-                )
-            continue
-
-        # Close table if we hit a non-table line
-        if in_table:
-            if table_body_started:
-                html_lines.append('</tbody>')
-            html_lines.append('</table></div>')
-            in_table = False
-
-        # Headings
-        heading_match = re.match(r'^(#{1,6})\s+(.+)$', stripped)
-        if heading_match:
-            if in_list:
-                html_lines.append('</ul>')
-                in_list = False
-            level = len(heading_match.group(1))
-            text = _inline_format(heading_match.group(2), brand_key)
-            html_lines.append(f'<h{level}>{text}</h{level}>')
-            continue
-
-        # Blockquotes
-        if stripped.startswith('> '):
-            if in_list:
-                html_lines.append('</ul>')
-                in_list = False
-            text = _inline_format(stripped[2:], brand_key)
-            html_lines.append(f'<blockquote>{text}</blockquote>')
-            continue
-
-        # List items
-        if stripped.startswith('- ') or stripped.startswith('* '):
-            if not in_list:
-                html_lines.append('<ul>')
-                in_list = True
-            text = _inline_format(stripped[2:], brand_key)
-            html_lines.append(f'  <li>{text}</li>')
-            continue
-
-        # Regular paragraph
-        if in_list:
-            html_lines.append('</ul>')
-            in_list = False
-        text = _inline_format(stripped, brand_key)
-        html_lines.append(f'<p>{text}</p>')
-
-    if in_list:
-        html_lines.append('</ul>')
-    if in_table:
-        if table_body_started:
-            html_lines.append('</tbody>')
-        html_lines.append('</table></div>')
-
-    return '\n'.join(html_lines)
-
-
-def _inline_format(text, brand_key='deals'):
-    """Apply inline markdown formatting (bold, italic, links)."""
-    global _APPROVED_ASINS
-
-    affiliate_tag = BRAND_AFFILIATE_TAGS.get(brand_key, 'dailydealdarl-20')
-
-    # Links [text](url) — Amazon affiliate links get nofollow + new tab
-    def _link_replace(match):
-        global _APPROVED_ASINS
-        link_text = match.group(1)
-        url = match.group(2)
-        if 'amazon.com' in url and 'tag=' in url:
-            # Sanitize: if Claude invented a /dp/ASIN not in our approved list,
-            # replace with a search URL that always works.
-            asin_m = re.search(r'/dp/([A-Z0-9]{10})', url)
-            if asin_m:
-                # Keep all /dp/ASIN links — don't convert to search URLs
-                pass
-            return f'<a href="{url}" target="_blank" rel="nofollow sponsored">{link_text}</a>'
-        return f'<a href="{url}">{link_text}</a>'
-    text = re.sub(r'\[([^\]]+)\]\(([^)]+)\)', _link_replace, text)
-    # Bold **text**
-    text = re.sub(r'\*\*([^*]+)\*\*', r'<strong>\1</strong>', text)
-    # Italic *text*
-    text = re.sub(r'\*([^*]+)\*', r'<em>\1</em>', text)
-    return text
+    return _ARTICLE_RENDERER.render(markdown_content)
 
 
 def _resolve_product_urls(products_list, brand_key, key_field='amazon_product_key'):
@@ -1371,6 +1244,45 @@ def article_to_html(markdown_content, brand_key, slug, pin_data=None):
         return _build_article_html(minimal_data, brand_key, slug, pin_data)
 
 
+# ── Affiliate link sanitization ────────────────────────────────────────────────
+# One pass over the article: each Amazon URL (up to the closing quote) is found
+# once and rewritten by a callback, and tag typos in the text between URLs are
+# fixed with plain str.replace, instead of one whole-document pass per rule.
+
+AMAZON_SEARCH_URL_RE = re.compile(r'https://www\.amazon\.com/s\?k=[^"]+')
+SEARCH_QUERY_RE = re.compile(r'[?&]k=([^&"]+)')
+DP_ASIN_RE = re.compile(r'/dp/([A-Z0-9]{10})')
+DP_TAG_RE = re.compile(r'amazon\.com/dp/([A-Z0-9]{10})\?tag=[a-z0-9-]+')
+FAKE_ASIN_RE = re.compile(r'^[X0]{5,}|^XXXXXXXXXX$|^B0{9}$')
+TAG_PARAM_RE = re.compile(r'(amazon\.com/[^"]*[\?&]tag=)([a-z0-9-]+)')
+FULL_AMAZON_URL_RE = re.compile(r'https://www\.amazon\.com/[^"]+')
+# Anchored on the literal host so the scan can skip ahead; a preceding
+# 'https://www.' is taken into the URL by offset
+AMAZON_SPAN_RE = re.compile(r'amazon\.com/[^"]*')
+URL_PREFIX = 'https://www.'
+AMAZON_LINK_RE = re.compile(r'https://www\.amazon\.com/[^"<\s]+')
+
+# Known AI-generated tag typos (any brand) → canonical tag
+TAG_TYPOS = {
+    'menopauseplan-20': 'dailydealdarl-20',
+}
+
+
+@lru_cache(maxsize=None)
+def _brand_matcher(brand_key):
+    """Precompiled product-key matcher for a brand's approved Amazon links."""
+    return ProductMatcher(AMAZON_AFFILIATE_LINKS.get(brand_key, {}))
+
+
+@lru_cache(maxsize=None)
+def _brand_tag_typos(brand_key):
+    """Wrong tag → canonical tag, for every tag that is wrong for this brand."""
+    typos = dict(TAG_TYPOS)
+    if brand_key != 'fitness':
+        typos['fitover3509-20'] = BRAND_AFFILIATE_TAGS.get(brand_key, 'dailydealdarl-20')
+    return typos
+
+
 def _sanitize_affiliate_links(html_content, brand_key):
     """Post-generation sanitization — checks every Amazon link.
 
@@ -1381,24 +1293,24 @@ def _sanitize_affiliate_links(html_content, brand_key):
     5. Logs any issues found for monitoring
     """
     CANONICAL_TAG = BRAND_AFFILIATE_TAGS.get(brand_key, 'dailydealdarl-20')
-    brand_amazon = AMAZON_AFFILIATE_LINKS.get(brand_key, {})
-    default_url = brand_amazon.get('_default', '')
+    default_url = AMAZON_AFFILIATE_LINKS.get(brand_key, {}).get('_default', '')
+    default_asin_m = DP_ASIN_RE.search(default_url)
+    default_asin = default_asin_m.group(1) if default_asin_m else 'B001ARYU58'
+    typos = _brand_tag_typos(brand_key)
     issues = []
+    typo_counts = {}
 
-    # ── Pass 0: Replace search URLs with real /dp/ASIN links ──
+    # ── Rule 0: Replace search URLs with real /dp/ASIN links ──
     def _fix_search_url(m):
         url = m.group(0)
         # Extract the search query to try matching against approved products
-        query_match = re.search(r'[?&]k=([^&"]+)', url)
+        query_match = SEARCH_QUERY_RE.search(url)
         if query_match:
             query = urllib.parse.unquote_plus(query_match.group(1)).lower()
-            # Try to match against approved product keys
-            for product_key, product_url in brand_amazon.items():
-                if product_key == '_default':
-                    continue
-                if product_key.lower() in query or query in product_key.lower():
-                    issues.append(f'Replaced search URL with approved ASIN for: {product_key}')
-                    return product_url
+            hit = _brand_matcher(brand_key).first_substring_match(query)
+            if hit:
+                issues.append(f'Replaced search URL with approved ASIN for: {hit[0]}')
+                return hit[1]
         # No match — use brand default
         if default_url:
             issues.append(f'Replaced unmatched search URL with brand default')
@@ -1406,61 +1318,31 @@ def _sanitize_affiliate_links(html_content, brand_key):
         issues.append(f'Removed unmatched search URL (no default available)')
         return ''
 
-    html_content = re.sub(
-        r'https://www\.amazon\.com/s\?k=[^"]+',
-        _fix_search_url,
-        html_content,
-    )
-
-    # ── Pass 1: Fix known tag typos ──
-    typo_map = {
-        'menopauseplan-20': 'dailydealdarl-20',
-    }
-    if brand_key != 'fitness':
-        typo_map['fitover3509-20'] = CANONICAL_TAG
-    for wrong, right in typo_map.items():
-        if wrong in html_content:
-            count = html_content.count(wrong)
-            issues.append(f'Fixed tag typo: {wrong} → {right} ({count}x)')
-            html_content = html_content.replace(wrong, right)
-
-    # ── Pass 2: Fix obviously fake ASINs ──
-    fake_asin_pattern = re.compile(r'^[X0]{5,}|^XXXXXXXXXX$|^B0{9}$')
+    # ── Rule 1: Fix known tag typos ──
+    def _fix_typos(text):
+        for wrong, right in typos.items():
+            if wrong in text:
+                typo_counts[wrong] = typo_counts.get(wrong, 0) + text.count(wrong)
+                text = text.replace(wrong, right)
+        return text
 
+    # ── Rule 2: Fix obviously fake ASINs ──
     def _fix_bad_asin(m):
-        full_match = m.group(0)
         asin = m.group(1)
-        if not fake_asin_pattern.match(asin):
-            return full_match
+        if not FAKE_ASIN_RE.match(asin):
+            return m.group(0)
         issues.append(f'Replaced fake ASIN: {asin}')
         # Use default product URL instead of search URL
-        if default_url:
-            asin_m = re.search(r'/dp/([A-Z0-9]{10})', default_url)
-            if asin_m:
-                return f'amazon.com/dp/{asin_m.group(1)}?tag={CANONICAL_TAG}'
-        return f'amazon.com/dp/B001ARYU58?tag={CANONICAL_TAG}'
-
-    html_content = re.sub(
-        r'amazon\.com/dp/([A-Z0-9]{10})\?tag=[a-z0-9-]+',
-        _fix_bad_asin,
-        html_content,
-    )
+        return f'amazon.com/dp/{default_asin}?tag={CANONICAL_TAG}'
 
-    # ── Pass 3: Force correct tag on ALL Amazon links ──
+    # ── Rule 3: Force correct tag on ALL Amazon links ──
     def _enforce_tag(m):
-        prefix = m.group(1)
         current_tag = m.group(2)
         if current_tag != CANONICAL_TAG:
             issues.append(f'Corrected tag: {current_tag} → {CANONICAL_TAG}')
-        return f'{prefix}{CANONICAL_TAG}'
+        return f'{m.group(1)}{CANONICAL_TAG}'
 
-    html_content = re.sub(
-        r'(amazon\.com/[^"]*[\?&]tag=)([a-z0-9-]+)',
-        _enforce_tag,
-        html_content,
-    )
-
-    # ── Pass 4: Ensure Amazon links WITHOUT a tag get one ──
+    # ── Rule 4: Ensure Amazon links WITHOUT a tag get one ──
     def _add_missing_tag(m):
         url = m.group(0)
         if 'tag=' not in url:
@@ -1469,12 +1351,32 @@ def _sanitize_affiliate_links(html_content, brand_key):
             return f'{url}{sep}tag={CANONICAL_TAG}'
         return url
 
-    html_content = re.sub(
-        r'https://www\.amazon\.com/[^"]+',
-        _add_missing_tag,
-        html_content,
-    )
+    def _sanitize(url):
+        if '/s?k=' in url:
+            url = AMAZON_SEARCH_URL_RE.sub(_fix_search_url, url)
+        url = _fix_typos(url)
+        if '/dp/' in url:
+            url = DP_TAG_RE.sub(_fix_bad_asin, url)
+        if 'tag=' in url:
+            url = TAG_PARAM_RE.sub(_enforce_tag, url)
+        if URL_PREFIX in url:
+            url = FULL_AMAZON_URL_RE.sub(_add_missing_tag, url)
+        return url
 
+    parts = []
+    pos = 0
+    for m in AMAZON_SPAN_RE.finditer(html_content):
+        start = m.start()
+        if start - len(URL_PREFIX) >= pos and html_content.startswith(URL_PREFIX, start - len(URL_PREFIX)):
+            start -= len(URL_PREFIX)
+        parts.append(_fix_typos(html_content[pos:start]))
+        parts.append(_sanitize(html_content[start:m.end()]))
+        pos = m.end()
+    parts.append(_fix_typos(html_content[pos:]))
+    html_content = ''.join(parts)
+
+    for wrong, count in typo_counts.items():
+        issues.append(f'Fixed tag typo: {wrong} → {typos[wrong]} ({count}x)')
     if issues:
         logger.info(f'Affiliate sanitization ({brand_key}): {len(issues)} fixes — {"; ".join(issues[:5])}')
 
@@ -1482,9 +1384,10 @@ def _sanitize_affiliate_links(html_content, brand_key):
 
 
 def validate_amazon_links(html_content, brand_key):
-    """Validate every Amazon URL in the article via HTTP HEAD requests.
+    """Validate every Amazon URL in the article.
 
-    - Sends HEAD request with browser user-agent, 10s timeout
+    - Checks each /dp/ ASIN through the shared AsinVerifier (pooled, concurrent
+      GETs; statuses cached on disk for ASIN_STATUS_TTL_HOURS)
     - If 404 or redirects to search page: replaces with verified ASIN from approved list
     - Verifies correct affiliate tag per brand
     - Rejects any remaining /s?k= search URLs
@@ -1493,22 +1396,23 @@ def validate_amazon_links(html_content, brand_key):
     CANONICAL_TAG = BRAND_AFFILIATE_TAGS.get(brand_key, 'dailydealdarl-20')
     brand_amazon = AMAZON_AFFILIATE_LINKS.get(brand_key, {})
     default_url = brand_amazon.get('_default', '')
+    matcher = _brand_matcher(brand_key)
     log = []
+    replacements = {}  # url -> fixed url, applied in one pass at the end
 
     # Find all Amazon URLs
-    amazon_urls = re.findall(r'https://www\.amazon\.com/[^"<\s]+', html_content)
+    amazon_urls = AMAZON_LINK_RE.findall(html_content)
     if not amazon_urls:
         log.append('No Amazon links found')
         return html_content, log
 
-    headers = {
-        'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
-    }
+    # Product pages are checked once per ASIN through the shared, cached
+    # verifier: ASINs seen within ASIN_STATUS_TTL_HOURS cost nothing
+    dp_asins = {url: m.group(1) for url in set(amazon_urls)
+                if '/s?' not in url and (m := DP_ASIN_RE.search(url))}
+    statuses = get_asin_verifier().verify(dp_asins.values()) if dp_asins else {}
 
     for url in set(amazon_urls):
-        # Skip already-validated /dp/ URLs from our approved list
-        asin_m = re.search(r'/dp/([A-Z0-9]{10})', url)
-
         # Reject search URLs outright
         if '/s?k=' in url or '/s?' in url:
             log.append(f'REJECTED search URL: {url[:80]}')
@@ -1517,63 +1421,46 @@ def validate_amazon_links(html_content, brand_key):
             replacement = default_url
             if query_m:
                 query = urllib.parse.unquote_plus(query_m.group(1)).lower()
-                for key, approved_url in brand_amazon.items():
-                    if key == '_default':
-                        continue
-                    if key.lower() in query or query in key.lower():
-                        replacement = approved_url
-                        break
+                hit = matcher.first_substring_match(query)
+                if hit:
+                    replacement = hit[1]
             if replacement:
-                html_content = html_content.replace(url, replacement)
+                replacements[url] = replacement
                 log.append(f'  → Replaced with: {replacement[:80]}')
             continue
 
-        # Verify /dp/ links via GET request (Amazon blocks HEAD with 405)
-        if asin_m:
-            try:
-                resp = requests.get(url, headers=headers, timeout=10, allow_redirects=True, stream=True)
-                final_url = resp.url if hasattr(resp, 'url') else ''
-                resp.close()  # Don't download the full page
-                is_broken = False
-                if resp.status_code == 404:
-                    is_broken = True
-                elif '/s?k=' in final_url or '/gp/search/' in final_url:
-                    is_broken = True
-                elif resp.status_code == 200 and 'Page Not Found' in resp.text[:500]:
-                    is_broken = True
-                
-                if is_broken:
-                    log.append(f'BROKEN link (HTTP {resp.status_code}): {url[:80]}')
-                    # Try to find a product-specific replacement from approved list
-                    asin_val = asin_m.group(1)
-                    replacement_found = False
-                    for key, approved_url in brand_amazon.items():
-                        if key == '_default':
-                            continue
-                        if asin_val in approved_url and approved_url != url:
-                            html_content = html_content.replace(url, approved_url)
-                            log.append(f'  → Replaced with approved: {approved_url[:80]}')
-                            replacement_found = True
-                            break
-                    if not replacement_found and default_url:
-                        html_content = html_content.replace(url, default_url)
-                        log.append(f'  → Replaced with default: {default_url[:80]}')
-                elif resp.status_code in (405, 503):
-                    log.append(f'SKIP: {url[:60]} → HTTP {resp.status_code} (Amazon rate limit, not broken)')
-                else:
-                    log.append(f'OK: {url[:80]} → HTTP {resp.status_code}')
-            except requests.RequestException as e:
-                log.append(f'Request failed for {url[:60]}: {e}')
+        if url in dp_asins:
+            status = statuses[dp_asins[url]]
+            checked = 'cached' if status.cached else f'HTTP {status.http_status}'
+            if status.broken:
+                log.append(f'BROKEN link ({checked}): {url[:80]}')
+                # Try to find a product-specific replacement from approved list
+                approved_url = next(
+                    (u for u in matcher.values_for_asin(dp_asins[url]) if u != url), None)
+                if approved_url:
+                    replacements[url] = approved_url
+                    log.append(f'  → Replaced with approved: {approved_url[:80]}')
+                elif default_url:
+                    replacements[url] = default_url
+                    log.append(f'  → Replaced with default: {default_url[:80]}')
+            elif status.error:
                 # Don't replace on timeout — might just be rate limited
+                log.append(f'Request failed for {url[:60]}: {status.error}')
+            elif not status.definitive:
+                log.append(f'SKIP: {url[:60]} → HTTP {status.http_status} (Amazon rate limit, not broken)')
+            else:
+                log.append(f'OK: {url[:80]} → {checked}')
 
-        # Verify affiliate tag
-        if f'tag={CANONICAL_TAG}' not in url and 'tag=' in url:
+        # Verify affiliate tag (a link replaced above already carries an approved one)
+        if url not in replacements and f'tag={CANONICAL_TAG}' not in url and 'tag=' in url:
             old_tag_m = re.search(r'tag=([a-z0-9-]+)', url)
             if old_tag_m:
-                fixed_url = url.replace(f'tag={old_tag_m.group(1)}', f'tag={CANONICAL_TAG}')
-                html_content = html_content.replace(url, fixed_url)
+                replacements[url] = url.replace(f'tag={old_tag_m.group(1)}', f'tag={CANONICAL_TAG}')
                 log.append(f'Fixed tag: {old_tag_m.group(1)} → {CANONICAL_TAG}')
 
+    if replacements:
+        html_content = AMAZON_LINK_RE.sub(lambda m: replacements.get(m.group(0), m.group(0)), html_content)
+
     logger.info(f'Amazon link validation ({brand_key}): {len(log)} entries')
     return html_content, log
 
@@ -0,0 +1,173 @@
+"""Parallel batch renderer for Pillow brand-template pins.
+
+render_pin_to_bytes does a blocking background download followed by a
+CPU-bound decode → compose → JPEG encode. Rendering a batch one pin at a time
+serializes both halves, so one slow Pexels fetch stalls every pin behind it.
+
+render_pins_batch splits the two halves:
+  - background downloads run on a thread pool (I/O bound)
+  - decode/compose/encode runs on a process pool (CPU bound, sidesteps the GIL)
+
+A job is handed to the process pool as soon as its own download finishes, and
+results are yielded in completion order, each with per-stage timings.
+
+Usage:
+    from video_automation.pin_batch_renderer import PinJob, render_pins_batch
+
+    jobs = [PinJob(brand='fitness', headline='...', keyword_or_url=url, key=pin_id)]
+    for result in render_pins_batch(jobs, workers=4):
+        if result.ok:
+            upload(result.image_bytes)
+        print(result.key, result.timings)
+"""
+
+import logging
+import os
+import time
+from concurrent.futures import (
+    FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait,
+)
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, Iterator, Optional
+
+from video_automation.pin_image_generator import fetch_background_bytes, render_brand_pin
+
+logger = logging.getLogger(__name__)
+
+# Downloads are network bound; more threads than render workers keeps the
+# process pool fed while slow fetches are still in flight.
+FETCH_THREADS_PER_WORKER = 2
+
+
+@dataclass
+class PinJob:
+    """One pin to render. `key` is echoed back on the result (e.g. a pin id)."""
+
+    brand: str
+    headline: str
+    subheadline: str = ""
+    keyword_or_url: str = ""
+    key: Any = None
+
+
+@dataclass
+class PinRenderResult:
+    """Outcome of one PinJob.
+
+    timings (seconds):
+        fetch  — background download
+        queue  — waiting for a free render worker
+        render — decode, compose and JPEG encode in the worker
+        total  — from batch start until this result was ready
+    """
+
+    job: PinJob
+    image_bytes: Optional[bytes] = None
+    error: Optional[str] = None
+    timings: Dict[str, float] = field(default_factory=dict)
+
+    @property
+    def ok(self) -> bool:
+        return self.image_bytes is not None and self.error is None
+
+    @property
+    def key(self) -> Any:
+        return self.job.key
+
+
+def _fetch(job):
+    """Thread-pool task: download the background, return (bytes, seconds)."""
+    started = time.perf_counter()
+    image_bytes = fetch_background_bytes(job.keyword_or_url, job.brand)
+    return image_bytes, time.perf_counter() - started
+
+
+def _render(brand, headline, subheadline, image_bytes):
+    """Process-pool task: render one template.
+
+    Returns (jpeg_bytes, started_at, finished_at) as wall-clock timestamps so
+    the parent can split queue time from render time across processes.
+    """
+    started_at = time.time()
+    jpeg = render_brand_pin(brand, headline, subheadline, image_bytes)
+    return jpeg, started_at, time.time()
+
+
+def default_workers() -> int:
+    """Render workers to use when none are given: one per core, at least 1."""
+    return max(1, os.cpu_count() or 1)
+
+
+def render_pins_batch(jobs: Iterable[PinJob], workers: Optional[int] = None,
+                      fetch_workers: Optional[int] = None,
+                      use_processes: bool = True) -> Iterator[PinRenderResult]:
+    """Render many pins concurrently, yielding results as they finish.
+
+    Args:
+        jobs: PinJob instances to render.
+        workers: Render worker count (defaults to the CPU count).
+        fetch_workers: Download threads (defaults to 2x workers).
+        use_processes: Render in a process pool. Set False to render on
+            threads instead (e.g. where fork is unavailable); downloads still
+            overlap but renders contend for the GIL.
+
+    Yields:
+        PinRenderResult per job, in completion order. Failures are reported
+        on the result rather than raised, so one bad pin never stops a batch.
+    """
+    jobs = list(jobs)
+    if not jobs:
+        return
+
+    workers = workers or default_workers()
+    fetch_workers = fetch_workers or workers * FETCH_THREADS_PER_WORKER
+    batch_start = time.perf_counter()
+    render_pool_cls = ProcessPoolExecutor if use_processes else ThreadPoolExecutor
+
+    with ThreadPoolExecutor(max_workers=fetch_workers) as fetch_pool, \
+            render_pool_cls(max_workers=workers) as render_pool:
+        fetches = {fetch_pool.submit(_fetch, job): job for job in jobs}
+        renders = {}
+
+        while fetches or renders:
+            done, _ = wait(list(fetches) + list(renders), return_when=FIRST_COMPLETED)
+            for future in done:
+                if future in fetches:
+                    job = fetches.pop(future)
+                    try:
+                        image_bytes, fetch_s = future.result()
+                    except Exception as e:
+                        # fetch_background_bytes swallows HTTP errors, so this is unexpected
+                        logger.warning(f"[{job.brand}] Background fetch crashed: {e}")
+                        image_bytes, fetch_s = None, 0.0
+                    submitted_at = time.time()
+                    render_future = render_pool.submit(
+                        _render, job.brand, job.headline, job.subheadline, image_bytes,
+                    )
+                    renders[render_future] = (job, fetch_s, submitted_at)
+                    continue
+
+                job, fetch_s, submitted_at = renders.pop(future)
+                result = PinRenderResult(job=job, timings={'fetch': round(fetch_s, 4)})
+                try:
+                    jpeg, started_at, finished_at = future.result()
+                    result.image_bytes = jpeg
+                    result.timings['queue'] = round(max(0.0, started_at - submitted_at), 4)
+                    result.timings['render'] = round(finished_at - started_at, 4)
+                except Exception as e:
+                    logger.error(f"[{job.brand}] Render failed for {job.key!r}: {e}")
+                    result.error = str(e)
+                result.timings['total'] = round(time.perf_counter() - batch_start, 4)
+                yield result
+
+
+def summarize_timings(results: Iterable[PinRenderResult]) -> Dict[str, float]:
+    """Aggregate per-stage timings for a finished batch (for logging)."""
+    results = list(results)
+    summary = {'pins': len(results), 'ok': sum(1 for r in results if r.ok)}
+    for stage in ('fetch', 'queue', 'render'):
+        values = [r.timings[stage] for r in results if stage in r.timings]
+        summary[f'{stage}_sum'] = round(sum(values), 3)
+        summary[f'{stage}_max'] = round(max(values), 3) if values else 0.0
+    summary['wall'] = max((r.timings.get('total', 0.0) for r in results), default=0.0)
+    return summary
@@ -36,14 +36,17 @@ from pathlib import Path
 from typing import Optional
 
 import requests
-from PIL import Image, ImageDraw, ImageFont
+from PIL import Image, ImageDraw
 
 # Add project root to path
 PROJECT_ROOT = Path(__file__).resolve().parent.parent
 sys.path.insert(0, str(PROJECT_ROOT))
 
+from video_automation import font_registry
+from video_automation.phash_index import dhash
 from video_automation.video_templates import BRAND_VIDEO_STYLES
 from utils.config import get_config
+from utils.image_cache import fetch_image_bytes, open_for_cover, pexels_cover_url
 
 logger = logging.getLogger(__name__)
 
@@ -107,6 +110,16 @@ def compute_image_hash(image_bytes):
     return hashlib.sha256(image_bytes).hexdigest()
 
 
+def compute_perceptual_hash(image_bytes):
+    """64-bit dHash (16 hex chars) for visual dedup; see phash_index.
+
+    Pass the background photo, not the finished pin: the brand template
+    (canvas, text band, logo) is shared by every pin of a brand and would
+    dominate the hash.
+    """
+    return dhash(image_bytes)
+
+
 def _font_filename(name, bold=False):
     """Convert font name to a local filename."""
     safe = name.lower().replace(" ", "_")
@@ -114,12 +127,26 @@ def _font_filename(name, bold=False):
     return f"{safe}{suffix}.ttf"
 
 
+# (name, bold) -> validated local path (or None after a failed download), so
+# ensure_font only touches the filesystem and network once per font per process.
+_resolved_fonts = {}
+
+
 def ensure_font(name, bold=False):
     """Download a Google Font TTF if not already cached.
 
     Returns path to TTF file, or None if download fails.
     Falls back gracefully rather than crashing the pipeline.
     """
+    key = (name, bold)
+    if key in _resolved_fonts:
+        return _resolved_fonts[key]
+    path = _resolved_fonts[key] = _ensure_font_uncached(name, bold)
+    return path
+
+
+def _ensure_font_uncached(name, bold=False):
+    """Validate or download a font file (see ensure_font)."""
     FONTS_DIR.mkdir(parents=True, exist_ok=True)
     local_path = FONTS_DIR / _font_filename(name, bold)
 
@@ -168,16 +195,17 @@ def load_font(name, size, bold=False):
     """Load a font at the given size, downloading if needed."""
     path = ensure_font(name, bold)
     if path and path.exists():
-        return ImageFont.truetype(str(path), size)
+        return font_registry.get_font(str(path), size)
     # Fallback to Pillow's default
-    return ImageFont.load_default(size)
+    return font_registry.get_default_font(size)
 
 
 def fetch_background_from_url(image_url):
-    """Download an image from a URL and return as PIL Image."""
-    resp = requests.get(image_url, timeout=30)
-    resp.raise_for_status()
-    return Image.open(BytesIO(resp.content)).convert("RGB")
+    """Download an image from a URL (via the shared image cache) and return as PIL Image.
+
+    Decoded at reduced scale where possible; still covers PIN_WIDTH x PIN_HEIGHT.
+    """
+    return open_for_cover(fetch_image_bytes(image_url), PIN_WIDTH, PIN_HEIGHT)
 
 
 def fetch_background(keyword, api_key):
@@ -191,15 +219,12 @@ def fetch_background(keyword, api_key):
         logger.warning(f"No Pexels photos for '{keyword}', using solid background")
         return Image.new("RGB", (PIN_WIDTH, PIN_HEIGHT), (40, 40, 40))
 
-    # Pick the first result
-    photo_url = client.get_photo_url(photos[0], size="large2x")
+    # Pick the first result, at the smallest size that still covers the pin
+    photo_url = pexels_cover_url(photos[0], PIN_WIDTH, PIN_HEIGHT)
     if not photo_url:
-        photo_url = client.get_photo_url(photos[0], size="original")
+        photo_url = client.get_photo_url(photos[0], size="large2x")
 
-    resp = requests.get(photo_url, timeout=30)
-    resp.raise_for_status()
-    img = Image.open(BytesIO(resp.content)).convert("RGB")
-    return img
+    return open_for_cover(fetch_image_bytes(photo_url), PIN_WIDTH, PIN_HEIGHT)
 
 
 def resize_and_crop(img, w, h):
@@ -233,25 +258,7 @@ def hex_to_rgb(hex_color):
 
 def _wrap_text(text, font, max_width):
     """Wrap text to fit within max_width pixels."""
-    words = text.split()
-    lines = []
-    current_line = ""
-
-    for word in words:
-        test_line = f"{current_line} {word}".strip()
-        bbox = font.getbbox(test_line)
-        line_width = bbox[2] - bbox[0]
-        if line_width <= max_width:
-            current_line = test_line
-        else:
-            if current_line:
-                lines.append(current_line)
-            current_line = word
-
-    if current_line:
-        lines.append(current_line)
-
-    return lines
+    return font_registry.wrap_text(text, font, max_width)
 
 
 def _draw_text_with_shadow(draw, xy, text, font, fill, shadow_color=(0, 0, 0), shadow_offset=3):
@@ -826,10 +833,10 @@ def _load_brand_font(size, bold=True, extra_bold=False):
         candidates = ["Montserrat-Medium.ttf", "Montserrat-Regular.ttf", "Montserrat-Bold.ttf"]
 
     for fname in candidates:
-        p = FONTS_DIR / fname
-        if p.exists():
+        p = _brand_font_file(fname)
+        if p:
             try:
-                return ImageFont.truetype(str(p), size)
+                return font_registry.get_font(str(p), size)
             except Exception:
                 continue
 
@@ -837,21 +844,22 @@ def _load_brand_font(size, bold=True, extra_bold=False):
     return load_font("Montserrat", size, bold=bold)
 
 
+# fname -> Path or None; Montserrat files are either shipped in assets/fonts
+# or not, so existence is checked once per process.
+_brand_font_files = {}
+
+
+def _brand_font_file(fname):
+    """Return FONTS_DIR/fname if it exists (cached per process)."""
+    if fname not in _brand_font_files:
+        p = FONTS_DIR / fname
+        _brand_font_files[fname] = p if p.exists() else None
+    return _brand_font_files[fname]
+
+
 def _wrap_brand_text(draw, text, font, max_width):
     """Word-wrap text to fit max_width, return list of lines."""
-    words = text.split()
-    lines, current = [], []
-    for word in words:
-        test = " ".join(current + [word])
-        bbox = draw.textbbox((0, 0), test, font=font)
-        if bbox[2] - bbox[0] > max_width and current:
-            lines.append(" ".join(current))
-            current = [word]
-        else:
-            current.append(word)
-    if current:
-        lines.append(" ".join(current))
-    return lines
+    return font_registry.wrap_text(text, font, max_width)
 
 
 def _create_hook_headline(topic: str, brand: str) -> str:
@@ -899,33 +907,16 @@ def _create_hook_headline(topic: str, brand: str) -> str:
         return short.title()          # Title case for deals
 
 
-def _fit_text(draw, text, font_path, max_width, max_height, start_size=130, min_size=60):
+def _fit_text(text, font_path, max_width, max_height, start_size=130, min_size=60):
     """Find the largest font size where word-wrapped text fits in the given area.
 
-    Steps down by 4pt from start_size until both total height and each line width
-    fit within the bounds. Returns (ImageFont, list_of_lines).
+    Searches the 4pt ladder from start_size down to min_size for the largest
+    size where both total height and each line width fit within the bounds.
+    Fonts and word widths come from font_registry, so repeated pins reuse
+    parsed TTFs. Returns (ImageFont, list_of_lines).
     """
-    font_path = str(font_path)
-    for size in range(start_size, min_size - 1, -4):
-        try:
-            font = ImageFont.truetype(font_path, size)
-        except Exception:
-            continue
-        lines = _wrap_brand_text(draw, text, font, max_width)
-        line_h = size + 18
-        total_h = len(lines) * line_h
-        too_wide = any(
-            (draw.textbbox((0, 0), l, font=font)[2] - draw.textbbox((0, 0), l, font=font)[0]) > max_width
-            for l in lines
-        )
-        if total_h <= max_height and not too_wide:
-            return font, lines
-    # Fallback: use minimum size regardless
-    try:
-        font = ImageFont.truetype(font_path, min_size)
-    except Exception:
-        font = ImageFont.load_default(min_size)
-    return font, _wrap_brand_text(draw, text, font, max_width)
+    return font_registry.fit_text(text, font_path, max_width, max_height,
+                                  start_size=start_size, min_size=min_size)
 
 
 def _render_fitness_pin(headline, subheadline, image_bytes=None):
@@ -938,7 +929,7 @@ def _render_fitness_pin(headline, subheadline, image_bytes=None):
     photo_h = PIN_HEIGHT - photo_top
     if image_bytes:
         try:
-            bg = Image.open(BytesIO(image_bytes)).convert("RGB")
+            bg = open_for_cover(image_bytes, PIN_WIDTH, photo_h)
             bg = resize_and_crop(bg, PIN_WIDTH, photo_h)
             canvas.paste(bg, (0, photo_top))
         except Exception:
@@ -957,15 +948,12 @@ def _render_fitness_pin(headline, subheadline, image_bytes=None):
     text_area_bottom = photo_top - 40     # Leave padding above the accent line
     max_text_h = text_area_bottom - text_area_top  # ~485px
 
-    font_path = FONTS_DIR / "Montserrat-ExtraBold.ttf"
-    if not font_path.exists():
-        font_path = FONTS_DIR / "Montserrat-Bold.ttf"
-    if not font_path.exists():
-        fp = ensure_font("Montserrat", bold=True)
-        font_path = fp if fp else None
+    font_path = (_brand_font_file("Montserrat-ExtraBold.ttf")
+                 or _brand_font_file("Montserrat-Bold.ttf")
+                 or ensure_font("Montserrat", bold=True))
 
     if font_path:
-        headline_font, lines = _fit_text(draw, hook, font_path, max_text_w, max_text_h,
+        headline_font, lines = _fit_text(hook, font_path, max_text_w, max_text_h,
                                          start_size=130, min_size=60)
     else:
         headline_font = _load_brand_font(110, bold=True, extra_bold=True)
@@ -981,8 +969,7 @@ def _render_fitness_pin(headline, subheadline, image_bytes=None):
     y = text_area_top + max(0, (max_text_h - total_text_h) // 2)
 
     for line in lines:
-        bbox = draw.textbbox((0, 0), line, font=headline_font)
-        lw = bbox[2] - bbox[0]
+        lw = font_registry.text_width(headline_font, line)
         x = (PIN_WIDTH - lw) // 2
         # Thick black outline: draw in 8 directions for strong contrast
         for dx in (-4, 0, 4):
@@ -1048,7 +1035,7 @@ def _render_deals_pin(headline, subheadline, image_bytes=None):
     photo_w, photo_h = 860, 520
     if image_bytes:
         try:
-            bg = Image.open(BytesIO(image_bytes)).convert("RGB")
+            bg = open_for_cover(image_bytes, photo_w, photo_h)
             bg = resize_and_crop(bg, photo_w, photo_h)
             photo_x = (PIN_WIDTH - photo_w) // 2
             canvas.paste(bg, (photo_x, photo_top))
@@ -1106,7 +1093,7 @@ def _render_menopause_pin(headline, subheadline, image_bytes=None):
         try:
             img_w, img_h = 800, 600
             img_top = 400
-            bg = Image.open(BytesIO(image_bytes)).convert("RGB")
+            bg = open_for_cover(image_bytes, img_w, img_h)
             bg = resize_and_crop(bg, img_w, img_h)
             img_x = (PIN_WIDTH - img_w) // 2
             canvas.paste(bg, (img_x, img_top))
@@ -1201,6 +1188,40 @@ def _render_menopause_pin(headline, subheadline, image_bytes=None):
 # MAIN RENDER FUNCTIONS
 # ═══════════════════════════════════════════════════════════════
 
+def fetch_background_bytes(keyword_or_url, brand=""):
+    """Download the background photo for a brand template (via the shared image cache).
+
+    Returns raw image bytes, or None when keyword_or_url is not a URL or the
+    download fails (templates render without a photo in that case).
+    """
+    if not keyword_or_url or not (
+        keyword_or_url.startswith("http://") or keyword_or_url.startswith("https://")
+    ):
+        return None
+    try:
+        return fetch_image_bytes(keyword_or_url)
+    except Exception as e:
+        logger.warning(f"[{brand}] Failed to fetch background: {e}")
+        return None
+
+
+def render_brand_pin(brand, headline, subheadline, image_bytes=None):
+    """Render a brand template from already-downloaded background bytes.
+
+    This is the CPU-bound half of render_pin_to_bytes (decode, compose,
+    JPEG encode) and is what pin_batch_renderer runs in worker processes.
+    """
+    if brand == "fitness":
+        return _render_fitness_pin(headline, subheadline, image_bytes)
+    elif brand == "deals":
+        return _render_deals_pin(headline, subheadline, image_bytes)
+    elif brand == "menopause":
+        return _render_menopause_pin(headline, subheadline, image_bytes)
+    else:
+        logger.warning(f"[{brand}] Unknown brand, using fitness template")
+        return _render_fitness_pin(headline, subheadline, image_bytes)
+
+
 def render_pin_to_bytes(brand, headline, subheadline, keyword_or_url, style="gradient"):
     """Render a pin image and return JPEG bytes (for pipeline use).
 
@@ -1209,6 +1230,9 @@ def render_pin_to_bytes(brand, headline, subheadline, keyword_or_url, style="gra
       - deals:     warm beige canvas, dark headline, centered photo, SHOP NOW button
       - menopause: soft pink-to-lavender gradient, botanical corners, elegant centered text
 
+    For many pins at once use pin_batch_renderer.render_pins_batch, which
+    overlaps the downloads and renders on worker pools.
+
     Args:
         brand: Brand key ('fitness', 'deals', 'menopause')
         headline: Main text overlay
@@ -1219,27 +1243,8 @@ def render_pin_to_bytes(brand, headline, subheadline, keyword_or_url, style="gra
     Returns:
         bytes: JPEG image data (always 1000x1500px)
     """
-    # Fetch background image from URL for use in brand templates
-    image_bytes = None
-    if keyword_or_url and (
-        keyword_or_url.startswith("http://") or keyword_or_url.startswith("https://")
-    ):
-        try:
-            resp = requests.get(keyword_or_url, timeout=30)
-            resp.raise_for_status()
-            image_bytes = resp.content
-        except Exception as e:
-            logger.warning(f"[{brand}] Failed to fetch background: {e}")
-
-    if brand == "fitness":
-        return _render_fitness_pin(headline, subheadline, image_bytes)
-    elif brand == "deals":
-        return _render_deals_pin(headline, subheadline, image_bytes)
-    elif brand == "menopause":
-        return _render_menopause_pin(headline, subheadline, image_bytes)
-    else:
-        logger.warning(f"[{brand}] Unknown brand, using fitness template")
-        return _render_fitness_pin(headline, subheadline, image_bytes)
+    image_bytes = fetch_background_bytes(keyword_or_url, brand)
+    return render_brand_pin(brand, headline, subheadline, image_bytes)
 
 
 def generate_pin(brand, headline, keyword, style="gradient",
@@ -1288,8 +1293,12 @@ def generate_pin(brand, headline, keyword, style="gradient",
     return output_path
 
 
-def generate_batch(brand, category, count=5, style="gradient"):
-    """Generate multiple pins from a content JSON file."""
+def generate_batch(brand, category, count=5, style="gradient", workers=1):
+    """Generate multiple pins from a content JSON file.
+
+    With workers > 1 pins are generated on a thread pool so Pexels lookups and
+    downloads overlap; results keep the order of the content file.
+    """
     brand_dir = BRAND_CONTENT_DIRS.get(brand, brand.replace("_", ""))
     content_path = PROJECT_ROOT / "outputs" / "content" / brand_dir / f"{category}_posts.json"
 
@@ -1300,28 +1309,36 @@ def generate_batch(brand, category, count=5, style="gradient"):
         posts = json.load(f)
 
     output_dir = PROJECT_ROOT / "outputs" / "pins" / brand / category
-    results = []
+    posts = posts[:count]
 
-    for i, post in enumerate(posts[:count]):
+    def _one(i, post):
         title = post.get("title", "")
         items = post.get("list_items", [])
         keyword = items[0].get("image_keyword", title) if items else title
 
-        logger.info(f"Generating pin {i+1}/{min(count, len(posts))}: {title[:60]}...")
+        logger.info(f"Generating pin {i+1}/{len(posts)}: {title[:60]}...")
 
         try:
-            path = generate_pin(
+            return generate_pin(
                 brand=brand,
                 headline=title,
                 keyword=keyword,
                 style=style,
                 output_dir=output_dir,
             )
-            results.append(path)
         except Exception as e:
             logger.error(f"Failed to generate pin for '{title}': {e}")
+            return None
+
+    if workers > 1:
+        from concurrent.futures import ThreadPoolExecutor
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            paths = list(executor.map(_one, range(len(posts)), posts))
+    else:
+        paths = [_one(i, post) for i, post in enumerate(posts)]
 
-    logger.info(f"Batch complete: {len(results)}/{min(count, len(posts))} pins generated")
+    results = [p for p in paths if p is not None]
+    logger.info(f"Batch complete: {len(results)}/{len(posts)} pins generated")
     return results
 
 
@@ -1335,6 +1352,7 @@ def main():
                         choices=list(OVERLAY_STYLES.keys()))
     parser.add_argument("--category", help="Content category for batch mode")
     parser.add_argument("--count", type=int, default=5, help="Number of pins in batch mode")
+    parser.add_argument("--workers", type=int, default=1, help="Parallel pins in batch mode")
 
     args = parser.parse_args()
 
@@ -1357,6 +1375,7 @@ def main():
             category=args.category,
             count=args.count,
             style=args.style,
+            workers=args.workers,
         )
         print(f"Generated {len(paths)} pins:")
         for p in paths:
@@ -13,7 +13,9 @@ Self-improving loop:
   → system continuously optimizes toward revenue
 
 Agents (run in parallel via ThreadPoolExecutor):
-  1. analytics_reader   — pulls content_performance, content_history, generated_articles
+  1. analytics_reader   — reads content_history and generated_articles from the
+                          local analytics snapshot, plus content_performance and
+                          affiliate_programs
   2. performance_analyzer — Claude scores each brand's content by revenue potential
   3. strategy_updater   — rewrites weekly_calendar toward top-earning topics
 """
@@ -27,9 +29,11 @@ from datetime import datetime, timedelta, timezone
 from concurrent.futures import ThreadPoolExecutor, as_completed
 
 sys.path.insert(0, '.')
+from analytics.snapshot import AnalyticsSnapshot
 from database.supabase_client import get_supabase_client
 
 BRANDS = ['fitness', 'deals', 'menopause']
+SNAPSHOT_TABLES = ('content_history', 'generated_articles')
 
 BRAND_NICHES = {
     'fitness': "men's fitness over 35 — supplements, strength training, weight loss, testosterone",
@@ -52,18 +56,30 @@ def analytics_reader_agent(db):
     print('[analytics_reader] Reading performance data...')
     data = {}
 
+    snapshot = AnalyticsSnapshot.open(db.client, SNAPSHOT_TABLES)
+    articles = snapshot['generated_articles']
+    history = snapshot['content_history']
+    recent = history.since(datetime.now(timezone.utc) - timedelta(days=14))
+
+    # Affiliate programs status, all brands in one query
+    programs_by_brand = {brand: [] for brand in BRANDS}
+    try:
+        progs = db.client.table('affiliate_programs').select(
+            'brand, program_name, status, commission_rate'
+        ).in_('brand', BRANDS).execute()
+        for prog in progs.data or []:
+            brand = prog.pop('brand', None)
+            if brand in programs_by_brand:
+                programs_by_brand[brand].append(prog)
+    except Exception as e:
+        print(f'  [analytics_reader] affiliate programs error: {e}')
+
     for brand in BRANDS:
         brand_data = {}
 
         # Recent generated articles (last 30)
-        try:
-            arts = db.client.table('generated_articles').select(
-                'slug, article_title, brand, created_at'
-            ).eq('brand', brand).order('created_at', desc=True).limit(30).execute()
-            brand_data['recent_articles'] = arts.data or []
-        except Exception as e:
-            brand_data['recent_articles'] = []
-            print(f'  [analytics_reader] articles error for {brand}: {e}')
+        brand_data['recent_articles'] = articles.records(
+            ['slug', 'article_title', 'brand', 'created_at'], where=articles.eq('brand', brand), limit=30)
 
         # Revenue-scored content (if table populated)
         try:
@@ -75,23 +91,11 @@ def analytics_reader_agent(db):
             brand_data['top_performers'] = []
 
         # Recent pin topics (last 14 days)
-        try:
-            cutoff = (datetime.now(timezone.utc) - timedelta(days=14)).isoformat()
-            hist = db.client.table('content_history').select(
-                'trending_topic, board, visual_style, status'
-            ).eq('brand', brand).gte('created_at', cutoff).execute()
-            brand_data['recent_topics'] = hist.data or []
-        except Exception:
-            brand_data['recent_topics'] = []
+        brand_data['recent_topics'] = history.records(
+            ['trending_topic', 'board', 'visual_style', 'status'],
+            where=recent & history.eq('brand', brand), newest_first=False)
 
-        # Affiliate programs status
-        try:
-            progs = db.client.table('affiliate_programs').select(
-                'program_name, status, commission_rate'
-            ).eq('brand', brand).execute()
-            brand_data['affiliate_programs'] = progs.data or []
-        except Exception:
-            brand_data['affiliate_programs'] = []
+        brand_data['affiliate_programs'] = programs_by_brand[brand]
 
         data[brand] = brand_data
         print(
@@ -25,6 +25,7 @@ from concurrent.futures import ThreadPoolExecutor, as_completed
 
 sys.path.insert(0, '.')
 from database.supabase_client import get_supabase_client
+from utils.markdown_renderer import MarkdownRenderer, sponsored_link_attrs
 
 BRANDS = ['fitness', 'deals', 'menopause']
 
@@ -53,6 +54,9 @@ BRAND_AMAZON_TAGS = {
     'menopause': 'dailydealdarl-20',
 }
 
+# Every outbound link in these articles is an affiliate link
+_MARKDOWN = MarkdownRenderer(link_attrs=sponsored_link_attrs, skip_h1=True)
+
 
 def _get_gemini_client():
     key = os.environ.get('GEMINI_API_KEY') or os.environ.get('ANTHROPIC_API_KEY', '')
@@ -70,32 +74,8 @@ def _make_slug(title: str) -> str:
 
 
 def _md_to_html(md_text: str, title: str, brand: str) -> str:
-    """Minimal markdown-to-HTML converter for article content."""
-    html_lines = []
-    for line in md_text.split('\n'):
-        line = line.strip()
-        if not line:
-            continue
-        if line.startswith('## '):
-            html_lines.append(f'<h2>{line[3:]}</h2>')
-        elif line.startswith('### '):
-            html_lines.append(f'<h3>{line[4:]}</h3>')
-        elif line.startswith('# '):
-            pass  # skip duplicate h1 (already in template)
-        elif line.startswith('- '):
-            html_lines.append(f'<li>{line[2:]}</li>')
-        else:
-            # Convert markdown links to HTML
-            line = re.sub(
-                r'\[([^\]]+)\]\(([^)]+)\)',
-                r'<a href="\2" rel="nofollow sponsored" target="_blank">\1</a>',
-                line
-            )
-            line = re.sub(r'\*\*([^*]+)\*\*', r'<strong>\1</strong>', line)
-            line = re.sub(r'\*([^*]+)\*', r'<em>\1</em>', line)
-            html_lines.append(f'<p>{line}</p>')
-
-    return '\n'.join(html_lines)
+    """Markdown-to-HTML for article content (the template already renders the H1)."""
+    return _MARKDOWN.render(md_text)
 
 
 # ─── Agent 1: GSC Researcher ──────────────────────────────────────────────────
@@ -71,6 +71,13 @@ def run_pipeline(
 
     results = []
 
+    # Scripts are independent Gemini calls — fetch them all concurrently up
+    # front (rate-limited by gemini_client) instead of one per loop iteration.
+    from video_automation.gemini_client import map_concurrent
+    scripts = map_concurrent(
+        lambda _: generate_script(brand=brand, topic=topic, format=format), range(count)
+    )
+
     for i in range(count):
         run_label = f"[{brand.name}] Video {i + 1}/{count}"
         logger.info(f"{'=' * 60}")
@@ -80,7 +87,9 @@ def run_pipeline(
         try:
             # --- Step 1: Generate script ---
             logger.info(f"{run_label} → Step 1: Generating script (format={format})...")
-            script_data = generate_script(brand=brand, topic=topic, format=format)
+            script_data = scripts[i]
+            if isinstance(script_data, Exception):
+                raise script_data
             result["title"] = script_data["title"]
             result["topic"] = script_data.get("topic")
             logger.info(f"{run_label} → Script: '{script_data['title']}'")
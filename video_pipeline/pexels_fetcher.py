@@ -64,6 +64,17 @@ def _try_nano_banana(query: str, brand: str, output_path: Path) -> bool:
         return False
 
 
+def _fetch_cached(img_url: str) -> bytes:
+    """Download an image through the shared on-disk cache (utils.image_cache)."""
+    import sys
+    project_root = Path(__file__).resolve().parent.parent
+    if str(project_root) not in sys.path:
+        sys.path.insert(0, str(project_root))
+
+    from utils.image_cache import fetch_image_bytes
+    return fetch_image_bytes(img_url, headers={"User-Agent": "VideoPipeline/1.0"})
+
+
 def fetch_portrait_images(
     queries: list[str],
     count: int = 4,
@@ -129,13 +140,7 @@ def fetch_portrait_images(
             # portrait is ~1080x1620, original can be huge — portrait is ideal
             img_url = photo["src"].get("portrait") or photo["src"].get("original")
 
-            img_req = urllib.request.Request(
-                img_url,
-                headers={"User-Agent": "VideoPipeline/1.0"},
-            )
-            with urllib.request.urlopen(img_req, timeout=30) as img_resp:
-                with open(img_path, "wb") as f:
-                    f.write(img_resp.read())
+            img_path.write_bytes(_fetch_cached(img_url))
 
             downloaded.append(img_path)
             logger.info(f"Pexels [{len(downloaded)}/{count}]: {img_path.name} ← '{query}'")
@@ -145,7 +145,6 @@ def generate_script(
         dict with keys: title, topic, hook, body_points, cta, full_script,
                         hashtags, pexels_search_queries, estimated_duration_seconds
     """
-    import time as _time
     try:
         import google.genai as genai
     except ImportError:
@@ -153,7 +152,12 @@ def generate_script(
             "google-genai not installed. Run: pip install google-genai"
         )
 
+    from video_automation.gemini_client import get_limiter
+    from video_automation.gemini_limiter import backoff_delay, estimate_tokens, retry_delay_from_error
+
     api_key = get_api_key("GEMINI_API_KEY")
+    # Share gemini_client's RPM/TPM budget so concurrent script calls don't 429
+    limiter = get_limiter()
 
     # Model fallback chain — if primary hits rate limit, try alternatives
     models_to_try = [model, "gemini-2.0-flash", "gemini-1.5-flash"]
@@ -171,6 +175,7 @@ def generate_script(
             for attempt in range(3):
                 try:
                     logger.info(f"Generating script: brand={brand.key}, model={attempt_model}, attempt={attempt+1}")
+                    limiter.acquire(estimate_tokens(prompt) + 2000)
                     response = client.models.generate_content(
                         model=attempt_model,
                         contents=prompt,
@@ -184,9 +189,9 @@ def generate_script(
                     last_error = e
                     err_str = str(e)
                     if any(code in err_str for code in ["429", "RESOURCE_EXHAUSTED", "503", "UNAVAILABLE", "overloaded", "high demand"]):
-                        wait = min(60, 10 * (attempt + 1))
-                        logger.warning(f"Retryable error on {attempt_model}, waiting {wait}s (attempt {attempt+1}/3): {err_str[:100]}")
-                        _time.sleep(wait)
+                        wait = retry_delay_from_error(e) or backoff_delay(attempt)
+                        logger.warning(f"Retryable error on {attempt_model}, waiting {wait:.1f}s (attempt {attempt+1}/3): {err_str[:100]}")
+                        limiter.pause(wait)
                     else:
                         raise  # Non-retryable error
             if response is not None:
@@ -3,6 +3,14 @@ Render a 1080x1920 vertical MP4 video.
 Two backends:
   - FFmpeg: Ken Burns + text overlays (create_video)
   - Remotion: SlideshowVideo React component (create_video_remotion)
+
+FFmpeg renders use a RenderProfile (draft / standard / final) for the x264
+preset, CRF, tune and thread count. Select one per call or with the
+VIDEO_RENDER_PROFILE env var. Text overlays never change during a clip, so
+they are rasterized once to a PNG and composited with a single overlay
+filter instead of re-running drawtext on every frame.
+
+Benchmark encode fps per profile with scripts/benchmark_video_render.py.
 """
 
 import json
@@ -14,10 +22,12 @@ import tempfile
 import textwrap
 import urllib.request
 import uuid
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Optional
+from typing import Optional, Union
 
-from .config import BrandConfig, BrandColors, get_api_key
+from .config import BrandConfig, BrandColors, FFMPEG_BIN, get_api_key
 
 logger = logging.getLogger(__name__)
 
@@ -25,6 +35,107 @@ VIDEO_W = 720
 VIDEO_H = 1280
 IMAGE_DURATION = 7  # seconds per image before transition
 FADE_DURATION = 0.5
+FPS = 25
+KEN_BURNS_ZOOM = 1.10  # zoom reached by the end of each image's segment
+
+# Concurrent Pexels downloads per video
+PEXELS_FETCH_WORKERS = 5
+
+# Bottom text panel (title + bullet points), composited from one PNG
+PANEL_HEIGHT = 500
+PANEL_ALPHA = 0.55
+TITLE_FONT = "/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf"
+BODY_FONT = "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf"
+
+
+@dataclass(frozen=True)
+class RenderProfile:
+    """x264 settings for one quality/speed trade-off.
+
+    supersample is the factor images are upscaled by before zoompan; 2 keeps
+    the Ken Burns motion smooth, 1 is jittery but roughly 4x less pixel work.
+    threads=0 lets ffmpeg pick (one per core).
+    """
+
+    name: str
+    preset: str
+    crf: int
+    tune: Optional[str] = None
+    threads: int = 0
+    supersample: int = 2
+
+    def codec_args(self) -> list[str]:
+        args = ["-c:v", "libx264", "-preset", self.preset, "-crf", str(self.crf)]
+        if self.tune:
+            args += ["-tune", self.tune]
+        if self.threads:
+            args += ["-threads", str(self.threads)]
+        return args
+
+
+RENDER_PROFILES: dict[str, RenderProfile] = {
+    # Previews and CI smoke tests: fastest encode, visibly soft
+    "draft": RenderProfile("draft", preset="ultrafast", crf=30, tune="zerolatency", supersample=1),
+    # Default for scheduled runs on 2-core runners
+    "standard": RenderProfile("standard", preset="veryfast", crf=23, tune="stillimage"),
+    # Hero uploads: slower encode, smaller file at higher quality
+    "final": RenderProfile("final", preset="slow", crf=20, tune="stillimage"),
+}
+DEFAULT_RENDER_PROFILE = "standard"
+
+
+def get_render_profile(profile: Union[str, RenderProfile, None] = None) -> RenderProfile:
+    """Resolve a profile name (or None → VIDEO_RENDER_PROFILE env, default standard).
+
+    VIDEO_RENDER_THREADS overrides the profile's thread count.
+    """
+    if not isinstance(profile, RenderProfile):
+        name = (profile or os.getenv("VIDEO_RENDER_PROFILE") or DEFAULT_RENDER_PROFILE).lower()
+        if name not in RENDER_PROFILES:
+            raise ValueError(f"Unknown render profile '{name}' (choose from {', '.join(RENDER_PROFILES)})")
+        profile = RENDER_PROFILES[name]
+    threads = os.getenv("VIDEO_RENDER_THREADS")
+    if threads:
+        profile = RenderProfile(profile.name, profile.preset, profile.crf, profile.tune,
+                                int(threads), profile.supersample)
+    return profile
+
+
+def _ffmpeg_bin() -> str:
+    """ffmpeg on PATH, else FFMPEG_BIN from config."""
+    return shutil.which("ffmpeg") or FFMPEG_BIN
+
+
+def _fetch_pexels_image(query: str, orientation: str, img_path: Path, api_key: str) -> Optional[Path]:
+    """Download the top Pexels result for one query; None on no results or error."""
+    try:
+        url = (
+            f"https://api.pexels.com/v1/search"
+            f"?query={urllib.request.quote(query)}"
+            f"&orientation={orientation}&per_page=1&page=1"
+        )
+        req = urllib.request.Request(url, headers={"Authorization": api_key, "User-Agent": "VideoBot/1.0"})
+        with urllib.request.urlopen(req, timeout=15) as resp:
+            data = json.loads(resp.read())
+
+        photos = data.get("photos", [])
+        if not photos:
+            logger.warning(f"No Pexels results for query: '{query}'")
+            return None
+
+        photo = photos[0]
+        img_url = photo["src"].get("large2x") or photo["src"]["original"]
+
+        img_req = urllib.request.Request(img_url, headers={"User-Agent": "VideoBot/1.0"})
+        with urllib.request.urlopen(img_req, timeout=30) as img_resp:
+            with open(img_path, "wb") as f:
+                f.write(img_resp.read())
+        logger.debug(f"Downloaded: {img_path.name} ({query})")
+        return img_path
+
+    except Exception as e:
+        logger.warning(f"Pexels fetch failed for '{query}': {e}")
+        return None
 
 
 def _fetch_pexels_images(
@@ -33,64 +144,62 @@ def _fetch_pexels_images(
     orientation: str,
     output_dir: Path,
 ) -> list[Path]:
-    """Download up to `count` images from Pexels matching the search queries."""
+    """Download up to `count` images from Pexels matching the search queries.
+
+    Queries are fetched concurrently, `count` at a time; later queries are
+    only tried to replace ones that failed. Results keep query order.
+    """
     api_key = get_api_key("PEXELS_API_KEY")
     downloaded: list[Path] = []
+    indexed = list(enumerate(queries))
 
-    for i, query in enumerate(queries):
-        if len(downloaded) >= count:
-            break
-        try:
-            url = (
-                f"https://api.pexels.com/v1/search"
-                f"?query={urllib.request.quote(query)}"
-                f"&orientation={orientation}&per_page=1&page=1"
-            )
-            req = urllib.request.Request(url, headers={"Authorization": api_key, "User-Agent": "VideoBot/1.0"})
-            with urllib.request.urlopen(req, timeout=15) as resp:
-                data = json.loads(resp.read())
-
-            photos = data.get("photos", [])
-            if not photos:
-                logger.warning(f"No Pexels results for query: '{query}'")
-                continue
-
-            photo = photos[0]
-            img_url = photo["src"].get("large2x") or photo["src"]["original"]
-            img_path = output_dir / f"img_{i:02d}.jpg"
-
-            img_req = urllib.request.Request(img_url, headers={"User-Agent": "VideoBot/1.0"})
-            with urllib.request.urlopen(img_req, timeout=30) as img_resp:
-                with open(img_path, "wb") as f:
-                    f.write(img_resp.read())
-            downloaded.append(img_path)
-            logger.debug(f"Downloaded: {img_path.name} ({query})")
-
-        except Exception as e:
-            logger.warning(f"Pexels fetch failed for '{query}': {e}")
-            continue
+    with ThreadPoolExecutor(max_workers=max(1, min(PEXELS_FETCH_WORKERS, count))) as pool:
+        while indexed and len(downloaded) < count:
+            wave, indexed = indexed[:count - len(downloaded)], indexed[count - len(downloaded):]
+            futures = [
+                pool.submit(_fetch_pexels_image, query, orientation, output_dir / f"img_{i:02d}.jpg", api_key)
+                for i, query in wave
+            ]
+            downloaded += [path for path in (f.result() for f in futures) if path]
 
     return downloaded
 
 
-def _escape_ffmpeg_text(text: str) -> str:
-    """Escape special characters for FFmpeg drawtext filter."""
-    return (
-        text
-        .replace("\\", "\\\\")
-        .replace("'", "\\'")
-        .replace(":", "\\:")
-        .replace("[", "\\[")
-        .replace("]", "\\]")
-    )
+def _hex_to_rgba(hex_color: str, alpha: float = 1.0) -> tuple[int, int, int, int]:
+    """Convert #RRGGBB to a Pillow RGBA tuple."""
+    hex_color = hex_color.lstrip("#")
+    return (int(hex_color[0:2], 16), int(hex_color[2:4], 16), int(hex_color[4:6], 16), int(alpha * 255))
 
 
-def _hex_to_ffmpeg_color(hex_color: str, alpha: float = 1.0) -> str:
-    """Convert #RRGGBB to FFmpeg 0xRRGGBBAA format."""
-    hex_color = hex_color.lstrip("#")
-    r, g, b = int(hex_color[0:2], 16), int(hex_color[2:4], 16), int(hex_color[4:6], 16)
-    a = int(alpha * 255)
-    return f"0x{r:02X}{g:02X}{b:02X}{a:02X}"
+def _render_text_panel(
+    title: str,
+    body_points: list[str],
+    colors: BrandColors,
+    output_path: Path,
+) -> Path:
+    """
+    Rasterize the bottom text panel (dark bar, title, up to 3 bullets) to a PNG.
+
+    Layout matches the drawtext filters this replaces: title 52px bold centred
+    40px into the bar, bullets 34px at x=60 stacked 80px apart from y=150.
+    """
+    from PIL import Image, ImageDraw, ImageFont
+
+    panel = Image.new("RGBA", (VIDEO_W, PANEL_HEIGHT), _hex_to_rgba("#000000", PANEL_ALPHA))
+    draw = ImageDraw.Draw(panel)
+
+    title_font = ImageFont.truetype(TITLE_FONT, 52)
+    title_text = textwrap.shorten(title, width=38, placeholder="...")
+    title_w = draw.textlength(title_text, font=title_font)
+    draw.text(((VIDEO_W - title_w) / 2, 40), title_text, font=title_font, fill=_hex_to_rgba(colors.text))
+
+    body_font = ImageFont.truetype(BODY_FONT, 34)
+    for j, point in enumerate(body_points[:3]):
+        text = textwrap.shorten(f"• {point}", width=48, placeholder="...")
+        draw.text((60, 150 + j * 80), text, font=body_font, fill=_hex_to_rgba(colors.accent))
+
+    panel.save(output_path, "PNG")
+    return output_path
 
 
 def _build_filter_complex(
@@ -100,34 +209,41 @@ def _build_filter_complex(
     body_points: list[str],
     colors: BrandColors,
     total_duration: float,
+    panel_input: Optional[int] = None,
+    supersample: int = 2,
 ) -> tuple[str, list[str]]:
     """
     Build the FFmpeg -filter_complex string and input list.
 
+    Args:
+        panel_input: Input index of the pre-rendered text panel PNG
+            (see _render_text_panel). None skips the text overlay.
+        supersample: Upscale factor before zoompan (RenderProfile.supersample)
+
     Returns:
         (filter_complex_string, extra_ffmpeg_args)
     """
     n = len(images)
     seg_duration = total_duration / n
-
-    primary = _hex_to_ffmpeg_color(colors.primary, 0.85)
-    text_color = _hex_to_ffmpeg_color(colors.text)
-    accent = _hex_to_ffmpeg_color(colors.accent)
+    seg_frames = max(1, int(seg_duration * FPS))
+    work_w, work_h = VIDEO_W * supersample, VIDEO_H * supersample
 
     filters = []
     scaled_labels = []
 
     # --- Per-image: scale, Ken Burns zoom/pan, fade in/out ---
+    # Each image is a single input frame; zoompan expands it to exactly
+    # seg_frames frames while zooming 1.0 -> KEN_BURNS_ZOOM.
     for i, img_path in enumerate(images):
         # Scale to slightly larger than frame so zoompan has room to move
         filters.append(
-            f"[{i}:v]scale={VIDEO_W * 2}:{VIDEO_H * 2}:force_original_aspect_ratio=increase,"
-            f"crop={VIDEO_W * 2}:{VIDEO_H * 2},"
+            f"[{i}:v]scale={work_w}:{work_h}:force_original_aspect_ratio=increase,"
+            f"crop={work_w}:{work_h},"
             f"zoompan="
-            f"z='if(lte(zoom,1.0),1.0,zoom-0.002)':"
+            f"z='1+{KEN_BURNS_ZOOM - 1:.3f}*on/{seg_frames}':"
             f"x='iw/2-(iw/zoom/2)':"
             f"y='ih/2-(ih/zoom/2)':"
-            f"d={int(seg_duration * 25)}:s={VIDEO_W}x{VIDEO_H}:fps=25,"
+            f"d={seg_frames}:s={VIDEO_W}x{VIDEO_H}:fps={FPS},"
             f"setpts=PTS-STARTPTS,"
             f"fade=t=in:st=0:d={FADE_DURATION},"
             f"fade=t=out:st={seg_duration - FADE_DURATION}:d={FADE_DURATION},"
@@ -138,48 +254,15 @@ def _build_filter_complex(
 
     # --- Concatenate all video segments ---
     concat_in = "".join(scaled_labels)
-    filters.append(f"{concat_in}concat=n={n}:v=1:a=0[vconcat]")
-
-    # --- Text overlays on the concatenated stream ---
-    # Overlay 1: dark gradient bar at bottom for text legibility
-    filters.append(
-        f"[vconcat]drawbox="
-        f"x=0:y={VIDEO_H - 500}:w={VIDEO_W}:h=500:"
-        f"color={_hex_to_ffmpeg_color('#000000', 0.55)}:t=fill"
-        f"[vbox]"
-    )
-
-    # Overlay 2: Title text
-    safe_title = _escape_ffmpeg_text(textwrap.shorten(title, width=38, placeholder="..."))
-    filters.append(
-        f"[vbox]drawtext="
-        f"text='{safe_title}':"
-        f"fontsize=52:fontcolor={text_color}:"
-        f"x=(w-text_w)/2:y={VIDEO_H - 460}:"
-        f"fontfile=/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf"
-        f"[vtitle]"
-    )
-
-    # Overlay 3: Body points (up to 3, stacked)
-    current_label = "[vtitle]"
-    for j, point in enumerate(body_points[:3]):
-        safe_point = _escape_ffmpeg_text(
-            textwrap.shorten(f"• {point}", width=48, placeholder="...")
-        )
-        next_label = f"[vpoint{j}]" if j < 2 else "[vfinal]"
-        y_pos = VIDEO_H - 350 + (j * 80)
+    if panel_input is None:
+        filters.append(f"{concat_in}concat=n={n}:v=1:a=0[vfinal]")
+    else:
+        filters.append(f"{concat_in}concat=n={n}:v=1:a=0[vconcat]")
+        # --- Text panel: one static RGBA frame, held for the whole clip ---
         filters.append(
-            f"{current_label}drawtext="
-            f"text='{safe_point}':"
-            f"fontsize=34:fontcolor={accent}:"
-            f"x=60:y={y_pos}:"
-            f"fontfile=/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf"
-            f"{next_label}"
+            f"[vconcat][{panel_input}:v]overlay=x=0:y={VIDEO_H - PANEL_HEIGHT}:"
+            f"eof_action=repeat:format=yuv420[vfinal]"
         )
-        current_label = next_label
-
-    if current_label != "[vfinal]":
-        filters.append(f"{current_label}copy[vfinal]")
 
     filter_str = ";".join(filters)
     return filter_str, []
@@ -193,6 +276,7 @@ def render_video(
     body_points: list[str],
     colors: BrandColors,
     total_duration: float,
+    profile: Union[str, RenderProfile, None] = None,
 ) -> Path:
     """
     Render a vertical MP4 from images + voiceover using FFmpeg.
@@ -205,12 +289,23 @@ def render_video(
         body_points: Bullet points for overlay
         colors: Brand color palette
         total_duration: Target video length in seconds
+        profile: RenderProfile or its name (default: VIDEO_RENDER_PROFILE
+            env var, else "standard")
 
     Returns:
         Path to the rendered MP4 file
     """
     output_path = Path(output_path)
     output_path.parent.mkdir(parents=True, exist_ok=True)
+    profile = get_render_profile(profile)
+
+    fd, panel_name = tempfile.mkstemp(prefix="text_panel_", suffix=".png")
+    os.close(fd)
+    panel_path = _render_text_panel(title, body_points, colors, Path(panel_name))
+
+    # Input: audio (if provided)
+    has_audio = voiceover_path and voiceover_path.exists()
+    panel_input = len(images) + (1 if has_audio else 0)
 
     filter_complex, _ = _build_filter_complex(
         images=images,
@@ -219,22 +314,27 @@ def render_video(
         body_points=body_points,
         colors=colors,
         total_duration=total_duration,
+        panel_input=panel_input,
+        supersample=profile.supersample,
     )
 
     # Build FFmpeg command
-    cmd = ["ffmpeg", "-y"]
+    cmd = [_ffmpeg_bin(), "-y"]
 
-    # Input: one entry per image, looped for its segment duration
-    seg_duration = total_duration / len(images)
+    # Input: one still frame per image (zoompan sets each segment's length;
+    # looping the input would make zoompan emit a full segment per frame)
     for img_path in images:
-        cmd += ["-loop", "1", "-t", str(seg_duration), "-i", str(img_path)]
+        cmd += ["-i", str(img_path)]
 
-    # Input: audio (if provided)
-    has_audio = voiceover_path and voiceover_path.exists()
     if has_audio:
         cmd += ["-i", str(voiceover_path)]
 
+    # Input: text panel, a single frame the overlay filter holds
+    cmd += ["-i", str(panel_path)]
+
     cmd += ["-filter_complex", filter_complex]
+    if profile.threads:
+        cmd += ["-filter_complex_threads", str(profile.threads)]
 
     # Map video output
     cmd += ["-map", "[vfinal]"]
@@ -244,10 +344,8 @@ def render_video(
         audio_idx = len(images)
         cmd += ["-map", f"{audio_idx}:a"]
 
+    cmd += profile.codec_args()
     cmd += [
-        "-c:v", "libx264",
-        "-preset", "fast",
-        "-crf", "23",
         "-pix_fmt", "yuv420p",
         "-c:a", "aac",
         "-b:a", "128k",
@@ -256,7 +354,7 @@ def render_video(
         str(output_path),
     ]
 
-    logger.info(f"Running FFmpeg render → {output_path.name}")
+    logger.info(f"Running FFmpeg render ({profile.name}: {profile.preset}/crf {profile.crf}) → {output_path.name}")
     logger.debug(f"FFmpeg command: {' '.join(cmd)}")
 
     try:
@@ -274,7 +372,10 @@ def render_video(
         return output_path
 
     except subprocess.TimeoutExpired:
-        raise RuntimeError("FFmpeg render timed out after 300 seconds")
+        raise RuntimeError("FFmpeg render timed out after 900 seconds")
+
+    finally:
+        panel_path.unlink(missing_ok=True)
 
 
 # Mapping from Python brand key → (Remotion composition ID, brands.ts config key)
@@ -426,6 +527,7 @@ def create_video(
     script_data: dict,
     voiceover_path: Optional[Path],
     output_path: Path,
+    profile: Union[str, RenderProfile, None] = None,
 ) -> Path:
     """
     Full pipeline: download Pexels images → render video.
@@ -435,6 +537,7 @@ def create_video(
         script_data: Output from script_generator.generate_script()
         voiceover_path: Path to generated MP3 (or None)
         output_path: Destination for the final MP4
+        profile: Render profile name or RenderProfile (see get_render_profile)
 
     Returns:
         Path to rendered MP4
@@ -466,4 +569,5 @@ def create_video(
             body_points=script_data.get("body_points", []),
             colors=brand.colors,
             total_duration=total_duration,
+            profile=profile,
         )